@@ -0,0 +1,192 @@
+"""
+Benchmark da camada de conexão e do CRUD de usuários.
+
+Para cada tamanho da tabela usuarios (por padrão 100, 1.000 e 10.000
+linhas) cria um banco temporário e mede, com aquecimento e repetições
+(ver benchmarks/harness.py):
+- execute_query: INSERT com um commit por linha e SELECT por id
+- execute_many: o mesmo INSERT em lote, com um único commit
+- criar_usuario, buscar_usuario_por_email, verificar_login,
+  listar_usuarios e atualizar_usuario
+
+Linhas inseridas durante uma repetição são apagadas antes da seguinte
+(fora da contagem), para a tabela manter o tamanho medido. Os
+resultados vão para um JSON que pode ser comparado com outra execução.
+
+O banco real (database/db.sqlite) não é tocado.
+
+Uso:
+    python benchmarks/bench_crud.py --saida base.json
+    python benchmarks/bench_crud.py --saida novo.json --comparar base.json
+    python benchmarks/harness.py base.json novo.json
+
+Autor: Sistema Gráfica
+Data: 2025
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+from typing import Callable, List
+
+# Adiciona o diretório pai ao path para importar database, modules e benchmarks
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import harness
+from database import connection
+from database import migrations
+from modules import usuarios
+
+
+SENHA = 'senha123'
+INSERT_USUARIO = "INSERT INTO usuarios (nome, email, senha, perfil) VALUES (?, ?, ?, ?)"
+
+# Operações por repetição: o bastante para a repetição durar alguns ms
+OPERACOES_ESCRITA = 100
+OPERACOES_LEITURA = 200
+
+
+def popular(tamanho: int) -> None:
+    """
+    Preenche usuarios com `tamanho` linhas (emails usuario<i>@bench.com).
+    """
+    senha = usuarios.gerar_hash_senha(SENHA)
+    connection.execute_many(
+        INSERT_USUARIO,
+        [(f"Usuário {i}", f"usuario{i}@bench.com", senha, 'admin' if i % 10 == 0 else 'operador')
+         for i in range(1, tamanho + 1)]
+    )
+
+
+def medir_tamanho(tamanho: int, repeticoes: int, aquecimento: int,
+                  rng: random.Random) -> List[harness.BenchmarkStats]:
+    """
+    Executa todas as medidas no banco configurado, já com `tamanho` usuários.
+
+    Returns:
+        List[harness.BenchmarkStats]: Uma entrada por medida
+    """
+    senha_hash = usuarios.gerar_hash_senha(SENHA)
+    contador = [0]
+
+    def novas_linhas(quantidade: int) -> List[tuple]:
+        # Apaga o que a repetição anterior inseriu e gera emails inéditos
+        connection.execute_query("DELETE FROM usuarios WHERE id > ?", (tamanho,))
+        inicio = contador[0]
+        contador[0] += quantidade
+        return [(f"Novo {i}", f"novo{i}@bench.com", senha_hash, 'operador')
+                for i in range(inicio, inicio + quantidade)]
+
+    def emails_existentes() -> List[str]:
+        return [f"usuario{rng.randint(1, tamanho)}@bench.com" for _ in range(OPERACOES_LEITURA)]
+
+    def ids_existentes(quantidade: int) -> Callable[[], List[int]]:
+        return lambda: [rng.randint(1, tamanho) for _ in range(quantidade)]
+
+    def execute_query_insert(linhas):
+        for linha in linhas:
+            connection.execute_query(INSERT_USUARIO, linha)
+
+    def execute_query_select(ids):
+        for id_usuario in ids:
+            connection.execute_query("SELECT * FROM usuarios WHERE id = ?", (id_usuario,))
+
+    def criar(linhas):
+        for nome, email, _, perfil in linhas:
+            if not usuarios.criar_usuario(nome, email, SENHA, perfil):
+                raise RuntimeError(f"criar_usuario falhou para {email}")
+
+    def buscar(emails):
+        for email in emails:
+            usuarios.buscar_usuario_por_email(email)
+
+    def login(emails):
+        for email in emails:
+            if usuarios.verificar_login(email, SENHA) is None:
+                raise RuntimeError(f"verificar_login falhou para {email}")
+
+    def atualizar(ids):
+        for id_usuario in ids:
+            usuarios.atualizar_usuario(id_usuario, nome=f"Usuário {id_usuario} ({rng.random():.6f})")
+
+    # (nome, função, operações por repetição, preparação)
+    medidas = [
+        ("execute_query INSERT (1 commit/linha)", execute_query_insert, OPERACOES_ESCRITA,
+         lambda: novas_linhas(OPERACOES_ESCRITA)),
+        ("execute_many INSERT (1 commit/lote)",
+         lambda linhas: connection.execute_many(INSERT_USUARIO, linhas), OPERACOES_ESCRITA,
+         lambda: novas_linhas(OPERACOES_ESCRITA)),
+        ("execute_query SELECT por id", execute_query_select, OPERACOES_LEITURA,
+         ids_existentes(OPERACOES_LEITURA)),
+        ("criar_usuario", criar, OPERACOES_ESCRITA, lambda: novas_linhas(OPERACOES_ESCRITA)),
+        ("buscar_usuario_por_email", buscar, OPERACOES_LEITURA, emails_existentes),
+        ("verificar_login", login, OPERACOES_LEITURA, emails_existentes),
+        ("listar_usuarios", lambda: usuarios.listar_usuarios(), 1, None),
+        ("atualizar_usuario", atualizar, OPERACOES_ESCRITA, ids_existentes(OPERACOES_ESCRITA)),
+    ]
+
+    resultados = []
+    for nome, funcao, operacoes, preparar in medidas:
+        resultados.append(harness.measure(nome, funcao, tamanho=tamanho, repeticoes=repeticoes,
+                                          aquecimento=aquecimento, operacoes=operacoes,
+                                          preparar=preparar))
+    # Deixa a tabela como estava para a próxima medida/tamanho
+    connection.execute_query("DELETE FROM usuarios WHERE id > ?", (tamanho,))
+    return resultados
+
+
+def main():
+    """
+    Executa o benchmark, grava o JSON e opcionalmente compara com outra execução.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark da conexão e do CRUD de usuários")
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=[100, 1000, 10000],
+                        help="quantidades de usuários na tabela")
+    parser.add_argument('--repeticoes', type=int, default=harness.DEFAULT_REPETITIONS)
+    parser.add_argument('--aquecimento', type=int, default=harness.DEFAULT_WARMUP)
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--saida', default='bench_crud.json', help="arquivo JSON de resultados")
+    parser.add_argument('--comparar', metavar='BASE.json', default=None,
+                        help="compara com uma execução anterior ao final")
+    parser.add_argument('--limite', type=float, default=harness.DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    rng = random.Random(args.semente)
+    resultados = []
+    anterior = connection.get_database_target()
+    for tamanho in args.tamanhos:
+        diretorio = tempfile.mkdtemp(prefix="bench_crud_")
+        try:
+            connection.configure_database(os.path.join(diretorio, "bench.sqlite"))
+            migrations.migrate()
+            popular(tamanho)
+            print(f"⏱️  {tamanho:,} usuários...")
+            resultados.extend(medir_tamanho(tamanho, args.repeticoes, args.aquecimento, rng))
+        finally:
+            connection.configure_database(anterior)
+            shutil.rmtree(diretorio, ignore_errors=True)
+
+    print()
+    print(harness.format_results(resultados))
+    harness.save_results(args.saida, resultados, {
+        'tamanhos': args.tamanhos,
+        'repeticoes': args.repeticoes,
+        'aquecimento': args.aquecimento,
+        'semente': args.semente,
+    })
+    print(f"\n💾 Resultados gravados em {args.saida}")
+
+    if args.comparar:
+        comparacoes = harness.compare(harness.load_results(args.comparar),
+                                      harness.load_results(args.saida), args.limite)
+        print()
+        print(harness.format_comparison(comparacoes))
+        if any(c.situacao == 'regressao' for c in comparacoes):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark da busca de usuários por email (login).
+
+Para cada tamanho da tabela usuarios, mede a consulta antiga
+(WHERE LOWER(email) = LOWER(?), leitura completa da tabela) e a atual
+(WHERE email = ?, coluna com COLLATE NOCASE e índice UNIQUE). Com o
+índice o custo da busca fica praticamente constante.
+
+O banco real (database/db.sqlite) não é tocado.
+
+Uso:
+    python benchmarks/bench_email_lookup.py --tamanhos 1000 10000 100000
+
+Autor: Sistema Gráfica
+Data: 2025
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from typing import Tuple
+
+# Adiciona o diretório pai ao path para importar database
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import connection
+from database import migrations
+
+
+CONSULTA_ANTIGA = "SELECT id, senha, perfil FROM usuarios WHERE LOWER(email) = LOWER(?)"
+CONSULTA_ATUAL = "SELECT id, senha, perfil FROM usuarios WHERE email = ?"
+
+
+def gerar_usuarios(quantidade: int) -> None:
+    """
+    Insere usuários com emails normalizados no banco configurado.
+    """
+    connection.execute_many(
+        "INSERT INTO usuarios (nome, email, senha, perfil) VALUES (?, ?, ?, ?)",
+        [(f"Usuário {i}", f"usuario{i:06d}@grafica.com", "0" * 64, 'operador')
+         for i in range(quantidade)]
+    )
+
+
+def medir(sql: str, quantidade: int, repeticoes: int) -> Tuple[float, str]:
+    """
+    Mede a consulta com emails sorteados, digitados com maiúsculas
+    (COLLATE NOCASE encontra o cadastro mesmo assim).
+
+    Returns:
+        Tuple[float, str]: (ms por consulta, plano)
+    """
+    random.seed(7)
+    emails = [f"USUARIO{random.randrange(quantidade):06d}@Grafica.com"
+              for _ in range(repeticoes)]
+    with connection.get_pool().connection() as conn:
+        plano = " | ".join(linha[3] for linha in
+                           conn.execute("EXPLAIN QUERY PLAN " + sql, (emails[0],)))
+        inicio = time.perf_counter()
+        for email in emails:
+            linha = conn.execute(sql, (email,)).fetchone()
+            assert linha is not None, email
+        return (time.perf_counter() - inicio) * 1000 / repeticoes, plano
+
+
+def main():
+    """
+    Executa o benchmark e imprime a comparação por tamanho.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark da busca por email")
+    parser.add_argument('--tamanhos', type=int, nargs='+',
+                        default=[1000, 10000, 100000], help="quantidades de usuários")
+    parser.add_argument('--repeticoes', type=int, default=200)
+    args = parser.parse_args()
+
+    diretorio = tempfile.mkdtemp(prefix="bench_email_")
+    anterior = connection.get_database_target()
+    planos = {}
+    try:
+        print(f"{'Usuários':>10}{'LOWER(email) (ms)':>20}{'email = ? (ms)':>17}{'Ganho':>9}")
+        print("-" * 56)
+        for quantidade in args.tamanhos:
+            connection.configure_database(os.path.join(diretorio, f"usuarios_{quantidade}.sqlite"))
+            migrations.migrate()
+            gerar_usuarios(quantidade)
+
+            ms_antiga, planos['antiga'] = medir(CONSULTA_ANTIGA, quantidade, args.repeticoes)
+            ms_atual, planos['atual'] = medir(CONSULTA_ATUAL, quantidade, args.repeticoes)
+            ganho = ms_antiga / ms_atual if ms_atual else float('inf')
+            print(f"{quantidade:>10,}{ms_antiga:>20.4f}{ms_atual:>17.4f}{ganho:>8.0f}x")
+
+        print("-" * 56)
+        print(f"Plano LOWER(email): {planos['antiga']}")
+        print(f"Plano email = ?:    {planos['atual']}")
+
+    finally:
+        connection.configure_database(anterior)
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
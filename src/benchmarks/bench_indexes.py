@@ -0,0 +1,215 @@
+"""
+Benchmark dos índices secundários de database/migrations.py (INDEXES).
+
+Gera um banco temporário grande, mede as consultas mais usadas sem os
+índices, cria os índices, executa ANALYZE e mede de novo. Também mostra
+o plano de cada consulta (SCAN = leitura completa, SEARCH = índice) e o
+custo extra nas inserções.
+
+O banco real (database/db.sqlite) não é tocado.
+
+Uso:
+    python benchmarks/bench_indexes.py --clientes 20000
+
+Autor: Sistema Gráfica
+Data: 2025
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict, Tuple
+
+# Adiciona o diretório pai ao path para importar database
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import connection
+from database import migrations
+from database import setup
+
+
+# (descrição, SQL, gerador de parâmetros)
+CONSULTAS = [
+    ("orçamentos de um cliente",
+     "SELECT * FROM orcamentos WHERE cliente_id = ?",
+     lambda n: (random.randint(1, n),)),
+    ("orçamentos aprovados de um cliente",
+     "SELECT * FROM orcamentos WHERE cliente_id = ? AND status = 'aprovado'",
+     lambda n: (random.randint(1, n),)),
+    ("últimos orçamentos pendentes",
+     "SELECT * FROM orcamentos WHERE status = 'pendente' ORDER BY data_criacao DESC LIMIT 50",
+     lambda n: ()),
+    ("orçamentos de um usuário",
+     "SELECT COUNT(*) FROM orcamentos WHERE usuario_id = ?",
+     lambda n: (random.randint(1, 20),)),
+    ("pagamentos de um orçamento",
+     "SELECT * FROM pagamentos WHERE orcamento_id = ?",
+     lambda n: (random.randint(1, n * 5),)),
+    ("contas em aberto por vencimento",
+     "SELECT * FROM pagamentos WHERE status_pagamento = 'pendente' ORDER BY data_vencimento LIMIT 50",
+     lambda n: ()),
+    ("produção de um orçamento",
+     "SELECT * FROM producao WHERE orcamento_id = ?",
+     lambda n: (random.randint(1, n * 5),)),
+    ("fila de produção",
+     "SELECT COUNT(*) FROM producao WHERE status_producao = 'em_andamento'",
+     lambda n: ()),
+    ("materiais ativos de uma categoria",
+     "SELECT * FROM materiais WHERE categoria = ? AND ativo = 1 ORDER BY nome",
+     lambda n: (random.choice(['Papel', 'Tinta', 'Acabamento', 'Brinde']),)),
+    ("material por código de barras",
+     "SELECT * FROM materiais WHERE codigo_barras = ?",
+     lambda n: (f"789{random.randint(0, n // 4):010d}",)),
+    ("clientes ativos por nome",
+     "SELECT id, nome FROM clientes WHERE ativo = 1 ORDER BY nome LIMIT 50",
+     lambda n: ()),
+]
+
+STATUS_ORCAMENTO = ['pendente', 'aprovado', 'rejeitado', 'concluido']
+STATUS_PAGAMENTO = ['pendente', 'pago', 'atrasado']
+STATUS_PRODUCAO = ['aguardando', 'em_andamento', 'concluido']
+
+
+def gerar_dados(clientes: int) -> None:
+    """
+    Popula o banco configurado: clientes, materiais (1/4), orçamentos (5x),
+    pagamentos e produção (um por orçamento).
+    """
+    random.seed(42)
+    n_orc = clientes * 5
+
+    connection.execute_many(
+        "INSERT INTO usuarios (nome, email) VALUES (?, ?)",
+        [(f"Usuário {i}", f"usuario{i}@grafica.com") for i in range(1, 21)]
+    )
+    connection.execute_many(
+        "INSERT INTO clientes (nome, cidade, estado, ativo) VALUES (?, ?, ?, ?)",
+        [(f"Cliente {i:06d}", "Fortaleza", "CE", int(random.random() < 0.9))
+         for i in range(1, clientes + 1)]
+    )
+    connection.execute_many(
+        "INSERT INTO materiais (nome, categoria, codigo_barras, ativo) VALUES (?, ?, ?, ?)",
+        [(f"Material {i}", random.choice(['Papel', 'Tinta', 'Acabamento', 'Brinde']),
+          f"789{i:010d}" if i % 3 else None, int(random.random() < 0.8))
+         for i in range(clientes // 4)]
+    )
+    connection.execute_many(
+        """INSERT INTO orcamentos (numero_orcamento, cliente_id, descricao_servico,
+           status, data_criacao, usuario_id) VALUES (?, ?, ?, ?, ?, ?)""",
+        [(f"ORC-{i:07d}", random.randint(1, clientes), "Impressão",
+          random.choice(STATUS_ORCAMENTO),
+          f"2024-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}",
+          random.randint(1, 20))
+         for i in range(1, n_orc + 1)]
+    )
+    connection.execute_many(
+        """INSERT INTO pagamentos (orcamento_id, valor_pagamento, status_pagamento,
+           data_vencimento, usuario_id) VALUES (?, ?, ?, ?, ?)""",
+        [(i, 10000, random.choice(STATUS_PAGAMENTO),  # R$ 100,00 em centavos
+          f"2025-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}",
+          random.randint(1, 20))
+         for i in range(1, n_orc + 1)]
+    )
+    connection.execute_many(
+        "INSERT INTO producao (orcamento_id, status_producao, usuario_id) VALUES (?, ?, ?)",
+        [(i, random.choice(STATUS_PRODUCAO), random.randint(1, 20))
+         for i in range(1, n_orc + 1)]
+    )
+
+
+def medir_consultas(clientes: int, repeticoes: int) -> Dict[str, Tuple[float, str]]:
+    """
+    Mede cada consulta de CONSULTAS.
+
+    Returns:
+        Dict[str, Tuple[float, str]]: descrição -> (ms por consulta, plano)
+    """
+    resultado = {}
+    with connection.get_pool().connection() as conn:
+        for descricao, sql, gerar in CONSULTAS:
+            random.seed(7)
+            parametros = [gerar(clientes) for _ in range(repeticoes)]
+            plano = " | ".join(linha[3] for linha in
+                               conn.execute("EXPLAIN QUERY PLAN " + sql, parametros[0]))
+            inicio = time.perf_counter()
+            for params in parametros:
+                conn.execute(sql, params).fetchall()
+            resultado[descricao] = ((time.perf_counter() - inicio) * 1000 / repeticoes, plano)
+    return resultado
+
+
+def medir_insercao(linhas: int) -> float:
+    """
+    Mede inserções de orçamentos (em um lote), em linhas por segundo.
+    """
+    base = 10_000_000
+    dados = [(f"BENCH-{base + i}", 1, "Impressão", 'pendente', '2025-01-01', 1)
+             for i in range(linhas)]
+    inicio = time.perf_counter()
+    connection.execute_many(
+        """INSERT INTO orcamentos (numero_orcamento, cliente_id, descricao_servico,
+           status, data_criacao, usuario_id) VALUES (?, ?, ?, ?, ?, ?)""", dados
+    )
+    segundos = time.perf_counter() - inicio
+    connection.execute_query("DELETE FROM orcamentos WHERE numero_orcamento LIKE 'BENCH-%'")
+    return linhas / segundos
+
+
+def main():
+    """
+    Executa o benchmark e imprime a comparação antes/depois.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark dos índices do esquema")
+    parser.add_argument('--clientes', type=int, default=20000,
+                        help="clientes gerados (orçamentos = 5x)")
+    parser.add_argument('--repeticoes', type=int, default=50)
+    args = parser.parse_args()
+
+    diretorio = tempfile.mkdtemp(prefix="bench_indices_")
+    anterior = connection.get_database_target()
+    try:
+        connection.configure_database(os.path.join(diretorio, "bench.sqlite"))
+        # Só as tabelas (migração 1): os índices (migração 2) são criados
+        # depois da primeira medição
+        migrations.migrate(target=1)
+
+        print(f"🏗️  Gerando dados: {args.clientes} clientes, {args.clientes * 5} orçamentos...")
+        gerar_dados(args.clientes)
+
+        antes = medir_consultas(args.clientes, args.repeticoes)
+        insercao_antes = medir_insercao(5000)
+
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            migrations.migrate(target=2)
+            setup.analyze_database()
+        criacao = time.perf_counter() - inicio
+
+        depois = medir_consultas(args.clientes, args.repeticoes)
+        insercao_depois = medir_insercao(5000)
+
+        print(f"\n🗂️  {len(migrations.INDEXES)} índices criados + ANALYZE em {criacao:.2f}s\n")
+        print(f"{'Consulta':<38}{'Antes (ms)':>12}{'Depois (ms)':>13}{'Ganho':>9}")
+        print("-" * 72)
+        for descricao, _, _ in CONSULTAS:
+            ms_antes, _ = antes[descricao]
+            ms_depois, plano = depois[descricao]
+            ganho = ms_antes / ms_depois if ms_depois else float('inf')
+            print(f"{descricao:<38}{ms_antes:>12.3f}{ms_depois:>13.3f}{ganho:>8.0f}x")
+            print(f"    {plano}")
+        print("-" * 72)
+        print(f"{'Inserção de orçamentos (linhas/s)':<38}{insercao_antes:>12,.0f}{insercao_depois:>13,.0f}")
+
+    finally:
+        connection.configure_database(anterior)
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark de throughput de inserção e leitura por perfil de PRAGMA.
+
+Compara os perfis definidos em database.connection.PRAGMA_PROFILES em um
+banco temporário, medindo:
+- inserções com um commit por linha (padrão de execute_query)
+- inserções em lote com um único commit (padrão de execute_many)
+- consultas SELECT por chave primária
+
+O banco real (database/db.sqlite) não é tocado.
+
+Autor: Sistema Gráfica
+Data: 2025
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict
+
+# Adiciona o diretório pai ao path para importar connection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.connection import PRAGMA_PROFILES, ConnectionPool
+
+
+CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS clientes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome VARCHAR(100) NOT NULL,
+    email VARCHAR(100),
+    cidade VARCHAR(50)
+)
+"""
+
+INSERT = "INSERT INTO clientes (nome, email, cidade) VALUES (?, ?, ?)"
+
+
+def _linha(i: int):
+    return (f"Cliente {i}", f"cliente{i}@exemplo.com", "Fortaleza")
+
+
+def medir_perfil(profile: str, linhas: int, diretorio: str) -> Dict[str, float]:
+    """
+    Mede o throughput de um perfil em um banco novo.
+
+    Args:
+        profile: Nome do perfil de PRAGMA
+        linhas: Quantidade de linhas inseridas/consultadas em cada etapa
+        diretorio: Diretório temporário para o arquivo do banco
+
+    Returns:
+        Dict[str, float]: Operações por segundo de cada etapa
+    """
+    db_path = os.path.join(diretorio, f"bench_{profile}.sqlite")
+
+    # O perfil somente leitura não consegue criar nem popular o banco,
+    # então a carga é feita com o perfil padrão e só a leitura usa o perfil
+    escrita = 'desktop' if PRAGMA_PROFILES[profile].get('query_only') else profile
+
+    resultado = {}
+    pool = ConnectionPool(db_path, max_size=1, profile=escrita)
+    with pool.connection() as conn:
+        conn.execute(CREATE_TABLE)
+        conn.commit()
+
+        inicio = time.perf_counter()
+        for i in range(linhas):
+            conn.execute(INSERT, _linha(i))
+            conn.commit()
+        resultado['insert_commit'] = linhas / (time.perf_counter() - inicio)
+
+        inicio = time.perf_counter()
+        conn.executemany(INSERT, (_linha(i) for i in range(linhas, linhas * 11)))
+        conn.commit()
+        resultado['insert_lote'] = linhas * 10 / (time.perf_counter() - inicio)
+    pool.close()
+
+    pool = ConnectionPool(db_path, max_size=1, profile=profile)
+    with pool.connection() as conn:
+        inicio = time.perf_counter()
+        for i in range(1, linhas + 1):
+            conn.execute("SELECT * FROM clientes WHERE id = ?", (i,)).fetchone()
+        resultado['select_pk'] = linhas / (time.perf_counter() - inicio)
+    pool.close()
+
+    return resultado
+
+
+def main():
+    """
+    Executa o benchmark para todos os perfis e imprime a tabela comparativa.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--linhas", type=int, default=2000,
+                        help="linhas por etapa (padrão: 2000)")
+    args = parser.parse_args()
+
+    diretorio = tempfile.mkdtemp(prefix="bench_pragmas_")
+    try:
+        print(f"⏱️  Benchmark de perfis de PRAGMA ({args.linhas} linhas por etapa)")
+        print(f"{'perfil':<18} {'insert/commit':>14} {'insert lote':>14} {'select pk':>14}")
+        print("-" * 62)
+        for profile in PRAGMA_PROFILES:
+            r = medir_perfil(profile, args.linhas, diretorio)
+            print(
+                f"{profile:<18} {r['insert_commit']:>12.0f}/s "
+                f"{r['insert_lote']:>12.0f}/s {r['select_pk']:>12.0f}/s"
+            )
+    finally:
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    """
+    Uso: python benchmarks/bench_pragmas.py [--linhas N]
+    """
+    main()
@@ -0,0 +1,169 @@
+"""
+Benchmark da busca textual (database/search.py).
+
+Gera um banco temporário com clientes, materiais e orçamentos (por
+padrão 500 mil registros no total) e compara, para alguns textos, a
+busca com LIKE '%texto%' (leitura completa das tabelas) com buscar()
+sobre os índices FTS5. Também mostra a taxa de inserção com os
+triggers que mantêm os índices.
+
+O banco real (database/db.sqlite) não é tocado.
+
+Uso:
+    python benchmarks/bench_search.py --registros 500000
+
+Autor: Sistema Gráfica
+Data: 2025
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+# Adiciona o diretório pai ao path para importar database
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import connection
+from database import migrations
+from database.search import buscar
+
+
+NOMES = ['João', 'José', 'Maria', 'Ana', 'Francisco', 'Antônio', 'Luíza', 'Conceição',
+         'Raimundo', 'Sebastião', 'Patrícia', 'Márcia', 'Cícero', 'Iracema']
+# Sobrenomes gerados a partir de sílabas: dezenas de milhares de palavras
+# diferentes, como em um cadastro real
+SILABAS = ['ba', 'bra', 'ca', 'cas', 'ço', 'da', 'fer', 'gal', 'gon', 'lei', 'lhães',
+           'ma', 'mon', 'nan', 'pa', 'pi', 'quei', 'ra', 'rão', 'ro', 'san', 'são',
+           'ta', 'tei', 'to', 'va', 'vei', 'xa']
+CIDADES = ['Fortaleza', 'Caucaia', 'Maracanaú', 'Sobral', 'Juazeiro do Norte',
+           'Crato', 'Iguatu', 'Quixadá', 'Canindé', 'Aracati']
+RAMOS = ['Gráfica', 'Papelaria', 'Confecções', 'Padaria', 'Farmácia', 'Ótica',
+         'Construções', 'Eventos', 'Comunicação Visual', 'Escola']
+SERVICOS = ['Impressão de cartões de visita', 'Banner em lona', 'Panfletos couché',
+            'Adesivos em vinil', 'Cardápios plastificados', 'Convites de casamento',
+            'Blocos de notas fiscais', 'Calendários de mesa', 'Etiquetas térmicas',
+            'Encadernação espiral', 'Crachás em PVC', 'Sacolas personalizadas']
+MATERIAIS = ['Papel', 'Lona', 'Vinil', 'Tinta', 'Couché', 'Offset', 'Cartão', 'PVC']
+
+# (descrição, texto digitado, tabela e colunas para o LIKE equivalente)
+BUSCAS = [
+    ("cliente por sobrenome", "galmonrão", 'clientes', ('nome', 'empresa', 'cidade')),
+    ("cliente por início + cidade", "tavei sobral", 'clientes', ('nome', 'empresa', 'cidade')),
+    ("nome comum (muitos achados)", "conceicao", 'clientes', ('nome', 'empresa', 'cidade')),
+    ("material por descrição", "couche etiq", 'materiais', ('nome', 'descricao', 'categoria')),
+    ("orçamento por número", "0012", 'orcamentos', ('numero_orcamento', 'descricao_servico')),
+    ("orçamento por serviço", "convites casam", 'orcamentos', ('numero_orcamento', 'descricao_servico')),
+]
+
+
+def sobrenome() -> str:
+    """
+    Sobrenome sintético de duas ou três sílabas.
+    """
+    return "".join(random.choice(SILABAS) for _ in range(random.randint(2, 3))).capitalize()
+
+
+def gerar_dados(registros: int) -> float:
+    """
+    Popula o banco configurado: metade clientes, 10% materiais, o
+    restante orçamentos.
+
+    Returns:
+        float: Linhas inseridas por segundo (com os triggers de busca)
+    """
+    random.seed(42)
+    clientes = registros // 2
+    materiais = registros // 10
+    orcamentos = registros - clientes - materiais
+
+    inicio = time.perf_counter()
+    connection.execute_many(
+        "INSERT INTO clientes (nome, empresa, cidade, estado) VALUES (?, ?, ?, 'CE')",
+        [(f"{random.choice(NOMES)} {sobrenome()} {sobrenome()}",
+          f"{random.choice(RAMOS)} {sobrenome()} Ltda",
+          random.choice(CIDADES))
+         for _ in range(clientes)]
+    )
+    connection.execute_many(
+        "INSERT INTO materiais (nome, descricao, categoria) VALUES (?, ?, ?)",
+        [(f"{random.choice(MATERIAIS)} {random.randint(60, 300)}g",
+          f"{random.choice(MATERIAIS)} para {random.choice(SERVICOS).lower()}",
+          random.choice(MATERIAIS))
+         for _ in range(materiais)]
+    )
+    connection.execute_many(
+        """INSERT INTO orcamentos (numero_orcamento, cliente_id, descricao_servico)
+           VALUES (?, ?, ?)""",
+        [(f"ORC-{i:07d}", random.randint(1, clientes),
+          f"{random.choice(SERVICOS)} - {random.randint(50, 5000)} unidades")
+         for i in range(1, orcamentos + 1)]
+    )
+    return registros / (time.perf_counter() - inicio)
+
+
+def medir(funcao, repeticoes: int) -> float:
+    """
+    Retorna o tempo médio de funcao(), em ms.
+    """
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return (time.perf_counter() - inicio) * 1000 / repeticoes
+
+
+def main():
+    """
+    Executa o benchmark e imprime a comparação LIKE x FTS5.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark da busca textual")
+    parser.add_argument('--registros', type=int, default=500000,
+                        help="total de clientes + materiais + orçamentos")
+    parser.add_argument('--repeticoes', type=int, default=5)
+    args = parser.parse_args()
+
+    diretorio = tempfile.mkdtemp(prefix="bench_busca_")
+    anterior = connection.get_database_target()
+    try:
+        connection.configure_database(os.path.join(diretorio, "bench.sqlite"))
+        migrations.migrate()
+
+        print(f"🏗️  Gerando {args.registros:,} registros...")
+        taxa = gerar_dados(args.registros)
+        print(f"   {taxa:,.0f} linhas/s com os triggers de busca\n")
+
+        print(f"{'Busca':<30}{'LIKE (ms)':>11}{'FTS5 (ms)':>11}{'Ganho':>8}{'Achados':>10}")
+        print("-" * 70)
+        with connection.get_pool().connection() as conn:
+            for descricao, texto, tabela, colunas in BUSCAS:
+                # LIKE: cada palavra em alguma coluna (sem ignorar acentos),
+                # ordenado pelo título como uma listagem faria
+                condicoes = " AND ".join(
+                    "(" + " OR ".join(f"{coluna} LIKE ?" for coluna in colunas) + ")"
+                    for _ in texto.split()
+                )
+                parametros = [f"%{palavra}%" for palavra in texto.split() for _ in colunas]
+                sql = f"SELECT id FROM {tabela} WHERE {condicoes} ORDER BY {colunas[0]} LIMIT 20"
+
+                ms_like = medir(lambda: conn.execute(sql, parametros).fetchall(), args.repeticoes)
+                ms_fts = medir(lambda: buscar(texto, [tabela]), args.repeticoes)
+                achados = len(buscar(texto, [tabela]))
+                ganho = ms_like / ms_fts if ms_fts else float('inf')
+                print(f"{descricao:<30}{ms_like:>11.2f}{ms_fts:>11.2f}{ganho:>7.0f}x{achados:>10}")
+
+            ms_todas = medir(lambda: buscar("grafica fortal"), args.repeticoes)
+        print("-" * 70)
+        print(f"buscar('grafica fortal') nas três tabelas: {ms_todas:.2f} ms")
+        for resultado in buscar("grafica fortal", limite=3):
+            print(f"   {resultado['tabela']} {resultado['id']}: {resultado['trecho']}")
+
+    finally:
+        connection.configure_database(anterior)
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Benchmark das tabelas de resumo (database/summaries.py).
+
+Gera um banco temporário com orçamentos e pagamentos e compara as
+consultas dos painéis (receita de um mês, saldo de um cliente, orçamentos
+por status) feitas agregando as tabelas de origem com as mesmas
+consultas sobre as tabelas de resumo. Também mede o custo dos triggers
+nas inserções de pagamentos.
+
+O banco real (database/db.sqlite) não é tocado.
+
+Uso:
+    python benchmarks/bench_summaries.py --orcamentos 200000
+
+Autor: Sistema Gráfica
+Data: 2025
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+# Adiciona o diretório pai ao path para importar database
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import connection
+from database import migrations
+from database import summaries
+
+
+FORMAS = ['dinheiro', 'pix', 'cartao', 'boleto']
+STATUS = ['pendente', 'aprovado', 'rejeitado', 'concluido']
+
+# (descrição, agregação na origem, leitura do resumo, parâmetros de cada uma)
+CONSULTAS = [
+    ("receita de um mês por forma",
+     """SELECT date(data_pagamento) AS dia, forma_pagamento, SUM(valor_pagamento)
+        FROM pagamentos WHERE status_pagamento = 'pago'
+          AND date(data_pagamento) BETWEEN ? AND ?
+        GROUP BY 1, 2""",
+     """SELECT dia, forma_pagamento, total FROM resumo_receita_diaria
+        WHERE dia BETWEEN ? AND ?""",
+     ('2024-06-01', '2024-06-30'), ('2024-06-01', '2024-06-30')),
+    ("saldo de um cliente",
+     """SELECT (SELECT COALESCE(SUM(valor_total), 0) FROM orcamentos
+                WHERE cliente_id = ? AND status IN ('aprovado', 'concluido'))
+             - (SELECT COALESCE(SUM(p.valor_pagamento), 0) FROM pagamentos p
+                JOIN orcamentos o ON o.id = p.orcamento_id
+                WHERE o.cliente_id = ? AND p.status_pagamento = 'pago')""",
+     "SELECT faturado - pago FROM resumo_saldo_cliente WHERE cliente_id = ?",
+     (123, 123), (123,)),
+    ("orçamentos por status",
+     "SELECT status, COUNT(*), SUM(valor_total) FROM orcamentos GROUP BY status",
+     "SELECT status, quantidade, total FROM resumo_orcamentos_status",
+     (), ()),
+]
+
+
+def gerar_dados(orcamentos: int) -> float:
+    """
+    Popula o banco configurado: 1 cliente para cada 10 orçamentos e 2
+    pagamentos por orçamento.
+
+    Returns:
+        float: Pagamentos inseridos por segundo (com os triggers)
+    """
+    random.seed(42)
+    clientes = max(orcamentos // 10, 1)
+    connection.execute_many(
+        "INSERT INTO clientes (nome) VALUES (?)",
+        [(f"Cliente {i}",) for i in range(clientes)]
+    )
+    connection.execute_many(
+        """INSERT INTO orcamentos (numero_orcamento, cliente_id, descricao_servico,
+           status, valor_total) VALUES (?, ?, 'Impressão', ?, ?)""",
+        [(f"ORC-{i:07d}", random.randint(1, clientes), random.choice(STATUS),
+          random.randint(1000, 500000))
+         for i in range(orcamentos)]
+    )
+    pagamentos = [(random.randint(1, orcamentos), random.randint(1000, 250000),
+                   random.choice(['pago', 'pago', 'pendente']), random.choice(FORMAS),
+                   f"2024-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}")
+                  for _ in range(orcamentos * 2)]
+    inicio = time.perf_counter()
+    connection.execute_many(
+        """INSERT INTO pagamentos (orcamento_id, valor_pagamento, status_pagamento,
+           forma_pagamento, data_pagamento) VALUES (?, ?, ?, ?, ?)""",
+        pagamentos
+    )
+    return len(pagamentos) / (time.perf_counter() - inicio)
+
+
+def medir(conn, sql: str, parametros: tuple, repeticoes: int) -> float:
+    """
+    Retorna o tempo médio da consulta, em ms.
+    """
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        conn.execute(sql, parametros).fetchall()
+    return (time.perf_counter() - inicio) * 1000 / repeticoes
+
+
+def main():
+    """
+    Executa o benchmark e imprime a comparação origem x resumo.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark das tabelas de resumo")
+    parser.add_argument('--orcamentos', type=int, default=200000,
+                        help="orçamentos gerados (pagamentos = 2x)")
+    parser.add_argument('--repeticoes', type=int, default=20)
+    args = parser.parse_args()
+
+    diretorio = tempfile.mkdtemp(prefix="bench_resumos_")
+    anterior = connection.get_database_target()
+    try:
+        connection.configure_database(os.path.join(diretorio, "bench.sqlite"))
+        migrations.migrate()
+
+        print(f"🏗️  Gerando {args.orcamentos:,} orçamentos e {args.orcamentos * 2:,} pagamentos...")
+        taxa = gerar_dados(args.orcamentos)
+        print(f"   pagamentos com os triggers dos resumos: {taxa:,.0f} linhas/s\n")
+
+        print(f"{'Consulta':<32}{'Origem (ms)':>13}{'Resumo (ms)':>13}{'Ganho':>9}")
+        print("-" * 67)
+        with connection.get_pool().connection() as conn:
+            for descricao, origem, resumo, params_origem, params_resumo in CONSULTAS:
+                ms_origem = medir(conn, origem, params_origem, args.repeticoes)
+                ms_resumo = medir(conn, resumo, params_resumo, args.repeticoes)
+                ganho = ms_origem / ms_resumo if ms_resumo else float('inf')
+                print(f"{descricao:<32}{ms_origem:>13.3f}{ms_resumo:>13.3f}{ganho:>8.0f}x")
+        print("-" * 67)
+
+        inicio = time.perf_counter()
+        diferencas = summaries.verify_summaries()
+        divergentes = sum(len(linhas) for linhas in diferencas.values())
+        print(f"verify_summaries(): {divergentes} divergência(s) em "
+              f"{time.perf_counter() - inicio:.2f}s")
+
+    finally:
+        connection.configure_database(anterior)
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+"""
+Infraestrutura comum dos benchmarks: medição repetível, estatísticas,
+resultados em JSON e comparação entre duas execuções.
+
+Cada medida roda algumas repetições de aquecimento (descartadas) e depois
+N repetições cronometradas, com o coletor de lixo desligado durante a
+contagem (como o timeit). Os tempos são por operação: uma repetição que
+executa 200 buscas tem seu tempo dividido por 200.
+
+Exemplo:
+    >>> from benchmarks.harness import measure, save_results
+    >>> r = measure("busca por email", lambda: buscar("x@y.com"), tamanho=1000)
+    >>> save_results("resultados.json", [r], {'repeticoes': 20})
+
+Comparação (sai com código 1 se houver regressão):
+    python benchmarks/harness.py base.json novo.json --limite 0.10
+
+Autor: Sistema Gráfica
+Data: 2025
+"""
+
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+
+# Versão do formato do arquivo JSON
+RESULTS_FORMAT = 1
+
+DEFAULT_REPETITIONS = 20
+DEFAULT_WARMUP = 3
+
+# Piora mínima da mediana (fração) para contar como regressão
+DEFAULT_THRESHOLD = 0.10
+
+
+class BenchmarkStats(NamedTuple):
+    """
+    Estatísticas de uma medida. Tempos em ms por operação.
+    """
+    nome: str
+    tamanho: int
+    repeticoes: int
+    operacoes: int
+    mediana_ms: float
+    media_ms: float
+    desvio_ms: float
+    min_ms: float
+    max_ms: float
+    p95_ms: float
+    ops_por_segundo: float
+
+
+class Comparison(NamedTuple):
+    """
+    Uma medida comparada entre a execução base e a nova.
+
+    situacao: 'regressao', 'melhora', 'igual', 'nova' (só na execução
+    nova) ou 'removida' (só na base).
+    """
+    nome: str
+    tamanho: int
+    base_ms: Optional[float]
+    novo_ms: Optional[float]
+    variacao: Optional[float]
+    situacao: str
+
+
+# ========================================================================================
+# MEDIÇÃO
+# ========================================================================================
+
+def _percentil(amostras: Sequence[float], p: float) -> float:
+    # Método do posto mais próximo: sempre um valor observado
+    ordenadas = sorted(amostras)
+    posto = max(math.ceil(p / 100 * len(ordenadas)), 1)
+    return ordenadas[posto - 1]
+
+
+def summarize(nome: str, tamanho: int, operacoes: int, tempos: Sequence[float]) -> BenchmarkStats:
+    """
+    Calcula as estatísticas a partir dos tempos de cada repetição.
+
+    Args:
+        nome: Nome da medida
+        tamanho: Tamanho da tabela (ou do conjunto de dados) medido
+        operacoes: Operações executadas em cada repetição
+        tempos: Segundos de cada repetição
+
+    Returns:
+        BenchmarkStats: Tempos por operação, em ms
+    """
+    por_operacao = [t * 1000 / operacoes for t in tempos]
+    mediana = statistics.median(por_operacao)
+    return BenchmarkStats(
+        nome=nome,
+        tamanho=tamanho,
+        repeticoes=len(por_operacao),
+        operacoes=operacoes,
+        mediana_ms=mediana,
+        media_ms=statistics.fmean(por_operacao),
+        desvio_ms=statistics.stdev(por_operacao) if len(por_operacao) > 1 else 0.0,
+        min_ms=min(por_operacao),
+        max_ms=max(por_operacao),
+        p95_ms=_percentil(por_operacao, 95),
+        ops_por_segundo=1000 / mediana if mediana else 0.0,
+    )
+
+
+def measure(nome: str, funcao: Callable[..., Any], tamanho: int = 0,
+            repeticoes: int = DEFAULT_REPETITIONS, aquecimento: int = DEFAULT_WARMUP,
+            operacoes: int = 1, preparar: Optional[Callable[[], Any]] = None) -> BenchmarkStats:
+    """
+    Mede uma função com aquecimento e repetições cronometradas.
+
+    Args:
+        nome: Nome da medida (chave na comparação, junto com o tamanho)
+        funcao: Executa as `operacoes` de uma repetição
+        tamanho: Tamanho da tabela medida (só registrado)
+        repeticoes: Repetições cronometradas
+        aquecimento: Repetições iniciais descartadas (caches, statements)
+        operacoes: Operações por repetição (os tempos são divididos por ela)
+        preparar: Chamada antes de cada repetição, fora da contagem; se
+            informada, seu retorno é passado para funcao
+
+    Returns:
+        BenchmarkStats: Estatísticas da medida
+
+    Raises:
+        ValueError: Se repeticoes ou operacoes forem menores que 1
+    """
+    if repeticoes < 1 or operacoes < 1:
+        raise ValueError("repeticoes e operacoes devem ser positivos")
+
+    tempos = []
+    gc_ligado = gc.isenabled()
+    try:
+        for i in range(aquecimento + repeticoes):
+            argumentos = (preparar(),) if preparar is not None else ()
+            gc.collect()
+            gc.disable()
+            inicio = time.perf_counter()
+            funcao(*argumentos)
+            decorrido = time.perf_counter() - inicio
+            if gc_ligado:
+                gc.enable()
+            if i >= aquecimento:
+                tempos.append(decorrido)
+    finally:
+        if gc_ligado:
+            gc.enable()
+
+    return summarize(nome, tamanho, operacoes, tempos)
+
+
+# ========================================================================================
+# ARQUIVOS DE RESULTADO
+# ========================================================================================
+
+def environment() -> Dict[str, Any]:
+    """
+    Descreve o ambiente da execução (gravado junto com os resultados,
+    para saber se duas execuções são comparáveis).
+    """
+    return {
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'sistema': platform.platform(),
+        'processador': platform.processor() or platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def save_results(caminho: str, resultados: Sequence[BenchmarkStats],
+                 parametros: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Grava os resultados em JSON.
+
+    Args:
+        caminho: Arquivo de saída (sobrescrito)
+        resultados: Medidas da execução
+        parametros: Parâmetros da execução (tamanhos, repetições...)
+    """
+    dados = {
+        'formato': RESULTS_FORMAT,
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'ambiente': environment(),
+        'parametros': parametros or {},
+        'resultados': [r._asdict() for r in resultados],
+    }
+    diretorio = os.path.dirname(os.path.abspath(caminho))
+    os.makedirs(diretorio, exist_ok=True)
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump(dados, arquivo, ensure_ascii=False, indent=2)
+
+
+def load_results(caminho: str) -> Dict[str, Any]:
+    """
+    Lê um arquivo gravado por save_results.
+
+    Raises:
+        ValueError: Se o arquivo não estiver no formato esperado
+    """
+    with open(caminho, encoding='utf-8') as arquivo:
+        dados = json.load(arquivo)
+    if not isinstance(dados, dict) or dados.get('formato') != RESULTS_FORMAT:
+        raise ValueError(f"{caminho}: não é um arquivo de resultados (formato {RESULTS_FORMAT})")
+    return dados
+
+
+def compare(base: Dict[str, Any], novo: Dict[str, Any],
+            limite: float = DEFAULT_THRESHOLD) -> List[Comparison]:
+    """
+    Compara duas execuções, medida a medida (nome + tamanho).
+
+    Uma medida regrediu quando a mediana piorou mais que `limite` e ficou
+    acima do p95 da base, ou seja, fora da variação normal da própria
+    base. Melhoras usam o critério simétrico.
+
+    Args:
+        base: Resultados de referência (load_results)
+        novo: Resultados a avaliar
+        limite: Variação mínima da mediana, em fração (0.10 = 10%)
+
+    Returns:
+        List[Comparison]: Na ordem da execução nova; as removidas no fim
+    """
+    def indexar(dados: Dict[str, Any]) -> Dict[Tuple[str, int], Dict]:
+        return {(r['nome'], r['tamanho']): r for r in dados['resultados']}
+
+    antigos = indexar(base)
+    comparacoes = []
+    for chave, atual in indexar(novo).items():
+        anterior = antigos.pop(chave, None)
+        if anterior is None:
+            comparacoes.append(Comparison(*chave, None, atual['mediana_ms'], None, 'nova'))
+            continue
+
+        base_ms, novo_ms = anterior['mediana_ms'], atual['mediana_ms']
+        variacao = (novo_ms - base_ms) / base_ms if base_ms else 0.0
+        if variacao > limite and novo_ms > anterior['p95_ms']:
+            situacao = 'regressao'
+        elif variacao < -limite and atual['p95_ms'] < base_ms:
+            situacao = 'melhora'
+        else:
+            situacao = 'igual'
+        comparacoes.append(Comparison(*chave, base_ms, novo_ms, variacao, situacao))
+
+    for chave, anterior in antigos.items():
+        comparacoes.append(Comparison(*chave, anterior['mediana_ms'], None, None, 'removida'))
+    return comparacoes
+
+
+# ========================================================================================
+# RELATÓRIOS
+# ========================================================================================
+
+MARCAS = {'regressao': '❌', 'melhora': '✅', 'igual': '  ', 'nova': '🆕', 'removida': '➖'}
+
+
+def format_results(resultados: Sequence[BenchmarkStats]) -> str:
+    """
+    Tabela de texto com as medidas de uma execução.
+    """
+    linhas = [f"{'Medida':<44}{'Tamanho':>9}{'Mediana':>11}{'p95':>10}{'Desvio':>9}{'ops/s':>11}",
+              "-" * 94]
+    for r in resultados:
+        linhas.append(f"{r.nome:<44}{r.tamanho:>9,}{r.mediana_ms:>9.3f}ms{r.p95_ms:>8.3f}ms"
+                      f"{r.desvio_ms:>7.3f}ms{r.ops_por_segundo:>11,.0f}")
+    return "\n".join(linhas)
+
+
+def format_comparison(comparacoes: Sequence[Comparison]) -> str:
+    """
+    Tabela de texto com a comparação entre duas execuções.
+    """
+    def ms(valor: Optional[float]) -> str:
+        return f"{valor:.3f}ms" if valor is not None else "-"
+
+    linhas = [f"   {'Medida':<44}{'Tamanho':>9}{'Base':>12}{'Nova':>12}{'Variação':>10}",
+              "-" * 90]
+    for c in comparacoes:
+        variacao = f"{c.variacao:+.1%}" if c.variacao is not None else "-"
+        linhas.append(f"{MARCAS[c.situacao]} {c.nome:<44}{c.tamanho:>9,}"
+                      f"{ms(c.base_ms):>12}{ms(c.novo_ms):>12}{variacao:>10}")
+    return "\n".join(linhas)
+
+
+def main():
+    """
+    Linha de comando: compara dois arquivos de resultados.
+    """
+    parser = argparse.ArgumentParser(description="Compara duas execuções de benchmark")
+    parser.add_argument('base', help="resultados de referência (JSON)")
+    parser.add_argument('novo', help="resultados a avaliar (JSON)")
+    parser.add_argument('--limite', type=float, default=DEFAULT_THRESHOLD,
+                        help="piora mínima da mediana para regressão (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    try:
+        base, novo = load_results(args.base), load_results(args.novo)
+    except (OSError, ValueError) as e:
+        print(f"❌ Erro ao ler resultados: {e}")
+        sys.exit(2)
+
+    if base['ambiente'] != novo['ambiente']:
+        print("⚠️  As execuções foram feitas em ambientes diferentes:")
+        for chave in sorted(set(base['ambiente']) | set(novo['ambiente'])):
+            if base['ambiente'].get(chave) != novo['ambiente'].get(chave):
+                print(f"   {chave}: {base['ambiente'].get(chave)} -> {novo['ambiente'].get(chave)}")
+        print()
+
+    comparacoes = compare(base, novo, args.limite)
+    print(format_comparison(comparacoes))
+
+    regressoes = [c for c in comparacoes if c.situacao == 'regressao']
+    print()
+    if regressoes:
+        print(f"❌ {len(regressoes)} regressão(ões) acima de {args.limite:.0%}")
+        sys.exit(1)
+    print(f"✅ Nenhuma regressão acima de {args.limite:.0%}")
+
+
+if __name__ == "__main__":
+    main()
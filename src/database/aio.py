@@ -0,0 +1,212 @@
+"""
+API assíncrona (asyncio) para a camada de banco de dados.
+
+O sqlite3 é bloqueante; aqui o trabalho é enviado para um pool pequeno e
+dedicado de threads, de modo que o loop de eventos nunca trava. Cada
+chamada aceita timeout e pode ser cancelada: se a consulta já estiver
+executando, ela é interrompida com Connection.interrupt().
+
+O número de chamadas em andamento por loop é limitado (max_pending);
+as demais aguardam em fila, na ordem de chegada.
+
+Exemplo:
+    >>> from database import aio
+    >>> linhas = await aio.execute_query("SELECT * FROM clientes", timeout=2.0)
+
+Autor: Sistema Gráfica
+Data: 2025
+"""
+
+import asyncio
+import atexit
+import os
+import sys
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple
+
+# Adiciona o diretório pai ao path para importar connection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import connection
+from database.logger import get_logger
+
+
+logger = get_logger('database.aio')
+
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_MAX_PENDING = 64
+
+_executor: Optional[ThreadPoolExecutor] = None
+_max_workers = DEFAULT_MAX_WORKERS
+_max_pending = DEFAULT_MAX_PENDING
+_semaforos = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+class _Job:
+    """
+    Trabalho executado em uma thread do banco, cancelável a partir do loop.
+    """
+
+    def __init__(self, func: Callable, args: Tuple, kwargs: dict):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self._cancelado = False
+        self._conns = set()
+        self._lock = threading.Lock()
+
+    def __call__(self) -> Any:
+        if self._cancelado:
+            raise asyncio.CancelledError()
+
+        # Cada conexão que func obtiver dos pools (só o de leitura, só o de
+        # escrita ou ambos) fica registrada enquanto estiver em uso, para
+        # que cancel() possa interrompê-la
+        with connection.track_connections(self):
+            return self.func(*self.args, **self.kwargs)
+
+    def connection_acquired(self, conn) -> None:
+        with self._lock:
+            if self._cancelado:
+                raise asyncio.CancelledError()
+            self._conns.add(conn)
+
+    def connection_released(self, conn) -> None:
+        with self._lock:
+            self._conns.discard(conn)
+
+    def cancel(self) -> None:
+        """
+        Impede o início do trabalho ou interrompe a consulta em execução.
+        """
+        with self._lock:
+            self._cancelado = True
+            for conn in self._conns:
+                conn.interrupt()
+
+
+def configure(max_workers: int = DEFAULT_MAX_WORKERS,
+              max_pending: int = DEFAULT_MAX_PENDING) -> None:
+    """
+    Configura o pool de threads do banco e o limite de chamadas em andamento.
+
+    O pool anterior, se existir, termina os trabalhos pendentes e é encerrado.
+
+    Args:
+        max_workers: Threads dedicadas ao banco (não deve passar do
+            max_size do pool de conexões)
+        max_pending: Chamadas simultâneas por loop; as demais aguardam
+    """
+    global _executor, _max_workers, _max_pending
+
+    if max_workers < 1 or max_pending < 1:
+        raise ValueError("max_workers e max_pending devem ser pelo menos 1")
+
+    with _lock:
+        antigo, _executor = _executor, None
+        _max_workers = max_workers
+        _max_pending = max_pending
+        _semaforos.clear()
+    if antigo is not None:
+        antigo.shutdown(wait=True)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=_max_workers, thread_name_prefix='grafica-db'
+                )
+    return _executor
+
+
+def _get_semaforo(loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+    semaforo = _semaforos.get(loop)
+    if semaforo is None:
+        semaforo = _semaforos[loop] = asyncio.Semaphore(_max_pending)
+    return semaforo
+
+
+async def run(func: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+    """
+    Executa uma função bloqueante do banco em uma thread dedicada.
+
+    Útil para unidades de trabalho síncronas (ex.: funções que usam
+    connection.transaction()), que rodam inteiras na mesma thread.
+
+    Args:
+        func: Função a executar
+        *args: Argumentos posicionais de func
+        timeout: Segundos até desistir (None = sem limite)
+        **kwargs: Argumentos nomeados de func
+
+    Returns:
+        Any: Retorno de func
+
+    Raises:
+        asyncio.TimeoutError: Se o timeout expirar (a consulta é interrompida)
+        asyncio.CancelledError: Se a tarefa for cancelada
+        sqlite3.Error: Erros do banco levantados por func
+    """
+    loop = asyncio.get_running_loop()
+    job = _Job(func, args, kwargs)
+
+    async with _get_semaforo(loop):
+        future = loop.run_in_executor(_get_executor(), job)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            job.cancel()
+            logger.debug("⏹️  Chamada assíncrona cancelada: %s", getattr(func, '__name__', func))
+            raise
+
+
+async def execute_query(query: str, params: Optional[Tuple] = None,
+                        timeout: Optional[float] = None) -> Optional[List]:
+    """
+    Versão assíncrona de connection.execute_query.
+
+    Args:
+        query: Comando SQL a ser executado
+        params: Parâmetros para o comando SQL (opcional)
+        timeout: Segundos até desistir (None = sem limite)
+
+    Returns:
+        List[sqlite3.Row]: Lista de resultados para SELECT, None para outros comandos
+    """
+    return await run(connection.execute_query, query, params, timeout=timeout)
+
+
+async def execute_many(query: str, params_list: List[Tuple],
+                       timeout: Optional[float] = None) -> None:
+    """
+    Versão assíncrona de connection.execute_many.
+
+    Args:
+        query: Comando SQL a ser executado
+        params_list: Lista de tuplas com parâmetros para cada execução
+        timeout: Segundos até desistir (None = sem limite)
+    """
+    await run(connection.execute_many, query, params_list, timeout=timeout)
+
+
+def shutdown(wait: bool = True) -> None:
+    """
+    Encerra as threads do banco. Registrada com atexit.
+
+    Args:
+        wait: Aguarda os trabalhos em andamento terminarem
+    """
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+atexit.register(shutdown)
@@ -0,0 +1,347 @@
+"""
+Arquivamento de orçamentos encerrados em um banco separado (ATTACH).
+
+Orçamentos antigos e encerrados saem do banco ativo e vão, junto com
+seus pagamentos e registros de produção, para um arquivo à parte
+(padrão: db_arquivo.sqlite, ao lado do banco ativo). O banco usado o
+dia inteiro fica pequeno: índices menores e páginas quentes no cache.
+
+Um orçamento é arquivado quando, antes da data de corte:
+- foi criado e está 'concluido' ou 'rejeitado'
+- todos os pagamentos estão 'pago' e a soma paga é igual ao valor
+  faturado (saldo zerado; rejeitados não podem ter pagamento)
+- toda a produção foi entregue (producao.data_conclusao preenchida)
+
+Os relatórios históricos anexam o arquivo com attached_archive(), que
+cria as views temporárias todos_orcamentos, todos_pagamentos e
+todas_producoes (UNION ALL do banco ativo com o arquivo).
+
+As tabelas de resumo (database/summaries.py) continuam somando os
+orçamentos arquivados: durante a exclusão do lote, uma linha em
+resumos_suspensos desliga os triggers de DELETE dos resumos. A busca
+textual cobre só o banco ativo.
+
+Linha de comando:
+    python database/archive.py --antes-de 2023-01-01
+    python database/archive.py --anos 2 --lote 1000 --vacuum
+    python database/archive.py status
+
+Autor: Sistema Gráfica
+Data: 2025
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Iterator, List, NamedTuple, Optional
+
+# Adiciona o diretório pai ao path para importar connection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.connection import (
+    DEFAULT_PROFILE, get_database_target, get_pool, invalidate_result_cache,
+    is_memory_target, open_connection, with_retry
+)
+from database.logger import get_logger
+
+
+logger = get_logger('database.archive')
+
+ARCHIVE_SCHEMA = 'arquivo'
+DEFAULT_BATCH_SIZE = 500
+
+# Tabelas arquivadas, na ordem de cópia (a exclusão é na ordem inversa)
+ARCHIVED_TABLES = ('orcamentos', 'pagamentos', 'producao')
+
+# Views temporárias de attached_archive(): view -> tabela
+HISTORY_VIEWS = {
+    'todos_orcamentos': 'orcamentos',
+    'todos_pagamentos': 'pagamentos',
+    'todas_producoes': 'producao',
+}
+
+# Índices do arquivo (consultas históricas por cliente e por orçamento;
+# por usuário, para a limpeza de database/soft_delete.py)
+_ARCHIVE_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS {schema}.idx_orcamentos_cliente ON orcamentos (cliente_id)",
+    "CREATE INDEX IF NOT EXISTS {schema}.idx_pagamentos_orcamento ON pagamentos (orcamento_id)",
+    "CREATE INDEX IF NOT EXISTS {schema}.idx_producao_orcamento ON producao (orcamento_id)",
+    "CREATE INDEX IF NOT EXISTS {schema}.idx_orcamentos_usuario ON orcamentos (usuario_id)",
+    "CREATE INDEX IF NOT EXISTS {schema}.idx_pagamentos_usuario ON pagamentos (usuario_id)",
+    "CREATE INDEX IF NOT EXISTS {schema}.idx_producao_usuario ON producao (usuario_id)",
+]
+
+# "CREATE TABLE [IF NOT EXISTS] nome", com ou sem aspas no nome
+_RE_CREATE_TABLE = re.compile(
+    r'^\s*CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?["`\[]?\w+["`\]]?\s*', re.IGNORECASE
+)
+
+# Orçamentos que podem ser arquivados (parâmetro: data de corte AAAA-MM-DD)
+_ELEGIVEIS = """
+SELECT o.id
+FROM main.orcamentos o
+WHERE o.id > :ultimo
+  AND o.status IN ('concluido', 'rejeitado')
+  AND date(o.data_criacao) < :corte
+  AND NOT EXISTS (
+      SELECT 1 FROM main.pagamentos p
+      WHERE p.orcamento_id = o.id
+        AND (p.status_pagamento != 'pago'
+             OR COALESCE(date(p.data_pagamento), date(p.data_criacao)) >= :corte)
+  )
+  AND NOT EXISTS (
+      SELECT 1 FROM main.producao pr
+      WHERE pr.orcamento_id = o.id
+        AND (pr.data_conclusao IS NULL OR date(pr.data_conclusao) >= :corte)
+  )
+  AND CASE WHEN o.status = 'concluido' THEN COALESCE(o.valor_total, 0) ELSE 0 END
+      = COALESCE((SELECT SUM(p.valor_pagamento) FROM main.pagamentos p
+                  WHERE p.orcamento_id = o.id), 0)
+ORDER BY o.id
+LIMIT :lote
+"""
+
+
+class ArchiveResult(NamedTuple):
+    """
+    Resultado de archive_closed().
+    """
+    orcamentos: int
+    pagamentos: int
+    producoes: int
+    lotes: int
+    segundos: float
+    arquivo: str
+
+
+def default_archive_path() -> str:
+    """
+    Caminho padrão do arquivo: db_arquivo.sqlite no diretório do banco ativo.
+
+    Raises:
+        ValueError: Se o banco ativo estiver em memória (informe o caminho)
+    """
+    alvo = get_database_target()
+    if is_memory_target(alvo):
+        raise ValueError("Banco ativo em memória: informe o caminho do arquivo")
+    base, extensao = os.path.splitext(alvo)
+    return f"{base}_arquivo{extensao or '.sqlite'}"
+
+
+def _colunas(conn: sqlite3.Connection, schema: str, tabela: str) -> List[str]:
+    return [linha[1] for linha in conn.execute(f"PRAGMA {schema}.table_info({tabela})")]
+
+
+def _anexar(conn: sqlite3.Connection, caminho: str) -> None:
+    """
+    Anexa o arquivo como ARCHIVE_SCHEMA e cria nele as tabelas que
+    faltarem, com a estrutura atual do banco ativo.
+    """
+    conn.execute(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (caminho,))
+    conn.execute(f"PRAGMA {ARCHIVE_SCHEMA}.journal_mode = WAL")
+
+    for tabela in ARCHIVED_TABLES:
+        if _colunas(conn, ARCHIVE_SCHEMA, tabela):
+            continue
+        sql = conn.execute(
+            "SELECT sql FROM main.sqlite_master WHERE type = 'table' AND name = ?", (tabela,)
+        ).fetchone()[0]
+        # "CREATE TABLE orcamentos (...)" -> "CREATE TABLE arquivo.orcamentos (...)"
+        # (após rebuild_table o nome fica entre aspas: CREATE TABLE "orcamentos")
+        definicao = _RE_CREATE_TABLE.sub('', sql, count=1)
+        conn.execute(f"CREATE TABLE {ARCHIVE_SCHEMA}.{tabela} {definicao}")
+    for indice in _ARCHIVE_INDEXES:
+        conn.execute(indice.format(schema=ARCHIVE_SCHEMA))
+
+
+def _mover_lote(conn: sqlite3.Connection, ids: List[int]) -> List[int]:
+    """
+    Copia os orçamentos (e seus pagamentos e produção) para o arquivo e
+    os apaga do banco ativo, em uma transação.
+
+    Returns:
+        List[int]: Linhas movidas por tabela, na ordem de ARCHIVED_TABLES
+    """
+    marcadores = ", ".join("?" * len(ids))
+    filtros = {
+        'orcamentos': f"id IN ({marcadores})",
+        'pagamentos': f"orcamento_id IN ({marcadores})",
+        'producao': f"orcamento_id IN ({marcadores})",
+    }
+
+    with_retry(lambda: conn.execute("BEGIN IMMEDIATE"), conn)
+    try:
+        movidas = []
+        for tabela in ARCHIVED_TABLES:
+            # Só as colunas que existem nos dois bancos (o arquivo pode ser
+            # de uma versão anterior do esquema)
+            destino = set(_colunas(conn, ARCHIVE_SCHEMA, tabela))
+            lista = ", ".join(c for c in _colunas(conn, 'main', tabela) if c in destino)
+            # OR REPLACE: um lote repetido (ex.: após queda) não duplica linhas
+            cursor = conn.execute(
+                f"INSERT OR REPLACE INTO {ARCHIVE_SCHEMA}.{tabela} ({lista}) "
+                f"SELECT {lista} FROM main.{tabela} WHERE {filtros[tabela]}", ids
+            )
+            movidas.append(cursor.rowcount)
+        # Exclusão dos dependentes antes dos orçamentos, sem tirar os
+        # valores dos resumos (a suspensão só existe nesta transação)
+        conn.execute("INSERT INTO main.resumos_suspensos (motivo) VALUES ('arquivamento')")
+        for tabela in reversed(ARCHIVED_TABLES):
+            conn.execute(f"DELETE FROM main.{tabela} WHERE {filtros[tabela]}", ids)
+        conn.execute("DELETE FROM main.resumos_suspensos WHERE motivo = 'arquivamento'")
+        conn.execute("COMMIT")
+        return movidas
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def archive_closed(antes_de: Optional[str] = None, anos: int = 2,
+                   caminho: Optional[str] = None,
+                   batch_size: int = DEFAULT_BATCH_SIZE,
+                   vacuum: bool = False) -> ArchiveResult:
+    """
+    Move para o arquivo os orçamentos encerrados antes da data de corte.
+
+    Cada lote de batch_size orçamentos é uma transação curta: as
+    estações continuam gravando entre um lote e outro. Como o banco usa
+    WAL, a transação não é atômica entre os dois arquivos; os dados são
+    copiados antes de apagados, então uma queda no meio só deixa linhas
+    repetidas, que o próximo arquivamento substitui.
+
+    Args:
+        antes_de: Data de corte (AAAA-MM-DD); padrão: hoje menos `anos`
+        anos: Idade mínima dos registros, se antes_de não for informada
+        caminho: Arquivo de destino (padrão: default_archive_path())
+        batch_size: Orçamentos por transação
+        vacuum: Executa VACUUM no banco ativo ao final, devolvendo ao
+            sistema o espaço liberado (bloqueia o banco durante a execução)
+
+    Returns:
+        ArchiveResult: Linhas movidas por tabela, lotes e duração
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size deve ser pelo menos 1")
+    if antes_de is None:
+        antes_de = (date.today() - timedelta(days=365 * anos)).isoformat()
+    caminho = caminho or default_archive_path()
+
+    conn = open_connection(get_database_target(), profile=DEFAULT_PROFILE)
+    # Transações controladas manualmente (BEGIN/COMMIT)
+    conn.isolation_level = None
+    inicio = time.perf_counter()
+    totais = [0, 0, 0]
+    lotes = 0
+    try:
+        _anexar(conn, caminho)
+        ultimo = 0
+        while True:
+            ids = [linha[0] for linha in conn.execute(
+                _ELEGIVEIS,
+                {'ultimo': ultimo, 'corte': antes_de, 'lote': batch_size}
+            )]
+            if not ids:
+                break
+            for i, quantidade in enumerate(_mover_lote(conn, ids)):
+                totais[i] += quantidade
+            lotes += 1
+            ultimo = ids[-1]
+            logger.debug("🗄️  Lote %s: %s orçamentos arquivados", lotes, len(ids))
+
+        conn.execute(f"DETACH DATABASE {ARCHIVE_SCHEMA}")
+        if vacuum and lotes:
+            conn.execute("VACUUM")
+    finally:
+        conn.close()
+        if lotes:
+            invalidate_result_cache(ARCHIVED_TABLES)
+
+    resultado = ArchiveResult(totais[0], totais[1], totais[2], lotes,
+                              time.perf_counter() - inicio, caminho)
+    logger.info("🗄️  Arquivados antes de %s: %s orçamentos, %s pagamentos, %s produções "
+                "em %.1fs (%s)", antes_de, resultado.orcamentos, resultado.pagamentos,
+                resultado.producoes, resultado.segundos, caminho)
+    return resultado
+
+
+@contextmanager
+def attached_archive(caminho: Optional[str] = None) -> Iterator[sqlite3.Connection]:
+    """
+    Conexão com o arquivo anexado, para relatórios históricos (somente
+    leitura: o que não tiver sido confirmado é desfeito ao sair).
+
+    Dentro do bloco existem as views temporárias todos_orcamentos,
+    todos_pagamentos e todas_producoes, que juntam (UNION ALL) o banco
+    ativo e o arquivo, e as tabelas do arquivo podem ser lidas como
+    arquivo.<tabela>. Ao sair, as views são removidas e o arquivo é
+    desanexado antes de a conexão voltar ao pool.
+
+    Exemplo:
+        >>> with attached_archive() as conn:
+        ...     conn.execute(\"\"\"SELECT strftime('%Y', data_pagamento) AS ano,
+        ...                           SUM(valor_pagamento)
+        ...                    FROM todos_pagamentos GROUP BY ano\"\"\").fetchall()
+    """
+    caminho = caminho or default_archive_path()
+    with get_pool().connection() as conn:
+        try:
+            _anexar(conn, caminho)
+            for view, tabela in HISTORY_VIEWS.items():
+                destino = set(_colunas(conn, ARCHIVE_SCHEMA, tabela))
+                lista = ", ".join(c for c in _colunas(conn, 'main', tabela) if c in destino)
+                conn.execute(
+                    f"CREATE TEMP VIEW IF NOT EXISTS {view} AS "
+                    f"SELECT {lista} FROM main.{tabela} "
+                    f"UNION ALL SELECT {lista} FROM {ARCHIVE_SCHEMA}.{tabela}"
+                )
+            conn.commit()
+            yield conn
+        finally:
+            # A conexão volta ao pool como saiu dele
+            conn.rollback()
+            for view in HISTORY_VIEWS:
+                conn.execute(f"DROP VIEW IF EXISTS temp.{view}")
+            conn.commit()
+            anexados = [linha[1] for linha in conn.execute("PRAGMA database_list")]
+            if ARCHIVE_SCHEMA in anexados:
+                conn.execute(f"DETACH DATABASE {ARCHIVE_SCHEMA}")
+
+
+def main():
+    """
+    Linha de comando: arquiva orçamentos encerrados ou mostra o status.
+    """
+    parser = argparse.ArgumentParser(description="Arquivamento de orçamentos encerrados")
+    parser.add_argument('comando', nargs='?', choices=['arquivar', 'status'], default='arquivar')
+    parser.add_argument('--antes-de', default=None, help="data de corte (AAAA-MM-DD)")
+    parser.add_argument('--anos', type=int, default=2,
+                        help="idade mínima, se --antes-de não for informado")
+    parser.add_argument('--arquivo', default=None, help="banco de arquivo")
+    parser.add_argument('--lote', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--vacuum', action='store_true',
+                        help="compacta o banco ativo ao final")
+    args = parser.parse_args()
+
+    if args.comando == 'status':
+        with attached_archive(args.arquivo) as conn:
+            print(f"{'Tabela':<12}{'Ativo':>12}{'Arquivo':>12}")
+            for tabela in ARCHIVED_TABLES:
+                ativo = conn.execute(f"SELECT COUNT(*) FROM main.{tabela}").fetchone()[0]
+                arquivo = conn.execute(
+                    f"SELECT COUNT(*) FROM {ARCHIVE_SCHEMA}.{tabela}").fetchone()[0]
+                print(f"{tabela:<12}{ativo:>12,}{arquivo:>12,}")
+        return
+
+    resultado = archive_closed(args.antes_de, args.anos, args.arquivo, args.lote, args.vacuum)
+    print(f"🗄️  {resultado.orcamentos} orçamentos, {resultado.pagamentos} pagamentos e "
+          f"{resultado.producoes} produções arquivados em {resultado.lotes} lote(s) "
+          f"({resultado.segundos:.1f}s) -> {resultado.arquivo}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,503 @@
+"""
+Backup online do banco (API de backup do SQLite).
+
+Copia o banco aberto, sem fechar o sistema, para um arquivo de snapshot
+consistente. A cópia é feita em passos de poucas páginas
+(pages_per_step), com uma pausa entre eles, para que as gravações das
+estações continuem fluindo durante o backup. Se o banco for alterado
+entre dois passos, o SQLite recomeça a cópia; depois de max_restarts
+recomeços o restante é copiado em um único passo (em WAL a leitura não
+bloqueia quem grava).
+
+O snapshot é gravado primeiro como "<nome>.parcial", verificado com
+PRAGMA integrity_check, opcionalmente comprimido (gzip) e só então
+renomeado: um arquivo com o nome final é sempre um backup completo.
+
+Exemplo:
+    >>> from database.backup import backup_database, prune_backups
+    >>> r = backup_database(compress=True)
+    >>> print(r.caminho, r.segundos, r.paginas_por_segundo)
+    >>> prune_backups(manter=7)
+
+Linha de comando:
+    python database/backup.py                         # um backup agora
+    python database/backup.py --comprimir --manter 14
+    python database/backup.py --intervalo 3600        # a cada hora (Ctrl+C encerra)
+    python database/backup.py listar
+    python database/backup.py verificar database/backups/db-20250101-120000.sqlite.gz
+
+Autor: Sistema Gráfica
+Data: 2025
+"""
+
+import argparse
+import gzip
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List, NamedTuple, Optional
+
+# Adiciona o diretório pai ao path para importar connection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.connection import (READ_ONLY_PROFILE, get_database_target, is_memory_target,
+                                 open_connection)
+from database.logger import get_logger
+
+
+logger = get_logger('database.backup')
+
+BACKUP_DIR_NAME = 'backups'
+DEFAULT_PAGES_PER_STEP = 256
+DEFAULT_STEP_SLEEP = 0.005
+DEFAULT_MAX_RESTARTS = 3
+DEFAULT_KEEP = 7
+
+# <banco>-AAAAMMDD-HHMMSS[-n].sqlite[.gz]
+_RE_BACKUP = re.compile(
+    r'^(?P<base>.+)-(?P<data>\d{8}-\d{6})(?:-(?P<seq>\d+))?\.sqlite(?:\.gz)?$'
+)
+
+
+class BackupError(sqlite3.DatabaseError):
+    """
+    Backup que não pôde ser concluído ou snapshot que falhou na verificação.
+    """
+
+
+class BackupResult(NamedTuple):
+    """
+    Resultado de backup_database.
+    """
+    caminho: str
+    paginas: int
+    reinicios: int
+    segundos: float
+    paginas_por_segundo: float
+    bytes: int
+    comprimido: bool
+    integridade: Optional[str]
+
+
+class _Recomecou(Exception):
+    # Interrompe a cópia em passos pela callback de progresso
+    pass
+
+
+def default_backup_dir(db_path: Optional[str] = None) -> str:
+    """
+    Diretório padrão dos backups: "backups" ao lado do arquivo do banco.
+
+    Raises:
+        ValueError: Se o banco estiver em memória (informe o diretório)
+    """
+    alvo = db_path if db_path is not None else get_database_target()
+    if is_memory_target(alvo):
+        raise ValueError("Banco em memória: informe o diretório dos backups")
+    return os.path.join(os.path.dirname(os.path.abspath(alvo)), BACKUP_DIR_NAME)
+
+
+def _nome_base(db_path: str) -> str:
+    if is_memory_target(db_path):
+        return 'memoria'
+    return os.path.splitext(os.path.basename(db_path))[0] or 'db'
+
+
+def _novo_caminho(diretorio: str, base: str, compress: bool) -> str:
+    carimbo = datetime.now().strftime('%Y%m%d-%H%M%S')
+    extensao = '.sqlite.gz' if compress else '.sqlite'
+    caminho = os.path.join(diretorio, f"{base}-{carimbo}{extensao}")
+    sequencia = 1
+    # Dois backups no mesmo segundo
+    while os.path.exists(caminho) or os.path.exists(caminho + '.parcial'):
+        sequencia += 1
+        caminho = os.path.join(diretorio, f"{base}-{carimbo}-{sequencia}{extensao}")
+    return caminho
+
+
+def _copiar(origem: sqlite3.Connection, destino: sqlite3.Connection, pages_per_step: int,
+            sleep: float, max_restarts: int,
+            progresso: Optional[Callable[[int, int], None]]) -> int:
+    """
+    Copia origem -> destino em passos; recomeça em um só passo se a
+    cópia for reiniciada mais de max_restarts vezes.
+
+    Returns:
+        int: Recomeços observados
+    """
+    estado = {'restante': None, 'reinicios': 0}
+
+    def acompanhar(status: int, restante: int, total: int) -> None:
+        # O restante só aumenta quando o SQLite recomeça a cópia
+        if estado['restante'] is not None and restante > estado['restante']:
+            estado['reinicios'] += 1
+            if estado['reinicios'] > max_restarts:
+                raise _Recomecou()
+        estado['restante'] = restante
+        if progresso is not None:
+            progresso(total - restante, total)
+
+    try:
+        origem.backup(destino, pages=pages_per_step, progress=acompanhar, sleep=sleep)
+    except _Recomecou:
+        logger.warning("⚠️  Backup reiniciado %s vezes pelas gravações; copiando em um único passo",
+                       estado['reinicios'])
+        origem.backup(destino, pages=-1)
+    return estado['reinicios']
+
+
+def backup_database(destino_dir: Optional[str] = None, db_path: Optional[str] = None,
+                    pages_per_step: int = DEFAULT_PAGES_PER_STEP,
+                    sleep: float = DEFAULT_STEP_SLEEP, compress: bool = False,
+                    verify: bool = True, max_restarts: int = DEFAULT_MAX_RESTARTS,
+                    progresso: Optional[Callable[[int, int], None]] = None) -> BackupResult:
+    """
+    Faz um snapshot do banco com a API de backup, sem bloquear as gravações.
+
+    Args:
+        destino_dir: Diretório dos backups (padrão: default_backup_dir)
+        db_path: Banco de origem (padrão: o de configure_database)
+        pages_per_step: Páginas copiadas por passo
+        sleep: Segundos de pausa entre os passos
+        compress: Grava o snapshot comprimido (.sqlite.gz)
+        verify: Roda PRAGMA integrity_check no snapshot antes de aceitá-lo
+        max_restarts: Recomeços tolerados antes de copiar em um só passo
+        progresso: Chamada a cada passo com (páginas copiadas, total)
+
+    Returns:
+        BackupResult: Caminho, páginas, duração e páginas por segundo
+
+    Raises:
+        BackupError: Se o snapshot falhar na verificação de integridade
+        ValueError: Se pages_per_step não for positivo
+    """
+    if pages_per_step < 1:
+        raise ValueError("pages_per_step deve ser positivo")
+    alvo = db_path if db_path is not None else get_database_target()
+    diretorio = destino_dir if destino_dir is not None else default_backup_dir(alvo)
+    os.makedirs(diretorio, exist_ok=True)
+
+    caminho = _novo_caminho(diretorio, _nome_base(alvo), compress)
+    snapshot = (caminho[:-len('.gz')] if compress else caminho) + '.parcial'
+
+    inicio = time.perf_counter()
+    integridade = None
+    try:
+        origem = open_connection(alvo, profile=READ_ONLY_PROFILE, read_only=True)
+        try:
+            destino = sqlite3.connect(snapshot)
+            try:
+                reinicios = _copiar(origem, destino, pages_per_step, sleep, max_restarts,
+                                    progresso)
+                # O snapshot é um arquivo só, sem -wal/-shm
+                destino.execute("PRAGMA journal_mode = DELETE")
+                paginas = destino.execute("PRAGMA page_count").fetchone()[0]
+                if verify:
+                    problemas = [linha[0] for linha in destino.execute("PRAGMA integrity_check")]
+                    integridade = "\n".join(problemas)
+                    if problemas != ['ok']:
+                        raise BackupError(f"Snapshot corrompido: {integridade[:500]}")
+            finally:
+                destino.close()
+        finally:
+            origem.close()
+
+        if compress:
+            with open(snapshot, 'rb') as entrada, gzip.open(caminho + '.parcial', 'wb',
+                                                          compresslevel=6) as saida:
+                shutil.copyfileobj(entrada, saida, 1024 * 1024)
+            os.remove(snapshot)
+            snapshot = caminho + '.parcial'
+        os.replace(snapshot, caminho)
+    except BaseException:
+        for resto in (snapshot, caminho + '.parcial'):
+            if os.path.exists(resto):
+                os.remove(resto)
+        raise
+
+    segundos = time.perf_counter() - inicio
+    resultado = BackupResult(
+        caminho=caminho,
+        paginas=paginas,
+        reinicios=reinicios,
+        segundos=segundos,
+        paginas_por_segundo=paginas / segundos if segundos else 0.0,
+        bytes=os.path.getsize(caminho),
+        comprimido=compress,
+        integridade=integridade,
+    )
+    logger.info("💾 Backup %s: %s páginas em %.2fs (%.0f páginas/s, %s recomeço(s))",
+                caminho, paginas, segundos, resultado.paginas_por_segundo, reinicios)
+    return resultado
+
+
+# ========================================================================================
+# RETENÇÃO E VERIFICAÇÃO
+# ========================================================================================
+
+def list_backups(destino_dir: Optional[str] = None, db_path: Optional[str] = None) -> List[str]:
+    """
+    Backups do banco no diretório, do mais antigo para o mais recente.
+
+    Só considera arquivos com o nome gerado por backup_database
+    (<banco>-AAAAMMDD-HHMMSS.sqlite[.gz]); arquivos ".parcial" ficam de fora.
+    """
+    alvo = db_path if db_path is not None else get_database_target()
+    diretorio = destino_dir if destino_dir is not None else default_backup_dir(alvo)
+    if not os.path.isdir(diretorio):
+        return []
+
+    base = _nome_base(alvo)
+    encontrados = []
+    for nome in os.listdir(diretorio):
+        achado = _RE_BACKUP.match(nome)
+        if achado and achado.group('base') == base:
+            encontrados.append((achado.group('data'), int(achado.group('seq') or 0), nome))
+    # Ordena pelo carimbo e pela sequência dos feitos no mesmo segundo
+    # (o nome puro não serve: "-2" viria antes de ".sqlite" e "-10" antes
+    # de "-2"; e o mtime muda com cópias)
+    return [os.path.join(diretorio, nome) for _, _, nome in sorted(encontrados)]
+
+
+def prune_backups(destino_dir: Optional[str] = None, db_path: Optional[str] = None,
+                  manter: int = DEFAULT_KEEP, max_dias: Optional[int] = None) -> List[str]:
+    """
+    Apaga os backups mais antigos.
+
+    Args:
+        destino_dir: Diretório dos backups (padrão: default_backup_dir)
+        db_path: Banco de origem (define o prefixo dos nomes)
+        manter: Quantidade de backups mais recentes mantidos
+        max_dias: Se informado, apaga também os backups mais velhos que
+            isso (o mais recente é sempre mantido)
+
+    Returns:
+        List[str]: Arquivos apagados
+
+    Raises:
+        ValueError: Se manter for menor que 1
+    """
+    if manter < 1:
+        raise ValueError("manter deve ser pelo menos 1")
+    backups = list_backups(destino_dir, db_path)
+    apagar = backups[:-manter]
+
+    if max_dias is not None:
+        limite = (datetime.now() - timedelta(days=max_dias)).strftime('%Y%m%d-%H%M%S')
+        for caminho in backups[-manter:-1]:
+            if _RE_BACKUP.match(os.path.basename(caminho)).group('data') < limite:
+                apagar.append(caminho)
+
+    for caminho in apagar:
+        os.remove(caminho)
+        logger.info("🗑️  Backup antigo removido: %s", caminho)
+    return apagar
+
+
+def verify_backup(caminho: str) -> str:
+    """
+    Roda PRAGMA integrity_check em um backup (descomprime .gz em um
+    arquivo temporário).
+
+    Returns:
+        str: "ok", ou a lista de problemas encontrados
+    """
+    temporario = None
+    try:
+        if caminho.endswith('.gz'):
+            descritor, temporario = tempfile.mkstemp(suffix='.sqlite')
+            with os.fdopen(descritor, 'wb') as saida, gzip.open(caminho, 'rb') as entrada:
+                shutil.copyfileobj(entrada, saida, 1024 * 1024)
+        alvo = temporario or caminho
+        if not os.path.exists(alvo):
+            raise FileNotFoundError(caminho)
+        conn = open_connection(alvo, profile=READ_ONLY_PROFILE, read_only=True)
+        try:
+            return "\n".join(linha[0] for linha in conn.execute("PRAGMA integrity_check"))
+        finally:
+            conn.close()
+    finally:
+        if temporario is not None:
+            os.remove(temporario)
+
+
+# ========================================================================================
+# AGENDAMENTO
+# ========================================================================================
+
+class BackupScheduler:
+    """
+    Thread que faz um backup a cada `intervalo` segundos e aplica a retenção.
+
+    Exemplo:
+        >>> agendador = BackupScheduler(intervalo=3600, manter=24, compress=True)
+        >>> ...
+        >>> agendador.close()
+    """
+
+    def __init__(self, intervalo: float, destino_dir: Optional[str] = None,
+                 db_path: Optional[str] = None, manter: int = DEFAULT_KEEP,
+                 max_dias: Optional[int] = None, compress: bool = False,
+                 iniciar_agora: bool = False, **opcoes):
+        """
+        Inicializa o agendador e inicia a thread.
+
+        Args:
+            intervalo: Segundos entre dois backups
+            destino_dir: Diretório dos backups (padrão: default_backup_dir)
+            db_path: Banco de origem (padrão: o de configure_database)
+            manter: Backups mantidos pela retenção (ver prune_backups)
+            max_dias: Idade máxima dos backups (ver prune_backups)
+            compress: Grava os snapshots comprimidos
+            iniciar_agora: Faz o primeiro backup imediatamente
+            **opcoes: Demais argumentos de backup_database
+        """
+        if intervalo <= 0:
+            raise ValueError("intervalo deve ser positivo")
+        if manter < 1:
+            raise ValueError("manter deve ser pelo menos 1")
+
+        self.intervalo = intervalo
+        self.db_path = db_path if db_path is not None else get_database_target()
+        self.destino_dir = (destino_dir if destino_dir is not None
+                            else default_backup_dir(self.db_path))
+        self.manter = manter
+        self.max_dias = max_dias
+        self.compress = compress
+        self.opcoes = opcoes
+        self.ultimo_resultado: Optional[BackupResult] = None
+        self.ultimo_erro: Optional[BaseException] = None
+        self.falhas = 0
+
+        self._parar = threading.Event()
+        self._iniciar_agora = iniciar_agora
+        self._thread = threading.Thread(target=self._run, name='grafica-backup', daemon=True)
+        self._thread.start()
+
+    def run_once(self) -> Optional[BackupResult]:
+        """
+        Faz um backup e aplica a retenção; erros são registrados, não propagados.
+
+        Returns:
+            Optional[BackupResult]: Resultado, ou None se o backup falhou
+        """
+        try:
+            resultado = backup_database(self.destino_dir, self.db_path,
+                                        compress=self.compress, **self.opcoes)
+            prune_backups(self.destino_dir, self.db_path, self.manter, self.max_dias)
+        except (sqlite3.Error, OSError, ValueError) as e:
+            self.falhas += 1
+            self.ultimo_erro = e
+            logger.error("❌ Falha no backup agendado: %s", e)
+            return None
+        self.ultimo_resultado = resultado
+        self.ultimo_erro = None
+        return resultado
+
+    def _run(self) -> None:
+        """
+        Laço da thread de backup.
+        """
+        if self._iniciar_agora:
+            self.run_once()
+        while not self._parar.wait(self.intervalo):
+            self.run_once()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Encerra a thread (um backup em andamento termina antes).
+
+        Args:
+            timeout: Segundos de espera pela thread (None = sem limite)
+        """
+        self._parar.set()
+        self._thread.join(timeout)
+
+
+def _tamanho(bytes_: int) -> str:
+    for unidade in ('B', 'KB', 'MB', 'GB'):
+        if bytes_ < 1024 or unidade == 'GB':
+            return f"{bytes_:.1f} {unidade}" if unidade != 'B' else f"{bytes_} B"
+        bytes_ /= 1024
+
+
+def main():
+    """
+    Linha de comando: backup, agendamento, listagem e verificação.
+    """
+    parser = argparse.ArgumentParser(description="Backup online do banco")
+    parser.add_argument('comando', nargs='?', default='backup',
+                        choices=['backup', 'listar', 'verificar'])
+    parser.add_argument('arquivo', nargs='?', help="backup a verificar (comando verificar)")
+    parser.add_argument('--destino', default=None, help="diretório dos backups")
+    parser.add_argument('--comprimir', action='store_true')
+    parser.add_argument('--manter', type=int, default=DEFAULT_KEEP,
+                        help="backups mantidos (os mais antigos são apagados)")
+    parser.add_argument('--max-dias', type=int, default=None)
+    parser.add_argument('--paginas', type=int, default=DEFAULT_PAGES_PER_STEP,
+                        help="páginas copiadas por passo")
+    parser.add_argument('--pausa', type=float, default=DEFAULT_STEP_SLEEP,
+                        help="segundos entre os passos")
+    parser.add_argument('--sem-verificacao', action='store_true')
+    parser.add_argument('--intervalo', type=float, default=None,
+                        help="repete o backup a cada N segundos até Ctrl+C")
+    args = parser.parse_args()
+
+    if args.comando == 'verificar':
+        if not args.arquivo:
+            parser.error("informe o arquivo a verificar")
+        try:
+            resultado = verify_backup(args.arquivo)
+        except (OSError, sqlite3.Error) as e:
+            print(f"❌ Não foi possível verificar {args.arquivo}: {e}")
+            sys.exit(1)
+        print(f"{'✅' if resultado == 'ok' else '❌'} {args.arquivo}: {resultado}")
+        sys.exit(0 if resultado == 'ok' else 1)
+
+    if args.comando == 'listar':
+        backups = list_backups(args.destino)
+        for caminho in backups:
+            print(f"   {os.path.basename(caminho):<40}{_tamanho(os.path.getsize(caminho)):>12}")
+        print(f"📦 {len(backups)} backup(s) em {args.destino or default_backup_dir()}")
+        return
+
+    opcoes = {'pages_per_step': args.paginas, 'sleep': args.pausa,
+              'verify': not args.sem_verificacao}
+
+    if args.intervalo is not None:
+        agendador = BackupScheduler(args.intervalo, args.destino, manter=args.manter,
+                                    max_dias=args.max_dias, compress=args.comprimir,
+                                    iniciar_agora=True, **opcoes)
+        print(f"⏰ Backup a cada {args.intervalo:g}s em {agendador.destino_dir} (Ctrl+C encerra)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            agendador.close()
+            print("\n👋 Agendamento encerrado")
+        return
+
+    try:
+        resultado = backup_database(args.destino, compress=args.comprimir, **opcoes)
+        removidos = prune_backups(args.destino, manter=args.manter, max_dias=args.max_dias)
+    except (sqlite3.Error, OSError, ValueError) as e:
+        print(f"❌ Erro no backup: {e}")
+        sys.exit(1)
+
+    print(f"✅ Backup em {resultado.caminho} ({_tamanho(resultado.bytes)})")
+    print(f"   {resultado.paginas:,} páginas em {resultado.segundos:.2f}s "
+          f"({resultado.paginas_por_segundo:,.0f} páginas/s, {resultado.reinicios} recomeço(s))")
+    if resultado.integridade is not None:
+        print(f"   integrity_check: {resultado.integridade}")
+    if removidos:
+        print(f"🗑️  {len(removidos)} backup(s) antigo(s) removido(s)")
+
+
+if __name__ == "__main__":
+    main()
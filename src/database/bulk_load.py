@@ -0,0 +1,516 @@
+"""
+Carga em lote de arquivos CSV nas tabelas clientes e materiais.
+
+Usado para migrar as planilhas antigas de clientes e de estoque. O
+arquivo é lido em fluxo (nunca inteiro na memória), cada linha é
+validada e convertida segundo o mapeamento de colunas, e as linhas
+válidas são gravadas em blocos (chunk_size) com um commit por bloco, em
+uma conexão própria com o perfil de PRAGMA "bulk-load".
+
+Linhas rejeitadas (validação ou restrição do banco, ex.: CPF/CNPJ
+repetido) vão para um arquivo CSV separado, com o motivo. O progresso
+fica registrado no próprio banco, na mesma transação de cada bloco, e
+uma carga interrompida pode ser retomada com resume=True.
+
+Exemplo:
+    >>> from database.bulk_load import load_csv
+    >>> resultado = load_csv("clientes_antigos.csv", "clientes",
+    ...                      mapping={"Razão Social": "empresa"})
+    >>> print(resultado.inseridas, resultado.linhas_por_segundo)
+
+Linha de comando:
+    python database/bulk_load.py clientes clientes_antigos.csv --delimitador ";"
+
+Autor: Sistema Gráfica
+Data: 2025
+"""
+
+import argparse
+import csv
+import os
+import re
+import sqlite3
+import sys
+import time
+import unicodedata
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# Adiciona o diretório pai ao path para importar connection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.connection import get_database_target, invalidate_result_cache, open_connection
+from database.logger import get_logger
+from database.money import Money
+
+
+logger = get_logger('database.bulk_load')
+
+DEFAULT_CHUNK_SIZE = 10000
+BULK_PROFILE = 'bulk-load'
+
+# Progresso das cargas: gravado junto com cada bloco, para retomar
+PROGRESS_TABLE = 'carga_progresso'
+
+# Tabela temporária (só da conexão da carga) que recebe cada bloco
+STAGING_TABLE = 'carga_bloco'
+
+
+# ========================================================================================
+# CONVERSORES E VALIDAÇÃO
+# ========================================================================================
+
+def _texto(max_len: int, obrigatorio: bool = False) -> Callable[[str], Optional[str]]:
+    def converter(valor: str) -> Optional[str]:
+        if not valor:
+            if obrigatorio:
+                raise ValueError("campo obrigatório vazio")
+            return None
+        if len(valor) > max_len:
+            raise ValueError(f"mais de {max_len} caracteres")
+        return valor
+    return converter
+
+
+def _email(valor: str) -> Optional[str]:
+    if not valor:
+        return None
+    if '@' not in valor or len(valor) > 100:
+        raise ValueError(f"email inválido: {valor}")
+    return valor.lower()
+
+
+def _uf(valor: str) -> Optional[str]:
+    if not valor:
+        return None
+    valor = valor.upper()
+    if len(valor) != 2 or not valor.isalpha():
+        raise ValueError(f"UF inválida: {valor}")
+    return valor
+
+
+def _cpf_cnpj(valor: str) -> Optional[str]:
+    if not valor:
+        return None
+    digitos = re.sub(r'\D', '', valor)
+    if len(digitos) not in (11, 14):
+        raise ValueError(f"CPF/CNPJ inválido: {valor}")
+    return digitos
+
+
+def _dinheiro(padrao: int) -> Callable[[str], int]:
+    def converter(valor: str) -> int:
+        if not valor:
+            return padrao
+        # Grava centavos inteiros (ver database/money.py)
+        centavos = Money.parse(valor).cents
+        if centavos < 0:
+            raise ValueError(f"valor negativo: {valor}")
+        return centavos
+    return converter
+
+
+def _padrao(converter: Callable[[str], Optional[str]], padrao: str) -> Callable[[str], str]:
+    def com_padrao(valor: str) -> str:
+        return converter(valor) or padrao
+    return com_padrao
+
+
+def _inteiro(padrao: int) -> Callable[[str], int]:
+    def converter(valor: str) -> int:
+        if not valor:
+            return padrao
+        try:
+            return int(valor)
+        except ValueError:
+            raise ValueError(f"inteiro inválido: {valor}") from None
+    return converter
+
+
+# Colunas aceitas por tabela: coluna -> (conversor, nomes alternativos no CSV)
+TABLE_SPECS: Dict[str, Dict[str, Tuple[Callable, Tuple[str, ...]]]] = {
+    'clientes': {
+        'nome': (_texto(100, obrigatorio=True), ('cliente', 'nome_cliente')),
+        'empresa': (_texto(100), ('razao_social',)),
+        'email': (_email, ('e_mail',)),
+        'telefone': (_texto(20), ('fone', 'celular')),
+        'endereco': (_texto(500), ('logradouro',)),
+        'cidade': (_texto(50), ('municipio',)),
+        'estado': (_uf, ('uf',)),
+        'cep': (_texto(10), ()),
+        'cpf_cnpj': (_cpf_cnpj, ('cpf', 'cnpj', 'documento')),
+        'observacoes': (_texto(2000), ('obs',)),
+    },
+    'materiais': {
+        'nome': (_texto(100, obrigatorio=True), ('material', 'produto')),
+        'descricao': (_texto(2000), ()),
+        'categoria': (_texto(50), ()),
+        'unidade': (_padrao(_texto(10), 'un'), ('un', 'unid')),
+        'preco_unitario': (_dinheiro(0), ('preco', 'valor', 'valor_unitario')),
+        'estoque_atual': (_inteiro(0), ('estoque', 'quantidade', 'qtd')),
+        'estoque_minimo': (_inteiro(0), ('minimo',)),
+        'fornecedor': (_texto(100), ()),
+        'codigo_barras': (_texto(50), ('ean', 'codigo')),
+    },
+}
+
+
+def _normalizar_cabecalho(nome: str) -> str:
+    """
+    "Razão Social " -> "razao_social".
+    """
+    sem_acento = unicodedata.normalize('NFKD', nome).encode('ascii', 'ignore').decode()
+    return re.sub(r'[^a-z0-9]+', '_', sem_acento.lower()).strip('_')
+
+
+def build_mapping(cabecalho: List[str], tabela: str,
+                  mapping: Optional[Dict[str, str]] = None) -> Dict[int, str]:
+    """
+    Associa as colunas do CSV às colunas da tabela.
+
+    O mapeamento explícito (cabeçalho do CSV -> coluna) tem prioridade;
+    as demais colunas são reconhecidas pelo nome normalizado (sem acento,
+    minúsculas) ou por nomes alternativos comuns (ex.: "UF" -> estado).
+    Colunas não reconhecidas são ignoradas.
+
+    Args:
+        cabecalho: Primeira linha do CSV
+        tabela: 'clientes' ou 'materiais'
+        mapping: Mapeamento explícito (opcional)
+
+    Returns:
+        Dict[int, str]: Índice da coluna no CSV -> coluna da tabela
+
+    Raises:
+        ValueError: Tabela desconhecida, coluna inexistente no mapeamento
+            ou coluna obrigatória (nome) ausente
+    """
+    if tabela not in TABLE_SPECS:
+        raise ValueError(f"Tabela não suportada: {tabela}. Use: {', '.join(TABLE_SPECS)}")
+    spec = TABLE_SPECS[tabela]
+
+    apelidos = {}
+    for coluna, (_, alternativos) in spec.items():
+        apelidos[coluna] = coluna
+        for alternativo in alternativos:
+            apelidos[alternativo] = coluna
+
+    explicito = {_normalizar_cabecalho(k): v for k, v in (mapping or {}).items()}
+    for coluna in explicito.values():
+        if coluna not in spec:
+            raise ValueError(f"Coluna inexistente em {tabela}: {coluna}")
+
+    normalizados = [_normalizar_cabecalho(nome) for nome in cabecalho]
+    resultado: Dict[int, str] = {
+        indice: explicito[chave] for indice, chave in enumerate(normalizados)
+        if chave in explicito
+    }
+    for indice, chave in enumerate(normalizados):
+        coluna = apelidos.get(chave)
+        if indice not in resultado and coluna and coluna not in resultado.values():
+            resultado[indice] = coluna
+
+    if 'nome' not in resultado.values():
+        raise ValueError(f"Coluna 'nome' não encontrada no cabeçalho: {cabecalho}")
+    return resultado
+
+
+# ========================================================================================
+# CARGA
+# ========================================================================================
+
+class BulkLoadResult(NamedTuple):
+    """
+    Resultado de uma carga.
+
+    Attributes:
+        tabela: Tabela de destino
+        lidas: Linhas de dados lidas do CSV nesta execução
+        inseridas: Linhas gravadas
+        rejeitadas: Linhas enviadas ao arquivo de rejeitadas
+        segundos: Duração da carga
+        linhas_por_segundo: Linhas lidas por segundo
+        arquivo_rejeitadas: Caminho do arquivo de rejeitadas (None se nenhuma)
+    """
+    tabela: str
+    lidas: int
+    inseridas: int
+    rejeitadas: int
+    segundos: float
+    linhas_por_segundo: float
+    arquivo_rejeitadas: Optional[str]
+
+
+class _Rejeitadas:
+    """
+    Arquivo CSV de linhas rejeitadas, criado só na primeira rejeição.
+
+    As rejeições de um bloco só são gravadas depois do commit do bloco
+    (confirmar), para que uma carga retomada não as repita.
+    """
+
+    def __init__(self, caminho: str, cabecalho: List[str], delimitador: str, anexar: bool):
+        self.caminho = caminho
+        self.cabecalho = cabecalho
+        self.delimitador = delimitador
+        self.anexar = anexar
+        self.total = 0
+        self._pendentes: List[List[str]] = []
+        self._arquivo = None
+        self._writer = None
+
+    def gravar(self, linha: List[str], motivo: str) -> None:
+        self._pendentes.append(linha + [motivo])
+
+    def confirmar(self) -> None:
+        if not self._pendentes:
+            return
+        if self._writer is None:
+            existe = self.anexar and os.path.exists(self.caminho)
+            self._arquivo = open(self.caminho, 'a' if existe else 'w',
+                                 newline='', encoding='utf-8')
+            self._writer = csv.writer(self._arquivo, delimiter=self.delimitador)
+            if not existe:
+                self._writer.writerow(self.cabecalho + ['motivo_rejeicao'])
+        self._writer.writerows(self._pendentes)
+        self.total += len(self._pendentes)
+        self._pendentes = []
+
+    def fechar(self) -> None:
+        if self._arquivo is not None:
+            self._arquivo.close()
+
+
+def _gravar_bloco(conn: sqlite3.Connection, colunas: List[str],
+                  bloco: List[Tuple[int, List[str], tuple]],
+                  rejeitadas: _Rejeitadas, chave: str, tabela: str,
+                  processadas: int) -> int:
+    """
+    Grava um bloco em uma transação, junto com o progresso da carga.
+
+    O bloco vai primeiro para a tabela temporária STAGING_TABLE e dela
+    para a tabela final com um único INSERT ... SELECT: assim os
+    triggers da tabela (ex.: índices de busca FTS5, que gravam seus
+    dados a cada comando) rodam uma vez por bloco, não por linha.
+
+    Se o INSERT falhar por restrição (ex.: UNIQUE), o bloco é regravado
+    linha a linha e só as linhas com erro são rejeitadas.
+
+    Returns:
+        int: Linhas inseridas
+    """
+    progresso = (f"INSERT OR REPLACE INTO {PROGRESS_TABLE} "
+                 "(arquivo, tabela, linhas, atualizado_em) VALUES (?, ?, ?, CURRENT_TIMESTAMP)")
+
+    lista = ', '.join(colunas)
+    marcadores = ', '.join('?' * len(colunas))
+    insert = f"INSERT INTO {tabela} ({lista}) VALUES ({marcadores})"
+
+    conn.execute("BEGIN")
+    try:
+        conn.executemany(f"INSERT INTO temp.{STAGING_TABLE} ({lista}) VALUES ({marcadores})",
+                         [valores for _, _, valores in bloco])
+        conn.execute(f"INSERT INTO {tabela} ({lista}) "
+                     f"SELECT {lista} FROM temp.{STAGING_TABLE} ORDER BY rowid")
+        conn.execute(f"DELETE FROM temp.{STAGING_TABLE}")
+        conn.execute(progresso, (chave, tabela, processadas))
+        conn.execute("COMMIT")
+        rejeitadas.confirmar()
+        return len(bloco)
+    except sqlite3.IntegrityError:
+        conn.execute("ROLLBACK")
+
+    inseridas = 0
+    conn.execute("BEGIN")
+    try:
+        for _, linha, valores in bloco:
+            try:
+                conn.execute(insert, valores)
+                inseridas += 1
+            except sqlite3.IntegrityError as e:
+                rejeitadas.gravar(linha, f"banco: {e}")
+        conn.execute(progresso, (chave, tabela, processadas))
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    rejeitadas.confirmar()
+    return inseridas
+
+
+def load_csv(caminho: str, tabela: str,
+             mapping: Optional[Dict[str, str]] = None,
+             chunk_size: int = DEFAULT_CHUNK_SIZE,
+             delimitador: str = ',',
+             encoding: str = 'utf-8-sig',
+             rejeitadas_path: Optional[str] = None,
+             resume: bool = False,
+             db_path: Optional[str] = None,
+             progresso: Optional[Callable[[int, int, float], None]] = None) -> BulkLoadResult:
+    """
+    Importa um arquivo CSV para clientes ou materiais.
+
+    Args:
+        caminho: Arquivo CSV (com cabeçalho)
+        tabela: 'clientes' ou 'materiais'
+        mapping: Cabeçalho do CSV -> coluna da tabela (ver build_mapping)
+        chunk_size: Linhas por commit
+        delimitador: Separador de campos (planilhas brasileiras usam ';')
+        encoding: Codificação do arquivo (utf-8-sig aceita BOM do Excel)
+        rejeitadas_path: Arquivo das linhas rejeitadas
+            (padrão: <caminho>.rejeitadas.csv)
+        resume: Continua de onde uma carga anterior do mesmo arquivo parou
+        db_path: Caminho do banco (padrão: o de configure_database)
+        progresso: Chamada a cada bloco com (lidas, inseridas, linhas/s)
+
+    Returns:
+        BulkLoadResult: Totais e throughput da carga
+
+    Raises:
+        ValueError: Tabela, mapeamento ou chunk_size inválidos
+        OSError: Falha ao ler o CSV
+        sqlite3.Error: Erro do banco que não seja de restrição
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size deve ser pelo menos 1")
+    if rejeitadas_path is None:
+        rejeitadas_path = os.path.splitext(caminho)[0] + '.rejeitadas.csv'
+    chave = os.path.abspath(caminho)
+
+    conn = open_connection(db_path or get_database_target(), profile=BULK_PROFILE)
+    # Transações controladas manualmente (BEGIN/COMMIT)
+    conn.isolation_level = None
+    inicio = time.perf_counter()
+    try:
+        conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {PROGRESS_TABLE} (
+            arquivo TEXT NOT NULL,
+            tabela VARCHAR(50) NOT NULL,
+            linhas INTEGER NOT NULL,
+            atualizado_em DATETIME,
+            PRIMARY KEY (arquivo, tabela)
+        )
+        """)
+        pular = 0
+        if resume:
+            linha = conn.execute(
+                f"SELECT linhas FROM {PROGRESS_TABLE} WHERE arquivo = ? AND tabela = ?",
+                (chave, tabela)
+            ).fetchone()
+            pular = linha[0] if linha else 0
+            if pular:
+                logger.info("⏩ Retomando carga de %s após %s linhas", caminho, pular)
+
+        with open(caminho, newline='', encoding=encoding) as arquivo:
+            leitor = csv.reader(arquivo, delimiter=delimitador)
+            cabecalho = next(leitor, None)
+            if cabecalho is None:
+                raise ValueError(f"Arquivo vazio: {caminho}")
+
+            colunas = build_mapping(cabecalho, tabela, mapping)
+            spec = TABLE_SPECS[tabela]
+            conversores = [(indice, spec[coluna][0]) for indice, coluna in colunas.items()]
+            destino = list(colunas.values())
+            conn.execute(f"CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} "
+                         f"({', '.join(destino)})")
+            largura = len(cabecalho)
+
+            rejeitadas = _Rejeitadas(rejeitadas_path, cabecalho, delimitador, anexar=pular > 0)
+            lidas = inseridas = processadas = 0
+            bloco: List[Tuple[int, List[str], tuple]] = []
+            try:
+                for processadas, linha in enumerate(leitor, start=1):
+                    if processadas <= pular:
+                        continue
+                    lidas += 1
+                    if len(linha) < largura:
+                        linha = linha + [''] * (largura - len(linha))
+                    try:
+                        valores = tuple(converter(linha[indice].strip())
+                                        for indice, converter in conversores)
+                    except ValueError as e:
+                        rejeitadas.gravar(linha, str(e))
+                        continue
+                    bloco.append((processadas, linha, valores))
+
+                    if len(bloco) >= chunk_size:
+                        inseridas += _gravar_bloco(conn, destino, bloco, rejeitadas,
+                                                   chave, tabela, processadas)
+                        bloco = []
+                        taxa = lidas / (time.perf_counter() - inicio)
+                        logger.debug("📦 %s: %s linhas lidas (%.0f linhas/s)", tabela, lidas, taxa)
+                        if progresso is not None:
+                            progresso(lidas, inseridas, taxa)
+
+                inseridas += _gravar_bloco(conn, destino, bloco, rejeitadas,
+                                           chave, tabela, processadas)
+            finally:
+                rejeitadas.fechar()
+
+        # Carga concluída: nada a retomar
+        conn.execute(f"DELETE FROM {PROGRESS_TABLE} WHERE arquivo = ? AND tabela = ?",
+                     (chave, tabela))
+    finally:
+        conn.close()
+        invalidate_result_cache([tabela])
+
+    segundos = time.perf_counter() - inicio
+    resultado = BulkLoadResult(
+        tabela=tabela,
+        lidas=lidas,
+        inseridas=inseridas,
+        rejeitadas=rejeitadas.total,
+        segundos=segundos,
+        linhas_por_segundo=lidas / segundos if segundos else 0.0,
+        arquivo_rejeitadas=rejeitadas_path if rejeitadas.total else None,
+    )
+    logger.info(
+        "✅ Carga de %s concluída: %s inseridas, %s rejeitadas em %.1fs (%.0f linhas/s)",
+        tabela, inseridas, rejeitadas.total, segundos, resultado.linhas_por_segundo
+    )
+    return resultado
+
+
+def main():
+    """
+    Linha de comando: importa um CSV para clientes ou materiais.
+    """
+    parser = argparse.ArgumentParser(description="Carga em lote de CSV")
+    parser.add_argument('tabela', choices=sorted(TABLE_SPECS))
+    parser.add_argument('arquivo')
+    parser.add_argument('--delimitador', default=',')
+    parser.add_argument('--encoding', default='utf-8-sig')
+    parser.add_argument('--chunk', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--mapear', action='append', default=[], metavar='CSV=COLUNA',
+                        help="associa um cabeçalho do CSV a uma coluna (repetível)")
+    parser.add_argument('--rejeitadas', default=None)
+    parser.add_argument('--retomar', action='store_true',
+                        help="continua uma carga interrompida do mesmo arquivo")
+    args = parser.parse_args()
+
+    mapping = {}
+    for item in args.mapear:
+        origem, sep, destino = item.partition('=')
+        if not sep:
+            parser.error(f"--mapear espera CSV=COLUNA: {item}")
+        mapping[origem] = destino
+
+    def mostrar(lidas: int, inseridas: int, taxa: float) -> None:
+        print(f"\r📦 {lidas} lidas, {inseridas} inseridas ({taxa:,.0f} linhas/s)", end='', flush=True)
+
+    try:
+        resultado = load_csv(args.arquivo, args.tabela, mapping=mapping,
+                             chunk_size=args.chunk, delimitador=args.delimitador,
+                             encoding=args.encoding, rejeitadas_path=args.rejeitadas,
+                             resume=args.retomar, progresso=mostrar)
+    except (ValueError, OSError, sqlite3.Error) as e:
+        print(f"\n❌ Erro na carga: {e}")
+        sys.exit(1)
+
+    print(f"\n✅ {resultado.inseridas} linhas inseridas em {resultado.tabela} "
+          f"({resultado.segundos:.1f}s, {resultado.linhas_por_segundo:,.0f} linhas/s)")
+    if resultado.rejeitadas:
+        print(f"⚠️  {resultado.rejeitadas} linhas rejeitadas: {resultado.arquivo_rejeitadas}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Cache de resultados de consultas com invalidação por tabela.
+
+Guarda o resultado de SELECTs (chave: SQL + parâmetros) em um LRU com
+tempo de vida (TTL). Cada entrada sabe quais tabelas a consulta lê;
+quando execute_query/execute_many grava em uma tabela, todas as entradas
+que dependem dela são descartadas.
+
+Gravações feitas por outros processos (outras estações) não são vistas
+pela invalidação: o TTL limita por quanto tempo um resultado pode ficar
+desatualizado.
+
+O cache é usado por database.connection quando habilitado com
+configure_result_cache(enabled=True).
+
+Autor: Sistema Gráfica
+Data: 2025
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Optional, Tuple
+
+
+_RE_TABELAS = re.compile(
+    r'\b(?:FROM|JOIN|INTO|UPDATE|TABLE(?:\s+IF\s+(?:NOT\s+)?EXISTS)?)\s+["`\[]?([A-Za-z_][A-Za-z0-9_]*)',
+    re.IGNORECASE
+)
+
+# Palavras que podem aparecer depois de FROM/JOIN sem ser tabela
+_NAO_TABELAS = frozenset({'select', 'values', 'where'})
+
+
+def extract_tables(query: str) -> FrozenSet[str]:
+    """
+    Extrai os nomes das tabelas citadas em um comando SQL.
+
+    A análise é textual (FROM, JOIN, INTO, UPDATE): pode incluir nomes a
+    mais (ex.: CTEs), o que só causa invalidações extras, nunca a falta delas.
+    Views não são resolvidas aqui: database.connection as troca pelas
+    tabelas que leem antes de guardar um resultado.
+
+    Args:
+        query: Comando SQL
+
+    Returns:
+        FrozenSet[str]: Nomes das tabelas em minúsculas
+    """
+    return frozenset(
+        nome.lower() for nome in _RE_TABELAS.findall(query)
+        if nome.lower() not in _NAO_TABELAS
+    )
+
+
+class _Entrada:
+    __slots__ = ('rows', 'tables', 'expira_em')
+
+    def __init__(self, rows: List, tables: FrozenSet[str], expira_em: float):
+        self.rows = rows
+        self.tables = tables
+        self.expira_em = expira_em
+
+
+class ResultCache:
+    """
+    LRU + TTL de resultados de consultas, invalidado por tabela.
+
+    Limites: max_entries (quantidade de consultas) e max_rows (total de
+    linhas guardadas somando todas as entradas).
+    """
+
+    def __init__(self, max_entries: int = 256, max_rows: int = 50000,
+                 ttl: float = 30.0):
+        """
+        Args:
+            max_entries: Quantidade máxima de resultados guardados
+            max_rows: Total máximo de linhas guardadas
+            ttl: Segundos de validade de cada resultado
+        """
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._entradas: 'OrderedDict[Hashable, _Entrada]' = OrderedDict()
+        self._por_tabela: Dict[str, set] = {}
+        self._versoes: Dict[str, int] = {}
+        # Incrementada por clear(): vale também para tabelas que o cache
+        # ainda não conhecia (sem versão própria)
+        self._epoca = 0
+        self._total_linhas = 0
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0,
+            'expired': 0,
+            'invalidations': 0,
+        }
+
+    @staticmethod
+    def make_key(query: str, params: Optional[Tuple]) -> Optional[Hashable]:
+        """
+        Monta a chave de cache; None se os parâmetros não forem hasheáveis.
+        """
+        chave = (query, tuple(params) if params else ())
+        try:
+            hash(chave)
+        except TypeError:
+            return None
+        return chave
+
+    def snapshot(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        """
+        Época e versões atuais das tabelas; tirada antes de executar a
+        consulta e conferida em put(), para não guardar um resultado que
+        uma gravação ou um clear() concorrente já tornou inválido.
+        """
+        with self._lock:
+            return self._versoes_atuais(tables)
+
+    def _versoes_atuais(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        return (self._epoca,) + tuple(self._versoes.get(t, 0) for t in tables)
+
+    def get(self, key: Hashable) -> Optional[List]:
+        """
+        Retorna uma cópia do resultado guardado, ou None.
+        """
+        with self._lock:
+            entrada = self._entradas.get(key)
+            if entrada is None:
+                self._stats['misses'] += 1
+                return None
+            if entrada.expira_em <= time.monotonic():
+                self._remover(key)
+                self._stats['expired'] += 1
+                self._stats['misses'] += 1
+                return None
+            self._entradas.move_to_end(key)
+            self._stats['hits'] += 1
+            return list(entrada.rows)
+
+    def put(self, key: Hashable, rows: List, tables: FrozenSet[str],
+            snapshot: Tuple[int, ...]) -> None:
+        """
+        Guarda um resultado, se as tabelas não mudaram desde snapshot.
+        """
+        if len(rows) > self.max_rows:
+            return
+        with self._lock:
+            if self._versoes_atuais(tables) != snapshot:
+                return
+            if key in self._entradas:
+                self._remover(key)
+            self._entradas[key] = _Entrada(list(rows), tables,
+                                           time.monotonic() + self.ttl)
+            self._total_linhas += len(rows)
+            for tabela in tables:
+                self._por_tabela.setdefault(tabela, set()).add(key)
+            self._stats['stores'] += 1
+
+            while (len(self._entradas) > self.max_entries
+                   or self._total_linhas > self.max_rows):
+                antiga = next(iter(self._entradas))
+                self._remover(antiga)
+                self._stats['evictions'] += 1
+
+    def invalidate(self, tables: Iterable[str]) -> None:
+        """
+        Descarta todos os resultados que leem alguma das tabelas.
+        """
+        with self._lock:
+            for tabela in tables:
+                self._versoes[tabela] = self._versoes.get(tabela, 0) + 1
+                for chave in list(self._por_tabela.get(tabela, ())):
+                    self._remover(chave)
+                    self._stats['invalidations'] += 1
+
+    def clear(self) -> None:
+        """
+        Descarta todos os resultados (ex.: após um comando DDL).
+        """
+        with self._lock:
+            self._epoca += 1
+            self._stats['invalidations'] += len(self._entradas)
+            self._entradas.clear()
+            self._por_tabela.clear()
+            self._total_linhas = 0
+
+    def _remover(self, key: Hashable) -> None:
+        entrada = self._entradas.pop(key)
+        self._total_linhas -= len(entrada.rows)
+        for tabela in entrada.tables:
+            chaves = self._por_tabela.get(tabela)
+            if chaves is not None:
+                chaves.discard(key)
+                if not chaves:
+                    del self._por_tabela[tabela]
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Retorna as métricas do cache.
+
+        Returns:
+            Dict[str, float]: hits, misses, stores, evictions, expired,
+            invalidations, entries, rows e hit_rate (0 a 1)
+        """
+        with self._lock:
+            resultado = dict(self._stats)
+            resultado['entries'] = len(self._entradas)
+            resultado['rows'] = self._total_linhas
+        consultas = resultado['hits'] + resultado['misses']
+        resultado['hit_rate'] = resultado['hits'] / consultas if consultas else 0.0
+        return resultado
@@ -4,19 +4,225 @@ Módulo de conexão com banco de dados SQLite para sistema da gráfica.
 Este módulo fornece funções reutilizáveis para gerenciar conexões
 e executar operações no banco de dados SQLite.
 
+As funções execute_query e execute_many usam um pool de conexões
+persistentes (ConnectionPool), evitando abrir e fechar o arquivo do
+banco a cada consulta. Toda conexão nova recebe um perfil de PRAGMAs
+(ver PRAGMA_PROFILES), por padrão o perfil "desktop" com journal WAL.
+
+Opcionalmente, os resultados de SELECTs podem ser guardados em cache
+(configure_result_cache); gravações feitas por execute_query e
+execute_many invalidam as tabelas afetadas.
+
+Com a fila de gravação ativa (configure_write_queue), escritas de várias
+threads são agrupadas por uma thread escritora em um único commit.
+
 Autor: Sistema Gráfica
 Data: 2025
 """
 
+import atexit
+import queue
+import random
 import sqlite3
 import os
-from typing import Optional, Any, List, Tuple
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import Future
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Optional, Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Tuple
+
+# Adiciona o diretório pai ao path para importar o módulo logger
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import profiling
+from database.cache import ResultCache, extract_tables
+from database.logger import get_logger
+
+
+logger = get_logger('database.connection')
+
+# Caminho relativo padrão para o arquivo do banco
+DB_PATH = os.path.join('database', 'db.sqlite')
+
+# Banco em uso: arquivo, ':memory:' ou URI file: (ver configure_database).
+# Pode ser definido pela variável de ambiente GRAFICA_DB.
+_db_target = DB_PATH
+
+# Conexão que mantém vivo um banco em memória enquanto ele estiver em uso
+_memory_keeper: Optional[sqlite3.Connection] = None
+_memory_count = 0
+
+# Diretórios já verificados (evita os.path.exists a cada conexão)
+_diretorios_verificados = set()
+_diretorios_lock = threading.Lock()
+
+
+# Perfis de PRAGMA aplicados ao abrir cada conexão.
+# cache_size negativo é em KiB; mmap_size é em bytes; busy_timeout em ms.
+# A ordem importa: journal_mode precisa vir antes de query_only.
+PRAGMA_PROFILES: Dict[str, Dict[str, Any]] = {
+    # Uso interativo (Tkinter): leitores não bloqueiam durante commits
+    'desktop': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,
+        'mmap_size': 64 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+    },
+    # Cargas em lote: sem fsync por commit, cache grande
+    'bulk-load': {
+        'journal_mode': 'WAL',
+        'synchronous': 'OFF',
+        'cache_size': -200000,
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 30000,
+    },
+    # Relatórios longos: somente leitura, cache e mmap maiores
+    'read-only-report': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -64000,
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 10000,
+        'query_only': 1,
+    },
+}
+
+DEFAULT_PROFILE = 'desktop'
+
+# busy_timeout (ms) que substitui o de todos os perfis (ver configure_retry)
+_busy_timeout: Optional[int] = None
+
+# Perfil usado pelas conexões somente leitura (ver get_read_pool)
+READ_ONLY_PROFILE = 'read-only-report'
+
+# Tamanho do cache de statements preparados do sqlite3, por conexão
+DEFAULT_CACHED_STATEMENTS = 128
+
+# Tamanho do cache de classificação de comandos SQL (ver get_statement_info)
+DEFAULT_STATEMENT_CACHE_SIZE = 256
+
+
+class PoolTimeoutError(sqlite3.OperationalError):
+    """
+    Nenhuma conexão do pool ficou disponível dentro do tempo limite.
+    """
+
+
+def _ensure_database_dir(db_path: str) -> None:
+    """
+    Garante que o diretório do arquivo do banco exista.
+    
+    A verificação é feita apenas uma vez por diretório durante a vida
+    do processo.
+    
+    Args:
+        db_path: Caminho do arquivo do banco de dados
+    """
+    diretorio = os.path.dirname(db_path)
+    if not diretorio or diretorio in _diretorios_verificados:
+        return
+    
+    with _diretorios_lock:
+        if diretorio not in _diretorios_verificados:
+            os.makedirs(diretorio, exist_ok=True)
+            _diretorios_verificados.add(diretorio)
 
 
-def get_connection() -> sqlite3.Connection:
+def apply_pragmas(conn: sqlite3.Connection, profile: str = DEFAULT_PROFILE,
+                  read_only: bool = False) -> None:
+    """
+    Aplica um perfil de PRAGMAs a uma conexão.
+    
+    Args:
+        conn: Conexão a ser configurada
+        profile: Nome do perfil em PRAGMA_PROFILES
+        read_only: Conexão aberta com mode=ro; journal_mode é ignorado,
+            pois alterá-lo exige escrita no arquivo
+        
+    Raises:
+        ValueError: Se o perfil não existir
+    """
+    if profile not in PRAGMA_PROFILES:
+        raise ValueError(
+            f"Perfil de PRAGMA desconhecido: {profile!r} "
+            f"(disponíveis: {', '.join(PRAGMA_PROFILES)})"
+        )
+    
+    for pragma, valor in PRAGMA_PROFILES[profile].items():
+        if read_only and pragma == 'journal_mode':
+            continue
+        if pragma == 'busy_timeout' and _busy_timeout is not None:
+            valor = _busy_timeout
+        # PRAGMA não aceita parâmetros; os valores vêm apenas dos perfis
+        conn.execute(f"PRAGMA {pragma} = {valor}")
+
+
+def open_connection(db_path: str, check_same_thread: bool = True,
+                    profile: str = DEFAULT_PROFILE,
+                    cached_statements: int = DEFAULT_CACHED_STATEMENTS,
+                    read_only: bool = False) -> sqlite3.Connection:
+    """
+    Abre uma nova conexão SQLite já configurada, fora do pool.
+    
+    Usada pelos pools e por rotinas que precisam de uma conexão própria
+    (carga em lote, arquivamento, backup); deve ser fechada pelo chamador.
+    
+    Args:
+        db_path: Caminho do arquivo do banco de dados
+        check_same_thread: Se False, a conexão pode ser usada por outras threads
+        profile: Perfil de PRAGMAs aplicado à conexão
+        cached_statements: Quantidade de statements preparados mantidos
+            pela conexão (reaproveitados enquanto ela estiver no pool)
+        read_only: Abre o arquivo com a URI file:...?mode=ro (o arquivo
+            precisa existir). Alvos que já são URI (ex.: bancos em memória)
+            são abertos como estão e ficam só com PRAGMA query_only
+        
+    Returns:
+        sqlite3.Connection: Nova conexão com row_factory = sqlite3.Row
+    """
+    uri = db_path.startswith('file:')
+    if uri or db_path == ':memory:':
+        alvo = db_path
+    elif read_only:
+        alvo = 'file:' + urllib.request.pathname2url(os.path.abspath(db_path)) + '?mode=ro'
+        uri = True
+    else:
+        _ensure_database_dir(db_path)
+        alvo = db_path
+    
+    conn = sqlite3.connect(alvo, check_same_thread=check_same_thread,
+                           cached_statements=cached_statements, uri=uri)
+    try:
+        apply_pragmas(conn, profile, read_only=read_only)
+    except (sqlite3.Error, ValueError):
+        conn.close()
+        raise
+    
+    # Configura para retornar resultados como Row (permite acesso por nome da coluna)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def get_connection(profile: str = DEFAULT_PROFILE,
+                   read_only: bool = False) -> sqlite3.Connection:
     """
     Estabelece conexão com o banco de dados SQLite.
     
+    Retorna uma conexão avulsa, fora do pool, para o banco configurado
+    (ver configure_database). Deve ser fechada com close_connection()
+    pelo chamador.
+    
+    Args:
+        profile: Perfil de PRAGMAs (ver PRAGMA_PROFILES)
+        read_only: Abre o banco em modo somente leitura (mode=ro)
+        
     Returns:
         sqlite3.Connection: Objeto de conexão com o banco de dados
         
@@ -24,24 +230,14 @@ def get_connection() -> sqlite3.Connection:
         sqlite3.Error: Erro ao conectar com o banco de dados
     """
     try:
-        # Caminho relativo para o arquivo do banco
-        db_path = os.path.join('database', 'db.sqlite')
-        
-        # Verifica se o diretório existe
-        if not os.path.exists('database'):
-            os.makedirs('database')
-        
         # Estabelece conexão com o banco
-        conn = sqlite3.connect(db_path)
-        
-        # Configura para retornar resultados como Row (permite acesso por nome da coluna)
-        conn.row_factory = sqlite3.Row
+        conn = open_connection(_db_target, profile=profile, read_only=read_only)
         
-        print(f"✅ Conexão estabelecida com sucesso: {db_path}")
+        logger.debug("✅ Conexão estabelecida com sucesso: %s", _db_target)
         return conn
         
     except sqlite3.Error as e:
-        print(f"❌ Erro ao conectar com o banco de dados: {e}")
+        logger.error("❌ Erro ao conectar com o banco de dados: %s", e)
         raise
 
 
@@ -55,15 +251,1374 @@ def close_connection(conn: sqlite3.Connection) -> None:
     try:
         if conn:
             conn.close()
-            print("✅ Conexão fechada com sucesso")
+            logger.debug("✅ Conexão fechada com sucesso")
     except sqlite3.Error as e:
-        print(f"❌ Erro ao fechar conexão: {e}")
+        logger.error("❌ Erro ao fechar conexão: %s", e)
+
+
+# ========================================================================================
+# POOL DE CONEXÕES
+# ========================================================================================
+
+# Observador da thread atual, avisado quando ela obtém ou devolve uma conexão
+# de qualquer pool (ver track_connections)
+_rastreio = threading.local()
+
+
+@contextmanager
+def track_connections(observador: Any) -> Iterator[Any]:
+    """
+    Avisa `observador` das conexões de pool obtidas e devolvidas pela thread.
+    
+    observador.connection_acquired(conn) é chamado quando a thread obtém uma
+    conexão de um pool (não nas obtenções aninhadas da mesma conexão); se
+    levantar uma exceção, a conexão é devolvida e a exceção propagada.
+    observador.connection_released(conn) é chamado ao devolvê-la.
+    
+    Args:
+        observador: Objeto com os métodos connection_acquired e connection_released
+        
+    Yields:
+        Any: O próprio observador
+    """
+    anterior = getattr(_rastreio, 'observador', None)
+    _rastreio.observador = observador
+    try:
+        yield observador
+    finally:
+        _rastreio.observador = anterior
+
+
+class ConnectionPool:
+    """
+    Pool de conexões SQLite persistentes.
+    
+    Cada thread reutiliza a mesma conexão enquanto a mantém em uso
+    (chamadas aninhadas recebem a mesma conexão). Ao ser liberada, a
+    conexão volta para a lista de ociosas e é reaproveitada pela próxima
+    requisição, de qualquer thread.
+    
+    Exemplo:
+        >>> pool = ConnectionPool(max_size=3)
+        >>> with pool.connection() as conn:
+        ...     conn.execute("SELECT 1")
+        >>> print(pool.stats())
+    """
+    
+    def __init__(self, db_path: Optional[str] = None, max_size: int = 5,
+                 timeout: float = 5.0, health_check_interval: float = 30.0,
+                 profile: str = DEFAULT_PROFILE,
+                 cached_statements: int = DEFAULT_CACHED_STATEMENTS,
+                 read_only: bool = False):
+        """
+        Inicializa o pool (nenhuma conexão é aberta antecipadamente).
+        
+        Args:
+            db_path: Caminho do banco (padrão: o de configure_database)
+            max_size: Número máximo de conexões abertas simultaneamente
+            timeout: Segundos de espera por uma conexão livre
+            health_check_interval: Conexões ociosas há mais tempo que isso
+                (em segundos) são testadas com SELECT 1 antes do reuso
+            profile: Perfil de PRAGMAs aplicado a cada conexão do pool
+            cached_statements: Statements preparados mantidos por conexão
+            read_only: Abre as conexões em modo somente leitura (mode=ro)
+        """
+        if max_size < 1:
+            raise ValueError("max_size deve ser pelo menos 1")
+        if profile not in PRAGMA_PROFILES:
+            raise ValueError(f"Perfil de PRAGMA desconhecido: {profile!r}")
+        
+        self.db_path = db_path if db_path is not None else _db_target
+        self.profile = profile
+        self.cached_statements = cached_statements
+        self.read_only = read_only
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        
+        self._cond = threading.Condition()
+        self._idle: List[Tuple[sqlite3.Connection, float]] = []
+        self._local = threading.local()
+        self._total = 0
+        self._closed = False
+        self._stats = {
+            'created': 0,
+            'reused': 0,
+            'discarded': 0,
+            'waits': 0,
+            'health_checks': 0,
+        }
+    
+    def _is_healthy(self, conn: sqlite3.Connection) -> bool:
+        """
+        Verifica se uma conexão ociosa ainda responde.
+        
+        Args:
+            conn: Conexão a ser testada
+            
+        Returns:
+            bool: True se a conexão está utilizável
+        """
+        self._stats['health_checks'] += 1
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+    
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        """
+        Fecha e descarta uma conexão do pool. Chamar com self._cond adquirido.
+        """
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        self._total -= 1
+        self._stats['discarded'] += 1
+        self._cond.notify()
+    
+    def acquire(self) -> sqlite3.Connection:
+        """
+        Obtém uma conexão do pool.
+        
+        Se a thread atual já possui uma conexão em uso, a mesma é retornada.
+        
+        Returns:
+            sqlite3.Connection: Conexão pronta para uso
+            
+        Raises:
+            PoolTimeoutError: Se nenhuma conexão ficar livre dentro do timeout
+            sqlite3.Error: Se o pool estiver fechado ou a conexão falhar
+        """
+        atual = getattr(self._local, 'conn', None)
+        if atual is not None:
+            self._local.depth += 1
+            return atual
+        
+        limite = time.monotonic() + self.timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise sqlite3.ProgrammingError("Pool de conexões fechado")
+                
+                if self._idle:
+                    conn, liberada_em = self._idle.pop()
+                    if (time.monotonic() - liberada_em >= self.health_check_interval
+                            and not self._is_healthy(conn)):
+                        self._discard(conn)
+                        continue
+                    self._stats['reused'] += 1
+                    break
+                
+                if self._total < self.max_size:
+                    # Reserva a vaga antes de abrir fora do lock
+                    self._total += 1
+                    conn = None
+                    break
+                
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    raise PoolTimeoutError(
+                        f"Nenhuma conexão livre após {self.timeout}s "
+                        f"(max_size={self.max_size})"
+                    )
+                self._stats['waits'] += 1
+                self._cond.wait(restante)
+        
+        if conn is None:
+            try:
+                conn = open_connection(self.db_path, check_same_thread=False,
+                                        profile=self.profile,
+                                        cached_statements=self.cached_statements,
+                                        read_only=self.read_only)
+            except sqlite3.Error:
+                with self._cond:
+                    self._total -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._stats['created'] += 1
+        
+        self._local.conn = conn
+        self._local.depth = 1
+        
+        observador = getattr(_rastreio, 'observador', None)
+        if observador is not None:
+            try:
+                observador.connection_acquired(conn)
+            except BaseException:
+                self.release(conn)
+                raise
+        return conn
+    
+    def release(self, conn: sqlite3.Connection) -> None:
+        """
+        Devolve ao pool uma conexão obtida com acquire().
+        
+        Args:
+            conn: Conexão a ser devolvida
+        """
+        if getattr(self._local, 'conn', None) is not conn:
+            raise sqlite3.ProgrammingError("Conexão não pertence a esta thread")
+        
+        self._local.depth -= 1
+        if self._local.depth > 0:
+            return
+        
+        self._local.conn = None
+        
+        observador = getattr(_rastreio, 'observador', None)
+        if observador is not None:
+            observador.connection_released(conn)
+        
+        # Não devolve transações pendentes para outro usuário da conexão
+        if conn.in_transaction:
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                pass
+        
+        with self._cond:
+            if self._closed:
+                self._discard(conn)
+                return
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+    
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Context manager que obtém e devolve uma conexão do pool.
+        
+        Yields:
+            sqlite3.Connection: Conexão do pool
+        """
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Retorna os contadores do pool.
+        
+        Returns:
+            Dict[str, int]: created (conexões abertas), reused (reaproveitadas),
+            discarded, waits, health_checks, in_use e idle
+        """
+        with self._cond:
+            resultado = dict(self._stats)
+            resultado['idle'] = len(self._idle)
+            resultado['in_use'] = self._total - len(self._idle)
+            return resultado
+    
+    def close(self) -> None:
+        """
+        Fecha todas as conexões ociosas e impede novas aquisições.
+        
+        Conexões ainda em uso são fechadas quando forem devolvidas.
+        """
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.pop()
+                self._discard(conn)
+            self._cond.notify_all()
+
+
+_pool: Optional[ConnectionPool] = None
+_read_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+# SELECTs fora de transaction() vão para o pool somente leitura
+_route_reads = True
+
+
+def configure_pool(max_size: int = 5, timeout: float = 5.0,
+                   health_check_interval: float = 30.0,
+                   db_path: Optional[str] = None,
+                   profile: str = DEFAULT_PROFILE,
+                   cached_statements: int = DEFAULT_CACHED_STATEMENTS) -> ConnectionPool:
+    """
+    (Re)configura o pool global usado por execute_query e execute_many.
+    
+    O pool anterior, se existir, é fechado.
+    
+    Args:
+        max_size: Número máximo de conexões simultâneas
+        timeout: Segundos de espera por uma conexão livre
+        health_check_interval: Intervalo para testar conexões ociosas
+        db_path: Caminho do banco (padrão: o de configure_database)
+        profile: Perfil de PRAGMAs das conexões do pool
+        cached_statements: Statements preparados mantidos por conexão
+        
+    Returns:
+        ConnectionPool: O novo pool global
+    """
+    global _pool
+    novo = ConnectionPool(
+        db_path, max_size=max_size, timeout=timeout,
+        health_check_interval=health_check_interval, profile=profile,
+        cached_statements=cached_statements,
+    )
+    with _pool_lock:
+        antigo, _pool = _pool, novo
+    if antigo is not None:
+        antigo.close()
+    return novo
+
+
+def get_pool() -> ConnectionPool:
+    """
+    Retorna o pool global, criando-o com a configuração padrão se necessário.
+    
+    Returns:
+        ConnectionPool: Pool global de conexões
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+    return _pool
+
+
+def get_pool_stats() -> Dict[str, int]:
+    """
+    Retorna os contadores do pool global (reuso x novas conexões).
+    
+    Returns:
+        Dict[str, int]: Contadores do pool, ou dicionário vazio se não criado
+    """
+    return _pool.stats() if _pool is not None else {}
+
+
+def configure_read_pool(max_size: int = 5, timeout: float = 5.0,
+                        health_check_interval: float = 30.0,
+                        db_path: Optional[str] = None,
+                        profile: str = READ_ONLY_PROFILE,
+                        cached_statements: int = DEFAULT_CACHED_STATEMENTS,
+                        route_reads: bool = True) -> ConnectionPool:
+    """
+    (Re)configura o pool somente leitura usado pelos SELECTs.
+    
+    As conexões são abertas com file:...?mode=ro e PRAGMA query_only, em
+    um pool separado: relatórios longos não ocupam as conexões usadas
+    pelas gravações.
+    
+    Args:
+        max_size: Número máximo de conexões de leitura simultâneas
+        timeout: Segundos de espera por uma conexão livre
+        health_check_interval: Intervalo para testar conexões ociosas
+        db_path: Caminho do banco (padrão: o de configure_database)
+        profile: Perfil de PRAGMAs das conexões de leitura
+        cached_statements: Statements preparados mantidos por conexão
+        route_reads: Se False, execute_query e iter_query deixam de
+            enviar SELECTs para este pool
+        
+    Returns:
+        ConnectionPool: O novo pool somente leitura
+    """
+    global _read_pool, _route_reads
+    novo = ConnectionPool(
+        db_path, max_size=max_size, timeout=timeout,
+        health_check_interval=health_check_interval, profile=profile,
+        cached_statements=cached_statements, read_only=True,
+    )
+    with _pool_lock:
+        antigo, _read_pool = _read_pool, novo
+        _route_reads = route_reads
+    if antigo is not None:
+        antigo.close()
+    return novo
+
+
+def get_read_pool() -> ConnectionPool:
+    """
+    Retorna o pool somente leitura, criando-o se necessário.
+    
+    Returns:
+        ConnectionPool: Pool de conexões somente leitura
+    """
+    global _read_pool
+    if _read_pool is None:
+        with _pool_lock:
+            if _read_pool is None:
+                _read_pool = ConnectionPool(profile=READ_ONLY_PROFILE, read_only=True)
+    return _read_pool
+
+
+def get_read_pool_stats() -> Dict[str, int]:
+    """
+    Retorna os contadores do pool somente leitura.
+    
+    Returns:
+        Dict[str, int]: Contadores do pool, ou dicionário vazio se não criado
+    """
+    return _read_pool.stats() if _read_pool is not None else {}
+
+
+def _pool_for(kind: str) -> ConnectionPool:
+    """
+    Escolhe o pool para um comando: SELECTs fora de transação vão para o
+    pool somente leitura; todo o resto usa o pool principal.
+    
+    Em bancos em memória (cache compartilhado) não há WAL: leitores e
+    escritores se bloqueiam por tabela, então tudo usa o pool principal.
+    """
+    if kind == 'read' and _route_reads and _memory_keeper is None and not in_transaction():
+        return get_read_pool()
+    return get_pool()
+
+
+def close_pool() -> None:
+    """
+    Fecha os pools globais e registra as estatísticas de uso.
+    
+    Registrada com atexit, é chamada automaticamente no encerramento.
+    """
+    global _pool, _read_pool
+    with _pool_lock:
+        pools = [('escrita', _pool), ('leitura', _read_pool)]
+        _pool = _read_pool = None
+    
+    for nome, pool in pools:
+        if pool is None:
+            continue
+        stats = pool.stats()
+        pool.close()
+        logger.info(
+            "🔌 Pool de conexões (%s) encerrado. Novas: %s, reutilizadas: %s, descartadas: %s",
+            nome, stats['created'], stats['reused'], stats['discarded']
+        )
+
+
+atexit.register(close_pool)
+
+
+# ========================================================================================
+# ALVO DO BANCO (ARQUIVO OU MEMÓRIA)
+# ========================================================================================
+
+def is_memory_target(target: str) -> bool:
+    """
+    Indica se o alvo é um banco em memória.
+    
+    Args:
+        target: Caminho ou URI do banco
+        
+    Returns:
+        bool: True para ':memory:', 'file::memory:...' e URIs com mode=memory
+    """
+    return (target == ':memory:' or target.startswith('file::memory:')
+            or (target.startswith('file:') and 'mode=memory' in target))
+
+
+def get_database_target() -> str:
+    """
+    Retorna o banco em uso (caminho do arquivo ou URI).
+    
+    Returns:
+        str: Alvo configurado por configure_database
+    """
+    return _db_target
+
+
+def configure_database(target: str = DB_PATH) -> str:
+    """
+    Troca o banco usado por get_connection, pelos pools e pela fila de
+    gravação.
+    
+    Aceita:
+    - um caminho de arquivo (padrão: database/db.sqlite)
+    - ':memory:': um banco em memória novo e exclusivo, compartilhado por
+      todas as conexões do processo (vira file:grafica_mem_N?mode=memory&cache=shared)
+    - uma URI, ex.: 'file::memory:?cache=shared'
+    
+    Os pools atuais são fechados (recriados sob demanda), a fila de
+    gravação é reiniciada no novo banco e o cache de resultados é
+    descartado. Um banco em memória existe enquanto estiver configurado:
+    ao trocar de alvo, ele é descartado.
+    
+    Args:
+        target: Caminho ou URI do banco
+        
+    Returns:
+        str: Alvo efetivo (':memory:' é convertido em uma URI nomeada)
+        
+    Exemplo:
+        >>> configure_database(':memory:')
+        'file:grafica_mem_1?mode=memory&cache=shared'
+    """
+    global _db_target, _memory_keeper, _memory_count, _alvos_triggers
+    
+    if target == ':memory:':
+        # Um ':memory:' comum seria um banco diferente para cada conexão do pool
+        _memory_count += 1
+        target = f"file:grafica_mem_{_memory_count}?mode=memory&cache=shared"
+    
+    fila = _write_queue
+    if fila is not None:
+        fila.close()
+    close_pool()
+    
+    antigo, _memory_keeper = _memory_keeper, None
+    _db_target = target
+    if is_memory_target(target):
+        _memory_keeper = sqlite3.connect(target, uri=target.startswith('file:'),
+                                         check_same_thread=False)
+    if antigo is not None:
+        antigo.close()
+    
+    _alvos_triggers = None
+    invalidate_result_cache()
+    if fila is not None:
+        configure_write_queue(window_ms=fila.window * 1000.0, max_batch=fila.max_batch,
+                              durability=fila.durability)
+    
+    logger.debug("🗄️  Banco configurado: %s", target)
+    return target
+
+
+# ========================================================================================
+# CLASSIFICAÇÃO DE COMANDOS SQL
+# ========================================================================================
+
+class StatementInfo(NamedTuple):
+    """
+    Informações de um comando SQL, calculadas uma vez por texto de SQL.
+    
+    Attributes:
+        kind: 'read' (SELECT), 'write' (INSERT/UPDATE/DELETE) ou 'other'
+        normalized: SQL normalizado, chave das estatísticas de profiling
+        tables: Tabelas lidas ou gravadas pelo comando (minúsculas)
+    """
+    kind: str
+    normalized: str
+    tables: FrozenSet[str]
+
+
+def _classify_statement(query: str) -> StatementInfo:
+    """
+    Classifica um comando SQL pelo seu primeiro token.
+    """
+    comando = query.lstrip()[:6].upper()
+    if comando in ('INSERT', 'UPDATE', 'DELETE'):
+        kind = 'write'
+    elif comando == 'SELECT':
+        kind = 'read'
+    else:
+        kind = 'other'
+    return StatementInfo(kind, profiling.normalize_sql(query), extract_tables(query))
+
+
+get_statement_info = lru_cache(maxsize=DEFAULT_STATEMENT_CACHE_SIZE)(_classify_statement)
+
+
+def configure_statement_cache(maxsize: int = DEFAULT_STATEMENT_CACHE_SIZE) -> None:
+    """
+    Redimensiona o cache de classificação de comandos (zera as estatísticas).
+    
+    Args:
+        maxsize: Quantidade máxima de textos SQL distintos mantidos
+    """
+    global get_statement_info
+    get_statement_info = lru_cache(maxsize=maxsize)(_classify_statement)
+
+
+def get_statement_cache_stats() -> Dict[str, int]:
+    """
+    Retorna as estatísticas do cache de classificação de comandos.
+    
+    Returns:
+        Dict[str, int]: hits, misses, size (textos em cache) e maxsize
+    """
+    info = get_statement_info.cache_info()
+    return {
+        'hits': info.hits,
+        'misses': info.misses,
+        'size': info.currsize,
+        'maxsize': info.maxsize,
+    }
+
+
+# ========================================================================================
+# CACHE DE RESULTADOS
+# ========================================================================================
+
+# Desabilitado por padrão (ver configure_result_cache)
+_result_cache: Optional[ResultCache] = None
+
+# Tabela -> tabelas gravadas pelos seus triggers (None = recarregar)
+_alvos_triggers: Optional[Dict[str, FrozenSet[str]]] = None
+
+# Tabela ou view -> tabelas que ela lê; None no valor = não pode ir para o
+# cache (None no mapa = recarregar)
+_tabelas_base: Optional[Dict[str, Optional[FrozenSet[str]]]] = None
+
+
+def configure_result_cache(enabled: bool = True, max_entries: int = 256,
+                           max_rows: int = 50000, ttl: float = 30.0) -> Optional[ResultCache]:
+    """
+    Habilita (ou desabilita) o cache de resultados de SELECTs.
+    
+    Com o cache ativo, execute_query e iter_query devolvem o resultado
+    guardado para o mesmo SQL com os mesmos parâmetros, enquanto nenhuma
+    das tabelas lidas for alterada e o TTL não expirar. Dentro de
+    transaction() o cache não é usado. SELECTs sobre views são invalidados
+    pelas tabelas que a view lê; os que citam views temporárias, CTEs ou
+    bancos anexados não são guardados.
+    
+    Gravações de outros processos não invalidam o cache: use um TTL curto
+    quando houver várias estações no mesmo banco.
+    
+    Args:
+        enabled: False desliga e descarta o cache
+        max_entries: Quantidade máxima de resultados guardados
+        max_rows: Total máximo de linhas guardadas
+        ttl: Segundos de validade de cada resultado
+        
+    Returns:
+        Optional[ResultCache]: O novo cache, ou None se desabilitado
+    """
+    global _result_cache
+    _result_cache = ResultCache(max_entries, max_rows, ttl) if enabled else None
+    return _result_cache
+
+
+def get_result_cache_stats() -> Dict[str, float]:
+    """
+    Retorna as métricas do cache de resultados.
+    
+    Returns:
+        Dict[str, float]: hits, misses, hit_rate, entries, rows, evictions,
+        expired e invalidations, ou dicionário vazio se desabilitado
+    """
+    cache = _result_cache
+    return cache.stats() if cache is not None else {}
+
+
+def invalidate_result_cache(tables: Optional[Iterable[str]] = None) -> None:
+    """
+    Descarta resultados em cache após alterações feitas por fora de
+    execute_query/execute_many (ex.: conexão própria ou outro processo).
+    
+    Args:
+        tables: Tabelas alteradas; None descarta tudo, inclusive os mapas de
+            triggers e views (use após mudanças de estrutura, como as migrações)
+    """
+    global _alvos_triggers, _tabelas_base
+    if tables is None:
+        # Recarregados no próximo uso, mesmo com o cache desligado agora
+        _alvos_triggers = None
+        _tabelas_base = None
+    cache = _result_cache
+    if cache is None:
+        return
+    if tables is None or _alvos_triggers is None:
+        # Sem o mapa não se sabe o que os triggers dessas tabelas gravam
+        cache.clear()
+    else:
+        cache.invalidate(_com_triggers(None, frozenset(t.lower() for t in tables)))
+
+
+def _com_triggers(conn: Optional[sqlite3.Connection],
+                  tables: FrozenSet[str]) -> FrozenSet[str]:
+    """
+    Acrescenta às tabelas gravadas as que seus triggers também gravam.
+    
+    O mapa de triggers é lido de sqlite_master uma vez e recarregado
+    depois de comandos DDL.
+    """
+    global _alvos_triggers
+    if _alvos_triggers is None and conn is not None:
+        alvos: Dict[str, set] = {}
+        for tabela, sql in conn.execute(
+                "SELECT tbl_name, sql FROM sqlite_master WHERE type = 'trigger'"):
+            alvos.setdefault(tabela.lower(), set()).update(extract_tables(sql or ''))
+        _alvos_triggers = {t: frozenset(a) for t, a in alvos.items()}
+    if not _alvos_triggers:
+        return tables
+    
+    resultado = set(tables)
+    pendentes = list(tables)
+    while pendentes:
+        for alvo in _alvos_triggers.get(pendentes.pop(), ()):
+            if alvo not in resultado:
+                resultado.add(alvo)
+                pendentes.append(alvo)
+    return frozenset(resultado)
+
+
+def _tabelas_lidas(conn: sqlite3.Connection,
+                   tables: FrozenSet[str]) -> Optional[FrozenSet[str]]:
+    """
+    Troca as views citadas em um SELECT pelas tabelas que elas leem.
+    
+    O mapa de tabelas e views é lido de sqlite_master uma vez e recarregado
+    depois de comandos DDL. Nomes que não são tabela nem view do banco
+    principal (views temporárias, CTEs, bancos anexados) não têm gravações
+    rastreáveis: nesse caso retorna None e o resultado não vai para o cache.
+    """
+    global _tabelas_base
+    mapa = _tabelas_base
+    if mapa is None:
+        objetos = {nome.lower(): (tipo, sql) for tipo, nome, sql in conn.execute(
+            "SELECT type, name, sql FROM sqlite_master WHERE type IN ('table', 'view')")}
+        mapa = {}
+        
+        def resolver(nome: str, visitados: FrozenSet[str]) -> Optional[FrozenSet[str]]:
+            if nome in mapa:
+                return mapa[nome]
+            objeto = objetos.get(nome)
+            if objeto is None or nome in visitados:
+                return None
+            tipo, sql = objeto
+            if tipo == 'table':
+                return frozenset({nome})
+            bases = set()
+            for citada in extract_tables(sql or ''):
+                tabelas = resolver(citada, visitados | {nome})
+                if tabelas is None:
+                    return None
+                bases.update(tabelas)
+            return frozenset(bases)
+        
+        for nome in objetos:
+            mapa[nome] = resolver(nome, frozenset())
+        _tabelas_base = mapa
+    
+    resultado = set()
+    for tabela in tables:
+        bases = mapa.get(tabela)
+        if bases is None:
+            return None
+        resultado.update(bases)
+    return frozenset(resultado)
+
+
+def _invalidar_apos_gravacao(conn: sqlite3.Connection, info: StatementInfo) -> None:
+    """
+    Invalida o cache após um comando que não é SELECT. Dentro de
+    transaction(), as tabelas são acumuladas e invalidadas no commit.
+    """
+    global _alvos_triggers, _tabelas_base
+    cache = _result_cache
+    if cache is None:
+        return
+    
+    if info.kind != 'write':
+        # DDL, PRAGMA etc.: não dá para saber o que mudou
+        _alvos_triggers = None
+        _tabelas_base = None
+        cache.clear()
+        return
+    
+    tabelas = _com_triggers(conn, info.tables)
+    if in_transaction():
+        _transacao.tabelas.update(tabelas)
+    else:
+        cache.invalidate(tabelas)
+
+
+# ========================================================================================
+# CONCORRÊNCIA (SQLITE_BUSY)
+# ========================================================================================
+
+class DatabaseBusyError(sqlite3.OperationalError):
+    """
+    O banco continuou bloqueado por outra conexão após todas as tentativas.
+    """
+
+
+class RetryPolicy(NamedTuple):
+    """
+    Política de novas tentativas quando o banco está bloqueado.
+    
+    Cada tentativa já espera até busy_timeout (PRAGMA) dentro do SQLite;
+    entre tentativas, a espera cresce exponencialmente, com jitter para
+    que várias estações não tentem de novo no mesmo instante.
+    
+    Attributes:
+        max_attempts: Total de tentativas (1 = sem novas tentativas)
+        base_delay: Espera após a primeira falha, em segundos
+        max_delay: Espera máxima entre tentativas, em segundos
+        jitter: Fração aleatória descontada de cada espera (0 a 1)
+    """
+    max_attempts: int = 5
+    base_delay: float = 0.05
+    max_delay: float = 2.0
+    jitter: float = 0.5
+
+
+_retry_policy = RetryPolicy()
+_lock_stats_lock = threading.Lock()
+_lock_stats = {
+    'busy_errors': 0,
+    'retries': 0,
+    'recovered': 0,
+    'gave_up': 0,
+    'wait_seconds': 0.0,
+    'max_wait_seconds': 0.0,
+}
+
+
+def configure_retry(max_attempts: int = 5, base_delay: float = 0.05,
+                    max_delay: float = 2.0, jitter: float = 0.5,
+                    busy_timeout: Optional[int] = None) -> RetryPolicy:
+    """
+    Configura as novas tentativas de comandos que encontram o banco bloqueado.
+    
+    Fora de transaction(), cada execute_query/execute_many é sua própria
+    transação: uma falha por bloqueio é desfeita por inteiro antes da nova
+    tentativa, então repetir é seguro. Dentro de transaction() só o BEGIN
+    é repetido; um bloqueio no meio do bloco é propagado, pois as leituras
+    anteriores podem estar desatualizadas.
+    
+    Args:
+        max_attempts: Total de tentativas (1 = sem novas tentativas)
+        base_delay: Espera após a primeira falha, em segundos
+        max_delay: Espera máxima entre tentativas, em segundos
+        jitter: Fração aleatória descontada de cada espera (0 a 1)
+        busy_timeout: Se informado, substitui o PRAGMA busy_timeout (ms)
+            de todos os perfis; vale para conexões novas (ver configure_pool)
+        
+    Returns:
+        RetryPolicy: A política em vigor
+    """
+    global _retry_policy, _busy_timeout
+    if max_attempts < 1:
+        raise ValueError("max_attempts deve ser pelo menos 1")
+    if not 0 <= jitter <= 1:
+        raise ValueError("jitter deve estar entre 0 e 1")
+    if busy_timeout is not None and busy_timeout < 0:
+        raise ValueError("busy_timeout não pode ser negativo")
+    
+    if busy_timeout is not None:
+        _busy_timeout = int(busy_timeout)
+    _retry_policy = RetryPolicy(max_attempts, base_delay, max_delay, jitter)
+    return _retry_policy
+
+
+def get_lock_stats() -> Dict[str, float]:
+    """
+    Retorna as métricas de espera por bloqueio do banco.
+    
+    Returns:
+        Dict[str, float]: busy_errors (falhas por bloqueio), retries,
+        recovered (comandos que passaram após repetir), gave_up,
+        wait_seconds (tempo total perdido com bloqueios) e max_wait_seconds
+    """
+    with _lock_stats_lock:
+        return dict(_lock_stats)
+
+
+def _is_busy(e: sqlite3.Error) -> bool:
+    """
+    Indica se o erro é SQLITE_BUSY/SQLITE_LOCKED (banco bloqueado).
+    """
+    if not isinstance(e, sqlite3.OperationalError) or isinstance(e, PoolTimeoutError):
+        return False
+    codigo = getattr(e, 'sqlite_errorcode', None)
+    if codigo is not None:
+        # Códigos estendidos (ex.: SQLITE_BUSY_SNAPSHOT) preservam o byte baixo
+        return codigo & 0xff in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+    return 'locked' in str(e).lower()
+
+
+def with_retry(operacao: Callable[[], Any],
+               conn: Optional[sqlite3.Connection] = None) -> Any:
+    """
+    Executa operacao() repetindo-a, conforme a política, se o banco
+    estiver bloqueado. Antes de cada nova tentativa, a transação pendente
+    de conn (se houver) é desfeita.
+    
+    Usada também por quem controla a própria conexão (ex.: BEGIN IMMEDIATE
+    das migrações e do arquivamento), fora de execute_query.
+    
+    Args:
+        operacao: Função sem argumentos a executar
+        conn: Conexão cuja transação é desfeita entre as tentativas
+        
+    Returns:
+        Any: Retorno de operacao()
+        
+    Raises:
+        DatabaseBusyError: Se todas as tentativas encontrarem o banco bloqueado
+    """
+    politica = _retry_policy
+    inicio = time.perf_counter()
+    for tentativa in range(1, politica.max_attempts + 1):
+        try:
+            resultado = operacao()
+        except sqlite3.OperationalError as e:
+            if not _is_busy(e):
+                raise
+            if conn is not None and conn.in_transaction:
+                conn.rollback()
+            
+            with _lock_stats_lock:
+                _lock_stats['busy_errors'] += 1
+                if tentativa == politica.max_attempts:
+                    _lock_stats['gave_up'] += 1
+                    _registrar_espera(time.perf_counter() - inicio)
+            if tentativa == politica.max_attempts:
+                raise DatabaseBusyError(
+                    f"Banco de dados ocupado após {tentativa} tentativas: {e}"
+                ) from e
+            
+            atraso = min(politica.max_delay, politica.base_delay * 2 ** (tentativa - 1))
+            atraso *= 1 - politica.jitter * random.random()
+            logger.debug("🔒 Banco bloqueado (tentativa %s/%s), nova tentativa em %.3fs",
+                         tentativa, politica.max_attempts, atraso)
+            with _lock_stats_lock:
+                _lock_stats['retries'] += 1
+            time.sleep(atraso)
+            continue
+        
+        if tentativa > 1:
+            with _lock_stats_lock:
+                _lock_stats['recovered'] += 1
+                _registrar_espera(time.perf_counter() - inicio)
+        return resultado
+
+
+def _registrar_espera(segundos: float) -> None:
+    """
+    Acumula o tempo perdido com bloqueio. Chamar com _lock_stats_lock adquirido.
+    """
+    _lock_stats['wait_seconds'] += segundos
+    _lock_stats['max_wait_seconds'] = max(_lock_stats['max_wait_seconds'], segundos)
+
+
+def _retry_busy(conn: sqlite3.Connection, operacao: Callable[[], Any]) -> Any:
+    """
+    Repete operacao() em caso de bloqueio, exceto dentro de transaction().
+    """
+    if in_transaction():
+        return operacao()
+    return with_retry(operacao, conn)
+
+
+# ========================================================================================
+# TRANSAÇÕES
+# ========================================================================================
+
+# Profundidade de transaction() aninhados, por thread
+_transacao = threading.local()
+
+
+def in_transaction() -> bool:
+    """
+    Indica se a thread atual está dentro de um bloco transaction().
+    
+    Returns:
+        bool: True se houver transação aberta por transaction()
+    """
+    return getattr(_transacao, 'depth', 0) > 0
+
+
+@contextmanager
+def transaction(immediate: bool = False) -> Iterator[sqlite3.Connection]:
+    """
+    Agrupa várias chamadas a execute_query/execute_many em uma transação.
+    
+    Todas as consultas feitas dentro do bloco, na mesma thread, usam a
+    mesma conexão do pool e são gravadas com um único commit ao final.
+    Se uma exceção escapar do bloco, tudo é desfeito. Blocos aninhados
+    viram SAVEPOINTs: um erro no bloco interno desfaz apenas o que foi
+    feito nele.
+    
+    Args:
+        immediate: Usa BEGIN IMMEDIATE, reservando a escrita já no início.
+            Recomendado para operações que leem e depois escrevem
+            (ex.: verificar email e inserir usuário)
+        
+    Yields:
+        sqlite3.Connection: Conexão da transação
+        
+    Exemplo:
+        >>> with transaction(immediate=True):
+        ...     if not execute_query("SELECT id FROM usuarios WHERE id = ?", (1,)):
+        ...         raise ValueError("Usuário não encontrado")
+        ...     execute_query("DELETE FROM usuarios WHERE id = ?", (1,))
+    """
+    with get_pool().connection() as conn:
+        depth = getattr(_transacao, 'depth', 0)
+        savepoint = f"sp_{depth}"
+        
+        if depth == 0:
+            with_retry(lambda: conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN"), conn)
+            # Tabelas gravadas na transação, invalidadas no cache após o commit
+            _transacao.tabelas = set()
+        else:
+            conn.execute(f"SAVEPOINT {savepoint}")
+        _transacao.depth = depth + 1
+        
+        try:
+            yield conn
+        except BaseException:
+            _transacao.depth = depth
+            if depth == 0:
+                conn.rollback()
+            else:
+                conn.execute(f"ROLLBACK TO {savepoint}")
+                conn.execute(f"RELEASE {savepoint}")
+            logger.debug("↩️  Transação desfeita (nível %s)", depth)
+            raise
+        
+        _transacao.depth = depth
+        try:
+            if depth == 0:
+                conn.commit()
+            else:
+                conn.execute(f"RELEASE {savepoint}")
+        except sqlite3.Error:
+            if depth == 0:
+                conn.rollback()
+            raise
+        
+        cache = _result_cache
+        if depth == 0 and cache is not None and _transacao.tabelas:
+            cache.invalidate(_transacao.tabelas)
+
+
+# ========================================================================================
+# FILA DE GRAVAÇÃO (GROUP COMMIT)
+# ========================================================================================
+
+# Modos de durabilidade da fila de gravação:
+# - 'full': commit com PRAGMA synchronous=FULL; resolve após o commit
+# - 'normal': commit com o synchronous do perfil; resolve após o commit
+# - 'deferred': resolve assim que o comando executa, antes do commit do
+#   grupo (mais rápido; uma falha no commit só aparece no log)
+DURABILITY_MODES = ('full', 'normal', 'deferred')
+
+
+class _Gravacao(NamedTuple):
+    query: str
+    params: Optional[Tuple]
+    info: StatementInfo
+    future: Future
+
+
+class WriteQueue:
+    """
+    Fila de gravações com uma única thread escritora (group commit).
+    
+    Comandos INSERT/UPDATE/DELETE que chegam dentro de uma janela curta
+    (window_ms) são executados em uma única transação, com um só commit.
+    Cada comando roda em um SAVEPOINT próprio: um erro desfaz apenas
+    aquele comando e é entregue só ao seu chamador, pelo Future.
+    
+    Exemplo:
+        >>> fila = WriteQueue(window_ms=5)
+        >>> futuro = fila.submit("UPDATE materiais SET estoque_atual = 0 WHERE id = ?", (1,))
+        >>> futuro.result()   # linhas afetadas
+        1
+    """
+    
+    def __init__(self, db_path: Optional[str] = None, window_ms: float = 5.0,
+                 max_batch: int = 200, durability: str = 'normal',
+                 profile: str = DEFAULT_PROFILE):
+        """
+        Inicializa a fila e inicia a thread escritora.
+        
+        Args:
+            db_path: Caminho do banco (padrão: o de configure_database)
+            window_ms: Tempo máximo de espera por mais comandos para o grupo
+            max_batch: Quantidade máxima de comandos por transação
+            durability: 'full', 'normal' ou 'deferred' (ver DURABILITY_MODES)
+            profile: Perfil de PRAGMAs da conexão da thread escritora
+        """
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Durabilidade desconhecida: {durability!r}. Use: {', '.join(DURABILITY_MODES)}")
+        if max_batch < 1:
+            raise ValueError("max_batch deve ser pelo menos 1")
+        
+        self.db_path = db_path if db_path is not None else _db_target
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self.durability = durability
+        self.profile = profile
+        
+        self._fila: 'queue.Queue[Optional[_Gravacao]]' = queue.Queue()
+        self._closed = False
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'statements': 0,
+            'batches': 0,
+            'errors': 0,
+            'commit_errors': 0,
+            'max_batch': 0,
+        }
+        self._thread = threading.Thread(target=self._run, name='grafica-writer', daemon=True)
+        self._thread.start()
+    
+    def submit(self, query: str, params: Optional[Tuple] = None) -> Future:
+        """
+        Enfileira um comando de escrita.
+        
+        Args:
+            query: Comando INSERT/UPDATE/DELETE
+            params: Parâmetros para o comando SQL (opcional)
+            
+        Returns:
+            Future: Resolve com o número de linhas afetadas, ou com o erro
+            
+        Raises:
+            sqlite3.ProgrammingError: Se a fila já foi encerrada
+        """
+        if self._closed:
+            raise sqlite3.ProgrammingError("Fila de gravação encerrada")
+        futuro: Future = Future()
+        self._fila.put(_Gravacao(query, params, get_statement_info(query), futuro))
+        return futuro
+    
+    def _proximo_grupo(self, primeiro: _Gravacao) -> Tuple[List[_Gravacao], bool]:
+        """
+        Junta ao primeiro comando os que chegarem dentro da janela.
+        
+        Returns:
+            Tuple: (grupo, True se a fila recebeu o sinal de encerramento)
+        """
+        grupo = [primeiro]
+        limite = time.monotonic() + self.window
+        while len(grupo) < self.max_batch:
+            restante = limite - time.monotonic()
+            try:
+                item = self._fila.get(timeout=restante) if restante > 0 else self._fila.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return grupo, True
+            grupo.append(item)
+        return grupo, False
+    
+    def _executar_grupo(self, conn: sqlite3.Connection, grupo: List[_Gravacao]) -> None:
+        """
+        Executa um grupo de comandos em uma transação, com um commit.
+        """
+        adiada = self.durability == 'deferred'
+        resultados: List[Tuple[Future, Any]] = []
+        executados: List[_Gravacao] = []
+        
+        try:
+            with_retry(lambda: conn.execute("BEGIN IMMEDIATE"), conn)
+        except sqlite3.Error as e:
+            for item in grupo:
+                item.future.set_exception(e)
+            self._contar(len(grupo), erros=len(grupo))
+            return
+        
+        erros = 0
+        for item in grupo:
+            inicio = time.perf_counter()
+            conn.execute("SAVEPOINT grupo")
+            try:
+                cursor = conn.execute(item.query, item.params or ())
+            except sqlite3.Error as e:
+                conn.execute("ROLLBACK TO grupo")
+                conn.execute("RELEASE grupo")
+                erros += 1
+                item.future.set_exception(e)
+                continue
+            conn.execute("RELEASE grupo")
+            executados.append(item)
+            if profiling.active:
+                profiling.record_query(conn, item.info.normalized, item.query, None,
+                                       time.perf_counter() - inicio, explain=False)
+            if adiada:
+                item.future.set_result(cursor.rowcount)
+            else:
+                resultados.append((item.future, cursor.rowcount))
+        
+        try:
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            try:
+                conn.execute("ROLLBACK")
+            except sqlite3.Error:
+                pass
+            logger.error("❌ Falha no commit do grupo de %s gravações: %s", len(executados), e)
+            for futuro, _ in resultados:
+                futuro.set_exception(e)
+            self._contar(len(grupo), erros=erros + len(resultados), falha_commit=True)
+            return
+        
+        for item in executados:
+            _invalidar_apos_gravacao(conn, item.info)
+        for futuro, rowcount in resultados:
+            futuro.set_result(rowcount)
+        self._contar(len(grupo), erros=erros)
+    
+    def _contar(self, tamanho: int, erros: int = 0, falha_commit: bool = False) -> None:
+        with self._stats_lock:
+            self._stats['statements'] += tamanho
+            self._stats['batches'] += 1
+            self._stats['errors'] += erros
+            self._stats['commit_errors'] += int(falha_commit)
+            self._stats['max_batch'] = max(self._stats['max_batch'], tamanho)
+    
+    def _run(self) -> None:
+        """
+        Laço da thread escritora.
+        """
+        conn = open_connection(self.db_path, profile=self.profile)
+        # Transações controladas manualmente (BEGIN IMMEDIATE/COMMIT)
+        conn.isolation_level = None
+        if self.durability == 'full':
+            conn.execute("PRAGMA synchronous=FULL")
+        try:
+            encerrar = False
+            while not encerrar:
+                primeiro = self._fila.get()
+                if primeiro is None:
+                    break
+                grupo, encerrar = self._proximo_grupo(primeiro)
+                try:
+                    self._executar_grupo(conn, grupo)
+                except Exception as e:
+                    # Nenhum chamador pode ficar esperando para sempre
+                    logger.error("❌ Erro inesperado na thread escritora: %s", e)
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                    for item in grupo:
+                        if not item.future.done():
+                            item.future.set_exception(e)
+        finally:
+            conn.close()
+    
+    def stats(self) -> Dict[str, float]:
+        """
+        Retorna os contadores da fila.
+        
+        Returns:
+            Dict[str, float]: statements, batches, errors, commit_errors,
+            max_batch, avg_batch (comandos por commit) e pending
+        """
+        with self._stats_lock:
+            resultado = dict(self._stats)
+        resultado['avg_batch'] = (resultado['statements'] / resultado['batches']
+                                  if resultado['batches'] else 0.0)
+        resultado['pending'] = self._fila.qsize()
+        return resultado
+    
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Grava os comandos já enfileirados e encerra a thread escritora.
+        
+        Args:
+            timeout: Segundos de espera pela thread (None = sem limite)
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._fila.put(None)
+        self._thread.join(timeout)
+
+
+_write_queue: Optional[WriteQueue] = None
+
+
+def configure_write_queue(enabled: bool = True, window_ms: float = 5.0,
+                          max_batch: int = 200,
+                          durability: str = 'normal') -> Optional[WriteQueue]:
+    """
+    Habilita (ou desabilita) a fila de gravação com group commit.
+    
+    Com a fila ativa, INSERT/UPDATE/DELETE feitos por execute_query fora
+    de transaction() são enviados à thread escritora; a chamada continua
+    bloqueante e retorna quando o comando for gravado (ou executado, em
+    'deferred'). Dentro de transaction() a fila não é usada. Use
+    submit_write para enfileirar sem esperar.
+    
+    Deve ser chamada depois de configure_pool: a thread escritora usa o
+    mesmo arquivo e perfil do pool principal.
+    
+    Args:
+        enabled: False encerra a fila (gravando o que estiver pendente)
+        window_ms: Tempo máximo de espera por mais comandos para o grupo
+        max_batch: Quantidade máxima de comandos por transação
+        durability: 'full', 'normal' ou 'deferred' (ver DURABILITY_MODES)
+        
+    Returns:
+        Optional[WriteQueue]: A nova fila, ou None se desabilitada
+    """
+    global _write_queue
+    nova = None
+    if enabled:
+        pool = get_pool()
+        nova = WriteQueue(pool.db_path, window_ms=window_ms, max_batch=max_batch,
+                          durability=durability, profile=pool.profile)
+    antiga, _write_queue = _write_queue, nova
+    if antiga is not None:
+        antiga.close()
+    return nova
+
+
+def submit_write(query: str, params: Optional[Tuple] = None) -> Future:
+    """
+    Enfileira um INSERT/UPDATE/DELETE sem esperar pela gravação.
+    
+    Args:
+        query: Comando de escrita
+        params: Parâmetros para o comando SQL (opcional)
+        
+    Returns:
+        Future: Resolve com o número de linhas afetadas, ou com o erro
+        
+    Raises:
+        sqlite3.ProgrammingError: Se a fila não estiver habilitada
+    """
+    fila = _write_queue
+    if fila is None:
+        raise sqlite3.ProgrammingError("Fila de gravação não habilitada (use configure_write_queue)")
+    return fila.submit(query, params)
+
+
+def get_write_queue_stats() -> Dict[str, float]:
+    """
+    Retorna os contadores da fila de gravação.
+    
+    Returns:
+        Dict[str, float]: Contadores da fila, ou dicionário vazio se desabilitada
+    """
+    fila = _write_queue
+    return fila.stats() if fila is not None else {}
+
+
+def close_write_queue() -> None:
+    """
+    Grava o que estiver pendente e encerra a fila. Registrada com atexit.
+    """
+    configure_write_queue(enabled=False)
+
+
+atexit.register(close_write_queue)
 
 
 def execute_query(query: str, params: Optional[Tuple] = None) -> Optional[List[sqlite3.Row]]:
     """
     Executa uma consulta SQL no banco de dados.
     
+    A conexão é obtida do pool global e devolvida ao final, sem ser fechada.
+    SELECTs usam o pool somente leitura (get_read_pool). Dentro de um bloco
+    transaction(), usa a conexão da transação e deixa o commit para o final
+    do bloco.
+    
+    Com o cache de resultados ativo (configure_result_cache), SELECTs
+    repetidos fora de transação são respondidos pelo cache, e os demais
+    comandos invalidam as tabelas que alteram.
+    
+    Com a fila de gravação ativa (configure_write_queue), INSERT/UPDATE/
+    DELETE fora de transação são gravados pela thread escritora, em grupo.
+    
+    Se o banco estiver bloqueado por outra conexão, o comando é repetido
+    conforme a política de configure_retry.
+    
     Args:
         query: Comando SQL a ser executado
         params: Parâmetros para o comando SQL (opcional)
@@ -72,82 +1627,224 @@ def execute_query(query: str, params: Optional[Tuple] = None) -> Optional[List[s
         List[sqlite3.Row]: Lista de resultados para SELECT, None para outros comandos
         
     Raises:
+        DatabaseBusyError: Banco bloqueado após todas as tentativas
         sqlite3.Error: Erro na execução da consulta
     """
-    conn = None
+    info = get_statement_info(query)
+    kind = info.kind
+    
+    fila = _write_queue
+    if fila is not None and kind == 'write' and not in_transaction():
+        try:
+            fila.submit(query, params).result()
+        except sqlite3.Error as e:
+            logger.error("❌ Erro na execução da consulta: %s | Query: %s", e, query)
+            logger.debug("Parâmetros: %s", params)
+            raise
+        return None
+    
+    cache = _result_cache
+    chave = None
+    if cache is not None and kind == 'read' and not in_transaction():
+        chave = cache.make_key(query, params)
+        if chave is not None:
+            results = cache.get(chave)
+            if results is not None:
+                return results
+    
+    inicio = time.perf_counter()
+    
     try:
-        # Estabelece conexão
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        # Executa a consulta com ou sem parâmetros
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        
-        # Commit para operações que modificam dados
-        if query.strip().upper().startswith(('INSERT', 'UPDATE', 'DELETE')):
-            conn.commit()
-            affected_rows = cursor.rowcount
-            print(f"✅ Consulta executada com sucesso. Linhas afetadas: {affected_rows}")
-            return None
-        
-        # Retorna resultados para SELECT
-        elif query.strip().upper().startswith('SELECT'):
-            results = cursor.fetchall()
-            print(f"✅ Consulta executada com sucesso. Registros encontrados: {len(results)}")
+        # Obtém conexão do pool (devolvida automaticamente ao sair do bloco);
+        # SELECTs usam o pool somente leitura
+        with _pool_for(kind).connection() as conn:
+            if chave is not None:
+                # Views resolvidas para as tabelas que de fato são gravadas
+                tabelas = _tabelas_lidas(conn, info.tables)
+                if tabelas is None:
+                    chave = None
+                else:
+                    versoes = cache.snapshot(tabelas)
+            cursor = conn.cursor()
+            
+            def executar() -> Optional[List[sqlite3.Row]]:
+                # Executa a consulta com ou sem parâmetros; o texto idêntico
+                # reaproveita o statement preparado em cache na conexão do pool
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+                if kind == 'read':
+                    return cursor.fetchall()
+                # Commit para operações que modificam dados (dentro de
+                # transaction() o commit fica para o final do bloco)
+                if not in_transaction():
+                    conn.commit()
+                return None
+            
+            # Banco bloqueado por outra conexão: tenta de novo (ver configure_retry)
+            results = _retry_busy(conn, executar)
+            
+            if kind == 'write':
+                _invalidar_apos_gravacao(conn, info)
+                logger.debug("✅ Consulta executada com sucesso. Linhas afetadas: %s", cursor.rowcount)
+            
+            # Retorna resultados para SELECT
+            elif kind == 'read':
+                if chave is not None:
+                    cache.put(chave, results, tabelas, versoes)
+                logger.debug("✅ Consulta executada com sucesso. Registros encontrados: %s", len(results))
+            
+            # Para outros comandos (CREATE, DROP, etc.)
+            else:
+                _invalidar_apos_gravacao(conn, info)
+                logger.debug("✅ Comando executado com sucesso")
+            
+            if profiling.active:
+                profiling.record_query(conn, info.normalized, query, params,
+                                       time.perf_counter() - inicio)
             return results
-        
-        # Para outros comandos (CREATE, DROP, etc.)
-        else:
-            conn.commit()
-            print("✅ Comando executado com sucesso")
-            return None
             
     except sqlite3.Error as e:
-        print(f"❌ Erro na execução da consulta: {e}")
-        print(f"Query: {query}")
-        if params:
-            print(f"Parâmetros: {params}")
+        logger.error("❌ Erro na execução da consulta: %s | Query: %s", e, query)
+        # Parâmetros podem conter dados pessoais: apenas em modo debug
+        logger.debug("Parâmetros: %s", params)
         raise
-        
-    finally:
-        # Garante que a conexão seja fechada
-        if conn:
-            close_connection(conn)
 
 
 def execute_many(query: str, params_list: List[Tuple]) -> None:
     """
     Executa múltiplas operações SQL com diferentes parâmetros.
     
+    Com o cache de resultados ativo, invalida as tabelas alteradas. Se o
+    banco estiver bloqueado, o lote inteiro é repetido (ver configure_retry).
+    
     Args:
         query: Comando SQL a ser executado
         params_list: Lista de tuplas com parâmetros para cada execução
         
     Raises:
+        DatabaseBusyError: Banco bloqueado após todas as tentativas
         sqlite3.Error: Erro na execução das consultas
     """
-    conn = None
+    info = get_statement_info(query)
+    if not isinstance(params_list, (list, tuple)):
+        # Um gerador se esgotaria na primeira tentativa
+        params_list = list(params_list)
+    inicio = time.perf_counter()
+    
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
+        with get_pool().connection() as conn:
+            cursor = conn.cursor()
+            
+            def executar() -> None:
+                # Executa múltiplas operações
+                cursor.executemany(query, params_list)
+                if not in_transaction():
+                    conn.commit()
+            
+            _retry_busy(conn, executar)
+            _invalidar_apos_gravacao(conn, info)
+            
+            affected_rows = cursor.rowcount
+            logger.debug("✅ %s operações executadas com sucesso. Linhas afetadas: %s",
+                         len(params_list), affected_rows)
+            
+            if profiling.active:
+                # O plano de um executemany não é capturado (params é uma lista)
+                profiling.record_query(conn, info.normalized, query, None,
+                                       time.perf_counter() - inicio, explain=False)
+        
+    except sqlite3.Error as e:
+        logger.error("❌ Erro na execução múltipla: %s | Query: %s", e, query)
+        raise
+
+
+def iter_query(query: str, params: Optional[Tuple] = None,
+               batch_size: int = 500) -> Iterator[sqlite3.Row]:
+    """
+    Executa um SELECT e devolve as linhas sob demanda, em lotes.
+    
+    Diferente de execute_query, o resultado nunca é carregado inteiro na
+    memória: as linhas são buscadas com fetchmany(batch_size). A conexão
+    do pool (somente leitura, fora de transaction()) fica reservada apenas
+    enquanto o iterador estiver ativo e é devolvida quando ele se esgota
+    ou é fechado.
+    
+    O iterador deve ser consumido na thread que o criou. Para interromper
+    a leitura antes do fim, use contextlib.closing ou chame close().
+    
+    Com o cache de resultados ativo, um resultado já guardado é devolvido
+    sem consultar o banco; uma leitura completa só é guardada se couber
+    em max_rows do cache.
+    
+    Args:
+        query: Comando SELECT a ser executado
+        params: Parâmetros para o comando SQL (opcional)
+        batch_size: Quantidade de linhas buscadas por vez
         
-        # Executa múltiplas operações
-        cursor.executemany(query, params_list)
-        conn.commit()
+    Yields:
+        sqlite3.Row: Uma linha do resultado por vez
         
-        affected_rows = cursor.rowcount
-        print(f"✅ {len(params_list)} operações executadas com sucesso. Linhas afetadas: {affected_rows}")
+    Raises:
+        ValueError: Se batch_size não for positivo
+        sqlite3.Error: Erro na execução da consulta
+        
+    Exemplo:
+        >>> for cliente in iter_query("SELECT * FROM clientes", batch_size=1000):
+        ...     exportar(cliente)
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size deve ser pelo menos 1")
+    
+    info = get_statement_info(query)
+    cache = _result_cache
+    chave = None
+    if cache is not None and info.kind == 'read' and not in_transaction():
+        chave = cache.make_key(query, params)
+        if chave is not None:
+            guardado = cache.get(chave)
+            if guardado is not None:
+                yield from guardado
+                return
+    
+    pool = _pool_for(info.kind)
+    conn = pool.acquire()
+    cursor = None
+    try:
+        if chave is not None:
+            tabelas = _tabelas_lidas(conn, info.tables)
+            if tabelas is None:
+                chave = None
+            else:
+                versoes = cache.snapshot(tabelas)
+        # Linhas acumuladas para o cache; abandonadas se passarem do limite
+        acumulado = [] if chave is not None else None
+        
+        cursor = conn.execute(query, params or ())
+        total = 0
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            total += len(rows)
+            if acumulado is not None:
+                acumulado.extend(rows)
+                if len(acumulado) > cache.max_rows:
+                    acumulado = None
+            yield from rows
+        if acumulado is not None:
+            cache.put(chave, acumulado, tabelas, versoes)
+        logger.debug("✅ Leitura em lotes concluída. Registros lidos: %s", total)
         
     except sqlite3.Error as e:
-        print(f"❌ Erro na execução múltipla: {e}")
+        logger.error("❌ Erro na leitura em lotes: %s | Query: %s", e, query)
         raise
         
     finally:
-        if conn:
-            close_connection(conn)
+        if cursor is not None:
+            cursor.close()
+        pool.release(conn)
 
 
 def test_connection() -> bool:
@@ -166,14 +1863,19 @@ def test_connection() -> bool:
         version = cursor.fetchone()[0]
         
         close_connection(conn)
-        print(f"✅ Teste de conexão bem-sucedido. SQLite versão: {version}")
+        logger.info("✅ Teste de conexão bem-sucedido. SQLite versão: %s", version)
         return True
         
     except Exception as e:
-        print(f"❌ Falha no teste de conexão: {e}")
+        logger.error("❌ Falha no teste de conexão: %s", e)
         return False
 
 
+# Banco definido pela variável de ambiente (ex.: GRAFICA_DB=:memory:)
+if os.environ.get('GRAFICA_DB'):
+    configure_database(os.environ['GRAFICA_DB'])
+
+
 if __name__ == "__main__":
     """
     Teste básico do módulo de conexão.
@@ -0,0 +1,152 @@
+"""
+Configuração de logging do sistema da gráfica.
+
+Todos os módulos obtêm seu logger com get_logger(), abaixo do logger raiz
+"grafica". O nível padrão é WARNING, de modo que as mensagens de depuração
+dos caminhos críticos (execute_query, CRUD de usuários) são descartadas
+sem formatar string alguma. Use sempre o formato preguiçoso do logging:
+
+    logger.debug("Registros encontrados: %s", len(resultados))
+
+O nível pode ser alterado com a variável de ambiente GRAFICA_LOG_LEVEL
+ou com configure_logging().
+
+Autor: Sistema Gráfica
+Data: 2025
+"""
+
+import logging
+import os
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+
+LOGGER_NAME = 'grafica'
+DEFAULT_LEVEL = 'WARNING'
+LOG_FORMAT = '%(asctime)s %(levelname)-7s %(name)s: %(message)s'
+
+_root_logger = logging.getLogger(LOGGER_NAME)
+_stream_handler: Optional[logging.Handler] = None
+_ring_buffer: Optional['RingBufferHandler'] = None
+_lock = threading.Lock()
+
+
+class RingBufferHandler(logging.Handler):
+    """
+    Handler que guarda os últimos registros de log em memória.
+
+    Útil para diagnóstico: a interface ou um comando de suporte pode
+    exibir as últimas mensagens sem depender de arquivo de log.
+    """
+
+    def __init__(self, capacity: int = 1000, level: int = logging.NOTSET):
+        """
+        Args:
+            capacity: Quantidade máxima de registros mantidos
+            level: Nível mínimo dos registros guardados
+        """
+        super().__init__(level)
+        self.buffer = deque(maxlen=capacity)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # A formatação da mensagem fica para quando o buffer for lido
+        self.buffer.append(record)
+
+    def records(self) -> List[Dict]:
+        """
+        Retorna os registros guardados, do mais antigo ao mais recente.
+
+        Returns:
+            List[Dict]: Registros com as chaves time, level, logger e message
+        """
+        with self.lock:
+            registros = list(self.buffer)
+        return [
+            {
+                'time': r.created,
+                'level': r.levelname,
+                'logger': r.name,
+                'message': r.getMessage(),
+            }
+            for r in registros
+        ]
+
+    def clear(self) -> None:
+        """
+        Descarta todos os registros guardados.
+        """
+        with self.lock:
+            self.buffer.clear()
+
+
+def configure_logging(level: Optional[str] = None,
+                      ring_buffer: int = 0,
+                      ring_buffer_level: Optional[str] = None) -> logging.Logger:
+    """
+    Configura o logger raiz do sistema.
+
+    Pode ser chamada novamente para alterar o nível ou habilitar o buffer.
+
+    Args:
+        level: Nível de log ('DEBUG', 'INFO', 'WARNING', ...). Se omitido,
+            usa GRAFICA_LOG_LEVEL ou WARNING
+        ring_buffer: Se maior que zero, habilita um RingBufferHandler
+            com essa capacidade
+        ring_buffer_level: Nível do buffer, independente do console
+            (ex.: 'DEBUG' no buffer e WARNING no console)
+
+    Returns:
+        logging.Logger: Logger raiz "grafica"
+    """
+    global _stream_handler, _ring_buffer
+
+    nivel = (level or os.environ.get('GRAFICA_LOG_LEVEL') or DEFAULT_LEVEL).upper()
+
+    with _lock:
+        if _stream_handler is None:
+            _stream_handler = logging.StreamHandler()
+            _stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+            _root_logger.addHandler(_stream_handler)
+            _root_logger.propagate = False
+        _stream_handler.setLevel(nivel)
+
+        if ring_buffer > 0:
+            if _ring_buffer is not None:
+                _root_logger.removeHandler(_ring_buffer)
+            _ring_buffer = RingBufferHandler(ring_buffer, (ring_buffer_level or nivel).upper())
+            _root_logger.addHandler(_ring_buffer)
+
+        # O logger deixa passar o menor nível entre os handlers; abaixo
+        # dele, logger.debug(...) retorna sem formatar nada
+        niveis = [_stream_handler.level]
+        if _ring_buffer is not None:
+            niveis.append(_ring_buffer.level)
+        _root_logger.setLevel(min(niveis))
+
+    return _root_logger
+
+
+def get_ring_buffer() -> Optional[RingBufferHandler]:
+    """
+    Retorna o buffer de diagnóstico, se habilitado em configure_logging().
+
+    Returns:
+        RingBufferHandler ou None
+    """
+    return _ring_buffer
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Retorna o logger de um módulo do sistema.
+
+    Args:
+        name: Nome curto do módulo (ex.: 'database.connection')
+
+    Returns:
+        logging.Logger: Logger "grafica.<name>"
+    """
+    if _stream_handler is None:
+        configure_logging()
+    return _root_logger.getChild(name)
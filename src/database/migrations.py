@@ -0,0 +1,910 @@
+"""
+Migrações versionadas do esquema do banco (PRAGMA user_version).
+
+Cada migração tem um número de versão, em ordem. migrate() lê a versão
+gravada no cabeçalho do banco (PRAGMA user_version) e aplica as
+pendentes em uma única transação: ou todas são aplicadas, ou nenhuma.
+Um banco já atualizado custa só a leitura desse PRAGMA.
+
+Como o SQLite não altera colunas com ALTER TABLE, mudanças de estrutura
+usam rebuild_table(): cria a tabela nova, copia os dados, apaga a antiga
+e renomeia, recriando índices e triggers.
+
+Para adicionar uma migração, acrescente um Migration ao final de
+MIGRATIONS com a próxima versão; nunca altere uma migração já publicada.
+
+Linha de comando:
+    python database/migrations.py            # aplica as pendentes
+    python database/migrations.py status     # versão atual e histórico
+
+Autor: Sistema Gráfica
+Data: 2025
+"""
+
+import os
+import re
+import sqlite3
+import sys
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Union
+
+# Adiciona o diretório pai ao path para importar connection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.connection import get_pool, invalidate_result_cache, with_retry
+from database.logger import get_logger
+from database.passwords import hash_password
+
+
+logger = get_logger('database.migrations')
+
+# Histórico das migrações aplicadas (versão, descrição, data e duração)
+HISTORY_TABLE = 'schema_migracoes'
+
+
+class MigrationError(sqlite3.DatabaseError):
+    """
+    Falha ao aplicar uma migração; nenhuma alteração foi gravada.
+    """
+
+
+class Migration(NamedTuple):
+    """
+    Uma etapa de evolução do esquema.
+
+    Attributes:
+        version: Versão do esquema depois desta etapa (1, 2, 3...)
+        description: Descrição curta, gravada no histórico
+        steps: Comandos SQL (str) ou funções que recebem a conexão,
+            executados em ordem dentro da transação
+    """
+    version: int
+    description: str
+    steps: List[Union[str, Callable[[sqlite3.Connection], None]]]
+
+
+class MigrationRecord(NamedTuple):
+    """
+    Migração aplicada por migrate().
+    """
+    version: int
+    description: str
+    seconds: float
+
+
+# ========================================================================================
+# REBUILD DE TABELAS
+# ========================================================================================
+
+def table_columns(conn: sqlite3.Connection, tabela: str) -> List[str]:
+    """
+    Retorna os nomes das colunas de uma tabela (vazio se ela não existir).
+    """
+    return [linha[1] for linha in conn.execute(f"PRAGMA table_info({tabela})")]
+
+
+def rebuild_table(conn: sqlite3.Connection, tabela: str, create_sql: str,
+                  colunas: Dict[str, str]) -> None:
+    """
+    Recria uma tabela com uma nova estrutura, preservando os dados.
+
+    Segue o procedimento recomendado pelo SQLite para alterações que o
+    ALTER TABLE não suporta: cria <tabela>_nova, copia os dados, apaga a
+    tabela antiga, renomeia a nova e recria os índices e triggers
+    explícitos da tabela original. O contador de AUTOINCREMENT
+    (sqlite_sequence) é preservado. Deve rodar dentro da transação da
+    migração, com foreign_keys desligado (padrão das conexões do sistema).
+
+    Args:
+        conn: Conexão com a transação da migração
+        tabela: Tabela a recriar
+        create_sql: CREATE TABLE da nova estrutura, usando o nome
+            "{tabela}" (ex.: "CREATE TABLE {tabela} (...)")
+        colunas: Coluna nova -> expressão SQL sobre a tabela antiga
+            (ex.: {"perfil": "CASE WHEN tipo = 'administrador' THEN 'admin' ELSE 'operador' END"})
+    """
+    if conn.execute("PRAGMA foreign_keys").fetchone()[0]:
+        # Com foreign_keys ligado, o DROP TABLE apagaria/recusaria linhas dependentes
+        raise MigrationError("rebuild_table exige PRAGMA foreign_keys = OFF")
+    nova = f"{tabela}_nova"
+
+    # Índices e triggers explícitos (os automáticos, de UNIQUE, têm sql NULL)
+    dependentes = [
+        linha[0] for linha in conn.execute(
+            "SELECT sql FROM sqlite_master "
+            "WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL",
+            (tabela,)
+        )
+    ]
+
+    # Maior id já usado (AUTOINCREMENT): a cópia só leva o maior id que
+    # ainda existe, e ids de linhas apagadas não podem voltar a ser usados
+    tem_sequencia = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_sequence'"
+    ).fetchone()
+    sequencia = conn.execute(
+        "SELECT seq FROM sqlite_sequence WHERE name = ?", (tabela,)
+    ).fetchone() if tem_sequencia else None
+
+    conn.execute(create_sql.format(tabela=nova))
+    conn.execute(
+        f"INSERT INTO {nova} ({', '.join(colunas)}) "
+        f"SELECT {', '.join(colunas.values())} FROM {tabela}"
+    )
+    conn.execute(f"DROP TABLE {tabela}")
+    conn.execute(f"ALTER TABLE {nova} RENAME TO {tabela}")
+
+    if sequencia is not None:
+        atualizada = conn.execute(
+            "UPDATE sqlite_sequence SET seq = max(seq, ?) WHERE name = ?",
+            (sequencia[0], tabela)
+        ).rowcount
+        if not atualizada:
+            # Tabela vazia: a cópia não criou a linha da sequência
+            conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)",
+                         (tabela, sequencia[0]))
+
+    for sql in dependentes:
+        conn.execute(sql)
+
+    problemas = conn.execute(f"PRAGMA foreign_key_check({tabela})").fetchall()
+    if problemas:
+        raise MigrationError(f"Chaves estrangeiras inválidas em {tabela}: {len(problemas)} linha(s)")
+
+
+# ========================================================================================
+# MIGRAÇÕES
+# ========================================================================================
+
+def _usuarios_perfil(conn: sqlite3.Connection) -> None:
+    """
+    usuarios: tipo -> perfil ('admin'/'operador'), como usado por
+    modules/usuarios.py, e senhas em texto puro convertidas para SHA256.
+    """
+    colunas = table_columns(conn, 'usuarios')
+    if 'tipo' in colunas and 'perfil' not in colunas:
+        perfil = "CASE WHEN tipo IN ('admin', 'administrador') THEN 'admin' ELSE 'operador' END"
+    elif 'perfil' in colunas:
+        perfil = "CASE WHEN perfil = 'admin' THEN 'admin' ELSE 'operador' END"
+    else:
+        perfil = "'operador'"
+
+    rebuild_table(conn, 'usuarios', """
+    CREATE TABLE {tabela} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nome VARCHAR(100) NOT NULL,
+        email VARCHAR(100) UNIQUE,
+        senha VARCHAR(255),
+        perfil VARCHAR(20) NOT NULL DEFAULT 'operador'
+            CHECK (perfil IN ('admin', 'operador')),
+        ativo BOOLEAN DEFAULT 1,
+        data_criacao DATETIME DEFAULT CURRENT_TIMESTAMP,
+        data_atualizacao DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """, {
+        'id': 'id',
+        'nome': 'nome',
+        'email': 'email',
+        'senha': 'senha',
+        'perfil': perfil,
+        'ativo': 'ativo',
+        'data_criacao': 'data_criacao',
+        'data_atualizacao': 'data_atualizacao',
+    })
+
+    # O setup antigo gravava a senha do admin de teste sem hash
+    hash_sha256 = re.compile(r'^[0-9a-f]{64}$')
+    for id_usuario, senha in conn.execute("SELECT id, senha FROM usuarios").fetchall():
+        if senha and not hash_sha256.match(senha):
+            conn.execute("UPDATE usuarios SET senha = ? WHERE id = ?",
+                         (hash_password(senha), id_usuario))
+
+
+def _usuarios_email_nocase(conn: sqlite3.Connection) -> None:
+    """
+    usuarios.email com COLLATE NOCASE e valores normalizados (sem espaços,
+    em minúsculas): "WHERE email = ?" passa a usar o índice UNIQUE em vez
+    de ler a tabela inteira, e o UNIQUE passa a valer sem diferenciar
+    maiúsculas.
+    """
+    duplicados = conn.execute("""
+        SELECT LOWER(TRIM(email)), COUNT(*) FROM usuarios
+        WHERE email IS NOT NULL
+        GROUP BY LOWER(TRIM(email)) HAVING COUNT(*) > 1
+    """).fetchall()
+    if duplicados:
+        # Não há como escolher automaticamente qual cadastro manter
+        emails = ", ".join(linha[0] for linha in duplicados[:5])
+        raise MigrationError(
+            f"{len(duplicados)} email(s) repetido(s) ignorando maiúsculas ({emails}); "
+            "corrija os cadastros e rode a migração de novo"
+        )
+
+    rebuild_table(conn, 'usuarios', """
+    CREATE TABLE {tabela} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nome VARCHAR(100) NOT NULL,
+        email VARCHAR(100) UNIQUE COLLATE NOCASE,
+        senha VARCHAR(255),
+        perfil VARCHAR(20) NOT NULL DEFAULT 'operador'
+            CHECK (perfil IN ('admin', 'operador')),
+        ativo BOOLEAN DEFAULT 1,
+        data_criacao DATETIME DEFAULT CURRENT_TIMESTAMP,
+        data_atualizacao DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """, {
+        'id': 'id',
+        'nome': 'nome',
+        'email': 'LOWER(TRIM(email))',
+        'senha': 'senha',
+        'perfil': 'perfil',
+        'ativo': 'ativo',
+        'data_criacao': 'data_criacao',
+        'data_atualizacao': 'data_atualizacao',
+    })
+
+
+def _para_centavos(conn: sqlite3.Connection, tabela: str, create_sql: str,
+                   colunas_dinheiro: List[str]) -> None:
+    """
+    Recria a tabela com as colunas de dinheiro em centavos (INTEGER),
+    convertendo os valores antigos em reais (REAL) com arredondamento.
+    """
+    colunas = {coluna: coluna for coluna in table_columns(conn, tabela)}
+    for coluna in colunas_dinheiro:
+        colunas[coluna] = f"CAST(ROUND({coluna} * 100) AS INTEGER)"
+    rebuild_table(conn, tabela, create_sql, colunas)
+
+
+def _dinheiro_em_centavos(conn: sqlite3.Connection) -> None:
+    """
+    Colunas de dinheiro: DECIMAL(10,2) (guardado como REAL pelo SQLite)
+    -> centavos em INTEGER. O CHECK de typeof recusa gravações que ainda
+    mandem reais em float em vez de centavos (ver database/money.py).
+
+    O CHECK só pega floats com parte fracionária: pela afinidade INTEGER
+    da coluna, o SQLite converte 12.0 em 12 antes de avaliar o CHECK, e o
+    valor é aceito como 12 centavos. Reais inteiros em float passam, por
+    isso o código deve gravar sempre via Money.
+    """
+    _para_centavos(conn, 'materiais', """
+    CREATE TABLE {tabela} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nome VARCHAR(100) NOT NULL,
+        descricao TEXT,
+        categoria VARCHAR(50),
+        unidade VARCHAR(10) DEFAULT 'un',
+        preco_unitario INTEGER DEFAULT 0
+            CHECK (typeof(preco_unitario) IN ('integer', 'null')),
+        estoque_atual INTEGER DEFAULT 0,
+        estoque_minimo INTEGER DEFAULT 0,
+        fornecedor VARCHAR(100),
+        codigo_barras VARCHAR(50),
+        ativo BOOLEAN DEFAULT 1,
+        data_cadastro DATETIME DEFAULT CURRENT_TIMESTAMP,
+        data_atualizacao DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """, ['preco_unitario'])
+
+    _para_centavos(conn, 'orcamentos', """
+    CREATE TABLE {tabela} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        numero_orcamento VARCHAR(20) UNIQUE NOT NULL,
+        cliente_id INTEGER NOT NULL,
+        descricao_servico TEXT NOT NULL,
+        quantidade INTEGER DEFAULT 1,
+        valor_unitario INTEGER DEFAULT 0
+            CHECK (typeof(valor_unitario) IN ('integer', 'null')),
+        valor_total INTEGER DEFAULT 0
+            CHECK (typeof(valor_total) IN ('integer', 'null')),
+        prazo_entrega DATE,
+        status VARCHAR(20) DEFAULT 'pendente',
+        observacoes TEXT,
+        data_criacao DATETIME DEFAULT CURRENT_TIMESTAMP,
+        data_aprovacao DATETIME,
+        data_vencimento DATETIME,
+        usuario_id INTEGER,
+        FOREIGN KEY (cliente_id) REFERENCES clientes(id),
+        FOREIGN KEY (usuario_id) REFERENCES usuarios(id)
+    )
+    """, ['valor_unitario', 'valor_total'])
+
+    _para_centavos(conn, 'pagamentos', """
+    CREATE TABLE {tabela} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        orcamento_id INTEGER NOT NULL,
+        valor_pagamento INTEGER NOT NULL
+            CHECK (typeof(valor_pagamento) = 'integer'),
+        forma_pagamento VARCHAR(30) DEFAULT 'dinheiro',
+        status_pagamento VARCHAR(20) DEFAULT 'pendente',
+        data_vencimento DATE,
+        data_pagamento DATETIME,
+        observacoes TEXT,
+        numero_comprovante VARCHAR(50),
+        data_criacao DATETIME DEFAULT CURRENT_TIMESTAMP,
+        usuario_id INTEGER,
+        FOREIGN KEY (orcamento_id) REFERENCES orcamentos(id),
+        FOREIGN KEY (usuario_id) REFERENCES usuarios(id)
+    )
+    """, ['valor_pagamento'])
+
+
+def _indice_busca(tabela: str, colunas: List[str]) -> List[str]:
+    """
+    Comandos de um índice FTS5 "<tabela>_busca" sobre colunas de texto.
+
+    O índice usa a própria tabela como conteúdo (content=), então guarda
+    só os termos; triggers o mantêm em dia a cada INSERT, DELETE e
+    UPDATE das colunas indexadas. unicode61 com remove_diacritics ignora
+    acentos ("grafica" encontra "Gráfica") e prefix='2 3' acelera buscas
+    por início de palavra.
+    """
+    indice = f"{tabela}_busca"
+    lista = ", ".join(colunas)
+    novos = ", ".join(f"new.{coluna}" for coluna in colunas)
+    antigos = ", ".join(f"old.{coluna}" for coluna in colunas)
+    return [
+        f"""
+        CREATE VIRTUAL TABLE {indice} USING fts5(
+            {lista},
+            content='{tabela}', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+        """,
+        f"""
+        CREATE TRIGGER {indice}_ai AFTER INSERT ON {tabela} BEGIN
+            INSERT INTO {indice} (rowid, {lista}) VALUES (new.id, {novos});
+        END
+        """,
+        f"""
+        CREATE TRIGGER {indice}_ad AFTER DELETE ON {tabela} BEGIN
+            INSERT INTO {indice} ({indice}, rowid, {lista}) VALUES ('delete', old.id, {antigos});
+        END
+        """,
+        f"""
+        CREATE TRIGGER {indice}_au AFTER UPDATE OF {lista} ON {tabela} BEGIN
+            INSERT INTO {indice} ({indice}, rowid, {lista}) VALUES ('delete', old.id, {antigos});
+            INSERT INTO {indice} (rowid, {lista}) VALUES (new.id, {novos});
+        END
+        """,
+        # Indexa as linhas que já existem
+        f"INSERT INTO {indice} ({indice}) VALUES ('rebuild')",
+    ]
+
+
+def _pagamento_nos_resumos(linha: str, sinal: int) -> str:
+    """
+    Comandos de trigger que somam (sinal 1) ou subtraem (sinal -1) um
+    pagamento ("new" ou "old") dos resumos de receita e de saldo.
+    """
+    dia = f"COALESCE(date({linha}.data_pagamento), date({linha}.data_criacao), '')"
+    forma = f"COALESCE({linha}.forma_pagamento, '')"
+    sql = f"""
+        INSERT INTO resumo_receita_diaria (dia, forma_pagamento, total, quantidade)
+        SELECT {dia}, {forma}, {sinal} * {linha}.valor_pagamento, {sinal}
+        WHERE {linha}.status_pagamento = 'pago'
+        ON CONFLICT (dia, forma_pagamento) DO UPDATE
+        SET total = total + excluded.total, quantidade = quantidade + excluded.quantidade;
+
+        INSERT INTO resumo_saldo_cliente (cliente_id, faturado, pago)
+        SELECT o.cliente_id, 0, {sinal} * {linha}.valor_pagamento
+        FROM orcamentos o
+        WHERE o.id = {linha}.orcamento_id AND {linha}.status_pagamento = 'pago'
+        ON CONFLICT (cliente_id) DO UPDATE SET pago = pago + excluded.pago;
+    """
+    if sinal < 0:
+        sql += f"""
+        DELETE FROM resumo_receita_diaria
+        WHERE dia = {dia} AND forma_pagamento = {forma} AND quantidade = 0;
+
+        DELETE FROM resumo_saldo_cliente
+        WHERE cliente_id = (SELECT cliente_id FROM orcamentos WHERE id = {linha}.orcamento_id)
+          AND faturado = 0 AND pago = 0;
+    """
+    return sql
+
+
+def _orcamento_nos_resumos(linha: str, sinal: int) -> str:
+    """
+    Comandos de trigger que somam (sinal 1) ou subtraem (sinal -1) um
+    orçamento ("new" ou "old") dos resumos por status e de saldo. No
+    saldo entram também os pagamentos já ligados ao orçamento, para que
+    trocar o cliente ou apagar o orçamento leve os pagamentos junto.
+    """
+    status = f"COALESCE({linha}.status, '')"
+    sql = f"""
+        INSERT INTO resumo_orcamentos_status (status, quantidade, total)
+        SELECT {status}, {sinal}, {sinal} * COALESCE({linha}.valor_total, 0)
+        WHERE true
+        ON CONFLICT (status) DO UPDATE
+        SET quantidade = quantidade + excluded.quantidade, total = total + excluded.total;
+
+        INSERT INTO resumo_saldo_cliente (cliente_id, faturado, pago)
+        SELECT {linha}.cliente_id,
+               {sinal} * CASE WHEN {linha}.status IN ('aprovado', 'concluido')
+                              THEN COALESCE({linha}.valor_total, 0) ELSE 0 END,
+               {sinal} * COALESCE((SELECT SUM(p.valor_pagamento) FROM pagamentos p
+                                   WHERE p.orcamento_id = {linha}.id
+                                     AND p.status_pagamento = 'pago'), 0)
+        WHERE {linha}.cliente_id IS NOT NULL
+        ON CONFLICT (cliente_id) DO UPDATE
+        SET faturado = faturado + excluded.faturado, pago = pago + excluded.pago;
+    """
+    if sinal < 0:
+        sql += f"""
+        DELETE FROM resumo_orcamentos_status WHERE status = {status} AND quantidade = 0;
+
+        DELETE FROM resumo_saldo_cliente
+        WHERE cliente_id = {linha}.cliente_id AND faturado = 0 AND pago = 0;
+    """
+    return sql
+
+
+def _preencher_resumos(conn: sqlite3.Connection) -> None:
+    """
+    Calcula o conteúdo inicial das tabelas de resumo.
+    """
+    # Import tardio: summaries importa connection, como este módulo
+    from database.summaries import fill_summaries
+    fill_summaries(conn)
+
+
+def _resumos_com_arquivo(conn: sqlite3.Connection) -> None:
+    """
+    Devolve aos resumos os valores de orçamentos já arquivados (antes da
+    migração 9, o arquivamento os subtraía).
+    """
+    from database.summaries import default_archive, fill_summaries
+    arquivo = default_archive()
+    if arquivo is not None:
+        fill_summaries(conn, arquivo)
+
+
+# Enquanto houver uma linha em resumos_suspensos (só dentro da transação
+# do arquivamento), os DELETEs não alteram os resumos
+_RESUMOS_ATIVOS = "WHEN NOT EXISTS (SELECT 1 FROM resumos_suspensos)"
+
+
+# Colunas que, ao mudar, alteram a contribuição da linha para os resumos
+_COLUNAS_RESUMO_PAGAMENTO = ("id, orcamento_id, valor_pagamento, status_pagamento, "
+                             "forma_pagamento, data_pagamento, data_criacao")
+_COLUNAS_RESUMO_ORCAMENTO = "id, cliente_id, status, valor_total"
+
+
+# Índices secundários: (nome, comando). Os parciais (WHERE ...) só são
+# usados por consultas que repetem a mesma condição, ex.: "AND ativo = 1".
+# Medidos com benchmarks/bench_indexes.py. Usados pela migração 2.
+INDEXES = [
+    # orcamentos: por cliente (e cliente + status), listagens por status/data
+    ("idx_orcamentos_cliente_status",
+     "CREATE INDEX IF NOT EXISTS idx_orcamentos_cliente_status ON orcamentos (cliente_id, status)"),
+    ("idx_orcamentos_status_criacao",
+     "CREATE INDEX IF NOT EXISTS idx_orcamentos_status_criacao ON orcamentos (status, data_criacao)"),
+    ("idx_orcamentos_usuario",
+     "CREATE INDEX IF NOT EXISTS idx_orcamentos_usuario ON orcamentos (usuario_id)"),
+
+    # pagamentos: por orçamento, contas em aberto por vencimento
+    ("idx_pagamentos_orcamento",
+     "CREATE INDEX IF NOT EXISTS idx_pagamentos_orcamento ON pagamentos (orcamento_id)"),
+    ("idx_pagamentos_status_vencimento",
+     "CREATE INDEX IF NOT EXISTS idx_pagamentos_status_vencimento ON pagamentos (status_pagamento, data_vencimento)"),
+    ("idx_pagamentos_usuario",
+     "CREATE INDEX IF NOT EXISTS idx_pagamentos_usuario ON pagamentos (usuario_id)"),
+
+    # producao: por orçamento e fila por status
+    ("idx_producao_orcamento",
+     "CREATE INDEX IF NOT EXISTS idx_producao_orcamento ON producao (orcamento_id)"),
+    ("idx_producao_status",
+     "CREATE INDEX IF NOT EXISTS idx_producao_status ON producao (status_producao)"),
+    ("idx_producao_usuario",
+     "CREATE INDEX IF NOT EXISTS idx_producao_usuario ON producao (usuario_id)"),
+
+    # materiais: catálogo ativo por categoria e leitura de código de barras
+    ("idx_materiais_categoria_ativos",
+     "CREATE INDEX IF NOT EXISTS idx_materiais_categoria_ativos ON materiais (categoria, nome) WHERE ativo = 1"),
+    ("idx_materiais_codigo_barras",
+     "CREATE INDEX IF NOT EXISTS idx_materiais_codigo_barras ON materiais (codigo_barras) WHERE codigo_barras IS NOT NULL"),
+
+    # clientes: listagem dos ativos por nome
+    ("idx_clientes_nome_ativos",
+     "CREATE INDEX IF NOT EXISTS idx_clientes_nome_ativos ON clientes (nome) WHERE ativo = 1"),
+]
+
+
+# Exclusão lógica (ativo = 0). Os índices "_ativos" atendem às listagens e
+# buscas do dia a dia, que repetem "ativo = 1"; os "_excluidos" guardam só
+# as linhas inativas, para a limpeza (database/soft_delete.py) achar as
+# antigas sem ler a tabela. Usados pela migração 8.
+SOFT_DELETE_INDEXES = [
+    # usuarios: listagem por nome e por perfil
+    ("idx_usuarios_nome_ativos",
+     "CREATE INDEX IF NOT EXISTS idx_usuarios_nome_ativos ON usuarios (nome) WHERE ativo = 1"),
+    ("idx_usuarios_perfil_ativos",
+     "CREATE INDEX IF NOT EXISTS idx_usuarios_perfil_ativos ON usuarios (perfil, nome) WHERE ativo = 1"),
+
+    # materiais: catálogo completo por nome (por categoria já existe)
+    ("idx_materiais_nome_ativos",
+     "CREATE INDEX IF NOT EXISTS idx_materiais_nome_ativos ON materiais (nome) WHERE ativo = 1"),
+
+    # inativos por data de exclusão
+    ("idx_clientes_excluidos",
+     "CREATE INDEX IF NOT EXISTS idx_clientes_excluidos ON clientes (data_exclusao) WHERE ativo = 0"),
+    ("idx_materiais_excluidos",
+     "CREATE INDEX IF NOT EXISTS idx_materiais_excluidos ON materiais (data_exclusao) WHERE ativo = 0"),
+    ("idx_usuarios_excluidos",
+     "CREATE INDEX IF NOT EXISTS idx_usuarios_excluidos ON usuarios (data_exclusao) WHERE ativo = 0"),
+]
+
+
+def _exclusao_logica(tabela: str) -> List[str]:
+    """
+    Comandos da coluna data_exclusao de uma tabela com exclusão lógica.
+
+    data_exclusao guarda quando a linha passou a ativo = 0 e volta a NULL
+    quando ela é reativada. Triggers a mantêm para qualquer gravação
+    (módulos, carga CSV, SQL avulso); as linhas já inativas recebem a
+    data da última atualização.
+    """
+    return [
+        f"ALTER TABLE {tabela} ADD COLUMN data_exclusao DATETIME",
+        f"""
+        UPDATE {tabela} SET data_exclusao = COALESCE(data_atualizacao, CURRENT_TIMESTAMP)
+        WHERE ativo = 0
+        """,
+        # Inserida já inativa sem data de exclusão
+        f"""
+        CREATE TRIGGER {tabela}_exclusao_ai AFTER INSERT ON {tabela}
+        WHEN new.ativo = 0 AND new.data_exclusao IS NULL BEGIN
+            UPDATE {tabela} SET data_exclusao = COALESCE(new.data_atualizacao, CURRENT_TIMESTAMP)
+            WHERE id = new.id;
+        END
+        """,
+        f"""
+        CREATE TRIGGER {tabela}_exclusao_au AFTER UPDATE OF ativo ON {tabela}
+        WHEN new.ativo IS NOT old.ativo BEGIN
+            UPDATE {tabela}
+            SET data_exclusao = CASE WHEN new.ativo = 0 THEN CURRENT_TIMESTAMP END
+            WHERE id = new.id;
+        END
+        """,
+    ]
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Esquema inicial (seis tabelas)", [
+        """
+        CREATE TABLE IF NOT EXISTS usuarios (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nome VARCHAR(100) NOT NULL,
+            email VARCHAR(100) UNIQUE,
+            senha VARCHAR(255),
+            tipo VARCHAR(20) DEFAULT 'operador',
+            ativo BOOLEAN DEFAULT 1,
+            data_criacao DATETIME DEFAULT CURRENT_TIMESTAMP,
+            data_atualizacao DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS clientes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nome VARCHAR(100) NOT NULL,
+            empresa VARCHAR(100),
+            email VARCHAR(100),
+            telefone VARCHAR(20),
+            endereco TEXT,
+            cidade VARCHAR(50),
+            estado VARCHAR(2),
+            cep VARCHAR(10),
+            cpf_cnpj VARCHAR(20) UNIQUE,
+            observacoes TEXT,
+            ativo BOOLEAN DEFAULT 1,
+            data_cadastro DATETIME DEFAULT CURRENT_TIMESTAMP,
+            data_atualizacao DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS materiais (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nome VARCHAR(100) NOT NULL,
+            descricao TEXT,
+            categoria VARCHAR(50),
+            unidade VARCHAR(10) DEFAULT 'un',
+            preco_unitario DECIMAL(10,2) DEFAULT 0.00,
+            estoque_atual INTEGER DEFAULT 0,
+            estoque_minimo INTEGER DEFAULT 0,
+            fornecedor VARCHAR(100),
+            codigo_barras VARCHAR(50),
+            ativo BOOLEAN DEFAULT 1,
+            data_cadastro DATETIME DEFAULT CURRENT_TIMESTAMP,
+            data_atualizacao DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS orcamentos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            numero_orcamento VARCHAR(20) UNIQUE NOT NULL,
+            cliente_id INTEGER NOT NULL,
+            descricao_servico TEXT NOT NULL,
+            quantidade INTEGER DEFAULT 1,
+            valor_unitario DECIMAL(10,2) DEFAULT 0.00,
+            valor_total DECIMAL(10,2) DEFAULT 0.00,
+            prazo_entrega DATE,
+            status VARCHAR(20) DEFAULT 'pendente',
+            observacoes TEXT,
+            data_criacao DATETIME DEFAULT CURRENT_TIMESTAMP,
+            data_aprovacao DATETIME,
+            data_vencimento DATETIME,
+            usuario_id INTEGER,
+            FOREIGN KEY (cliente_id) REFERENCES clientes(id),
+            FOREIGN KEY (usuario_id) REFERENCES usuarios(id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS pagamentos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            orcamento_id INTEGER NOT NULL,
+            valor_pagamento DECIMAL(10,2) NOT NULL,
+            forma_pagamento VARCHAR(30) DEFAULT 'dinheiro',
+            status_pagamento VARCHAR(20) DEFAULT 'pendente',
+            data_vencimento DATE,
+            data_pagamento DATETIME,
+            observacoes TEXT,
+            numero_comprovante VARCHAR(50),
+            data_criacao DATETIME DEFAULT CURRENT_TIMESTAMP,
+            usuario_id INTEGER,
+            FOREIGN KEY (orcamento_id) REFERENCES orcamentos(id),
+            FOREIGN KEY (usuario_id) REFERENCES usuarios(id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS producao (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            orcamento_id INTEGER NOT NULL,
+            status_producao VARCHAR(30) DEFAULT 'aguardando',
+            data_inicio DATETIME,
+            data_previsao_fim DATETIME,
+            data_conclusao DATETIME,
+            responsavel VARCHAR(100),
+            equipamento_usado VARCHAR(100),
+            observacoes_producao TEXT,
+            qualidade_aprovada BOOLEAN DEFAULT 0,
+            data_criacao DATETIME DEFAULT CURRENT_TIMESTAMP,
+            data_atualizacao DATETIME DEFAULT CURRENT_TIMESTAMP,
+            usuario_id INTEGER,
+            FOREIGN KEY (orcamento_id) REFERENCES orcamentos(id),
+            FOREIGN KEY (usuario_id) REFERENCES usuarios(id)
+        )
+        """,
+    ]),
+    Migration(2, "Índices das colunas de busca", [sql for _, sql in INDEXES]),
+    Migration(3, "usuarios: coluna tipo substituída por perfil", [_usuarios_perfil]),
+    Migration(4, "usuarios: email normalizado e COLLATE NOCASE", [_usuarios_email_nocase]),
+    Migration(5, "Valores em dinheiro guardados em centavos (INTEGER)", [_dinheiro_em_centavos]),
+    Migration(6, "Busca textual (FTS5) em clientes, materiais e orçamentos",
+              _indice_busca('clientes', ['nome', 'empresa', 'cidade'])
+              + _indice_busca('materiais', ['nome', 'descricao', 'categoria'])
+              + _indice_busca('orcamentos', ['numero_orcamento', 'descricao_servico'])),
+    Migration(7, "Tabelas de resumo financeiro mantidas por triggers", [
+        """
+        CREATE TABLE resumo_receita_diaria (
+            dia TEXT NOT NULL,
+            forma_pagamento TEXT NOT NULL,
+            total INTEGER NOT NULL DEFAULT 0,
+            quantidade INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (dia, forma_pagamento)
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TABLE resumo_saldo_cliente (
+            cliente_id INTEGER PRIMARY KEY,
+            faturado INTEGER NOT NULL DEFAULT 0,
+            pago INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+        """
+        CREATE TABLE resumo_orcamentos_status (
+            status TEXT PRIMARY KEY,
+            quantidade INTEGER NOT NULL DEFAULT 0,
+            total INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+        """,
+        f"""
+        CREATE TRIGGER resumo_pagamentos_ai AFTER INSERT ON pagamentos BEGIN
+            {_pagamento_nos_resumos('new', 1)}
+        END
+        """,
+        f"""
+        CREATE TRIGGER resumo_pagamentos_ad AFTER DELETE ON pagamentos BEGIN
+            {_pagamento_nos_resumos('old', -1)}
+        END
+        """,
+        f"""
+        CREATE TRIGGER resumo_pagamentos_au AFTER UPDATE OF {_COLUNAS_RESUMO_PAGAMENTO}
+        ON pagamentos BEGIN
+            {_pagamento_nos_resumos('old', -1)}
+            {_pagamento_nos_resumos('new', 1)}
+        END
+        """,
+        f"""
+        CREATE TRIGGER resumo_orcamentos_ai AFTER INSERT ON orcamentos BEGIN
+            {_orcamento_nos_resumos('new', 1)}
+        END
+        """,
+        f"""
+        CREATE TRIGGER resumo_orcamentos_ad AFTER DELETE ON orcamentos BEGIN
+            {_orcamento_nos_resumos('old', -1)}
+        END
+        """,
+        f"""
+        CREATE TRIGGER resumo_orcamentos_au AFTER UPDATE OF {_COLUNAS_RESUMO_ORCAMENTO}
+        ON orcamentos BEGIN
+            {_orcamento_nos_resumos('old', -1)}
+            {_orcamento_nos_resumos('new', 1)}
+        END
+        """,
+        _preencher_resumos,
+    ]),
+    Migration(8, "Exclusão lógica: data_exclusao e índices parciais de ativos",
+              _exclusao_logica('clientes') + _exclusao_logica('materiais')
+              + _exclusao_logica('usuarios') + [sql for _, sql in SOFT_DELETE_INDEXES]),
+    Migration(9, "Resumos mantêm os valores dos orçamentos arquivados", [
+        """
+        CREATE TABLE resumos_suspensos (
+            motivo TEXT PRIMARY KEY
+        ) WITHOUT ROWID
+        """,
+        "DROP TRIGGER resumo_pagamentos_ad",
+        f"""
+        CREATE TRIGGER resumo_pagamentos_ad AFTER DELETE ON pagamentos
+        {_RESUMOS_ATIVOS} BEGIN
+            {_pagamento_nos_resumos('old', -1)}
+        END
+        """,
+        "DROP TRIGGER resumo_orcamentos_ad",
+        f"""
+        CREATE TRIGGER resumo_orcamentos_ad AFTER DELETE ON orcamentos
+        {_RESUMOS_ATIVOS} BEGIN
+            {_orcamento_nos_resumos('old', -1)}
+        END
+        """,
+        _resumos_com_arquivo,
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+# ========================================================================================
+# EXECUÇÃO
+# ========================================================================================
+
+def get_version(conn: Optional[sqlite3.Connection] = None) -> int:
+    """
+    Retorna a versão do esquema gravada no banco (PRAGMA user_version).
+    """
+    if conn is not None:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+    with get_pool().connection() as conn:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(target: Optional[int] = None) -> List[MigrationRecord]:
+    """
+    Aplica as migrações pendentes em uma única transação.
+
+    Se o banco já estiver na versão alvo, apenas PRAGMA user_version é
+    lido. Caso contrário, a versão é relida após BEGIN IMMEDIATE (outra
+    estação pode ter migrado antes), as etapas pendentes são executadas
+    em ordem e a nova versão é gravada no mesmo commit.
+
+    Args:
+        target: Versão desejada (padrão: a mais recente)
+
+    Returns:
+        List[MigrationRecord]: Migrações aplicadas (vazia se já atualizado)
+
+    Raises:
+        MigrationError: Se uma etapa falhar (tudo é desfeito) ou se o
+            banco estiver em uma versão mais nova que a deste código
+    """
+    alvo = LATEST_VERSION if target is None else target
+
+    with get_pool().connection() as conn:
+        versao = get_version(conn)
+        if versao == alvo:
+            return []
+        if versao > alvo:
+            raise MigrationError(
+                f"Banco na versão {versao}, mais nova que a esperada ({alvo}). "
+                "Atualize o sistema."
+            )
+
+        aplicadas: List[MigrationRecord] = []
+        with_retry(lambda: conn.execute("BEGIN IMMEDIATE"), conn)
+        try:
+            versao = get_version(conn)
+            conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {HISTORY_TABLE} (
+                versao INTEGER PRIMARY KEY,
+                descricao TEXT NOT NULL,
+                aplicada_em DATETIME DEFAULT CURRENT_TIMESTAMP,
+                duracao_ms REAL
+            )
+            """)
+
+            for migracao in MIGRATIONS:
+                if not versao < migracao.version <= alvo:
+                    continue
+                inicio = time.perf_counter()
+                for etapa in migracao.steps:
+                    if callable(etapa):
+                        etapa(conn)
+                    else:
+                        conn.execute(etapa)
+                segundos = time.perf_counter() - inicio
+
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {HISTORY_TABLE} (versao, descricao, duracao_ms) "
+                    "VALUES (?, ?, ?)",
+                    (migracao.version, migracao.description, segundos * 1000)
+                )
+                aplicadas.append(MigrationRecord(migracao.version, migracao.description, segundos))
+                logger.info("🧱 Migração %s aplicada: %s (%.1f ms)",
+                            migracao.version, migracao.description, segundos * 1000)
+
+            # PRAGMA não aceita parâmetros; alvo é sempre um inteiro
+            conn.execute(f"PRAGMA user_version = {int(alvo)}")
+            conn.commit()
+
+        except Exception as e:
+            conn.rollback()
+            logger.error("❌ Migração desfeita, banco mantido na versão %s: %s", versao, e)
+            if isinstance(e, MigrationError):
+                raise
+            raise MigrationError(f"Falha ao migrar da versão {versao}: {e}") from e
+
+    # Estrutura nova: resultados em cache e mapa de triggers ficam inválidos
+    invalidate_result_cache()
+    return aplicadas
+
+
+def get_history() -> List[sqlite3.Row]:
+    """
+    Retorna o histórico de migrações aplicadas neste banco.
+    """
+    with get_pool().connection() as conn:
+        existe = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (HISTORY_TABLE,)
+        ).fetchone()
+        if not existe:
+            return []
+        return conn.execute(
+            f"SELECT versao, descricao, aplicada_em, duracao_ms FROM {HISTORY_TABLE} ORDER BY versao"
+        ).fetchall()
+
+
+def main():
+    """
+    Linha de comando: aplica as migrações ou mostra o status.
+    """
+    if len(sys.argv) > 1 and sys.argv[1] == 'status':
+        print(f"📌 Versão do banco: {get_version()} (mais recente: {LATEST_VERSION})")
+        for linha in get_history():
+            print(f"  {linha['versao']:>3}  {linha['aplicada_em']}  "
+                  f"{linha['duracao_ms']:8.1f} ms  {linha['descricao']}")
+        return
+
+    try:
+        aplicadas = migrate()
+    except MigrationError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if not aplicadas:
+        print(f"✅ Banco já está na versão {LATEST_VERSION}")
+    for registro in aplicadas:
+        print(f"🧱 {registro.version}: {registro.description} ({registro.seconds * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
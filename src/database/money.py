@@ -0,0 +1,159 @@
+"""
+Valores monetários em centavos inteiros.
+
+As colunas de dinheiro (materiais.preco_unitario, orcamentos.valor_unitario,
+orcamentos.valor_total e pagamentos.valor_pagamento) guardam centavos em
+INTEGER desde a migração 5. Assim SUM() e comparações no SQL são exatos,
+sem o arredondamento de ponto flutuante do antigo DECIMAL(10,2) (que o
+SQLite guardava como REAL).
+
+Money pode ser passado direto como parâmetro das consultas (é gravado
+como inteiro) e reconstrói o valor lido do banco:
+
+    >>> from database.money import Money
+    >>> execute_query("UPDATE materiais SET preco_unitario = ? WHERE id = ?",
+    ...               (Money.parse("25,90"), 1))
+    >>> total = execute_query("SELECT SUM(valor_pagamento) FROM pagamentos")[0][0]
+    >>> print(Money(total or 0))
+    R$ 1.234,56
+
+Autor: Sistema Gráfica
+Data: 2025
+"""
+
+import re
+import sqlite3
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from functools import total_ordering
+from typing import Union
+
+
+CENTAVOS = Decimal('0.01')
+
+# Só pontos, em grupos de três dígitos: "1.234", "12.345.678"
+_MILHAR_COM_PONTO = re.compile(r'-?\d{1,3}(\.\d{3})+')
+
+
+@total_ordering
+class Money:
+    """
+    Valor em reais, guardado como centavos inteiros (imutável).
+    """
+
+    __slots__ = ('cents',)
+
+    def __init__(self, cents: int = 0):
+        """
+        Args:
+            cents: Valor em centavos (ex.: 2590 para R$ 25,90)
+        """
+        if isinstance(cents, bool) or not isinstance(cents, int):
+            raise TypeError(f"centavos devem ser int, recebido {type(cents).__name__}; "
+                            "use Money.parse() para valores em reais")
+        object.__setattr__(self, 'cents', cents)
+
+    def __setattr__(self, nome, valor):
+        raise AttributeError("Money é imutável")
+
+    @classmethod
+    def parse(cls, valor: Union[str, int, float, Decimal, 'Money']) -> 'Money':
+        """
+        Converte um valor em reais para centavos.
+
+        Aceita números e textos nos formatos "25.90", "25,90" e "R$ 1.234,56".
+        Texto só com pontos em grupos de três dígitos ("1.234", "1.234.567")
+        segue o formato brasileiro: os pontos separam milhares, então "1.234"
+        é R$ 1.234,00. Lido como decimal teria três casas, que não são aceitas.
+
+        Raises:
+            ValueError: Se o valor não for válido ou tiver mais de duas casas
+                decimais (ex.: "1,234" ou 0.005), em vez de arredondar
+        """
+        if isinstance(valor, Money):
+            return valor
+        if isinstance(valor, str):
+            texto = valor.replace('R$', '').strip()
+            # Formato brasileiro: 1.234,56
+            if ',' in texto:
+                texto = texto.replace('.', '').replace(',', '.')
+            elif _MILHAR_COM_PONTO.fullmatch(texto):
+                texto = texto.replace('.', '')
+            try:
+                numero = Decimal(texto)
+            except InvalidOperation:
+                raise ValueError(f"valor inválido: {valor}") from None
+        elif isinstance(valor, float):
+            # str() evita levar o erro binário do float (0.1 -> 0.1000000000000000055...)
+            numero = Decimal(str(valor))
+        else:
+            numero = Decimal(valor)
+        if not numero.is_finite():
+            raise ValueError(f"valor inválido: {valor}")
+        if numero.as_tuple().exponent < -2:
+            raise ValueError(f"valor com mais de duas casas decimais: {valor}")
+        return cls(int(numero * 100))
+
+    def to_decimal(self) -> Decimal:
+        """
+        Retorna o valor em reais como Decimal com duas casas.
+        """
+        return (Decimal(self.cents) / 100).quantize(CENTAVOS)
+
+    def __add__(self, outro: 'Money') -> 'Money':
+        if not isinstance(outro, Money):
+            return NotImplemented
+        return Money(self.cents + outro.cents)
+
+    def __radd__(self, outro):
+        # Permite sum([...]) sem start=Money(0)
+        if outro == 0:
+            return self
+        return self.__add__(outro)
+
+    def __sub__(self, outro: 'Money') -> 'Money':
+        if not isinstance(outro, Money):
+            return NotImplemented
+        return Money(self.cents - outro.cents)
+
+    def __neg__(self) -> 'Money':
+        return Money(-self.cents)
+
+    def __mul__(self, fator: Union[int, Decimal]) -> 'Money':
+        """
+        Multiplica por uma quantidade (ex.: valor_unitario * quantidade).
+        """
+        if isinstance(fator, bool) or not isinstance(fator, (int, Decimal)):
+            return NotImplemented
+        if isinstance(fator, int):
+            return Money(self.cents * fator)
+        return Money(int((self.cents * fator).quantize(Decimal(1), rounding=ROUND_HALF_UP)))
+
+    __rmul__ = __mul__
+
+    def __eq__(self, outro) -> bool:
+        if not isinstance(outro, Money):
+            return NotImplemented
+        return self.cents == outro.cents
+
+    def __lt__(self, outro: 'Money') -> bool:
+        if not isinstance(outro, Money):
+            return NotImplemented
+        return self.cents < outro.cents
+
+    def __hash__(self) -> int:
+        return hash(self.cents)
+
+    def __bool__(self) -> bool:
+        return self.cents != 0
+
+    def __str__(self) -> str:
+        reais, centavos = divmod(abs(self.cents), 100)
+        sinal = '-' if self.cents < 0 else ''
+        return f"{sinal}R$ {reais:,}".replace(',', '.') + f",{centavos:02d}"
+
+    def __repr__(self) -> str:
+        return f"Money({self.cents})"
+
+
+# Money como parâmetro de consulta é gravado como centavos inteiros
+sqlite3.register_adapter(Money, lambda valor: valor.cents)
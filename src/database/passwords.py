@@ -0,0 +1,30 @@
+"""
+Hash das senhas dos usuários.
+
+Fica na camada de banco porque é usado tanto pelo cadastro de usuários
+(modules/usuarios.py) quanto pelo setup, pelas migrações e pelo gerador
+de dados sintéticos, que não devem depender dos módulos de negócio.
+
+Autor: Sistema Gráfica
+Data: 2025
+"""
+
+import hashlib
+
+
+def hash_password(senha: str) -> str:
+    """
+    Gera hash SHA256 para a senha fornecida.
+
+    Args:
+        senha (str): Senha em texto puro
+
+    Returns:
+        str: Hash SHA256 da senha (64 caracteres hexadecimais)
+
+    Exemplo:
+        >>> len(hash_password("minha_senha123"))
+        64
+    """
+    # O hash nunca é registrado em log, nem parcialmente
+    return hashlib.sha256(senha.encode('utf-8')).hexdigest()
@@ -0,0 +1,384 @@
+"""
+Instrumentação de consultas: tempos por comando, log de consultas lentas
+e captura de EXPLAIN QUERY PLAN.
+
+Desligada por padrão (custo zero além de um teste de booleano em
+execute_query). Para ligar:
+
+    from database import profiling
+    profiling.configure_profiling(enabled=True, slow_query_ms=50, explain=True)
+
+ou defina a variável de ambiente GRAFICA_QUERY_STATS=1.
+
+Os tempos são agrupados pelo SQL normalizado (literais trocados por ?,
+espaços colapsados, listas IN (?, ?, ...) reduzidas a IN (?)), em um
+histograma por faixas de latência. Com explain=True, a primeira execução
+de cada comando registra seu plano; planos com SCAN (leitura da tabela
+inteira, ex.: WHERE LOWER(email) = LOWER(?)) são marcados.
+
+Uso pela linha de comando:
+    python database/profiling.py dump [--arquivo database/query_stats.json]
+    python database/profiling.py explain "SELECT * FROM usuarios WHERE email = ?" x@y.com
+
+Autor: Sistema Gráfica
+Data: 2025
+"""
+
+import argparse
+import atexit
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+from logging.handlers import RotatingFileHandler
+from typing import Dict, List, Optional, Tuple
+
+# Adiciona o diretório pai ao path para importar o módulo logger
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.logger import get_logger
+
+
+logger = get_logger('database.profiling')
+
+# Limites superiores (ms) das faixas do histograma; a última é infinita
+BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, float('inf'))
+
+DEFAULT_SLOW_QUERY_MS = 100.0
+DEFAULT_SLOW_LOG_PATH = os.path.join('database', 'slow_queries.log')
+DEFAULT_STATS_PATH = os.path.join('database', 'query_stats.json')
+
+# Lido diretamente por execute_query a cada chamada
+active = os.environ.get('GRAFICA_QUERY_STATS', '') not in ('', '0')
+
+_slow_query_ms = DEFAULT_SLOW_QUERY_MS
+_explain = False
+_stats: Dict[str, 'QueryHistogram'] = {}
+_planos: Dict[str, Dict] = {}
+_lock = threading.Lock()
+_slow_logger = logging.getLogger('grafica.slow_queries')
+_slow_handler: Optional[logging.Handler] = None
+_dump_path: Optional[str] = None
+
+_RE_STRING = re.compile(r"'(?:[^']|'')*'")
+_RE_NUMERO = re.compile(r"\b\d+(?:\.\d+)?\b")
+_RE_ESPACOS = re.compile(r"\s+")
+_RE_LISTA_IN = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)+\s*\)", re.IGNORECASE)
+
+
+class QueryHistogram:
+    """
+    Histograma de latência de um comando SQL normalizado.
+    """
+
+    __slots__ = ('count', 'total_ms', 'min_ms', 'max_ms', 'buckets', 'slow')
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = float('inf')
+        self.max_ms = 0.0
+        self.buckets = [0] * len(BUCKETS_MS)
+        self.slow = 0
+
+    def add(self, ms: float, lenta: bool) -> None:
+        self.count += 1
+        self.total_ms += ms
+        self.min_ms = min(self.min_ms, ms)
+        self.max_ms = max(self.max_ms, ms)
+        for i, limite in enumerate(BUCKETS_MS):
+            if ms <= limite:
+                self.buckets[i] += 1
+                break
+        if lenta:
+            self.slow += 1
+
+    def percentile(self, p: float) -> float:
+        """
+        Estima um percentil pelo limite superior da faixa correspondente.
+
+        Args:
+            p: Percentil entre 0 e 100
+
+        Returns:
+            float: Latência estimada em ms (max_ms para a última faixa)
+        """
+        alvo = self.count * p / 100.0
+        acumulado = 0
+        for i, quantidade in enumerate(self.buckets):
+            acumulado += quantidade
+            if acumulado >= alvo and quantidade:
+                return min(BUCKETS_MS[i], self.max_ms)
+        return self.max_ms
+
+    def as_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'total_ms': round(self.total_ms, 3),
+            'avg_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+            'min_ms': round(self.min_ms, 3) if self.count else 0.0,
+            'max_ms': round(self.max_ms, 3),
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'slow': self.slow,
+            'buckets': {
+                ('inf' if limite == float('inf') else f'<={limite}'): quantidade
+                for limite, quantidade in zip(BUCKETS_MS, self.buckets)
+            },
+        }
+
+
+def normalize_sql(query: str) -> str:
+    """
+    Normaliza um comando SQL para agrupar execuções equivalentes.
+
+    Args:
+        query: Texto SQL original
+
+    Returns:
+        str: SQL com literais trocados por ?, espaços colapsados e
+        listas IN (?, ?, ...) reduzidas a IN (?)
+
+    Exemplo:
+        >>> normalize_sql("SELECT * FROM t WHERE id IN (1, 2, 3) AND nome = 'x'")
+        'SELECT * FROM t WHERE id IN (?) AND nome = ?'
+    """
+    sql = _RE_STRING.sub('?', query)
+    sql = _RE_NUMERO.sub('?', sql)
+    sql = _RE_ESPACOS.sub(' ', sql).strip()
+    return _RE_LISTA_IN.sub('IN (?)', sql)
+
+
+def configure_profiling(enabled: bool = True,
+                        slow_query_ms: float = DEFAULT_SLOW_QUERY_MS,
+                        slow_log_path: Optional[str] = DEFAULT_SLOW_LOG_PATH,
+                        explain: bool = False,
+                        dump_on_exit: Optional[str] = None,
+                        max_bytes: int = 1024 * 1024,
+                        backup_count: int = 3) -> None:
+    """
+    Liga/desliga a instrumentação de consultas.
+
+    Args:
+        enabled: Coleta tempos em execute_query/execute_many
+        slow_query_ms: Consultas acima deste tempo vão para o log de lentas
+        slow_log_path: Arquivo do log de lentas (rotativo); None desliga
+        explain: Registra o EXPLAIN QUERY PLAN na primeira execução de cada comando
+        dump_on_exit: Se informado, salva as estatísticas neste JSON ao sair
+        max_bytes: Tamanho máximo de cada arquivo do log de lentas
+        backup_count: Quantidade de arquivos antigos mantidos na rotação
+    """
+    global active, _slow_query_ms, _explain, _slow_handler, _dump_path
+    active = enabled
+    _slow_query_ms = slow_query_ms
+    _explain = explain
+
+    with _lock:
+        if _slow_handler is not None:
+            _slow_logger.removeHandler(_slow_handler)
+            _slow_handler.close()
+            _slow_handler = None
+
+        if slow_log_path:
+            diretorio = os.path.dirname(slow_log_path)
+            if diretorio:
+                os.makedirs(diretorio, exist_ok=True)
+            _slow_handler = RotatingFileHandler(
+                slow_log_path, maxBytes=max_bytes, backupCount=backup_count,
+                encoding='utf-8'
+            )
+            _slow_handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+            _slow_logger.addHandler(_slow_handler)
+            _slow_logger.setLevel(logging.INFO)
+            _slow_logger.propagate = False
+
+    if dump_on_exit and _dump_path is None:
+        atexit.register(_salvar_ao_sair)
+    _dump_path = dump_on_exit
+
+
+def _salvar_ao_sair() -> None:
+    if _dump_path:
+        save_stats(_dump_path)
+
+
+def _capturar_plano(conn: sqlite3.Connection, normalizado: str,
+                    query: str, params: Optional[Tuple]) -> None:
+    """
+    Executa EXPLAIN QUERY PLAN e guarda o plano do comando normalizado.
+    """
+    try:
+        linhas = conn.execute("EXPLAIN QUERY PLAN " + query, params or ()).fetchall()
+    except sqlite3.Error as e:
+        logger.debug("Não foi possível obter o plano: %s", e)
+        return
+
+    detalhes = [linha[3] for linha in linhas]
+    full_scan = any(
+        d.startswith('SCAN ') and not d.startswith('SCAN CONSTANT ROW')
+        for d in detalhes
+    )
+    with _lock:
+        _planos[normalizado] = {'plan': detalhes, 'full_scan': full_scan}
+
+    if full_scan:
+        logger.info("🐢 Plano com leitura completa de tabela: %s | %s",
+                    normalizado, '; '.join(detalhes))
+        _slow_logger.info("FULL SCAN | %s | %s", normalizado, '; '.join(detalhes))
+
+
+def record_query(conn: sqlite3.Connection, normalizado: str, query: str,
+                 params: Optional[Tuple], segundos: float,
+                 explain: bool = True) -> None:
+    """
+    Registra a execução de um comando. Chamada por execute_query.
+
+    Args:
+        conn: Conexão usada (para EXPLAIN QUERY PLAN, se habilitado)
+        normalizado: SQL normalizado (chave do histograma)
+        query: SQL original
+        params: Parâmetros usados
+        segundos: Duração medida
+        explain: Se False, não captura o plano nesta execução
+    """
+    ms = segundos * 1000.0
+    lenta = ms >= _slow_query_ms
+
+    with _lock:
+        histograma = _stats.get(normalizado)
+        if histograma is None:
+            histograma = _stats[normalizado] = QueryHistogram()
+        histograma.add(ms, lenta)
+        sem_plano = explain and _explain and normalizado not in _planos
+
+    if lenta:
+        _slow_logger.info("%.1f ms | %s", ms, normalizado)
+
+    if sem_plano and query.lstrip()[:6].upper() in ('SELECT', 'INSERT', 'UPDATE', 'DELETE'):
+        _capturar_plano(conn, normalizado, query, params)
+
+
+def get_query_stats() -> List[Dict]:
+    """
+    Retorna as estatísticas por comando, do maior para o menor tempo total.
+
+    Returns:
+        List[Dict]: Um item por SQL normalizado, com count, total_ms,
+        avg_ms, min_ms, max_ms, p50_ms, p95_ms, slow, buckets, plan e full_scan
+    """
+    with _lock:
+        itens = []
+        for sql, histograma in _stats.items():
+            item = {'sql': sql}
+            item.update(histograma.as_dict())
+            plano = _planos.get(sql)
+            item['plan'] = plano['plan'] if plano else None
+            item['full_scan'] = plano['full_scan'] if plano else None
+            itens.append(item)
+    return sorted(itens, key=lambda i: i['total_ms'], reverse=True)
+
+
+def get_query_plans() -> Dict[str, Dict]:
+    """
+    Retorna os planos capturados, por SQL normalizado.
+
+    Returns:
+        Dict[str, Dict]: {'plan': [...], 'full_scan': bool} por comando
+    """
+    with _lock:
+        return {sql: dict(plano) for sql, plano in _planos.items()}
+
+
+def reset_query_stats() -> None:
+    """
+    Descarta todas as estatísticas e planos coletados.
+    """
+    with _lock:
+        _stats.clear()
+        _planos.clear()
+
+
+def save_stats(path: str = DEFAULT_STATS_PATH) -> None:
+    """
+    Salva as estatísticas atuais em JSON (lido pelo comando dump).
+
+    Args:
+        path: Arquivo de destino
+    """
+    diretorio = os.path.dirname(path)
+    if diretorio:
+        os.makedirs(diretorio, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as arquivo:
+        json.dump(get_query_stats(), arquivo, ensure_ascii=False, indent=2)
+
+
+def format_report(itens: List[Dict], limite: int = 20) -> str:
+    """
+    Formata as estatísticas como tabela de texto.
+
+    Args:
+        itens: Saída de get_query_stats() (ou do JSON salvo)
+        limite: Quantidade máxima de comandos exibidos
+
+    Returns:
+        str: Relatório pronto para exibir
+    """
+    linhas = [
+        f"{'qtd':>7} {'total ms':>10} {'média':>8} {'p95':>8} {'máx':>8} {'lentas':>6}  sql",
+        "-" * 100,
+    ]
+    for item in itens[:limite]:
+        marca = ' [SCAN]' if item.get('full_scan') else ''
+        linhas.append(
+            f"{item['count']:>7} {item['total_ms']:>10.1f} {item['avg_ms']:>8.2f} "
+            f"{item['p95_ms']:>8.2f} {item['max_ms']:>8.2f} {item['slow']:>6}  "
+            f"{item['sql'][:120]}{marca}"
+        )
+    return "\n".join(linhas)
+
+
+def main():
+    """
+    Linha de comando: dump das estatísticas salvas ou EXPLAIN de um comando.
+    """
+    parser = argparse.ArgumentParser(description="Estatísticas de consultas SQL")
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    dump = sub.add_parser('dump', help="exibe as estatísticas salvas em JSON")
+    dump.add_argument('--arquivo', default=DEFAULT_STATS_PATH)
+    dump.add_argument('--limite', type=int, default=20)
+
+    explain = sub.add_parser('explain', help="exibe o plano de um comando")
+    explain.add_argument('sql')
+    explain.add_argument('params', nargs='*')
+
+    args = parser.parse_args()
+
+    if args.comando == 'dump':
+        if not os.path.exists(args.arquivo):
+            print(f"❌ Arquivo não encontrado: {args.arquivo}")
+            print("💡 Use configure_profiling(dump_on_exit=...) ou save_stats()")
+            sys.exit(1)
+        with open(args.arquivo, encoding='utf-8') as arquivo:
+            print(format_report(json.load(arquivo), args.limite))
+    else:
+        from database.connection import get_connection, close_connection
+
+        conn = get_connection()
+        try:
+            for linha in conn.execute("EXPLAIN QUERY PLAN " + args.sql, args.params):
+                print(f"  {linha[3]}")
+        finally:
+            close_connection(conn)
+
+
+# Ativada pela variável de ambiente: usa a configuração padrão
+if active:
+    configure_profiling(enabled=True)
+
+
+if __name__ == "__main__":
+    main()
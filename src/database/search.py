@@ -0,0 +1,128 @@
+"""
+Busca textual em clientes, materiais e orçamentos (FTS5).
+
+Usa os índices "<tabela>_busca" criados pela migração 6, mantidos em dia
+por triggers. A busca ignora acentos e maiúsculas e cada palavra digitada
+vale como início de palavra: "graf cear" encontra "Gráfica Ceará Ltda".
+Os resultados vêm ordenados por relevância (bm25), com pesos maiores
+para o nome do que para os outros campos.
+
+Exemplo:
+    >>> from database.search import buscar
+    >>> for r in buscar("joao fortal"):
+    ...     print(r['tabela'], r['id'], r['titulo'], r['trecho'])
+    clientes 1 João Silva [João] Silva … [Fortaleza]
+
+Autor: Sistema Gráfica
+Data: 2025
+"""
+
+import os
+import re
+import sys
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+# Adiciona o diretório pai ao path para importar connection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.connection import execute_query
+from database.logger import get_logger
+
+
+logger = get_logger('database.search')
+
+
+class SearchSpec(NamedTuple):
+    """
+    Como buscar em uma tabela: coluna usada como título, pesos do bm25
+    (na ordem das colunas do índice) e se a tabela tem a coluna ativo.
+    """
+    titulo: str
+    pesos: tuple
+    tem_ativo: bool
+
+
+SEARCH_SPECS: Dict[str, SearchSpec] = {
+    # índice: nome, empresa, cidade
+    'clientes': SearchSpec('nome', (10.0, 5.0, 2.0), True),
+    # índice: nome, descricao, categoria
+    'materiais': SearchSpec('nome', (10.0, 2.0, 3.0), True),
+    # índice: numero_orcamento, descricao_servico
+    'orcamentos': SearchSpec('numero_orcamento', (10.0, 5.0), False),
+}
+
+_RE_PALAVRA = re.compile(r'\w+', re.UNICODE)
+
+
+def build_match_query(texto: str) -> Optional[str]:
+    """
+    Converte o texto digitado em uma consulta MATCH do FTS5.
+
+    Cada palavra vira um prefixo entre aspas ("palavra"*), então aspas,
+    hífens e operadores digitados pelo usuário nunca causam erro de
+    sintaxe. Todas as palavras precisam aparecer (AND).
+
+    Returns:
+        Optional[str]: Consulta MATCH, ou None se não houver palavras
+    """
+    palavras = _RE_PALAVRA.findall(texto or '')
+    if not palavras:
+        return None
+    return " ".join(f'"{palavra}"*' for palavra in palavras)
+
+
+def buscar(texto: str, tabelas: Optional[Iterable[str]] = None, limite: int = 20,
+           apenas_ativos: bool = True) -> List[Dict]:
+    """
+    Busca o texto nas tabelas e retorna os resultados mais relevantes.
+
+    Args:
+        texto: Texto digitado (palavras ou inícios de palavras)
+        tabelas: Tabelas a consultar (padrão: clientes, materiais e orcamentos)
+        limite: Quantidade máxima de resultados no total
+        apenas_ativos: Ignora clientes e materiais inativos
+
+    Returns:
+        List[Dict]: Resultados com tabela, id, titulo, trecho (campo
+        encontrado, com os termos entre colchetes) e relevancia (menor é
+        melhor), do mais para o menos relevante
+
+    Raises:
+        ValueError: Se uma tabela não tiver índice de busca
+    """
+    consulta = build_match_query(texto)
+    if consulta is None:
+        return []
+
+    tabelas = list(tabelas) if tabelas is not None else list(SEARCH_SPECS)
+    resultados = []
+    for tabela in tabelas:
+        spec = SEARCH_SPECS.get(tabela)
+        if spec is None:
+            raise ValueError(f"Tabela sem índice de busca: {tabela}")
+
+        indice = f"{tabela}_busca"
+        pesos = ", ".join(str(peso) for peso in spec.pesos)
+        filtro = "AND t.ativo = 1" if apenas_ativos and spec.tem_ativo else ""
+        query = f"""
+        SELECT t.id, t.{spec.titulo} AS titulo,
+               snippet({indice}, -1, '[', ']', '…', 10) AS trecho,
+               bm25({indice}, {pesos}) AS relevancia
+        FROM {indice}
+        JOIN {tabela} t ON t.id = {indice}.rowid
+        WHERE {indice} MATCH ? {filtro}
+        ORDER BY relevancia
+        LIMIT ?
+        """
+        for row in execute_query(query, (consulta, limite)):
+            resultados.append({
+                'tabela': tabela,
+                'id': row['id'],
+                'titulo': row['titulo'],
+                'trecho': row['trecho'],
+                'relevancia': row['relevancia'],
+            })
+
+    resultados.sort(key=lambda r: r['relevancia'])
+    logger.debug("🔎 Busca %r: %s resultado(s)", texto, len(resultados))
+    return resultados[:limite]
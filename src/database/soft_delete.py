@@ -0,0 +1,319 @@
+"""
+Exclusão lógica (ativo = 0) de clientes, materiais e usuários, e limpeza
+dos registros inativos há muito tempo.
+
+Excluir um cadastro apenas o desativa: os orçamentos, pagamentos e a
+produção continuam apontando para ele, e ele pode ser reativado. A
+coluna data_exclusao (migração 8, mantida por triggers) guarda quando a
+linha foi desativada.
+
+As consultas do dia a dia filtram "ativo = 1" e usam índices parciais
+que só contêm as linhas ativas, então o histórico de inativos não as
+deixa mais lentas. A limpeza usa o índice parcial oposto (só inativos,
+por data_exclusao).
+
+purge_inactive() apaga de vez os inativos desativados antes da data de
+corte, exceto os que ainda são referenciados por orçamentos, pagamentos
+ou produção, no banco ativo ou no arquivo (database/archive.py).
+
+Linha de comando:
+    python database/soft_delete.py status
+    python database/soft_delete.py limpar --dias 730 --lote 1000
+    python database/soft_delete.py limpar --antes-de 2023-01-01 --tabelas clientes
+
+Autor: Sistema Gráfica
+Data: 2025
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+# Adiciona o diretório pai ao path para importar connection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.archive import ARCHIVE_SCHEMA, _anexar, default_archive_path
+from database.connection import (
+    DEFAULT_PROFILE, execute_query, get_database_target, get_read_pool,
+    invalidate_result_cache, open_connection, transaction, with_retry
+)
+from database.logger import get_logger
+from database.migrations import migrate, table_columns
+
+
+logger = get_logger('database.soft_delete')
+
+DEFAULT_RETENTION_DAYS = 730
+DEFAULT_BATCH_SIZE = 500
+
+# Tabelas com exclusão lógica -> (tabela, coluna) que as referenciam
+SOFT_DELETE_TABLES = {
+    'clientes': [('orcamentos', 'cliente_id')],
+    'materiais': [],
+    'usuarios': [('orcamentos', 'usuario_id'), ('pagamentos', 'usuario_id'),
+                 ('producao', 'usuario_id')],
+}
+
+
+class PurgeResult(NamedTuple):
+    """
+    Resultado de purge_inactive().
+
+    removidos: linhas apagadas por tabela; mantidos: inativos antigos
+    preservados por ainda serem referenciados.
+    """
+    removidos: Dict[str, int]
+    mantidos: Dict[str, int]
+    lotes: int
+    segundos: float
+    corte: str
+
+
+def _validar_tabela(tabela: str) -> None:
+    if tabela not in SOFT_DELETE_TABLES:
+        raise ValueError(f"Tabela sem exclusão lógica: {tabela} "
+                         f"(use {', '.join(SOFT_DELETE_TABLES)})")
+
+
+# ========================================================================================
+# DESATIVAÇÃO E REATIVAÇÃO
+# ========================================================================================
+
+def _mudar_ativo(tabela: str, id_registro: int, ativo: int) -> bool:
+    _validar_tabela(tabela)
+    if not id_registro or id_registro <= 0:
+        return False
+
+    with transaction(immediate=True):
+        linha = execute_query(f"SELECT ativo FROM {tabela} WHERE id = ?", (id_registro,))
+        if not linha or linha[0]['ativo'] == ativo:
+            return False
+        # data_exclusao é preenchida (ou limpa) pelo trigger de ativo
+        execute_query(
+            f"UPDATE {tabela} SET ativo = ?, data_atualizacao = CURRENT_TIMESTAMP WHERE id = ?",
+            (ativo, id_registro)
+        )
+    return True
+
+
+def deactivate(tabela: str, id_registro: int) -> bool:
+    """
+    Exclui logicamente um registro (ativo = 0).
+
+    Args:
+        tabela: 'clientes', 'materiais' ou 'usuarios'
+        id_registro: ID do registro
+
+    Returns:
+        bool: True se foi desativado; False se não existe ou já estava inativo
+
+    Raises:
+        ValueError: Se a tabela não tiver exclusão lógica
+    """
+    desativado = _mudar_ativo(tabela, id_registro, 0)
+    if desativado:
+        logger.info("🗑️  %s %s desativado", tabela, id_registro)
+    return desativado
+
+
+def reactivate(tabela: str, id_registro: int) -> bool:
+    """
+    Reativa um registro excluído logicamente.
+
+    Returns:
+        bool: True se foi reativado; False se não existe ou já estava ativo
+
+    Raises:
+        ValueError: Se a tabela não tiver exclusão lógica
+    """
+    reativado = _mudar_ativo(tabela, id_registro, 1)
+    if reativado:
+        logger.info("♻️  %s %s reativado", tabela, id_registro)
+    return reativado
+
+
+# ========================================================================================
+# LIMPEZA DOS INATIVOS
+# ========================================================================================
+
+def _consulta_lote(tabela: str, esquemas: Sequence[str]) -> str:
+    """
+    Próximo lote de inativos antigos, em ordem de (data_exclusao, id),
+    com 1 nos que ainda são referenciados.
+    """
+    referencias = [
+        f"EXISTS (SELECT 1 FROM {esquema}.{origem} r WHERE r.{coluna} = t.id)"
+        for esquema in esquemas
+        for origem, coluna in SOFT_DELETE_TABLES[tabela]
+    ]
+    referenciado = " OR ".join(referencias) if referencias else "0"
+    # "ativo = 0" repetido na consulta permite usar o índice parcial
+    # idx_<tabela>_excluidos, que só tem as linhas inativas
+    return f"""
+    SELECT t.id, t.data_exclusao, {referenciado} AS referenciado
+    FROM main.{tabela} t
+    WHERE t.ativo = 0
+      AND t.data_exclusao < :corte
+      AND (t.data_exclusao, t.id) > (:ultima_data, :ultimo_id)
+    ORDER BY t.data_exclusao, t.id
+    LIMIT :lote
+    """
+
+
+def _limpar_tabela(conn: sqlite3.Connection, tabela: str, corte: str,
+                   esquemas: Sequence[str], batch_size: int) -> List[int]:
+    """
+    Apaga os inativos antigos e não referenciados de uma tabela, um lote
+    por transação.
+
+    Returns:
+        List[int]: [removidos, mantidos, lotes]
+    """
+    consulta = _consulta_lote(tabela, esquemas)
+    removidos = mantidos = lotes = 0
+    ultima_data, ultimo_id = '', 0
+    while True:
+        # Seleção e exclusão na mesma transação: uma referência nova ou
+        # uma reativação entre as duas não passa despercebida
+        with_retry(lambda: conn.execute("BEGIN IMMEDIATE"), conn)
+        try:
+            linhas = conn.execute(consulta, {
+                'corte': corte, 'ultima_data': ultima_data, 'ultimo_id': ultimo_id,
+                'lote': batch_size,
+            }).fetchall()
+            apagar = [linha[0] for linha in linhas if not linha[2]]
+            if apagar:
+                marcadores = ", ".join("?" * len(apagar))
+                conn.execute(f"DELETE FROM main.{tabela} WHERE id IN ({marcadores})", apagar)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        if not linhas:
+            return [removidos, mantidos, lotes]
+        removidos += len(apagar)
+        mantidos += len(linhas) - len(apagar)
+        lotes += 1
+        ultima_data, ultimo_id = linhas[-1][1], linhas[-1][0]
+        logger.debug("🧹 %s, lote %s: %s removidos, %s mantidos",
+                     tabela, lotes, len(apagar), len(linhas) - len(apagar))
+
+
+def purge_inactive(dias: int = DEFAULT_RETENTION_DAYS, antes_de: Optional[str] = None,
+                   tabelas: Optional[Sequence[str]] = None,
+                   arquivo: Optional[str] = None,
+                   batch_size: int = DEFAULT_BATCH_SIZE) -> PurgeResult:
+    """
+    Apaga de vez os registros desativados antes da data de corte.
+
+    Registros ainda referenciados (clientes com orçamentos, usuários com
+    orçamentos, pagamentos ou produção) são mantidos, também quando a
+    referência está só no arquivo de orçamentos. Cada lote é uma
+    transação curta, como no arquivamento.
+
+    Args:
+        dias: Tempo mínimo desde a desativação, se antes_de não for informada
+        antes_de: Data de corte (AAAA-MM-DD ou AAAA-MM-DD HH:MM:SS, UTC
+            como o CURRENT_TIMESTAMP do SQLite)
+        tabelas: Tabelas a limpar (padrão: todas de SOFT_DELETE_TABLES)
+        arquivo: Banco de arquivo consultado (padrão: default_archive_path(),
+            se existir)
+        batch_size: Registros examinados por transação
+
+    Returns:
+        PurgeResult: Removidos e mantidos por tabela, lotes e duração
+
+    Raises:
+        ValueError: Se uma tabela não tiver exclusão lógica ou batch_size < 1
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size deve ser pelo menos 1")
+    tabelas = list(tabelas or SOFT_DELETE_TABLES)
+    for tabela in tabelas:
+        _validar_tabela(tabela)
+    if antes_de is None:
+        # Mesmo formato (UTC, sem fuso) que CURRENT_TIMESTAMP grava em data_exclusao
+        antes_de = (datetime.now(timezone.utc) - timedelta(days=dias)).strftime('%Y-%m-%d %H:%M:%S')
+    if arquivo is None:
+        try:
+            padrao = default_archive_path()
+        except ValueError:
+            padrao = None
+        arquivo = padrao if padrao and os.path.exists(padrao) else None
+
+    conn = open_connection(get_database_target(), profile=DEFAULT_PROFILE)
+    # Transações controladas manualmente (BEGIN/COMMIT)
+    conn.isolation_level = None
+    inicio = time.perf_counter()
+    removidos, mantidos = {}, {}
+    lotes = 0
+    try:
+        esquemas = ['main']
+        if arquivo:
+            _anexar(conn, arquivo)
+            esquemas.append(ARCHIVE_SCHEMA)
+        for tabela in tabelas:
+            removidos[tabela], mantidos[tabela], lotes_tabela = _limpar_tabela(
+                conn, tabela, antes_de, esquemas, batch_size
+            )
+            lotes += lotes_tabela
+        if arquivo:
+            conn.execute(f"DETACH DATABASE {ARCHIVE_SCHEMA}")
+    finally:
+        conn.close()
+        if any(removidos.values()):
+            invalidate_result_cache([t for t, n in removidos.items() if n])
+
+    resultado = PurgeResult(removidos, mantidos, lotes, time.perf_counter() - inicio, antes_de)
+    logger.info("🧹 Inativos antes de %s: %s removidos, %s mantidos (referenciados) em %.1fs",
+                antes_de, sum(removidos.values()), sum(mantidos.values()), resultado.segundos)
+    return resultado
+
+
+def main():
+    """
+    Linha de comando: limpa os inativos antigos ou mostra o status.
+    """
+    parser = argparse.ArgumentParser(description="Exclusão lógica: status e limpeza de inativos")
+    parser.add_argument('comando', nargs='?', choices=['limpar', 'status'], default='status')
+    parser.add_argument('--dias', type=int, default=DEFAULT_RETENTION_DAYS,
+                        help="tempo mínimo desde a desativação")
+    parser.add_argument('--antes-de', default=None, help="data de corte (AAAA-MM-DD, UTC)")
+    parser.add_argument('--tabelas', nargs='+', choices=list(SOFT_DELETE_TABLES), default=None)
+    parser.add_argument('--arquivo', default=None, help="banco de arquivo de orçamentos")
+    parser.add_argument('--lote', type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    if args.comando == 'status':
+        # Só leitura: em um banco ainda não migrado não há data_exclusao
+        print(f"{'Tabela':<12}{'Ativos':>12}{'Inativos':>12}  Exclusão mais antiga")
+        for tabela in args.tabelas or SOFT_DELETE_TABLES:
+            with get_read_pool().connection() as conn:
+                migrada = 'data_exclusao' in table_columns(conn, tabela)
+            antiga = "MIN(data_exclusao)" if migrada else "NULL"
+            linha = execute_query(f"""
+                SELECT (SELECT COUNT(*) FROM {tabela} WHERE ativo = 1) AS ativos,
+                       (SELECT COUNT(*) FROM {tabela} WHERE ativo = 0) AS inativos,
+                       (SELECT {antiga} FROM {tabela} WHERE ativo = 0) AS antiga
+            """)[0]
+            print(f"{tabela:<12}{linha['ativos']:>12,}{linha['inativos']:>12,}  "
+                  f"{linha['antiga'] or '-'}")
+        return
+
+    # data_exclusao e os índices parciais vêm da migração 8
+    migrate()
+    resultado = purge_inactive(args.dias, args.antes_de, args.tabelas, args.arquivo, args.lote)
+    for tabela, quantidade in resultado.removidos.items():
+        print(f"🧹 {tabela}: {quantidade} removido(s), "
+              f"{resultado.mantidos[tabela]} mantido(s) por referência")
+    print(f"✅ Inativos desde antes de {resultado.corte}: {resultado.lotes} lote(s) "
+          f"({resultado.segundos:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+"""
+Tabelas de resumo para relatórios financeiros.
+
+Mantidas por triggers (migração 7) a cada INSERT, UPDATE e DELETE em
+orcamentos e pagamentos, para que os painéis leiam poucas linhas já
+somadas em vez de agregar todo o histórico:
+
+- resumo_receita_diaria: pagamentos pagos por dia e forma de pagamento
+  (dia = data do pagamento, ou da criação se ela não foi informada)
+- resumo_saldo_cliente: por cliente, total faturado (orçamentos
+  aprovados ou concluídos) e total pago; saldo = faturado - pago
+- resumo_orcamentos_status: quantidade e valor dos orçamentos por status
+
+Os resumos cobrem todo o histórico, inclusive os orçamentos movidos
+para o arquivo (database/archive.py): o arquivamento suspende os
+triggers de DELETE (tabela resumos_suspensos, migração 9), então os
+valores arquivados continuam somados. Por isso o recálculo é a soma do
+banco ativo com o arquivo, lido por uma conexão própria; como cada
+orçamento sai junto com seus pagamentos, as duas partes se somam.
+
+Valores em centavos (ver database/money.py). verify_summaries() compara
+as tabelas com um recálculo completo e rebuild_summaries() as refaz.
+
+Linha de comando:
+    python database/summaries.py verificar      # só compara
+    python database/summaries.py reconstruir    # compara e refaz
+    python database/summaries.py verificar /backup/db_arquivo.sqlite
+
+Autor: Sistema Gráfica
+Data: 2025
+"""
+
+import os
+import sqlite3
+import sys
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# Adiciona o diretório pai ao path para importar connection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.archive import default_archive_path
+from database.connection import (
+    READ_ONLY_PROFILE, execute_query, invalidate_result_cache, open_connection, transaction
+)
+from database.logger import get_logger
+from database.money import Money
+
+
+logger = get_logger('database.summaries')
+
+
+class SummarySpec(NamedTuple):
+    """
+    Tabela de resumo: colunas da chave, colunas somadas e o SELECT que
+    recalcula o conteúdo inteiro a partir das tabelas de origem.
+    """
+    chave: Tuple[str, ...]
+    valores: Tuple[str, ...]
+    recalculo: str
+
+
+SUMMARIES: Dict[str, SummarySpec] = {
+    'resumo_receita_diaria': SummarySpec(('dia', 'forma_pagamento'), ('total', 'quantidade'), """
+        SELECT COALESCE(date(data_pagamento), date(data_criacao), '') AS dia,
+               COALESCE(forma_pagamento, '') AS forma_pagamento,
+               SUM(valor_pagamento) AS total,
+               COUNT(*) AS quantidade
+        FROM pagamentos
+        WHERE status_pagamento = 'pago'
+        GROUP BY 1, 2
+    """),
+    'resumo_saldo_cliente': SummarySpec(('cliente_id',), ('faturado', 'pago'), """
+        SELECT cliente_id, SUM(faturado) AS faturado, SUM(pago) AS pago
+        FROM (
+            SELECT cliente_id,
+                   CASE WHEN status IN ('aprovado', 'concluido')
+                        THEN COALESCE(valor_total, 0) ELSE 0 END AS faturado,
+                   0 AS pago
+            FROM orcamentos
+            UNION ALL
+            SELECT o.cliente_id, 0, p.valor_pagamento
+            FROM pagamentos p
+            JOIN orcamentos o ON o.id = p.orcamento_id
+            WHERE p.status_pagamento = 'pago'
+        )
+        WHERE cliente_id IS NOT NULL
+        GROUP BY cliente_id
+        HAVING SUM(faturado) != 0 OR SUM(pago) != 0
+    """),
+    'resumo_orcamentos_status': SummarySpec(('status',), ('quantidade', 'total'), """
+        SELECT COALESCE(status, '') AS status,
+               COUNT(*) AS quantidade,
+               SUM(COALESCE(valor_total, 0)) AS total
+        FROM orcamentos
+        GROUP BY 1
+    """),
+}
+
+
+# ========================================================================================
+# VERIFICAÇÃO E RECONSTRUÇÃO
+# ========================================================================================
+
+def _ler(conn: sqlite3.Connection, sql: str, spec: SummarySpec,
+         resultado: Optional[Dict[tuple, tuple]] = None) -> Dict[tuple, tuple]:
+    # Com `resultado`, soma as linhas lidas às que já estão nele
+    resultado = {} if resultado is None else resultado
+    n = len(spec.chave)
+    for linha in conn.execute(sql):
+        chave, valores = tuple(linha[:n]), tuple(linha[n:])
+        if chave in resultado:
+            valores = tuple(a + b for a, b in zip(resultado[chave], valores))
+        resultado[chave] = valores
+    # Linhas zeradas equivalem a linhas ausentes
+    return {chave: valores for chave, valores in resultado.items() if any(valores)}
+
+
+def _recalcular(conn: sqlite3.Connection, spec: SummarySpec,
+                conn_arquivo: Optional[sqlite3.Connection]) -> Dict[tuple, tuple]:
+    esperado = _ler(conn, spec.recalculo, spec)
+    if conn_arquivo is not None:
+        esperado = _ler(conn_arquivo, spec.recalculo, spec, esperado)
+    return esperado
+
+
+def _comparar(conn: sqlite3.Connection, tabela: str, spec: SummarySpec,
+              conn_arquivo: Optional[sqlite3.Connection] = None) -> List[str]:
+    colunas = ", ".join(spec.chave + spec.valores)
+    atual = _ler(conn, f"SELECT {colunas} FROM {tabela}", spec)
+    esperado = _recalcular(conn, spec, conn_arquivo)
+
+    diferencas = []
+    for chave in sorted(set(atual) | set(esperado), key=repr):
+        if atual.get(chave) != esperado.get(chave):
+            diferencas.append(f"{tabela} {dict(zip(spec.chave, chave))}: "
+                              f"tabela={atual.get(chave)} recalculado={esperado.get(chave)}")
+    return diferencas
+
+
+def default_archive(arquivo: Optional[str] = None) -> Optional[str]:
+    """
+    Arquivo de orçamentos somado aos resumos: `arquivo`, se informado, ou
+    o padrão de database/archive.py, se existir (None se não houver).
+    """
+    if arquivo is not None:
+        return arquivo
+    try:
+        padrao = default_archive_path()
+    except ValueError:
+        # Banco em memória: sem arquivo padrão
+        return None
+    return padrao if os.path.exists(padrao) else None
+
+
+@contextmanager
+def _arquivo_aberto(caminho: Optional[str]) -> Iterator[Optional[sqlite3.Connection]]:
+    # Conexão somente leitura com o arquivo (None se não houver arquivo)
+    if caminho is None:
+        yield None
+        return
+    conn = open_connection(caminho, profile=READ_ONLY_PROFILE, read_only=True)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def verify_summaries(arquivo: Optional[str] = None) -> Dict[str, List[str]]:
+    """
+    Compara cada tabela de resumo com um recálculo completo (banco ativo
+    mais o arquivo de orçamentos).
+
+    Args:
+        arquivo: Arquivo de orçamentos (padrão: default_archive())
+
+    Returns:
+        Dict[str, List[str]]: Tabela -> descrição das linhas divergentes
+        (listas vazias quando tudo confere)
+    """
+    with _arquivo_aberto(default_archive(arquivo)) as conn_arquivo:
+        # Leitura em uma única transação: as duas versões veem o mesmo estado
+        with transaction() as conn:
+            return {tabela: _comparar(conn, tabela, spec, conn_arquivo)
+                    for tabela, spec in SUMMARIES.items()}
+
+
+def rebuild_summaries(conn: Optional[sqlite3.Connection] = None,
+                      arquivo: Optional[str] = None) -> Dict[str, List[str]]:
+    """
+    Recalcula todas as tabelas de resumo a partir de orcamentos e
+    pagamentos, do banco ativo e do arquivo.
+
+    Args:
+        conn: Conexão com uma transação já aberta (usado pela migração);
+            se omitida, abre uma transação própria
+        arquivo: Arquivo de orçamentos (padrão: default_archive())
+
+    Returns:
+        Dict[str, List[str]]: Divergências encontradas antes de refazer
+        (ver verify_summaries)
+    """
+    if conn is None:
+        with transaction(immediate=True) as conn:
+            diferencas = rebuild_summaries(conn, arquivo)
+        invalidate_result_cache(SUMMARIES)
+        return diferencas
+
+    caminho = default_archive(arquivo)
+    diferencas = {}
+    with _arquivo_aberto(caminho) as conn_arquivo:
+        for tabela, spec in SUMMARIES.items():
+            diferencas[tabela] = _comparar(conn, tabela, spec, conn_arquivo)
+            if diferencas[tabela]:
+                logger.warning("⚠️  %s: %s linha(s) divergente(s) corrigida(s)",
+                               tabela, len(diferencas[tabela]))
+    fill_summaries(conn, caminho)
+    return diferencas
+
+
+def fill_summaries(conn: sqlite3.Connection, arquivo: Optional[str] = None) -> None:
+    """
+    Substitui o conteúdo das tabelas de resumo pelo recálculo completo,
+    sem comparar (usado pelas migrações e pelo gerador de dados).
+
+    Args:
+        conn: Conexão com uma transação já aberta
+        arquivo: Arquivo de orçamentos cujos valores também entram nos
+            resumos (None: só o banco ativo)
+    """
+    for tabela, spec in SUMMARIES.items():
+        colunas = ", ".join(spec.chave + spec.valores)
+        conn.execute(f"DELETE FROM {tabela}")
+        conn.execute(f"INSERT INTO {tabela} ({colunas}) SELECT {colunas} FROM ({spec.recalculo})")
+
+    if arquivo is None:
+        return
+    with _arquivo_aberto(arquivo) as conn_arquivo:
+        for tabela, spec in SUMMARIES.items():
+            colunas = ", ".join(spec.chave + spec.valores)
+            marcadores = ", ".join("?" * (len(spec.chave) + len(spec.valores)))
+            soma = ", ".join(f"{v} = {v} + excluded.{v}" for v in spec.valores)
+            conn.executemany(
+                f"INSERT INTO {tabela} ({colunas}) VALUES ({marcadores}) "
+                f"ON CONFLICT ({', '.join(spec.chave)}) DO UPDATE SET {soma}",
+                [tuple(linha) for linha in conn_arquivo.execute(spec.recalculo)]
+            )
+
+
+# ========================================================================================
+# CONSULTAS DOS PAINÉIS
+# ========================================================================================
+
+def receita_por_dia(inicio: str, fim: str,
+                    forma_pagamento: Optional[str] = None) -> List[Dict]:
+    """
+    Receita (pagamentos pagos) por dia e forma de pagamento.
+
+    Args:
+        inicio: Primeiro dia (AAAA-MM-DD)
+        fim: Último dia (AAAA-MM-DD), inclusive
+        forma_pagamento: Filtra uma forma de pagamento
+
+    Returns:
+        List[Dict]: dia, forma_pagamento, total (Money) e quantidade
+    """
+    query = """
+    SELECT dia, forma_pagamento, total, quantidade
+    FROM resumo_receita_diaria
+    WHERE dia BETWEEN ? AND ?
+    """
+    parametros = [inicio, fim]
+    if forma_pagamento is not None:
+        query += " AND forma_pagamento = ?"
+        parametros.append(forma_pagamento)
+    query += " ORDER BY dia, forma_pagamento"
+
+    return [{
+        'dia': row['dia'],
+        'forma_pagamento': row['forma_pagamento'],
+        'total': Money(row['total']),
+        'quantidade': row['quantidade'],
+    } for row in execute_query(query, tuple(parametros))]
+
+
+def saldo_cliente(cliente_id: int) -> Dict[str, Money]:
+    """
+    Total faturado, total pago e saldo em aberto de um cliente.
+
+    Returns:
+        Dict[str, Money]: faturado, pago e saldo (zerados se o cliente
+        não tiver movimento)
+    """
+    resultado = execute_query(
+        "SELECT faturado, pago FROM resumo_saldo_cliente WHERE cliente_id = ?", (cliente_id,)
+    )
+    faturado, pago = (resultado[0]['faturado'], resultado[0]['pago']) if resultado else (0, 0)
+    return {'faturado': Money(faturado), 'pago': Money(pago), 'saldo': Money(faturado - pago)}
+
+
+def maiores_saldos(limite: int = 10) -> List[Dict]:
+    """
+    Clientes com os maiores saldos em aberto.
+
+    Returns:
+        List[Dict]: cliente_id, nome e saldo (Money), do maior para o menor
+    """
+    query = """
+    SELECT r.cliente_id, c.nome, r.faturado - r.pago AS saldo
+    FROM resumo_saldo_cliente r
+    LEFT JOIN clientes c ON c.id = r.cliente_id
+    WHERE r.faturado > r.pago
+    ORDER BY saldo DESC
+    LIMIT ?
+    """
+    return [{
+        'cliente_id': row['cliente_id'],
+        'nome': row['nome'],
+        'saldo': Money(row['saldo']),
+    } for row in execute_query(query, (limite,))]
+
+
+def orcamentos_por_status() -> Dict[str, Dict]:
+    """
+    Quantidade e valor total dos orçamentos em cada status.
+
+    Returns:
+        Dict[str, Dict]: status -> {'quantidade': int, 'total': Money}
+    """
+    return {
+        row['status']: {'quantidade': row['quantidade'], 'total': Money(row['total'])}
+        for row in execute_query(
+            "SELECT status, quantidade, total FROM resumo_orcamentos_status ORDER BY status"
+        )
+    }
+
+
+def main():
+    """
+    Linha de comando: verifica ou reconstrói as tabelas de resumo.
+    """
+    comando = sys.argv[1] if len(sys.argv) > 1 else 'verificar'
+    arquivo = sys.argv[2] if len(sys.argv) > 2 else None
+    if comando not in ('verificar', 'reconstruir') or len(sys.argv) > 3:
+        print("Uso: python database/summaries.py [verificar|reconstruir] [arquivo]")
+        sys.exit(2)
+
+    if comando == 'reconstruir':
+        diferencas = rebuild_summaries(arquivo=arquivo)
+    else:
+        diferencas = verify_summaries(arquivo)
+
+    total = 0
+    for tabela, linhas in diferencas.items():
+        total += len(linhas)
+        print(f"{'✅' if not linhas else '❌'} {tabela}: {len(linhas)} divergência(s)")
+        for linha in linhas[:20]:
+            print(f"   {linha}")
+
+    if comando == 'reconstruir':
+        print("🔁 Tabelas de resumo reconstruídas")
+    elif total:
+        print("💡 Rode 'python database/summaries.py reconstruir' para corrigir")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
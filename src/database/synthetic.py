@@ -0,0 +1,767 @@
+"""
+Gerador de dados sintéticos para as seis tabelas do sistema.
+
+Preenche usuarios, clientes, materiais, orcamentos, pagamentos e producao
+com dados brasileiros plausíveis (nomes, cidades e DDDs, CPF/CNPJ e
+códigos de barras com dígitos verificadores válidos, valores em
+centavos) e chaves estrangeiras consistentes: pagamentos somam o valor
+do orçamento, só orçamentos aprovados ou concluídos têm pagamentos e
+produção, e as datas seguem a ordem criação -> aprovação -> produção.
+
+A mesma semente e os mesmos parâmetros geram sempre os mesmos dados (as
+datas são relativas a `ate`, não ao dia de hoje). Os ids continuam a
+partir dos já existentes, então o gerador também serve para aumentar um
+banco de teste.
+
+A gravação é feita em uma única transação, em blocos (chunk_size) com
+executemany. Quando a carga é maior do que os dados já existentes, os
+índices secundários e os triggers das seis tabelas ficam desligados
+durante a gravação; no fim eles são recriados e os índices de busca
+(FTS5) e as tabelas de resumo são reconstruídos de uma vez, o que é
+muito mais rápido do que mantê-los linha a linha. Como tudo está na
+mesma transação, uma interrupção não deixa o banco sem triggers. Cargas
+menores que o banco mantêm os triggers ligados (reconstruir tudo
+custaria mais do que a própria carga).
+
+Use apenas em bancos de teste ou de benchmark.
+
+Exemplo:
+    >>> from database import connection
+    >>> from database.synthetic import generate_dataset
+    >>> connection.configure_database("/tmp/grande.sqlite")
+    >>> resultado = generate_dataset('grande', seed=42)
+    >>> print(resultado.linhas['orcamentos'], resultado.linhas_por_segundo)
+
+Linha de comando:
+    python database/synthetic.py medio --banco /tmp/medio.sqlite --semente 7
+
+Autor: Sistema Gráfica
+Data: 2025
+"""
+
+import argparse
+import bisect
+import os
+import random
+import sqlite3
+import sys
+import time
+import unicodedata
+from datetime import date, timedelta
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# Adiciona o diretório pai ao path para importar connection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.connection import (configure_database, get_database_target,
+                                 invalidate_result_cache, open_connection)
+from database.logger import get_logger
+from database.migrations import migrate
+from database.passwords import hash_password
+from database.search import SEARCH_SPECS
+from database.summaries import default_archive, fill_summaries
+
+
+logger = get_logger('database.synthetic')
+
+BULK_PROFILE = 'bulk-load'
+DEFAULT_CHUNK_SIZE = 50000
+DEFAULT_SEED = 42
+
+# Último dia dos dados gerados (fixo, para a geração ser reproduzível)
+DEFAULT_END_DATE = date(2025, 12, 31)
+
+# Senha de todos os usuários gerados
+SENHA_PADRAO = 'senha123'
+
+# Escala -> quantidade de orçamentos. Cada orçamento gera em média ~1,1
+# pagamento e ~0,7 ordem de produção, e há um cliente para cada 8
+# orçamentos: o total fica perto de 2,9 linhas por orçamento.
+ESCALAS: Dict[str, int] = {
+    'mini': 3500,             # ~10 mil linhas
+    'pequeno': 35000,         # ~100 mil linhas
+    'medio': 350000,          # ~1 milhão de linhas
+    'grande': 1000000,        # ~3 milhões de linhas
+    'producao': 3500000,      # ~10 milhões de linhas
+}
+
+TABELAS = ('usuarios', 'clientes', 'materiais', 'orcamentos', 'pagamentos', 'producao')
+
+
+# ========================================================================================
+# VOCABULÁRIO
+# ========================================================================================
+
+PRENOMES = [
+    'Maria', 'José', 'Ana', 'João', 'Francisco', 'Antônio', 'Francisca', 'Carlos',
+    'Paulo', 'Pedro', 'Lucas', 'Luiz', 'Marcos', 'Luís', 'Gabriel', 'Rafael',
+    'Adriana', 'Juliana', 'Márcia', 'Fernanda', 'Patrícia', 'Aline', 'Raimundo',
+    'Sebastião', 'Cícero', 'Iracema', 'Luíza', 'Conceição', 'Daniel', 'Marcelo',
+    'Bruno', 'Eduardo', 'Felipe', 'Camila', 'Amanda', 'Bruna', 'Jéssica', 'Letícia',
+    'Júlia', 'Beatriz', 'Larissa', 'Vitória', 'Rodrigo', 'Thiago', 'Gustavo',
+    'Mateus', 'Vinícius', 'Leonardo', 'Sandra', 'Rita', 'Vera', 'Sônia', 'Cláudia',
+    'Alexandre', 'André', 'Fábio', 'Ricardo', 'Roberto', 'Sérgio', 'Jorge',
+]
+
+SOBRENOMES = [
+    'Silva', 'Santos', 'Oliveira', 'Souza', 'Rodrigues', 'Ferreira', 'Alves',
+    'Pereira', 'Lima', 'Gomes', 'Costa', 'Ribeiro', 'Martins', 'Carvalho',
+    'Almeida', 'Lopes', 'Soares', 'Fernandes', 'Vieira', 'Barbosa', 'Rocha',
+    'Dias', 'Nascimento', 'Andrade', 'Moreira', 'Nunes', 'Marques', 'Machado',
+    'Mendes', 'Freitas', 'Cardoso', 'Ramos', 'Gonçalves', 'Santana', 'Teixeira',
+    'Araújo', 'Cavalcante', 'Holanda', 'Bezerra', 'Sampaio', 'Magalhães', 'Brandão',
+    'Monteiro', 'Queiroz', 'Pinheiro', 'Xavier', 'Farias', 'Sales', 'Benevides',
+    'Gurgel', 'Bastos', 'Távora', 'Aguiar', 'Leitão', 'Coelho', 'Castro',
+]
+
+RAMOS = [
+    'Papelaria', 'Confecções', 'Padaria', 'Farmácia', 'Ótica', 'Construções',
+    'Eventos', 'Comunicação Visual', 'Escola', 'Restaurante', 'Clínica',
+    'Imobiliária', 'Supermercado', 'Academia', 'Pet Shop', 'Autopeças',
+    'Materiais de Construção', 'Distribuidora', 'Advocacia', 'Contabilidade',
+]
+
+SUFIXOS_EMPRESA = ['Ltda', 'Ltda', 'Ltda', 'ME', 'EIRELI', 'S/A', 'EPP']
+
+PROVEDORES = ['gmail.com', 'hotmail.com', 'yahoo.com.br', 'outlook.com', 'uol.com.br',
+              'bol.com.br', 'terra.com.br']
+
+# (cidade, UF, DDD, faixa de CEP, peso) — a gráfica fica em Fortaleza
+CIDADES = [
+    ('Fortaleza', 'CE', '85', (60000, 61599), 40),
+    ('Caucaia', 'CE', '85', (61600, 61699), 6),
+    ('Maracanaú', 'CE', '85', (61900, 61939), 5),
+    ('Eusébio', 'CE', '85', (61760, 61769), 3),
+    ('Aquiraz', 'CE', '85', (61700, 61709), 2),
+    ('Sobral', 'CE', '88', (62010, 62119), 4),
+    ('Juazeiro do Norte', 'CE', '88', (63010, 63059), 4),
+    ('Crato', 'CE', '88', (63100, 63139), 2),
+    ('Iguatu', 'CE', '88', (63500, 63509), 1),
+    ('Quixadá', 'CE', '88', (63900, 63909), 1),
+    ('Natal', 'RN', '84', (59000, 59139), 4),
+    ('Mossoró', 'RN', '84', (59600, 59649), 2),
+    ('João Pessoa', 'PB', '83', (58000, 58099), 3),
+    ('Recife', 'PE', '81', (50000, 52999), 4),
+    ('Teresina', 'PI', '86', (64000, 64099), 3),
+    ('São Luís', 'MA', '98', (65000, 65099), 2),
+    ('Salvador', 'BA', '71', (40000, 42599), 3),
+    ('São Paulo', 'SP', '11', (1000, 5999), 5),
+    ('Rio de Janeiro', 'RJ', '21', (20000, 23799), 3),
+    ('Belo Horizonte', 'MG', '31', (30000, 31999), 2),
+    ('Brasília', 'DF', '61', (70000, 72799), 2),
+]
+
+TIPOS_LOGRADOURO = ['Rua', 'Rua', 'Rua', 'Avenida', 'Travessa', 'Alameda']
+LOGRADOUROS = [
+    'Barão de Studart', 'Santos Dumont', 'Dom Luís', 'Desembargador Moreira',
+    'Padre Valdevino', 'Treze de Maio', 'José Bonifácio', 'Pereira Filgueiras',
+    'Antônio Sales', 'Senador Pompeu', 'Major Facundo', 'Floriano Peixoto',
+    'Sete de Setembro', 'Rui Barbosa', 'Tiradentes', 'Castro Alves', 'das Flores',
+    'Beira Mar', 'Washington Soares', 'Bezerra de Menezes', 'Monsenhor Tabosa',
+]
+BAIRROS = ['Centro', 'Aldeota', 'Meireles', 'Fátima', 'Benfica', 'Montese', 'Parangaba',
+           'Messejana', 'Cocó', 'Papicu', 'Varjota', 'Jacarecanga', 'Bairro de Fátima',
+           'Cidade dos Funcionários', 'Edson Queiroz', 'Dionísio Torres']
+
+# (categoria, nome, variações, unidade, faixa de preço em centavos, fornecedores)
+CATALOGO = [
+    ('Papel', 'Papel Couché', ['90g A4', '115g A4', '150g A3', '170g SRA3', '250g A3'],
+     'pct', (2890, 12900), ['Suzano', 'International Paper']),
+    ('Papel', 'Papel Offset', ['75g A4', '90g A4', '120g A3', '180g 66x96'],
+     'pct', (1990, 8990), ['Suzano', 'Chamex']),
+    ('Papel', 'Papel Sulfite', ['75g A4', '90g A4', '75g Ofício'], 'cx', (2290, 3990),
+     ['Chamex', 'Report']),
+    ('Papel', 'Cartão Supremo', ['250g', '300g', '350g'], 'pct', (5990, 18900),
+     ['Suzano', 'Papirus']),
+    ('Papel', 'Papel Kraft', ['80g bobina', '120g A4'], 'rl', (4590, 15900), ['Klabin']),
+    ('Papel', 'Papel Vergê', ['120g A4 branco', '180g A4 palha'], 'pct', (2490, 5990),
+     ['Filipaper']),
+    ('Lona', 'Lona Front', ['280g', '340g', '440g'], 'm²', (890, 2490),
+     ['Vulcan', 'Sansuy']),
+    ('Lona', 'Lona Backlight', ['440g', '510g'], 'm²', (1490, 3290), ['Vulcan']),
+    ('Vinil', 'Vinil Adesivo', ['branco brilho', 'branco fosco', 'transparente',
+                                'perfurado'], 'm²', (990, 3990), ['Oracal', 'Avery']),
+    ('Tinta', 'Tinta Eco-Solvente', ['ciano 1L', 'magenta 1L', 'amarelo 1L', 'preto 1L'],
+     'L', (18900, 39900), ['Sun Chemical', 'Sherwin-Williams']),
+    ('Tinta', 'Toner', ['preto', 'ciano', 'magenta', 'amarelo'], 'un', (24900, 89900),
+     ['Konica Minolta', 'Xerox']),
+    ('PVC', 'Placa PVC Expandido', ['2mm', '3mm', '5mm'], 'm²', (3990, 12900),
+     ['Sansuy']),
+    ('PVC', 'Cartão PVC', ['0,76mm branco', 'com chip'], 'un', (45, 390), ['Plastcard']),
+    ('Acabamento', 'Espiral', ['9mm', '14mm', '25mm', '33mm'], 'pct', (990, 4990),
+     ['Acco']),
+    ('Acabamento', 'Bobina de Laminação', ['brilho 32cm', 'fosca 32cm'], 'rl',
+     (8990, 19900), ['Plastimax']),
+    ('Acabamento', 'Ilhós', ['latão', 'níquel'], 'mil', (2990, 6990), ['Metalúrgica Ceará']),
+    ('Embalagem', 'Envelope', ['ofício', 'saco A4 kraft', 'convite 16x22'], 'cx',
+     (1990, 9990), ['Foroni', 'Scrity']),
+    ('Embalagem', 'Sacola Kraft', ['pequena', 'média', 'grande'], 'cento', (4990, 18900),
+     ['Klabin']),
+]
+
+# (serviço, quantidades, faixa do valor unitário em centavos)
+SERVICOS = [
+    ('Impressão de cartões de visita', [500, 1000, 2000, 5000], (8, 35)),
+    ('Panfletos couché 4x4', [1000, 2500, 5000, 10000, 20000], (6, 25)),
+    ('Banner em lona com ilhós', [1, 2, 3, 5, 10], (4500, 25000)),
+    ('Adesivos em vinil recortado', [50, 100, 250, 500, 1000], (40, 450)),
+    ('Cardápios plastificados', [10, 20, 50, 100], (890, 4500)),
+    ('Convites de casamento', [100, 150, 200, 300], (350, 1800)),
+    ('Blocos de pedido numerados', [10, 20, 50, 100], (990, 3500)),
+    ('Calendários de mesa', [50, 100, 250, 500], (690, 2490)),
+    ('Etiquetas térmicas', [1000, 5000, 10000], (2, 9)),
+    ('Encadernação espiral', [5, 10, 20, 50], (590, 2500)),
+    ('Crachás em PVC', [10, 25, 50, 100, 200], (490, 1890)),
+    ('Sacolas personalizadas', [100, 250, 500, 1000], (190, 890)),
+    ('Placas em PVC', [1, 2, 5, 10], (3500, 18000)),
+    ('Fachada em ACM com adesivo', [1], (150000, 890000)),
+    ('Apostilas impressas', [20, 50, 100, 300], (890, 4990)),
+    ('Envelopes timbrados', [500, 1000, 2000], (25, 90)),
+]
+ACABAMENTOS = ['', '', ' com laminação fosca', ' com verniz localizado', ' frente e verso',
+               ' com cantos arredondados', ' em papel reciclado', ' com entrega']
+
+# Status do orçamento: orçamentos recentes ainda estão em aberto
+STATUS_RECENTES = [('pendente', 40), ('aprovado', 35), ('concluido', 10), ('rejeitado', 15)]
+STATUS_ANTIGOS = [('concluido', 65), ('rejeitado', 25), ('aprovado', 5), ('pendente', 5)]
+DIAS_RECENTES = 45
+
+PARCELAS = [(1, 60), (2, 25), (3, 15)]
+FORMAS_A_VISTA = [('pix', 35), ('dinheiro', 15), ('cartao_credito', 20),
+                  ('cartao_debito', 10), ('boleto', 15), ('transferencia', 5)]
+FORMAS_PARCELADO = [('cartao_credito', 60), ('boleto', 40)]
+
+EQUIPAMENTOS = ['Offset Heidelberg GTO 52', 'Digital Konica C3070', 'Plotter Roland VS-540',
+                'Plotter de recorte Graphtec', 'Laminadora Fortex', 'Guilhotina Guarani',
+                'Impressora térmica Zebra', 'Router CNC']
+
+
+def _sem_acento(texto: str) -> str:
+    texto = unicodedata.normalize('NFKD', texto)
+    return ''.join(c for c in texto if not unicodedata.combining(c)).lower().replace(' ', '')
+
+
+# Versões sem acento para montar emails (calculadas uma vez)
+_PRENOMES_EMAIL = [_sem_acento(nome) for nome in PRENOMES]
+_SOBRENOMES_EMAIL = [_sem_acento(nome) for nome in SOBRENOMES]
+
+
+# ========================================================================================
+# DOCUMENTOS E SORTEIO
+# ========================================================================================
+
+def cpf_digits(base: int) -> str:
+    """
+    CPF (11 dígitos, sem máscara) com os dígitos verificadores corretos.
+
+    Args:
+        base: Número de 0 a 999.999.999 (os nove primeiros dígitos)
+    """
+    digitos = [int(c) for c in f"{base:09d}"]
+    for tamanho in (9, 10):
+        soma = sum(d * peso for d, peso in zip(digitos, range(tamanho + 1, 1, -1)))
+        digitos.append(soma * 10 % 11 % 10)
+    return ''.join(map(str, digitos))
+
+
+def cnpj_digits(raiz: int, filial: int = 1) -> str:
+    """
+    CNPJ (14 dígitos, sem máscara) com os dígitos verificadores corretos.
+
+    Args:
+        raiz: Número de 0 a 99.999.999 (os oito primeiros dígitos)
+        filial: Número do estabelecimento (0001 = matriz)
+    """
+    digitos = [int(c) for c in f"{raiz:08d}{filial:04d}"]
+    for pesos in ([5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2], [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]):
+        resto = sum(d * peso for d, peso in zip(digitos, pesos)) % 11
+        digitos.append(0 if resto < 2 else 11 - resto)
+    return ''.join(map(str, digitos))
+
+
+def ean13(base: int) -> str:
+    """
+    Código de barras EAN-13 com prefixo brasileiro (789) e dígito verificador.
+
+    Args:
+        base: Número de 0 a 999.999.999 (código do produto)
+    """
+    digitos = [int(c) for c in f"789{base:09d}"]
+    soma = sum(d * (3 if i % 2 else 1) for i, d in enumerate(digitos))
+    return ''.join(map(str, digitos)) + str((10 - soma % 10) % 10)
+
+
+def _embaralhar(numero: int, deslocamento: int, modulo: int) -> int:
+    # Bijeção em [0, modulo): números distintos geram documentos distintos
+    # (387420489 = 3^18 não tem fator 2 nem 5, logo é inversível módulo 10^n)
+    return (numero * 387420489 + deslocamento) % modulo
+
+
+def _sorteador(rng: random.Random, opcoes: Sequence[Tuple[object, int]]) -> Callable[[], object]:
+    """
+    Retorna uma função que sorteia um valor de (valor, peso) com rng.
+    """
+    valores = [valor for valor, _ in opcoes]
+    acumulados = []
+    total = 0
+    for _, peso in opcoes:
+        total += peso
+        acumulados.append(total)
+
+    def sortear():
+        return valores[bisect.bisect(acumulados, rng.random() * total)]
+    return sortear
+
+
+class _Datas:
+    """
+    Textos de data e hora por índice de dia, calculados uma vez.
+
+    O dia 0 é o primeiro dia do período e ultimo_dia é `ate`; há folga
+    depois dele para prazos e vencimentos futuros.
+    """
+
+    FOLGA = 180
+
+    def __init__(self, ate: date, dias: int):
+        inicio = ate - timedelta(days=dias - 1)
+        self.ultimo_dia = dias - 1
+        self.dias = [(inicio + timedelta(days=i)).isoformat() for i in range(dias + self.FOLGA)]
+        # Horário comercial, de segundo em segundo (com o espaço separador)
+        self.horas = [f" {h:02d}:{m:02d}:{s:02d}"
+                      for h in range(8, 19) for m in range(60) for s in range(60)]
+
+    def data(self, dia: int) -> str:
+        return self.dias[dia]
+
+    def data_hora(self, rng: random.Random, dia: int) -> str:
+        return self.dias[dia] + self.horas[int(rng.random() * len(self.horas))]
+
+
+# ========================================================================================
+# GERAÇÃO DAS LINHAS
+# ========================================================================================
+
+def _situacao(rng: random.Random, fracao_ativos: float, cadastro: str) -> tuple:
+    # (ativo, cadastro, atualização, exclusão): inativos com data_exclusao
+    # explícita, já que os triggers podem estar desligados durante a carga
+    if rng.random() < fracao_ativos:
+        return 1, cadastro, cadastro, None
+    return 0, cadastro, cadastro, cadastro
+
+
+def _usuarios(rng: random.Random, primeiro_id: int, quantidade: int,
+              datas: _Datas) -> List[tuple]:
+    senha = hash_password(SENHA_PADRAO)
+    linhas = []
+    for usuario_id in range(primeiro_id, primeiro_id + quantidade):
+        p, s = rng.randrange(len(PRENOMES)), rng.randrange(len(SOBRENOMES))
+        # Um administrador a cada dez usuários (o primeiro sempre é)
+        perfil = 'admin' if (usuario_id - primeiro_id) % 10 == 0 else 'operador'
+        criacao = datas.data_hora(rng, rng.randrange(datas.ultimo_dia + 1))
+        linhas.append((
+            usuario_id, f"{PRENOMES[p]} {SOBRENOMES[s]}",
+            f"{_PRENOMES_EMAIL[p]}.{_SOBRENOMES_EMAIL[s]}.{usuario_id}@graficacontrol.com.br",
+            senha, perfil, *_situacao(rng, 0.9, criacao),
+        ))
+    return linhas
+
+
+def _clientes(rng: random.Random, primeiro_id: int, quantidade: int,
+              datas: _Datas, deslocamento: int) -> List[tuple]:
+    cidade = _sorteador(rng, [(c, c[4]) for c in CIDADES])
+    linhas = []
+    for cliente_id in range(primeiro_id, primeiro_id + quantidade):
+        p, s1, s2 = (rng.randrange(len(PRENOMES)), rng.randrange(len(SOBRENOMES)),
+                     rng.randrange(len(SOBRENOMES)))
+        nome = f"{PRENOMES[p]} {SOBRENOMES[s1]} {SOBRENOMES[s2]}"
+        nome_cidade, uf, ddd, (cep_min, cep_max), _ = cidade()
+
+        if rng.random() < 0.35:
+            empresa = (f"{rng.choice(RAMOS)} {SOBRENOMES[s2]} "
+                       f"{rng.choice(SUFIXOS_EMPRESA)}")
+            documento = cnpj_digits(_embaralhar(cliente_id, deslocamento, 10 ** 8))
+            email = f"contato{cliente_id}@{_sem_acento(empresa.split()[-2])}.com.br"
+        else:
+            empresa = None
+            documento = cpf_digits(_embaralhar(cliente_id, deslocamento, 10 ** 9))
+            email = (f"{_PRENOMES_EMAIL[p]}.{_SOBRENOMES_EMAIL[s1]}{cliente_id}"
+                     f"@{rng.choice(PROVEDORES)}")
+
+        cadastro = datas.data_hora(rng, rng.randrange(datas.ultimo_dia + 1))
+        linhas.append((
+            cliente_id, nome, empresa, email,
+            f"({ddd}) 9{rng.randrange(10000):04d}-{rng.randrange(10000):04d}",
+            f"{rng.choice(TIPOS_LOGRADOURO)} {rng.choice(LOGRADOUROS)}, "
+            f"{rng.randint(1, 3999)} - {rng.choice(BAIRROS)}",
+            nome_cidade, uf,
+            f"{rng.randint(cep_min, cep_max):05d}-{rng.randrange(1000):03d}",
+            documento, *_situacao(rng, 0.97, cadastro),
+        ))
+    return linhas
+
+
+def _materiais(rng: random.Random, primeiro_id: int, quantidade: int,
+               datas: _Datas, deslocamento: int) -> List[tuple]:
+    linhas = []
+    for material_id in range(primeiro_id, primeiro_id + quantidade):
+        categoria, nome, variacoes, unidade, (preco_min, preco_max), fornecedores = (
+            CATALOGO[rng.randrange(len(CATALOGO))]
+        )
+        variacao = rng.choice(variacoes)
+        minimo = rng.choice([5, 10, 20, 50])
+        cadastro = datas.data_hora(rng, rng.randrange(datas.ultimo_dia + 1))
+        linhas.append((
+            material_id, f"{nome} {variacao}",
+            f"{nome} {variacao} para uso em {rng.choice(SERVICOS)[0].lower()}",
+            categoria, unidade, rng.randint(preco_min, preco_max),
+            rng.randint(0, minimo * 8), minimo, rng.choice(fornecedores),
+            ean13(_embaralhar(material_id, deslocamento, 10 ** 9)),
+            *_situacao(rng, 0.95, cadastro),
+        ))
+    return linhas
+
+
+class _Gerador:
+    """
+    Gera orçamentos em blocos, com os pagamentos e a produção de cada um.
+    """
+
+    def __init__(self, rng: random.Random, datas: _Datas, ids: Dict[str, int],
+                 clientes: int, usuarios: int):
+        self.rng = rng
+        self.datas = datas
+        self.ids = ids
+        self.clientes = clientes
+        self.usuarios = usuarios
+        self.status_recente = _sorteador(rng, STATUS_RECENTES)
+        self.status_antigo = _sorteador(rng, STATUS_ANTIGOS)
+        self.parcelas = _sorteador(rng, PARCELAS)
+        self.forma_a_vista = _sorteador(rng, FORMAS_A_VISTA)
+        self.forma_parcelado = _sorteador(rng, FORMAS_PARCELADO)
+        self.responsaveis = [f"{rng.choice(PRENOMES)} {rng.choice(SOBRENOMES)}"
+                             for _ in range(max(3, usuarios))]
+
+    def bloco(self, quantidade: int) -> Tuple[List[tuple], List[tuple], List[tuple]]:
+        """
+        Gera `quantidade` orçamentos.
+
+        É o trecho mais executado do gerador: usa rng.random() direto em
+        vez de randrange/choice e textos de data pré-calculados.
+
+        Returns:
+            Tuple: Linhas de orcamentos, pagamentos e producao
+        """
+        r = self.rng.random
+        ids = self.ids
+        dias_txt, horas = self.datas.dias, self.datas.horas
+        n_horas = len(horas)
+        ultimo = self.datas.ultimo_dia
+        dias = ultimo + 1
+        n_servicos, n_acabamentos = len(SERVICOS), len(ACABAMENTOS)
+        n_responsaveis, n_equipamentos = len(self.responsaveis), len(EQUIPAMENTOS)
+        clientes_base, usuarios_base = ids['clientes_base'] + 1, ids['usuarios_base'] + 1
+        orcamentos, pagamentos, producao = [], [], []
+
+        for _ in range(quantidade):
+            ids['orcamentos'] += 1
+            orcamento_id = ids['orcamentos']
+            # Mais orçamentos nos meses recentes (a gráfica cresce)
+            dia = int(dias * r() ** 0.5)
+            status = self.status_recente() if ultimo - dia < DIAS_RECENTES else self.status_antigo()
+            # Poucos clientes concentram boa parte dos pedidos
+            cliente_id = clientes_base + int(self.clientes * r() ** 2)
+            usuario_id = usuarios_base + int(self.usuarios * r())
+
+            servico, quantidades, (vu_min, vu_max) = SERVICOS[int(n_servicos * r())]
+            qtd = quantidades[int(len(quantidades) * r())]
+            valor_unitario = vu_min + int((vu_max - vu_min + 1) * r())
+            valor_total = qtd * valor_unitario
+            criacao = dias_txt[dia] + horas[int(n_horas * r())]
+
+            aprovado = status == 'aprovado' or status == 'concluido'
+            if aprovado:
+                dia_aprovacao = min(dia + int(4 * r()), ultimo)
+                prazo = dia_aprovacao + 3 + int(18 * r())
+                aprovacao = dias_txt[dia_aprovacao] + horas[int(n_horas * r())]
+            else:
+                prazo = dia + 3 + int(18 * r())
+                aprovacao = None
+
+            orcamentos.append((
+                orcamento_id, f"ORC-{criacao[:4]}-{orcamento_id:07d}", cliente_id,
+                f"{servico}{ACABAMENTOS[int(n_acabamentos * r())]} - {qtd} unidades",
+                qtd, valor_unitario, valor_total, dias_txt[prazo], status,
+                "Cliente pediu prova de cor" if r() < 0.05 else None,
+                criacao, aprovacao, dias_txt[dia + 15], usuario_id,
+            ))
+            if not aprovado:
+                continue
+
+            # Pagamentos: parcelas mensais que somam o valor do orçamento
+            parcelas = self.parcelas()
+            forma = self.forma_a_vista() if parcelas == 1 else self.forma_parcelado()
+            prefixo = forma[:3].upper()
+            valor_parcela, resto = divmod(valor_total, parcelas)
+            for k in range(parcelas):
+                ids['pagamentos'] += 1
+                pagamento_id = ids['pagamentos']
+                vencimento = dia_aprovacao + 30 * k
+                if status == 'concluido' or (vencimento <= ultimo and r() < 0.85):
+                    situacao = 'pago'
+                    dia_pagamento = max(dia_aprovacao, min(vencimento - int(3 * r()), ultimo))
+                    data_pagamento = dias_txt[dia_pagamento] + horas[int(n_horas * r())]
+                    comprovante = f"{prefixo}{pagamento_id:09d}"
+                else:
+                    situacao = 'vencido' if vencimento < ultimo else 'pendente'
+                    data_pagamento = comprovante = None
+                pagamentos.append((
+                    pagamento_id, orcamento_id, valor_parcela + (resto if k == 0 else 0),
+                    forma, situacao, dias_txt[vencimento], data_pagamento,
+                    f"Parcela {k + 1}/{parcelas}" if parcelas > 1 else None,
+                    comprovante, aprovacao, usuario_id,
+                ))
+
+            # Produção: concluída nos orçamentos concluídos
+            ids['producao'] += 1
+            inicio_producao = min(dia_aprovacao + 1, ultimo)
+            if status == 'concluido':
+                situacao = 'concluido'
+                data_inicio = dias_txt[inicio_producao] + horas[int(n_horas * r())]
+                conclusao = (dias_txt[min(inicio_producao + int(6 * r()), ultimo)]
+                             + horas[int(n_horas * r())])
+                qualidade = 1 if r() < 0.97 else 0
+            else:
+                situacao = 'em_andamento' if r() < 0.5 else 'aguardando'
+                data_inicio = (dias_txt[inicio_producao] + horas[int(n_horas * r())]
+                               if situacao == 'em_andamento' else None)
+                conclusao, qualidade = None, 0
+            producao.append((
+                ids['producao'], orcamento_id, situacao, data_inicio, dias_txt[prazo],
+                conclusao, self.responsaveis[int(n_responsaveis * r())],
+                EQUIPAMENTOS[int(n_equipamentos * r())],
+                "Refeito por falha de registro" if qualidade == 0 and conclusao else None,
+                qualidade, aprovacao, conclusao or aprovacao, usuario_id,
+            ))
+
+        return orcamentos, pagamentos, producao
+
+
+INSERTS = {
+    'usuarios': """INSERT INTO usuarios (id, nome, email, senha, perfil, ativo,
+                   data_criacao, data_atualizacao, data_exclusao)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+    'clientes': """INSERT INTO clientes (id, nome, empresa, email, telefone, endereco,
+                   cidade, estado, cep, cpf_cnpj, ativo, data_cadastro, data_atualizacao,
+                   data_exclusao) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+    'materiais': """INSERT INTO materiais (id, nome, descricao, categoria, unidade,
+                    preco_unitario, estoque_atual, estoque_minimo, fornecedor, codigo_barras,
+                    ativo, data_cadastro, data_atualizacao, data_exclusao)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+    'orcamentos': """INSERT INTO orcamentos (id, numero_orcamento, cliente_id,
+                     descricao_servico, quantidade, valor_unitario, valor_total, prazo_entrega,
+                     status, observacoes, data_criacao, data_aprovacao, data_vencimento,
+                     usuario_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+    'pagamentos': """INSERT INTO pagamentos (id, orcamento_id, valor_pagamento,
+                     forma_pagamento, status_pagamento, data_vencimento, data_pagamento,
+                     observacoes, numero_comprovante, data_criacao, usuario_id)
+                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+    'producao': """INSERT INTO producao (id, orcamento_id, status_producao, data_inicio,
+                   data_previsao_fim, data_conclusao, responsavel, equipamento_usado,
+                   observacoes_producao, qualidade_aprovada, data_criacao, data_atualizacao,
+                   usuario_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+}
+
+
+# ========================================================================================
+# GRAVAÇÃO
+# ========================================================================================
+
+class DatasetResult(NamedTuple):
+    """
+    Resultado de generate_dataset.
+    """
+    orcamentos: int
+    semente: int
+    linhas: Dict[str, int]
+    segundos: float
+    linhas_por_segundo: float
+
+
+def _desligar_derivados(conn: sqlite3.Connection) -> List[str]:
+    """
+    Remove os índices secundários e os triggers das seis tabelas.
+
+    Returns:
+        List[str]: Comandos que os recriam (índices antes dos triggers)
+    """
+    marcadores = ', '.join('?' * len(TABELAS))
+    objetos = conn.execute(f"""
+        SELECT type, name, sql FROM sqlite_master
+        WHERE type IN ('index', 'trigger') AND sql IS NOT NULL
+          AND tbl_name IN ({marcadores})
+        ORDER BY type = 'trigger', name
+    """, TABELAS).fetchall()
+    for tipo, nome, _ in objetos:
+        conn.execute(f'DROP {tipo.upper()} "{nome}"')
+    return [sql for _, _, sql in objetos]
+
+
+def generate_dataset(escala: str = 'pequeno', seed: int = DEFAULT_SEED,
+                     orcamentos: Optional[int] = None, ate: date = DEFAULT_END_DATE,
+                     anos: int = 3, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     progresso: Optional[Callable[[int, int, float], None]] = None
+                     ) -> DatasetResult:
+    """
+    Gera dados sintéticos no banco configurado (ver configure_database).
+
+    Aplica as migrações pendentes antes de gravar.
+
+    Args:
+        escala: Nome em ESCALAS (define a quantidade de orçamentos)
+        seed: Semente do gerador; a mesma semente gera os mesmos dados
+        orcamentos: Quantidade de orçamentos (substitui a escala)
+        ate: Último dia do período gerado
+        anos: Tamanho do período, em anos
+        chunk_size: Orçamentos gerados e gravados por bloco
+        progresso: Chamada após cada bloco com (orçamentos gravados,
+            total, linhas por segundo)
+
+    Returns:
+        DatasetResult: Linhas gravadas por tabela e taxa de gravação
+
+    Raises:
+        ValueError: Se a escala não existir ou as quantidades forem inválidas
+    """
+    if orcamentos is None:
+        if escala not in ESCALAS:
+            raise ValueError(f"Escala desconhecida: {escala!r} (disponíveis: {', '.join(ESCALAS)})")
+        orcamentos = ESCALAS[escala]
+    if orcamentos < 1 or anos < 1 or chunk_size < 1:
+        raise ValueError("orcamentos, anos e chunk_size devem ser positivos")
+
+    migrate()
+
+    rng = random.Random(seed)
+    datas = _Datas(ate, anos * 365)
+    quantidades = {
+        'usuarios': min(max(orcamentos // 20000, 5), 200),
+        'clientes': max(orcamentos // 8, 20),
+        'materiais': min(max(orcamentos // 100, 50), 20000),
+    }
+    deslocamento = rng.randrange(10 ** 9)
+
+    inicio = time.perf_counter()
+    conn = open_connection(get_database_target(), profile=BULK_PROFILE)
+    conn.isolation_level = None
+    linhas = dict.fromkeys(TABELAS, 0)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Ids continuam a partir dos existentes
+            ids = {tabela: conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {tabela}").fetchone()[0]
+                   for tabela in TABELAS}
+            ids['usuarios_base'] = ids['usuarios']
+            ids['clientes_base'] = ids['clientes']
+
+            reconstruir = ids['orcamentos'] < orcamentos
+            recriar = _desligar_derivados(conn) if reconstruir else []
+
+            for tabela, gerar in (('usuarios', _usuarios), ('clientes', _clientes),
+                                  ('materiais', _materiais)):
+                extra = () if tabela == 'usuarios' else (deslocamento,)
+                quantidade = quantidades[tabela]
+                for primeiro in range(0, quantidade, chunk_size):
+                    bloco = gerar(rng, ids[tabela] + primeiro + 1,
+                                  min(chunk_size, quantidade - primeiro), datas, *extra)
+                    conn.executemany(INSERTS[tabela], bloco)
+                    linhas[tabela] += len(bloco)
+
+            gerador = _Gerador(rng, datas, ids, quantidades['clientes'], quantidades['usuarios'])
+            gravados = 0
+            while gravados < orcamentos:
+                quantidade = min(chunk_size, orcamentos - gravados)
+                for tabela, bloco in zip(('orcamentos', 'pagamentos', 'producao'),
+                                         gerador.bloco(quantidade)):
+                    conn.executemany(INSERTS[tabela], bloco)
+                    linhas[tabela] += len(bloco)
+                gravados += quantidade
+
+                taxa = sum(linhas.values()) / (time.perf_counter() - inicio)
+                logger.debug("📦 %s/%s orçamentos (%.0f linhas/s)", gravados, orcamentos, taxa)
+                if progresso is not None:
+                    progresso(gravados, orcamentos, taxa)
+
+            if reconstruir:
+                # Busca e resumos antes dos índices: os recálculos leem as
+                # tabelas inteiras em sequência, sem passar pelos índices
+                for tabela in SEARCH_SPECS:
+                    conn.execute(f"INSERT INTO {tabela}_busca({tabela}_busca) VALUES ('rebuild')")
+                # (os orçamentos já arquivados continuam nos resumos)
+                fill_summaries(conn, default_archive())
+            for sql in recriar:
+                conn.execute(sql)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        # Estatísticas do planejador para o novo volume (ver setup.analyze_database)
+        conn.execute("PRAGMA analysis_limit = 1000")
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+        invalidate_result_cache()
+
+    segundos = time.perf_counter() - inicio
+    total = sum(linhas.values())
+    resultado = DatasetResult(
+        orcamentos=orcamentos,
+        semente=seed,
+        linhas=linhas,
+        segundos=segundos,
+        linhas_por_segundo=total / segundos if segundos else 0.0,
+    )
+    logger.info("✅ Dados sintéticos: %s linhas (%s orçamentos, semente %s) em %.1fs (%.0f linhas/s)",
+                total, orcamentos, seed, segundos, resultado.linhas_por_segundo)
+    return resultado
+
+
+def main():
+    """
+    Linha de comando: gera dados sintéticos em um banco de teste.
+    """
+    parser = argparse.ArgumentParser(description="Gerador de dados sintéticos")
+    parser.add_argument('escala', nargs='?', default='pequeno', choices=list(ESCALAS))
+    parser.add_argument('--banco', required=True,
+                        help="arquivo do banco (criado se não existir)")
+    parser.add_argument('--semente', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--orcamentos', type=int, default=None,
+                        help="quantidade de orçamentos (substitui a escala)")
+    parser.add_argument('--ate', type=date.fromisoformat, default=DEFAULT_END_DATE,
+                        help="último dia dos dados (AAAA-MM-DD)")
+    parser.add_argument('--anos', type=int, default=3)
+    parser.add_argument('--lote', type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    def mostrar(gravados: int, total: int, taxa: float) -> None:
+        print(f"\r📦 {gravados:,}/{total:,} orçamentos ({taxa:,.0f} linhas/s)", end='', flush=True)
+
+    configure_database(args.banco)
+    try:
+        resultado = generate_dataset(args.escala, seed=args.semente, orcamentos=args.orcamentos,
+                                     ate=args.ate, anos=args.anos, chunk_size=args.lote,
+                                     progresso=mostrar)
+    except (ValueError, sqlite3.Error) as e:
+        print(f"\n❌ Erro ao gerar dados: {e}")
+        sys.exit(1)
+
+    print()
+    for tabela, quantidade in resultado.linhas.items():
+        print(f"   {tabela:<12}{quantidade:>12,}")
+    print(f"✅ {sum(resultado.linhas.values()):,} linhas em {resultado.segundos:.1f}s "
+          f"({resultado.linhas_por_segundo:,.0f} linhas/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Bancos em memória para testes e benchmarks.
+
+Um banco modelo é criado uma única vez por processo (por padrão com
+setup.create_database) e mantido em memória. Cada teste recebe uma cópia
+nova desse modelo, feita com a API de backup do sqlite3, em um banco em
+memória próprio: o arquivo database/db.sqlite nunca é tocado e cada
+cópia leva milissegundos.
+
+Exemplo:
+    >>> from database.testing import isolated_database
+    >>> with isolated_database():
+    ...     criar_usuario("Teste", "teste@grafica.com", "1234", "operador")
+    ...     # ao sair, o banco anterior volta a ser usado
+
+Autor: Sistema Gráfica
+Data: 2025
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+# Adiciona o diretório pai ao path para importar connection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import connection
+from database.logger import get_logger
+
+
+logger = get_logger('database.testing')
+
+_template: Optional[sqlite3.Connection] = None
+_template_lock = threading.Lock()
+
+
+def _criar_esquema_padrao() -> None:
+    # Import tardio: setup importa connection e imprime o progresso
+    from database.setup import create_database
+    create_database()
+
+
+def build_template(builder: Optional[Callable[[], None]] = None,
+                   rebuild: bool = False) -> sqlite3.Connection:
+    """
+    Cria (uma vez) o banco modelo em memória.
+
+    builder é executado com um banco em memória vazio configurado como
+    alvo (ver connection.configure_database), então pode usar
+    execute_query e as funções de setup normalmente. O alvo anterior é
+    restaurado ao final.
+
+    Args:
+        builder: Função que cria o esquema e os dados do modelo
+            (padrão: setup.create_database)
+        rebuild: Descarta o modelo existente e cria de novo
+
+    Returns:
+        sqlite3.Connection: Conexão com o banco modelo (não fechar)
+    """
+    global _template
+
+    with _template_lock:
+        if _template is not None and not rebuild:
+            return _template
+
+        anterior = connection.get_database_target()
+        alvo = connection.configure_database(':memory:')
+        try:
+            (builder or _criar_esquema_padrao)()
+
+            modelo = sqlite3.connect(':memory:', check_same_thread=False)
+            origem = sqlite3.connect(alvo, uri=True)
+            try:
+                origem.backup(modelo)
+            finally:
+                origem.close()
+        finally:
+            connection.configure_database(anterior)
+
+        antigo, _template = _template, modelo
+        if antigo is not None:
+            antigo.close()
+        logger.debug("🧩 Banco modelo criado")
+        return _template
+
+
+def clone_template() -> str:
+    """
+    Configura como alvo uma cópia nova do banco modelo.
+
+    Returns:
+        str: URI do banco em memória com a cópia
+
+    Exemplo:
+        >>> alvo = clone_template()
+        >>> execute_query("SELECT COUNT(*) FROM usuarios")
+    """
+    modelo = build_template()
+    alvo = connection.configure_database(':memory:')
+
+    destino = sqlite3.connect(alvo, uri=True)
+    try:
+        with _template_lock:
+            modelo.backup(destino)
+    finally:
+        destino.close()
+    return alvo
+
+
+@contextmanager
+def isolated_database(template: bool = True) -> Iterator[str]:
+    """
+    Executa um bloco com um banco em memória descartável.
+
+    Args:
+        template: Se True, o banco começa como cópia do modelo
+            (build_template); se False, começa vazio
+
+    Yields:
+        str: URI do banco em memória
+    """
+    anterior = connection.get_database_target()
+    alvo = clone_template() if template else connection.configure_database(':memory:')
+    try:
+        yield alvo
+    finally:
+        connection.configure_database(anterior)
+
+
+def reset_template() -> None:
+    """
+    Descarta o banco modelo (o próximo uso o recria).
+    """
+    global _template
+    with _template_lock:
+        antigo, _template = _template, None
+    if antigo is not None:
+        antigo.close()
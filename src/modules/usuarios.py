@@ -4,51 +4,40 @@ Módulo de gerenciamento de usuários para sistema da gráfica.
 Este módulo implementa todas as operações CRUD (Create, Read, Update, Delete)
 para usuários do sistema, incluindo hash de senhas e validações.
 
+A exclusão é lógica (ativo = 0): o usuário some das listagens e não
+consegue mais entrar, mas continua ligado aos orçamentos, pagamentos e
+registros de produção que fez, e pode ser reativado. Os desativados há
+muito tempo são apagados por database/soft_delete.py.
+
 Sprint 3 - Cadastro de Usuários
 Autor: Sistema Gráfica
 Data: 2025
 """
 
-import hashlib
 import os
 import sys
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from typing import Iterator, List, Dict, Optional, Tuple
 
 # Adiciona o diretório pai ao path para importar connection
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from database.connection import execute_query
+from database.connection import execute_query, iter_query, transaction
+from database.logger import get_logger
+# O hash fica na camada de banco (usado também pelo setup e pelas migrações)
+from database.passwords import hash_password as gerar_hash_senha
 
 
-def gerar_hash_senha(senha: str) -> str:
-    """
-    Gera hash SHA256 para a senha fornecida.
-    
-    Args:
-        senha (str): Senha em texto puro
-        
-    Returns:
-        str: Hash SHA256 da senha
-        
-    Exemplo:
-        >>> hash_gerado = gerar_hash_senha("minha_senha123")
-        >>> print(len(hash_gerado))  # 64 caracteres
-        64
-    """
-    # Converte a senha para bytes e gera o hash SHA256
-    senha_bytes = senha.encode('utf-8')
-    hash_objeto = hashlib.sha256(senha_bytes)
-    hash_hex = hash_objeto.hexdigest()
-    
-    print(f"🔐 Hash gerado para senha (primeiros 8 caracteres): {hash_hex[:8]}...")
-    return hash_hex
+logger = get_logger('modules.usuarios')
 
 
 def criar_usuario(nome: str, email: str, senha: str, perfil: str) -> bool:
     """
     Cria um novo usuário no sistema.
     
+    Se o email pertencer a um usuário desativado, esse usuário é reativado
+    com o nome, a senha e o perfil informados (mantém o mesmo ID).
+    
     Args:
         nome (str): Nome completo do usuário
         email (str): Email único do usuário
@@ -56,13 +45,14 @@ def criar_usuario(nome: str, email: str, senha: str, perfil: str) -> bool:
         perfil (str): Perfil do usuário ('admin' ou 'operador')
         
     Returns:
-        bool: True se usuário foi criado com sucesso, False caso contrário
+        bool: True se usuário foi criado (ou reativado) com sucesso, False
+        se o email já estiver em uso por um usuário ativo ou houver erro
         
     Raises:
         ValueError: Se os parâmetros estiverem inválidos
         sqlite3.Error: Se houver erro no banco de dados
     """
-    print(f"👤 Criando usuário: {nome} ({email}) - Perfil: {perfil}")
+    logger.debug("👤 Criando usuário: %s (%s) - Perfil: %s", nome, email, perfil)
     
     # Validações básicas
     if not nome or not nome.strip():
@@ -81,35 +71,91 @@ def criar_usuario(nome: str, email: str, senha: str, perfil: str) -> bool:
         raise ValueError("Perfil deve ser 'admin' ou 'operador'")
     
     try:
-        # Verifica se email já existe
-        usuario_existente = buscar_usuario_por_email(email)
-        if usuario_existente:
-            print(f"❌ Email {email} já está em uso")
-            return False
-        
-        # Gera hash da senha
-        senha_hash = gerar_hash_senha(senha)
-        
-        # Insere o novo usuário
-        query = """
-        INSERT INTO usuarios (nome, email, senha, perfil, data_criacao, data_atualizacao) 
-        VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-        """
-        
-        execute_query(query, (nome.strip(), email.strip().lower(), senha_hash, perfil))
-        
-        print(f"✅ Usuário {nome} criado com sucesso!")
-        return True
+        # Verificação do email e INSERT em uma única transação
+        with transaction(immediate=True):
+            # Verifica se email já existe (inclusive em usuário desativado)
+            usuario_existente = buscar_usuario_por_email(email, incluir_inativos=True)
+            if usuario_existente and usuario_existente['ativo']:
+                logger.info("❌ Email %s já está em uso", email)
+                return False
+            
+            # Gera hash da senha
+            senha_hash = gerar_hash_senha(senha)
+            
+            if usuario_existente:
+                # O email pertence a um usuário desativado: reaproveita a
+                # linha (o email é UNIQUE) com os dados do novo cadastro
+                query = """
+                UPDATE usuarios 
+                SET nome = ?, senha = ?, perfil = ?, ativo = 1, data_atualizacao = CURRENT_TIMESTAMP 
+                WHERE id = ?
+                """
+                execute_query(query, (nome.strip(), senha_hash, perfil, usuario_existente['id']))
+                
+                logger.info("♻️  Usuário desativado com o email %s reativado como %s", email, nome)
+                return True
+            
+            # Insere o novo usuário
+            query = """
+            INSERT INTO usuarios (nome, email, senha, perfil, data_criacao, data_atualizacao) 
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+            """
+            
+            execute_query(query, (nome.strip(), email.strip().lower(), senha_hash, perfil))
+            
+            logger.info("✅ Usuário %s criado com sucesso!", nome)
+            return True
         
     except Exception as e:
-        print(f"❌ Erro ao criar usuário: {e}")
+        logger.error("❌ Erro ao criar usuário: %s", e)
         return False
 
 
-def listar_usuarios() -> List[Dict]:
+def iter_usuarios(batch_size: int = 500, incluir_inativos: bool = False) -> Iterator[Dict]:
+    """
+    Percorre os usuários ativos, ordenados por nome, sob demanda.
+    
+    Usa memória constante independente do tamanho da tabela; indicado
+    para exportações e relatórios. Mesmos campos de listar_usuarios().
+    
+    Args:
+        batch_size (int): Quantidade de linhas lidas do banco por vez
+        incluir_inativos (bool): Inclui os usuários desativados
+        
+    Yields:
+        Dict: Dados de um usuário
+        
+    Raises:
+        sqlite3.Error: Se houver erro no banco de dados
+    """
+    # "ativo = 1" usa o índice parcial idx_usuarios_nome_ativos, já em
+    # ordem de nome: os inativos acumulados não entram na leitura
+    query = f"""
+    SELECT id, nome, email, perfil, ativo, data_criacao, data_atualizacao 
+    FROM usuarios 
+    {'' if incluir_inativos else 'WHERE ativo = 1'}
+    ORDER BY nome
+    """
+    
+    for row in iter_query(query, batch_size=batch_size):
+        yield {
+            'id': row['id'],
+            'nome': row['nome'],
+            'email': row['email'],
+            'perfil': row['perfil'],
+            'ativo': bool(row['ativo']),
+            'data_criacao': row['data_criacao'],
+            'data_atualizacao': row['data_atualizacao']
+        }
+
+
+def listar_usuarios(incluir_inativos: bool = False) -> List[Dict]:
     """
-    Lista todos os usuários cadastrados no sistema.
+    Lista os usuários ativos do sistema.
     
+    Args:
+        incluir_inativos (bool): Inclui os usuários desativados
+        
     Returns:
         List[Dict]: Lista de dicionários com dados dos usuários
         
@@ -120,53 +166,37 @@ def listar_usuarios() -> List[Dict]:
                 'nome': 'Admin Sistema',
                 'email': 'admin@grafica.com',
                 'perfil': 'admin',
+                'ativo': True,
                 'data_criacao': '2025-01-15 10:30:00'
             },
             ...
         ]
     """
-    print("📋 Listando todos os usuários...")
+    logger.debug("📋 Listando todos os usuários...")
     
     try:
-        query = """
-        SELECT id, nome, email, perfil, data_criacao, data_atualizacao 
-        FROM usuarios 
-        ORDER BY nome
-        """
+        # Converte as linhas direto para dicionários, sem lista intermediária
+        usuarios = list(iter_usuarios(incluir_inativos=incluir_inativos))
         
-        resultado = execute_query(query)
-        
-        if not resultado:
-            print("ℹ️  Nenhum usuário encontrado")
+        if not usuarios:
+            logger.debug("ℹ️  Nenhum usuário encontrado")
             return []
         
-        # Converte sqlite3.Row para dicionários normais
-        usuarios = []
-        for row in resultado:
-            usuario = {
-                'id': row['id'],
-                'nome': row['nome'],
-                'email': row['email'],
-                'perfil': row['perfil'],
-                'data_criacao': row['data_criacao'],
-                'data_atualizacao': row['data_atualizacao']
-            }
-            usuarios.append(usuario)
-        
-        print(f"✅ {len(usuarios)} usuário(s) encontrado(s)")
+        logger.debug("✅ %s usuário(s) encontrado(s)", len(usuarios))
         return usuarios
         
     except Exception as e:
-        print(f"❌ Erro ao listar usuários: {e}")
+        logger.error("❌ Erro ao listar usuários: %s", e)
         return []
 
 
-def buscar_usuario_por_email(email: str) -> Optional[Dict]:
+def buscar_usuario_por_email(email: str, incluir_inativos: bool = False) -> Optional[Dict]:
     """
-    Busca um usuário específico pelo email.
+    Busca um usuário ativo pelo email.
     
     Args:
         email (str): Email do usuário a ser buscado
+        incluir_inativos (bool): Também encontra usuários desativados
         
     Returns:
         Dict ou None: Dados do usuário se encontrado, None caso contrário
@@ -176,23 +206,25 @@ def buscar_usuario_por_email(email: str) -> Optional[Dict]:
         >>> if usuario:
         ...     print(f"Usuário: {usuario['nome']}")
     """
-    print(f"🔍 Buscando usuário por email: {email}")
+    logger.debug("🔍 Buscando usuário por email: %s", email)
     
     if not email or not email.strip():
-        print("❌ Email não fornecido")
+        logger.info("❌ Email não fornecido")
         return None
     
     try:
-        query = """
-        SELECT id, nome, email, senha, perfil, data_criacao, data_atualizacao 
+        # email tem COLLATE NOCASE: a comparação ignora maiúsculas e usa o
+        # índice UNIQUE (LOWER(email) = ... obrigaria a ler a tabela inteira)
+        query = f"""
+        SELECT id, nome, email, senha, perfil, ativo, data_criacao, data_atualizacao 
         FROM usuarios 
-        WHERE LOWER(email) = LOWER(?)
+        WHERE email = ?{'' if incluir_inativos else ' AND ativo = 1'}
         """
         
-        resultado = execute_query(query, (email.strip(),))
+        resultado = execute_query(query, (email.strip().lower(),))
         
         if not resultado:
-            print(f"ℹ️  Usuário com email {email} não encontrado")
+            logger.debug("ℹ️  Usuário com email %s não encontrado", email)
             return None
         
         # Pega o primeiro resultado (email é único)
@@ -203,21 +235,25 @@ def buscar_usuario_por_email(email: str) -> Optional[Dict]:
             'email': row['email'],
             'senha': row['senha'],  # Hash - nunca exibir em logs
             'perfil': row['perfil'],
+            'ativo': bool(row['ativo']),
             'data_criacao': row['data_criacao'],
             'data_atualizacao': row['data_atualizacao']
         }
         
-        print(f"✅ Usuário encontrado: {usuario['nome']} - Perfil: {usuario['perfil']}")
+        logger.debug("✅ Usuário encontrado: %s - Perfil: %s", usuario['nome'], usuario['perfil'])
         return usuario
         
     except Exception as e:
-        print(f"❌ Erro ao buscar usuário: {e}")
+        logger.error("❌ Erro ao buscar usuário: %s", e)
         return None
 
 
 def buscar_usuario_por_id(id_usuario: int) -> Optional[Dict]:
     """
-    Busca um usuário específico pelo ID.
+    Busca um usuário específico pelo ID, ativo ou não.
+    
+    Usado para mostrar quem fez um orçamento ou pagamento, inclusive
+    usuários já desativados; consulte o campo 'ativo' quando importar.
     
     Args:
         id_usuario (int): ID do usuário
@@ -225,15 +261,15 @@ def buscar_usuario_por_id(id_usuario: int) -> Optional[Dict]:
     Returns:
         Dict ou None: Dados do usuário se encontrado, None caso contrário
     """
-    print(f"🔍 Buscando usuário por ID: {id_usuario}")
+    logger.debug("🔍 Buscando usuário por ID: %s", id_usuario)
     
     if not id_usuario or id_usuario <= 0:
-        print("❌ ID inválido")
+        logger.info("❌ ID inválido")
         return None
     
     try:
         query = """
-        SELECT id, nome, email, perfil, data_criacao, data_atualizacao 
+        SELECT id, nome, email, perfil, ativo, data_criacao, data_atualizacao 
         FROM usuarios 
         WHERE id = ?
         """
@@ -241,7 +277,7 @@ def buscar_usuario_por_id(id_usuario: int) -> Optional[Dict]:
         resultado = execute_query(query, (id_usuario,))
         
         if not resultado:
-            print(f"ℹ️  Usuário com ID {id_usuario} não encontrado")
+            logger.debug("ℹ️  Usuário com ID %s não encontrado", id_usuario)
             return None
         
         row = resultado[0]
@@ -250,15 +286,16 @@ def buscar_usuario_por_id(id_usuario: int) -> Optional[Dict]:
             'nome': row['nome'],
             'email': row['email'],
             'perfil': row['perfil'],
+            'ativo': bool(row['ativo']),
             'data_criacao': row['data_criacao'],
             'data_atualizacao': row['data_atualizacao']
         }
         
-        print(f"✅ Usuário encontrado: {usuario['nome']}")
+        logger.debug("✅ Usuário encontrado: %s", usuario['nome'])
         return usuario
         
     except Exception as e:
-        print(f"❌ Erro ao buscar usuário por ID: {e}")
+        logger.error("❌ Erro ao buscar usuário por ID: %s", e)
         return None
 
 
@@ -284,88 +321,96 @@ def atualizar_usuario(id_usuario: int, nome: str = None, email: str = None,
         >>> # Atualizar nome e senha
         >>> sucesso = atualizar_usuario(1, nome="João", senha="nova_senha123")
     """
-    print(f"✏️  Atualizando usuário ID: {id_usuario}")
+    logger.debug("✏️  Atualizando usuário ID: %s", id_usuario)
     
     if not id_usuario or id_usuario <= 0:
-        print("❌ ID de usuário inválido")
-        return False
-    
-    # Verifica se usuário existe
-    usuario_atual = buscar_usuario_por_id(id_usuario)
-    if not usuario_atual:
-        print(f"❌ Usuário com ID {id_usuario} não encontrado")
+        logger.info("❌ ID de usuário inválido")
         return False
     
     try:
-        # Monta query dinâmica baseada nos campos fornecidos
-        campos_update = []
-        parametros = []
-        
-        if nome is not None and nome.strip():
-            campos_update.append("nome = ?")
-            parametros.append(nome.strip())
-        
-        if email is not None and email.strip():
-            # Verifica se novo email já existe (em outro usuário)
-            if email.lower() != usuario_atual['email'].lower():
-                usuario_email_existente = buscar_usuario_por_email(email)
-                if usuario_email_existente:
-                    print(f"❌ Email {email} já está em uso por outro usuário")
-                    return False
-            
-            if '@' not in email:
-                print("❌ Email deve ter formato válido")
-                return False
-                
-            campos_update.append("email = ?")
-            parametros.append(email.strip().lower())
-        
-        if senha is not None and senha.strip():
-            if len(senha) < 4:
-                print("❌ Senha deve ter pelo menos 4 caracteres")
+        # Verificação e UPDATE em uma única transação (um único commit)
+        with transaction(immediate=True):
+            # Verifica se usuário existe
+            usuario_atual = buscar_usuario_por_id(id_usuario)
+            if not usuario_atual:
+                logger.info("❌ Usuário com ID %s não encontrado", id_usuario)
                 return False
+            
+            # Monta query dinâmica baseada nos campos fornecidos
+            campos_update = []
+            parametros = []
+            
+            if nome is not None and nome.strip():
+                campos_update.append("nome = ?")
+                parametros.append(nome.strip())
+            
+            if email is not None and email.strip():
+                # Verifica se novo email já existe (em outro usuário)
+                if email.lower() != usuario_atual['email'].lower():
+                    usuario_email_existente = buscar_usuario_por_email(
+                        email, incluir_inativos=True
+                    )
+                    if usuario_email_existente:
+                        logger.info("❌ Email %s já está em uso por outro usuário", email)
+                        return False
                 
-            senha_hash = gerar_hash_senha(senha)
-            campos_update.append("senha = ?")
-            parametros.append(senha_hash)
-        
-        if perfil is not None and perfil.strip():
-            if perfil not in ['admin', 'operador']:
-                print("❌ Perfil deve ser 'admin' ou 'operador'")
+                if '@' not in email:
+                    logger.info("❌ Email deve ter formato válido")
+                    return False
+                    
+                campos_update.append("email = ?")
+                parametros.append(email.strip().lower())
+            
+            if senha is not None and senha.strip():
+                if len(senha) < 4:
+                    logger.info("❌ Senha deve ter pelo menos 4 caracteres")
+                    return False
+                    
+                senha_hash = gerar_hash_senha(senha)
+                campos_update.append("senha = ?")
+                parametros.append(senha_hash)
+            
+            if perfil is not None and perfil.strip():
+                if perfil not in ['admin', 'operador']:
+                    logger.info("❌ Perfil deve ser 'admin' ou 'operador'")
+                    return False
+                    
+                campos_update.append("perfil = ?")
+                parametros.append(perfil)
+            
+            # Se nenhum campo foi fornecido para atualização
+            if not campos_update:
+                logger.debug("ℹ️  Nenhum campo fornecido para atualização")
                 return False
-                
-            campos_update.append("perfil = ?")
-            parametros.append(perfil)
-        
-        # Se nenhum campo foi fornecido para atualização
-        if not campos_update:
-            print("ℹ️  Nenhum campo fornecido para atualização")
-            return False
-        
-        # Adiciona data de atualização
-        campos_update.append("data_atualizacao = CURRENT_TIMESTAMP")
-        parametros.append(id_usuario)  # Para a cláusula WHERE
-        
-        # Monta e executa query
-        query = f"""
-        UPDATE usuarios 
-        SET {', '.join(campos_update)} 
-        WHERE id = ?
-        """
-        
-        execute_query(query, tuple(parametros))
-        
-        print(f"✅ Usuário ID {id_usuario} atualizado com sucesso!")
-        return True
+            
+            # Adiciona data de atualização
+            campos_update.append("data_atualizacao = CURRENT_TIMESTAMP")
+            parametros.append(id_usuario)  # Para a cláusula WHERE
+            
+            # Monta e executa query
+            query = f"""
+            UPDATE usuarios 
+            SET {', '.join(campos_update)} 
+            WHERE id = ?
+            """
+            
+            execute_query(query, tuple(parametros))
+            
+            logger.info("✅ Usuário ID %s atualizado com sucesso!", id_usuario)
+            return True
         
     except Exception as e:
-        print(f"❌ Erro ao atualizar usuário: {e}")
+        logger.error("❌ Erro ao atualizar usuário: %s", e)
         return False
 
 
 def deletar_usuario(id_usuario: int) -> bool:
     """
-    Remove um usuário do sistema.
+    Remove (desativa) um usuário do sistema.
+    
+    A exclusão é lógica: o usuário fica com ativo = 0, deixa de aparecer
+    nas listagens e de conseguir entrar, mas os orçamentos, pagamentos e
+    registros de produção continuam ligados a ele.
     
     Args:
         id_usuario (int): ID do usuário a ser removido
@@ -374,30 +419,75 @@ def deletar_usuario(id_usuario: int) -> bool:
         bool: True se usuário foi removido com sucesso, False caso contrário
         
     Nota:
-        Esta operação é irreversível. Use com cuidado!
+        Pode ser desfeita com reativar_usuario() até a limpeza dos
+        inativos antigos (database/soft_delete.py).
     """
-    print(f"🗑️  Deletando usuário ID: {id_usuario}")
+    logger.debug("🗑️  Deletando usuário ID: %s", id_usuario)
     
     if not id_usuario or id_usuario <= 0:
-        print("❌ ID de usuário inválido")
+        logger.info("❌ ID de usuário inválido")
         return False
     
     try:
-        # Verifica se usuário existe antes de deletar
-        usuario = buscar_usuario_por_id(id_usuario)
-        if not usuario:
-            print(f"❌ Usuário com ID {id_usuario} não encontrado")
-            return False
+        # Verificação e UPDATE em uma única transação
+        with transaction(immediate=True):
+            # Verifica se usuário existe e ainda está ativo
+            usuario = buscar_usuario_por_id(id_usuario)
+            if not usuario or not usuario['ativo']:
+                logger.info("❌ Usuário com ID %s não encontrado", id_usuario)
+                return False
+            
+            # Desativa (data_exclusao é preenchida pelo trigger de ativo)
+            query = """
+            UPDATE usuarios 
+            SET ativo = 0, data_atualizacao = CURRENT_TIMESTAMP 
+            WHERE id = ?
+            """
+            execute_query(query, (id_usuario,))
+            
+            logger.info("✅ Usuário '%s' removido com sucesso!", usuario['nome'])
+            return True
         
-        # Executa a exclusão
-        query = "DELETE FROM usuarios WHERE id = ?"
-        execute_query(query, (id_usuario,))
+    except Exception as e:
+        logger.error("❌ Erro ao deletar usuário: %s", e)
+        return False
+
+
+def reativar_usuario(id_usuario: int) -> bool:
+    """
+    Reativa um usuário removido por deletar_usuario().
+    
+    Args:
+        id_usuario (int): ID do usuário a ser reativado
         
-        print(f"✅ Usuário '{usuario['nome']}' removido com sucesso!")
-        return True
+    Returns:
+        bool: True se usuário foi reativado, False se não existe ou já está ativo
+    """
+    logger.debug("♻️  Reativando usuário ID: %s", id_usuario)
+    
+    if not id_usuario or id_usuario <= 0:
+        logger.info("❌ ID de usuário inválido")
+        return False
+    
+    try:
+        with transaction(immediate=True):
+            usuario = buscar_usuario_por_id(id_usuario)
+            if not usuario or usuario['ativo']:
+                logger.info("❌ Usuário com ID %s não encontrado entre os removidos", id_usuario)
+                return False
+            
+            query = """
+            UPDATE usuarios 
+            SET ativo = 1, data_atualizacao = CURRENT_TIMESTAMP 
+            WHERE id = ?
+            """
+            execute_query(query, (id_usuario,))
+            
+            logger.info("✅ Usuário '%s' reativado com sucesso!", usuario['nome'])
+            return True
         
     except Exception as e:
-        print(f"❌ Erro ao deletar usuário: {e}")
+        logger.error("❌ Erro ao reativar usuário: %s", e)
         return False
 
 
@@ -417,78 +507,87 @@ def verificar_login(email: str, senha: str) -> Optional[Dict]:
         >>> if usuario:
         ...     print(f"Login válido: {usuario['nome']}")
     """
-    print(f"🔐 Verificando login para: {email}")
+    logger.debug("🔐 Verificando login para: %s", email)
     
     if not email or not senha:
-        print("❌ Email e senha são obrigatórios")
+        logger.info("❌ Email e senha são obrigatórios")
         return None
     
     try:
         # Busca usuário pelo email
         usuario = buscar_usuario_por_email(email)
         if not usuario:
-            print("❌ Usuário não encontrado")
+            logger.info("❌ Usuário não encontrado")
             return None
         
         # Verifica senha
         senha_hash = gerar_hash_senha(senha)
         if senha_hash == usuario['senha']:
-            print(f"✅ Login válido para {usuario['nome']} - Perfil: {usuario['perfil']}")
+            logger.debug("✅ Login válido para %s - Perfil: %s", usuario['nome'], usuario['perfil'])
             # Remove a senha do retorno por segurança
             del usuario['senha']
             return usuario
         else:
-            print("❌ Senha incorreta")
+            logger.info("❌ Senha incorreta")
             return None
             
     except Exception as e:
-        print(f"❌ Erro na verificação de login: {e}")
+        logger.error("❌ Erro na verificação de login: %s", e)
         return None
 
 
-def contar_usuarios() -> int:
+def contar_usuarios(incluir_inativos: bool = False) -> int:
     """
-    Conta o total de usuários cadastrados.
+    Conta os usuários ativos.
     
+    Args:
+        incluir_inativos (bool): Conta também os usuários desativados
+        
     Returns:
-        int: Número total de usuários
+        int: Número de usuários
     """
     try:
-        resultado = execute_query("SELECT COUNT(*) as total FROM usuarios")
+        # Só ativos: contagem pelo índice parcial, sem ler os inativos
+        query = "SELECT COUNT(*) as total FROM usuarios"
+        if not incluir_inativos:
+            query += " WHERE ativo = 1"
+        resultado = execute_query(query)
         return resultado[0]['total'] if resultado else 0
     except Exception as e:
-        print(f"❌ Erro ao contar usuários: {e}")
+        logger.error("❌ Erro ao contar usuários: %s", e)
         return 0
 
 
-def listar_usuarios_por_perfil(perfil: str) -> List[Dict]:
+def listar_usuarios_por_perfil(perfil: str, incluir_inativos: bool = False) -> List[Dict]:
     """
-    Lista usuários filtrados por perfil.
+    Lista usuários ativos filtrados por perfil.
     
     Args:
         perfil (str): Perfil a filtrar ('admin' ou 'operador')
+        incluir_inativos (bool): Inclui os usuários desativados
         
     Returns:
         List[Dict]: Lista de usuários do perfil especificado
     """
-    print(f"📋 Listando usuários com perfil: {perfil}")
+    logger.debug("📋 Listando usuários com perfil: %s", perfil)
     
     if perfil not in ['admin', 'operador']:
-        print("❌ Perfil deve ser 'admin' ou 'operador'")
+        logger.info("❌ Perfil deve ser 'admin' ou 'operador'")
         return []
     
     try:
-        query = """
-        SELECT id, nome, email, perfil, data_criacao, data_atualizacao 
+        # Ativos: idx_usuarios_perfil_ativos (perfil, nome), já ordenado
+        query = f"""
+        SELECT id, nome, email, perfil, ativo, data_criacao, data_atualizacao 
         FROM usuarios 
-        WHERE perfil = ? 
+        WHERE perfil = ?{'' if incluir_inativos else ' AND ativo = 1'} 
         ORDER BY nome
         """
         
         resultado = execute_query(query, (perfil,))
         
         if not resultado:
-            print(f"ℹ️  Nenhum usuário encontrado com perfil {perfil}")
+            logger.debug("ℹ️  Nenhum usuário encontrado com perfil %s", perfil)
             return []
         
         usuarios = []
@@ -498,16 +597,17 @@ def listar_usuarios_por_perfil(perfil: str) -> List[Dict]:
                 'nome': row['nome'],
                 'email': row['email'],
                 'perfil': row['perfil'],
+                'ativo': bool(row['ativo']),
                 'data_criacao': row['data_criacao'],
                 'data_atualizacao': row['data_atualizacao']
             }
             usuarios.append(usuario)
         
-        print(f"✅ {len(usuarios)} usuário(s) encontrado(s) com perfil {perfil}")
+        logger.debug("✅ %s usuário(s) encontrado(s) com perfil %s", len(usuarios), perfil)
         return usuarios
         
     except Exception as e:
-        print(f"❌ Erro ao listar usuários por perfil: {e}")
+        logger.error("❌ Erro ao listar usuários por perfil: %s", e)
         return []
 
 
@@ -515,10 +615,23 @@ def listar_usuarios_por_perfil(perfil: str) -> List[Dict]:
 # TESTES E EXECUÇÃO PRINCIPAL
 # ========================================================================================
 
-def executar_testes():
+def executar_testes(banco_real: bool = False):
     """
     Executa testes básicos do módulo de usuários.
+    
+    Por padrão os testes rodam em uma cópia em memória do banco modelo
+    (database.testing), sem alterar database/db.sqlite.
+    
+    Args:
+        banco_real: Executa os testes no banco configurado (arquivo)
     """
+    if not banco_real:
+        from database.testing import isolated_database
+        
+        with isolated_database():
+            executar_testes(banco_real=True)
+        return
+    
     print("\n" + "=" * 60)
     print("🧪 EXECUTANDO TESTES DO MÓDULO DE USUÁRIOS")
     print("=" * 60)
@@ -557,6 +670,15 @@ def executar_testes():
         total = contar_usuarios()
         print(f"  Total de usuários: {total}")
         
+        print("\n7️⃣ Teste: Remover e reativar usuário")
+        if usuario:
+            removido = deletar_usuario(usuario['id'])
+            bloqueado = verificar_login("operador@grafica.com", "teste123") is None
+            reativado = reativar_usuario(usuario['id'])
+            print(f"  Removido: {'✅' if removido else '❌'}  "
+                  f"Login bloqueado: {'✅' if bloqueado else '❌'}  "
+                  f"Reativado: {'✅' if reativado else '❌'}")
+        
         print("\n" + "=" * 60)
         print("✅ TESTES CONCLUÍDOS COM SUCESSO!")
         print("=" * 60)
@@ -570,6 +692,6 @@ if __name__ == "__main__":
     """
     Executa testes quando o módulo é chamado diretamente.
     
-    Uso: python modules/usuarios.py
+    Uso: python modules/usuarios.py [--banco-real]
     """
-    executar_testes()
\ No newline at end of file
+    executar_testes(banco_real='--banco-real' in sys.argv)
\ No newline at end of file
@@ -0,0 +1,109 @@
+"""
+Versão assíncrona (asyncio) das operações CRUD de usuários.
+
+Cada função tem a mesma assinatura e o mesmo retorno da função de mesmo
+nome em modules/usuarios.py, mais o argumento opcional timeout. O
+trabalho é executado nas threads dedicadas de database.aio, então o
+loop de eventos não é bloqueado.
+
+Exemplo:
+    >>> from modules import usuarios_aio
+    >>> usuario = await usuarios_aio.verificar_login("admin@grafica.com", "admin123")
+
+Sprint 3 - Cadastro de Usuários
+Autor: Sistema Gráfica
+Data: 2025
+"""
+
+import os
+import sys
+from typing import Dict, List, Optional
+
+# Adiciona o diretório pai ao path para importar database e modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import aio
+from modules import usuarios
+
+
+async def criar_usuario(nome: str, email: str, senha: str, perfil: str,
+                        timeout: Optional[float] = None) -> bool:
+    """
+    Versão assíncrona de usuarios.criar_usuario.
+    """
+    return await aio.run(usuarios.criar_usuario, nome, email, senha, perfil,
+                         timeout=timeout)
+
+
+async def listar_usuarios(incluir_inativos: bool = False,
+                          timeout: Optional[float] = None) -> List[Dict]:
+    """
+    Versão assíncrona de usuarios.listar_usuarios.
+    """
+    return await aio.run(usuarios.listar_usuarios, incluir_inativos, timeout=timeout)
+
+
+async def buscar_usuario_por_email(email: str, incluir_inativos: bool = False,
+                                   timeout: Optional[float] = None) -> Optional[Dict]:
+    """
+    Versão assíncrona de usuarios.buscar_usuario_por_email.
+    """
+    return await aio.run(usuarios.buscar_usuario_por_email, email, incluir_inativos,
+                         timeout=timeout)
+
+
+async def buscar_usuario_por_id(id_usuario: int,
+                                timeout: Optional[float] = None) -> Optional[Dict]:
+    """
+    Versão assíncrona de usuarios.buscar_usuario_por_id.
+    """
+    return await aio.run(usuarios.buscar_usuario_por_id, id_usuario, timeout=timeout)
+
+
+async def atualizar_usuario(id_usuario: int, nome: str = None, email: str = None,
+                            senha: str = None, perfil: str = None,
+                            timeout: Optional[float] = None) -> bool:
+    """
+    Versão assíncrona de usuarios.atualizar_usuario.
+    """
+    return await aio.run(usuarios.atualizar_usuario, id_usuario, nome=nome,
+                         email=email, senha=senha, perfil=perfil, timeout=timeout)
+
+
+async def deletar_usuario(id_usuario: int, timeout: Optional[float] = None) -> bool:
+    """
+    Versão assíncrona de usuarios.deletar_usuario.
+    """
+    return await aio.run(usuarios.deletar_usuario, id_usuario, timeout=timeout)
+
+
+async def reativar_usuario(id_usuario: int, timeout: Optional[float] = None) -> bool:
+    """
+    Versão assíncrona de usuarios.reativar_usuario.
+    """
+    return await aio.run(usuarios.reativar_usuario, id_usuario, timeout=timeout)
+
+
+async def verificar_login(email: str, senha: str,
+                          timeout: Optional[float] = None) -> Optional[Dict]:
+    """
+    Versão assíncrona de usuarios.verificar_login.
+    """
+    return await aio.run(usuarios.verificar_login, email, senha, timeout=timeout)
+
+
+async def contar_usuarios(incluir_inativos: bool = False,
+                          timeout: Optional[float] = None) -> int:
+    """
+    Versão assíncrona de usuarios.contar_usuarios.
+    """
+    return await aio.run(usuarios.contar_usuarios, incluir_inativos, timeout=timeout)
+
+
+async def listar_usuarios_por_perfil(perfil: str, incluir_inativos: bool = False,
+                                     timeout: Optional[float] = None) -> List[Dict]:
+    """
+    Versão assíncrona de usuarios.listar_usuarios_por_perfil.
+    """
+    return await aio.run(usuarios.listar_usuarios_por_perfil, perfil, incluir_inativos,
+                         timeout=timeout)
@@ -0,0 +1,39 @@
+"""
+Configuração comum dos testes automatizados (pytest).
+
+Cada teste que usa a fixture `banco` recebe um arquivo SQLite novo, já
+migrado, em um diretório temporário; database/db.sqlite nunca é tocado.
+
+Uso (a partir de src/):
+    python -m pytest tests
+
+Autor: Sistema Gráfica
+Data: 2025
+"""
+
+import os
+import sys
+
+import pytest
+
+# Adiciona o diretório pai ao path para importar database e modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import connection
+from database.migrations import migrate
+
+
+@pytest.fixture
+def banco(tmp_path):
+    """
+    Banco em arquivo, migrado até a última versão; o alvo anterior volta
+    a ser usado ao final.
+    """
+    anterior = connection.get_database_target()
+    caminho = str(tmp_path / "db.sqlite")
+    connection.configure_database(caminho)
+    try:
+        migrate()
+        yield caminho
+    finally:
+        connection.configure_database(anterior)
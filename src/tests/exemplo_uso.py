@@ -260,15 +260,19 @@ def main():
     Função principal que executa todos os exemplos.
     """
     try:
+        from database.testing import isolated_database
+        
         print("🚀 Iniciando exemplos do sistema...")
+        print("💾 Usando banco em memória (database/db.sqlite não é alterado)")
         print()
         
-        # Executa exemplos em sequência
-        exemplo_1_setup_banco()
-        exemplo_2_operacoes_crud()
-        exemplo_3_interface_grafica()
-        exemplo_4_relatorio_sistema()
-        exemplo_5_limpeza_dados_teste()
+        # Executa exemplos em sequência, em um banco descartável
+        with isolated_database(template=False):
+            exemplo_1_setup_banco()
+            exemplo_2_operacoes_crud()
+            exemplo_3_interface_grafica()
+            exemplo_4_relatorio_sistema()
+            exemplo_5_limpeza_dados_teste()
         
         # Mensagem final
         print("=" * 70)
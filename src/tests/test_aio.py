@@ -0,0 +1,62 @@
+"""
+API assíncrona (database/aio.py): uso dos pools e cancelamento.
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from database import aio, connection
+
+
+def test_leitura_nao_ocupa_conexao_de_escrita(banco):
+    stats = {}
+    criadas = connection.get_pool_stats().get('created', 0)
+
+    def consulta():
+        stats['escrita'] = connection.get_pool_stats()
+        stats['leitura'] = connection.get_read_pool().stats()
+        return connection.execute_query("SELECT COUNT(*) FROM clientes")
+
+    async def principal():
+        linhas = await aio.execute_query("SELECT COUNT(*) FROM clientes")
+        await aio.run(consulta)
+        return linhas
+
+    assert asyncio.run(principal())[0][0] == 0
+    # Durante o trabalho nenhuma conexão (de nenhum pool) estava presa a ele
+    assert stats['escrita'].get('in_use', 0) == 0
+    assert stats['leitura'].get('in_use', 0) == 0
+    assert connection.get_pool_stats().get('created', 0) == criadas
+
+
+def test_escrita_cria_banco_inexistente(tmp_path):
+    anterior = connection.get_database_target()
+    caminho = str(tmp_path / "novo.sqlite")
+    connection.configure_database(caminho)
+    try:
+        async def principal():
+            await aio.execute_query("CREATE TABLE t (x INTEGER)")
+            await aio.execute_query("INSERT INTO t VALUES (1)")
+            return await aio.execute_query("SELECT x FROM t")
+
+        assert [tuple(l) for l in asyncio.run(principal())] == [(1,)]
+        assert os.path.exists(caminho)
+    finally:
+        connection.configure_database(anterior)
+
+
+def test_timeout_interrompe_consulta(banco):
+    lenta = """
+        WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n)
+        SELECT COUNT(*) FROM n
+    """
+
+    async def principal():
+        with pytest.raises(asyncio.TimeoutError):
+            await aio.execute_query(lenta, timeout=0.2)
+        # A consulta lenta foi interrompida; o banco segue respondendo
+        return await aio.execute_query("SELECT 1", timeout=5.0)
+
+    assert asyncio.run(principal())[0][0] == 1
@@ -0,0 +1,97 @@
+"""
+Tabelas de resumo (database/summaries.py) depois do arquivamento
+(database/archive.py): os valores arquivados continuam somados.
+"""
+
+import sqlite3
+
+from database import archive, summaries, synthetic
+from database.connection import execute_query
+
+
+def _resumos(caminho):
+    conn = sqlite3.connect(caminho)
+    try:
+        return {tabela: sorted(conn.execute(f"SELECT * FROM {tabela}").fetchall())
+                for tabela in summaries.SUMMARIES}
+    finally:
+        conn.close()
+
+
+def _sem_divergencias(diferencas):
+    return all(not linhas for linhas in diferencas.values())
+
+
+def test_arquivamento_preserva_resumos(banco):
+    synthetic.generate_dataset('mini', seed=3)
+    antes = _resumos(banco)
+    assert _sem_divergencias(summaries.verify_summaries())
+
+    resultado = archive.archive_closed(antes_de='2030-01-01')
+
+    assert resultado.orcamentos > 0
+    assert _resumos(banco) == antes
+    assert _sem_divergencias(summaries.verify_summaries())
+
+
+def test_exclusao_fora_do_arquivamento_atualiza_resumos(banco):
+    synthetic.generate_dataset('mini', seed=3)
+    archive.archive_closed(antes_de='2030-01-01')
+    orcamento = execute_query("SELECT id FROM orcamentos ORDER BY id LIMIT 1")[0]['id']
+
+    execute_query("DELETE FROM pagamentos WHERE orcamento_id = ?", (orcamento,))
+    execute_query("DELETE FROM orcamentos WHERE id = ?", (orcamento,))
+
+    assert execute_query("SELECT COUNT(*) AS n FROM resumos_suspensos")[0]['n'] == 0
+    assert _sem_divergencias(summaries.verify_summaries())
+
+
+def test_reconstrucao_soma_o_arquivo(banco):
+    synthetic.generate_dataset('mini', seed=3)
+    archive.archive_closed(antes_de='2030-01-01')
+    antes = _resumos(banco)
+    execute_query("DELETE FROM resumo_saldo_cliente")
+
+    diferencas = summaries.rebuild_summaries()
+
+    assert diferencas['resumo_saldo_cliente']
+    assert _resumos(banco) == antes
+
+
+def test_migracao_9_devolve_valores_arquivados_antes_dela(tmp_path):
+    from database import connection
+    from database.migrations import migrate
+
+    anterior = connection.get_database_target()
+    caminho = str(tmp_path / "db.sqlite")
+    connection.configure_database(caminho)
+    try:
+        migrate(target=8)
+        execute_query("INSERT INTO clientes (id, nome) VALUES (1, 'Cliente')")
+        execute_query("""INSERT INTO orcamentos (id, numero_orcamento, cliente_id, descricao_servico,
+                         quantidade, valor_unitario, valor_total, status, data_criacao)
+                         VALUES (1, 'ORC-1', 1, 'Cartões', 1, 5000, 5000, 'concluido',
+                                 '2020-01-01')""")
+        execute_query("""INSERT INTO pagamentos (orcamento_id, valor_pagamento, forma_pagamento,
+                         status_pagamento, data_pagamento) VALUES (1, 5000, 'pix', 'pago',
+                         '2020-01-02')""")
+        antes = _resumos(caminho)
+
+        # Arquivamento como era antes da migração 9: os DELETEs
+        # subtraíam os valores dos resumos
+        conn = sqlite3.connect(caminho, isolation_level=None)
+        archive._anexar(conn, archive.default_archive_path())
+        for tabela in archive.ARCHIVED_TABLES:
+            conn.execute(f"INSERT INTO arquivo.{tabela} SELECT * FROM main.{tabela}")
+        for tabela in reversed(archive.ARCHIVED_TABLES):
+            conn.execute(f"DELETE FROM main.{tabela}")
+        conn.execute("DETACH DATABASE arquivo")
+        conn.close()
+        assert _resumos(caminho) != antes
+
+        migrate()
+
+        assert _resumos(caminho) == antes
+        assert _sem_divergencias(summaries.verify_summaries())
+    finally:
+        connection.configure_database(anterior)
@@ -0,0 +1,48 @@
+"""
+Testes da retenção de backups (database/backup.py).
+"""
+
+import os
+from datetime import datetime
+
+from database import backup
+
+
+class _RelogioParado(datetime):
+    """datetime.now() sempre no mesmo segundo."""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2025, 1, 1, 12, 0, 0)
+
+
+def test_list_backups_ordena_sequencia_do_mesmo_segundo(tmp_path):
+    nomes = ["db-20250101-120000-10.sqlite", "db-20250101-120000-2.sqlite",
+             "db-20250101-120000.sqlite.gz", "db-20250101-115959.sqlite",
+             "outro-20250101-130000.sqlite", "db-20250101-120000-3.sqlite.parcial"]
+    for nome in nomes:
+        (tmp_path / nome).write_bytes(b"")
+
+    encontrados = backup.list_backups(str(tmp_path), db_path=str(tmp_path / "db.sqlite"))
+
+    assert [os.path.basename(c) for c in encontrados] == [
+        "db-20250101-115959.sqlite",
+        "db-20250101-120000.sqlite.gz",
+        "db-20250101-120000-2.sqlite",
+        "db-20250101-120000-10.sqlite",
+    ]
+
+
+def test_prune_mantem_os_mais_recentes_do_mesmo_segundo(banco, tmp_path, monkeypatch):
+    monkeypatch.setattr(backup, 'datetime', _RelogioParado)
+    destino = str(tmp_path / "backups")
+    criados = [backup.backup_database(destino, verify=False).caminho for _ in range(4)]
+    assert [os.path.basename(c) for c in criados] == [
+        "db-20250101-120000.sqlite", "db-20250101-120000-2.sqlite",
+        "db-20250101-120000-3.sqlite", "db-20250101-120000-4.sqlite",
+    ]
+
+    apagados = backup.prune_backups(destino, manter=2)
+
+    assert apagados == criados[:2]
+    assert backup.list_backups(destino) == criados[2:]
@@ -0,0 +1,72 @@
+"""
+Infraestrutura dos benchmarks (benchmarks/harness.py) e execução curta
+do benchmark de CRUD (benchmarks/bench_crud.py).
+"""
+
+import json
+import random
+
+import pytest
+
+from benchmarks import bench_crud, harness
+
+
+def _execucao(mediana, p95, nome='busca', tamanho=100):
+    return {'resultados': [{'nome': nome, 'tamanho': tamanho,
+                            'mediana_ms': mediana, 'p95_ms': p95}]}
+
+
+def test_estatisticas_por_operacao():
+    r = harness.summarize('x', 10, 2, [0.002, 0.004, 0.006, 0.008])
+
+    assert (r.repeticoes, r.min_ms, r.max_ms) == (4, 1.0, 4.0)
+    assert r.mediana_ms == pytest.approx(2.5)
+    assert r.p95_ms == 4.0
+    assert r.ops_por_segundo == pytest.approx(400)
+
+
+def test_measure_descarta_aquecimento_e_passa_o_preparo():
+    chamadas = []
+
+    r = harness.measure('x', chamadas.append, repeticoes=3, aquecimento=2,
+                        preparar=lambda: len(chamadas))
+
+    assert chamadas == [0, 1, 2, 3, 4]
+    assert r.repeticoes == 3
+    with pytest.raises(ValueError):
+        harness.measure('x', lambda: None, repeticoes=0)
+
+
+def test_comparacao_exige_piora_fora_do_p95():
+    base = _execucao(1.0, 1.05)
+
+    assert harness.compare(base, _execucao(1.2, 1.3))[0].situacao == 'regressao'
+    assert harness.compare(_execucao(1.0, 1.5), _execucao(1.2, 1.3))[0].situacao == 'igual'
+    assert harness.compare(base, _execucao(0.5, 0.6))[0].situacao == 'melhora'
+    situacoes = [c.situacao for c in harness.compare(base, _execucao(1.0, 1.0, nome='outra'))]
+    assert situacoes == ['nova', 'removida']
+
+
+def test_arquivo_de_resultados(tmp_path):
+    caminho = str(tmp_path / "r" / "base.json")
+    resultado = harness.summarize('x', 0, 1, [0.001])
+
+    harness.save_results(caminho, [resultado], {'repeticoes': 1})
+
+    dados = harness.load_results(caminho)
+    assert dados['resultados'] == [resultado._asdict()]
+    assert dados['ambiente']['sqlite']
+    (tmp_path / "outro.json").write_text(json.dumps({'formato': 0}), encoding='utf-8')
+    with pytest.raises(ValueError):
+        harness.load_results(str(tmp_path / "outro.json"))
+
+
+def test_bench_crud_execucao_curta(banco):
+    bench_crud.popular(20)
+
+    resultados = bench_crud.medir_tamanho(20, repeticoes=1, aquecimento=0,
+                                          rng=random.Random(1))
+
+    assert {r.nome for r in resultados} >= {'criar_usuario', 'verificar_login'}
+    assert all(r.tamanho == 20 and r.mediana_ms > 0 for r in resultados)
+    assert harness.format_results(resultados).count('\n') == len(resultados) + 1
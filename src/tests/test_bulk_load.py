@@ -0,0 +1,93 @@
+"""
+Carga de CSV em lote (database/bulk_load.py).
+"""
+
+import csv
+
+import pytest
+
+from database.bulk_load import PROGRESS_TABLE, build_mapping, load_csv
+from database.connection import execute_query
+
+
+def _csv(caminho, linhas, delimitador=';'):
+    with open(caminho, 'w', newline='', encoding='utf-8') as arquivo:
+        csv.writer(arquivo, delimiter=delimitador).writerows(linhas)
+    return str(caminho)
+
+
+def _clientes(quantidade):
+    return [['Nome', 'Razão Social', 'UF', 'CPF']] + [
+        [f'Cliente {i}', f'Empresa {i}', 'sp', f'{i:011d}'] for i in range(1, quantidade + 1)
+    ]
+
+
+def test_mapeamento_por_nome_normalizado_e_apelidos():
+    colunas = build_mapping(['Cliente', 'Razão Social', 'UF', 'Qualquer'], 'clientes',
+                            mapping={'Qualquer': 'observacoes'})
+
+    assert colunas == {0: 'nome', 1: 'empresa', 2: 'estado', 3: 'observacoes'}
+    with pytest.raises(ValueError):
+        build_mapping(['Empresa'], 'clientes')
+
+
+def test_carga_converte_e_grava_em_blocos(banco, tmp_path):
+    caminho = _csv(tmp_path / "clientes.csv", _clientes(25))
+
+    resultado = load_csv(caminho, 'clientes', chunk_size=10, delimitador=';')
+
+    assert (resultado.lidas, resultado.inseridas, resultado.rejeitadas) == (25, 25, 0)
+    linha = execute_query("SELECT empresa, estado, cpf_cnpj FROM clientes WHERE nome = ?",
+                          ('Cliente 7',))[0]
+    assert tuple(linha) == ('Empresa 7', 'SP', '00000000007')
+    assert execute_query(f"SELECT COUNT(*) FROM {PROGRESS_TABLE}")[0][0] == 0
+
+
+def test_precos_de_materiais_em_centavos(banco, tmp_path):
+    caminho = _csv(tmp_path / "materiais.csv", [
+        ['Produto', 'Preço', 'Estoque'],
+        ['Papel A4', '12,50', '100'],
+        ['Vinil', 'R$ 1.234,56', ''],
+    ])
+
+    load_csv(caminho, 'materiais', delimitador=';')
+
+    precos = execute_query("SELECT nome, preco_unitario, estoque_atual FROM materiais ORDER BY id")
+    assert [tuple(p) for p in precos] == [('Papel A4', 1250, 100), ('Vinil', 123456, 0)]
+
+
+def test_linhas_invalidas_vao_para_o_arquivo_de_rejeitadas(banco, tmp_path):
+    linhas = _clientes(4)
+    linhas[2][2] = 'XYZ'        # UF inválida
+    linhas[4][3] = '00000000001'  # CPF repetido: restrição UNIQUE do banco
+    caminho = _csv(tmp_path / "clientes.csv", linhas)
+
+    resultado = load_csv(caminho, 'clientes', chunk_size=10, delimitador=';')
+
+    assert (resultado.inseridas, resultado.rejeitadas) == (2, 2)
+    with open(resultado.arquivo_rejeitadas, newline='', encoding='utf-8') as arquivo:
+        rejeitadas = list(csv.reader(arquivo, delimiter=';'))
+    assert rejeitadas[0][-1] == 'motivo_rejeicao'
+    motivos = {linha[0]: linha[-1] for linha in rejeitadas[1:]}
+    assert motivos['Cliente 2'].startswith('UF inválida')
+    assert motivos['Cliente 4'].startswith('banco:')
+    nomes = [r['nome'] for r in execute_query("SELECT nome FROM clientes ORDER BY id")]
+    assert nomes == ['Cliente 1', 'Cliente 3']
+
+
+def test_carga_interrompida_e_retomada(banco, tmp_path):
+    caminho = _csv(tmp_path / "clientes.csv", _clientes(25))
+
+    def interromper(lidas, inseridas, taxa):
+        if inseridas >= 20:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        load_csv(caminho, 'clientes', chunk_size=10, delimitador=';', progresso=interromper)
+    assert execute_query("SELECT COUNT(*) FROM clientes")[0][0] == 20
+
+    resultado = load_csv(caminho, 'clientes', chunk_size=10, delimitador=';', resume=True)
+
+    assert (resultado.lidas, resultado.inseridas) == (5, 5)
+    assert execute_query("SELECT COUNT(DISTINCT cpf_cnpj) FROM clientes")[0][0] == 25
+    assert execute_query(f"SELECT COUNT(*) FROM {PROGRESS_TABLE}")[0][0] == 0
@@ -0,0 +1,116 @@
+"""
+Cache de resultados (database/cache.py) e sua invalidação pelas
+gravações de database/connection.py, inclusive as feitas por triggers.
+"""
+
+import pytest
+
+from database import connection
+from database.cache import ResultCache
+from database.connection import execute_query, iter_query, transaction
+
+
+def test_put_apos_clear_descarta_tabela_nunca_vista():
+    cache = ResultCache()
+    tabelas = frozenset({'clientes'})
+    versoes = cache.snapshot(tabelas)
+
+    cache.clear()
+    cache.put(('SELECT * FROM clientes', ()), [(1,)], tabelas, versoes)
+
+    assert cache.get(('SELECT * FROM clientes', ())) is None
+
+
+def test_put_apos_invalidate_descarta_resultado():
+    cache = ResultCache()
+    tabelas = frozenset({'clientes', 'orcamentos'})
+    versoes = cache.snapshot(tabelas)
+
+    cache.invalidate(['orcamentos'])
+    cache.put('chave', [(1,)], tabelas, versoes)
+    assert cache.get('chave') is None
+
+    cache.put('chave', [(1,)], tabelas, cache.snapshot(tabelas))
+    assert cache.get('chave') == [(1,)]
+
+
+@pytest.fixture
+def cache_ativo(banco):
+    connection.configure_result_cache(enabled=True)
+    try:
+        yield banco
+    finally:
+        connection.configure_result_cache(enabled=False)
+
+
+def _novo_orcamento(numero, valor, status='aprovado'):
+    execute_query("INSERT INTO orcamentos (numero_orcamento, cliente_id, descricao_servico, "
+                  "valor_total, status) VALUES (?, 1, 'Panfleto', ?, ?)",
+                  (numero, valor, status))
+
+
+def test_gravacao_invalida_tabelas_escritas_por_triggers(cache_ativo):
+    execute_query("INSERT INTO clientes (id, nome) VALUES (1, 'Gráfica Central')")
+    status = "SELECT quantidade, total FROM resumo_orcamentos_status WHERE status = 'aprovado'"
+    saldo = "SELECT faturado FROM resumo_saldo_cliente WHERE cliente_id = 1"
+    busca = "SELECT rowid FROM clientes_busca WHERE clientes_busca MATCH 'papelaria'"
+    assert execute_query(status) == []
+    assert execute_query(saldo) == []
+    assert execute_query(busca) == []
+
+    _novo_orcamento('ORC-1', 1000)
+    execute_query("UPDATE clientes SET nome = 'Papelaria Central' WHERE id = 1")
+
+    assert tuple(execute_query(status)[0]) == (1, 1000)
+    assert execute_query(saldo)[0]['faturado'] == 1000
+    assert [tuple(r) for r in execute_query(busca)] == [(1,)]
+    assert connection.get_result_cache_stats()['invalidations'] >= 3
+
+
+def test_transacao_invalida_no_commit_e_nao_no_rollback(cache_ativo):
+    execute_query("INSERT INTO clientes (id, nome) VALUES (1, 'Cliente')")
+    consulta = "SELECT COALESCE(SUM(total), 0) AS total FROM resumo_orcamentos_status"
+    assert execute_query(consulta)[0]['total'] == 0
+
+    with pytest.raises(RuntimeError):
+        with transaction():
+            _novo_orcamento('ORC-1', 700)
+            raise RuntimeError("desfaz")
+    assert execute_query(consulta)[0]['total'] == 0
+
+    with transaction():
+        _novo_orcamento('ORC-2', 300)
+    assert execute_query(consulta)[0]['total'] == 300
+
+
+def test_select_sobre_view_invalidado_pelas_tabelas_da_view(cache_ativo):
+    execute_query("CREATE VIEW clientes_ativos AS SELECT id, nome FROM clientes WHERE ativo = 1")
+    execute_query("CREATE VIEW nomes_ativos AS SELECT nome FROM clientes_ativos")
+    consulta = "SELECT COUNT(*) AS n FROM nomes_ativos"
+    assert execute_query(consulta)[0]['n'] == 0
+    assert execute_query(consulta)[0]['n'] == 0
+    assert connection.get_result_cache_stats()['hits'] == 1
+
+    execute_query("INSERT INTO clientes (id, nome) VALUES (1, 'Cliente')")
+
+    assert execute_query(consulta)[0]['n'] == 1
+    assert [r['n'] for r in iter_query(consulta)] == [1]
+
+
+def test_select_sobre_view_temporaria_nao_e_guardado(cache_ativo):
+    connection.configure_read_pool(route_reads=False)
+    try:
+        with connection.get_pool().connection() as conn:
+            conn.execute("CREATE TEMP VIEW todos AS SELECT id FROM clientes")
+            consulta = "SELECT COUNT(*) AS n FROM todos"
+            assert execute_query(consulta)[0]['n'] == 0
+
+            # Gravação por fora de execute_query, que nenhuma invalidação veria
+            conn.execute("INSERT INTO clientes (id, nome) VALUES (1, 'Cliente')")
+            conn.commit()
+
+            assert execute_query(consulta)[0]['n'] == 1
+            assert connection.get_result_cache_stats()['entries'] == 0
+            conn.execute("DROP VIEW temp.todos")
+    finally:
+        connection.configure_read_pool()
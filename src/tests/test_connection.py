@@ -0,0 +1,61 @@
+"""
+Conexões de database/connection.py: perfis de PRAGMA e política de bloqueio.
+"""
+
+import copy
+import sqlite3
+
+import pytest
+
+from database import connection
+
+
+def test_busy_timeout_de_configure_retry_nao_altera_perfis(banco, monkeypatch):
+    monkeypatch.setattr(connection, '_busy_timeout', None)
+    perfis = copy.deepcopy(connection.PRAGMA_PROFILES)
+
+    connection.configure_retry(busy_timeout=1234)
+    conn = connection.get_connection()
+    try:
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 1234
+    finally:
+        conn.close()
+
+    assert connection.PRAGMA_PROFILES == perfis
+
+
+@pytest.mark.parametrize('perfil, synchronous, cache_size', [
+    ('desktop', 1, -16000),
+    ('bulk-load', 0, -200000),
+    ('read-only-report', 1, -64000),
+])
+def test_perfis_de_pragma_aplicados_na_abertura(banco, perfil, synchronous, cache_size):
+    conn = connection.get_connection(profile=perfil)
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == synchronous
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == cache_size
+    finally:
+        conn.close()
+
+
+def test_perfil_de_relatorio_recusa_gravacao(banco):
+    conn = connection.get_connection(profile='read-only-report')
+    try:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO clientes (nome) VALUES ('Cliente')")
+    finally:
+        conn.close()
+
+
+def test_perfil_desconhecido(banco):
+    with pytest.raises(ValueError):
+        connection.get_connection(profile='turbo')
+    with pytest.raises(ValueError):
+        connection.ConnectionPool(banco, profile='turbo')
+
+
+def test_pool_usa_o_perfil_configurado(banco):
+    pool = connection.configure_pool(profile='bulk-load')
+    with pool.connection() as conn:
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 0
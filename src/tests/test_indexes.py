@@ -0,0 +1,45 @@
+"""
+Índices secundários (database/migrations.py) e ANALYZE (database/setup.py).
+"""
+
+import pytest
+
+from database.connection import execute_query, get_pool
+from database.migrations import INDEXES
+from database.setup import analyze_database
+
+
+def _plano(sql, params=()):
+    with get_pool().connection() as conn:
+        linhas = conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+    return ' | '.join(linha[3] for linha in linhas)
+
+
+def test_todos_os_indices_criados(banco):
+    existentes = {linha['name'] for linha in execute_query(
+        "SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+    assert {nome for nome, _ in INDEXES} <= existentes
+
+
+@pytest.mark.parametrize('sql, indice', [
+    ("SELECT id FROM orcamentos WHERE cliente_id = ? AND status = 'aprovado'",
+     'idx_orcamentos_cliente_status'),
+    ("SELECT id FROM orcamentos WHERE status = 'pendente' ORDER BY data_criacao",
+     'idx_orcamentos_status_criacao'),
+    ("SELECT id FROM pagamentos WHERE orcamento_id = ?", 'idx_pagamentos_orcamento'),
+    ("SELECT id FROM producao WHERE status_producao = 'fila'", 'idx_producao_status'),
+    ("SELECT id FROM materiais WHERE codigo_barras = ?", 'idx_materiais_codigo_barras'),
+    ("SELECT id FROM clientes WHERE ativo = 1 ORDER BY nome", 'idx_clientes_nome_ativos'),
+])
+def test_consultas_frequentes_usam_indice(banco, sql, indice):
+    params = (1,) * sql.count('?')
+    assert indice in _plano(sql, params)
+
+
+def test_analyze_grava_estatisticas(banco):
+    execute_query("INSERT INTO clientes (nome) VALUES ('Cliente')")
+
+    analyze_database()
+
+    assert execute_query("SELECT COUNT(*) FROM sqlite_stat1")[0][0] > 0
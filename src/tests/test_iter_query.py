@@ -0,0 +1,48 @@
+"""
+Leitura em lotes com iter_query (database/connection.py).
+"""
+
+from contextlib import closing
+
+import pytest
+
+from database import connection
+from database.connection import execute_many, execute_query, iter_query, transaction
+
+
+@pytest.fixture
+def clientes(banco):
+    execute_many("INSERT INTO clientes (id, nome) VALUES (?, ?)",
+                 [(i, f"Cliente {i}") for i in range(1, 26)])
+    return banco
+
+
+def test_devolve_todas_as_linhas_em_ordem(clientes):
+    linhas = list(iter_query("SELECT id, nome FROM clientes ORDER BY id", batch_size=7))
+
+    assert [l['id'] for l in linhas] == list(range(1, 26))
+    assert linhas[0]['nome'] == 'Cliente 1'
+
+
+def test_conexao_reservada_so_enquanto_o_iterador_esta_ativo(clientes):
+    pool = connection.get_read_pool()
+
+    with closing(iter_query("SELECT id FROM clientes", batch_size=5)) as linhas:
+        next(linhas)
+        assert pool.stats()['in_use'] == 1
+    assert pool.stats()['in_use'] == 0
+
+    list(iter_query("SELECT id FROM clientes", batch_size=5))
+    assert pool.stats()['in_use'] == 0
+
+
+def test_dentro_de_transacao_enxerga_gravacoes_pendentes(clientes):
+    with transaction():
+        execute_query("INSERT INTO clientes (id, nome) VALUES (26, 'Novo')")
+        ids = [l['id'] for l in iter_query("SELECT id FROM clientes ORDER BY id")]
+    assert ids[-1] == 26
+
+
+def test_lote_invalido(clientes):
+    with pytest.raises(ValueError):
+        next(iter_query("SELECT id FROM clientes", batch_size=0))
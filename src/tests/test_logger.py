@@ -0,0 +1,77 @@
+"""
+Logger do sistema (database/logger.py): níveis, formatação preguiçosa e
+buffer de diagnóstico.
+"""
+
+import logging
+
+import pytest
+
+from database import logger as logger_mod
+from database.connection import execute_query
+from database.logger import configure_logging, get_logger, get_ring_buffer
+
+
+class _Contador:
+    """Argumento de log que conta quantas vezes foi formatado."""
+
+    def __init__(self):
+        self.formatado = 0
+
+    def __str__(self):
+        self.formatado += 1
+        return 'contador'
+
+
+@pytest.fixture
+def logging_restaurado(monkeypatch):
+    monkeypatch.delenv('GRAFICA_LOG_LEVEL', raising=False)
+    buffer_anterior = get_ring_buffer()
+    yield
+    buffer = get_ring_buffer()
+    if buffer is not buffer_anterior:
+        logger_mod._root_logger.removeHandler(buffer)
+        logger_mod._ring_buffer = buffer_anterior
+    configure_logging()
+
+
+def test_nivel_padrao_descarta_debug_sem_formatar(logging_restaurado):
+    configure_logging()
+    argumento = _Contador()
+
+    get_logger('teste').debug("valor: %s", argumento)
+
+    assert argumento.formatado == 0
+
+
+def test_nivel_vem_da_variavel_de_ambiente(logging_restaurado, monkeypatch):
+    monkeypatch.setenv('GRAFICA_LOG_LEVEL', 'info')
+
+    assert configure_logging().getEffectiveLevel() == logging.INFO
+
+
+def test_buffer_guarda_debug_com_console_em_warning(logging_restaurado):
+    raiz = configure_logging('WARNING', ring_buffer=2, ring_buffer_level='DEBUG')
+    log = get_logger('teste')
+
+    for i in range(3):
+        log.debug("mensagem %s", i)
+
+    assert raiz.handlers[0].level == logging.WARNING
+    registros = get_ring_buffer().records()
+    assert [r['message'] for r in registros] == ['mensagem 1', 'mensagem 2']
+    assert registros[0]['logger'] == 'grafica.teste'
+    assert registros[0]['level'] == 'DEBUG'
+
+    get_ring_buffer().clear()
+    assert get_ring_buffer().records() == []
+
+
+def test_consultas_registradas_em_debug(logging_restaurado, banco):
+    configure_logging('WARNING', ring_buffer=100, ring_buffer_level='DEBUG')
+
+    execute_query("SELECT COUNT(*) FROM clientes")
+
+    assert any(r['logger'] == 'grafica.database.connection'
+               and r['message'].endswith('Registros encontrados: 1')
+               for r in get_ring_buffer().records())
@@ -0,0 +1,218 @@
+"""
+Migrações do esquema (database/migrations.py) a partir de um banco
+criado pela versão anterior ao versionamento (user_version = 0).
+"""
+
+import sqlite3
+
+import pytest
+
+from database import connection, summaries
+from database.connection import execute_query
+from database.migrations import LATEST_VERSION, MigrationError, get_version, migrate
+
+
+# Esquema criado pelo setup.py original, antes das migrações
+ESQUEMA_LEGADO = [
+    """
+    CREATE TABLE usuarios (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nome VARCHAR(100) NOT NULL,
+        email VARCHAR(100) UNIQUE,
+        senha VARCHAR(255),
+        tipo VARCHAR(20) DEFAULT 'operador',
+        ativo BOOLEAN DEFAULT 1,
+        data_criacao DATETIME DEFAULT CURRENT_TIMESTAMP,
+        data_atualizacao DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE clientes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nome VARCHAR(100) NOT NULL,
+        empresa VARCHAR(100),
+        email VARCHAR(100),
+        telefone VARCHAR(20),
+        endereco TEXT,
+        cidade VARCHAR(50),
+        estado VARCHAR(2),
+        cep VARCHAR(10),
+        cpf_cnpj VARCHAR(20) UNIQUE,
+        observacoes TEXT,
+        ativo BOOLEAN DEFAULT 1,
+        data_cadastro DATETIME DEFAULT CURRENT_TIMESTAMP,
+        data_atualizacao DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE materiais (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nome VARCHAR(100) NOT NULL,
+        descricao TEXT,
+        categoria VARCHAR(50),
+        unidade VARCHAR(10) DEFAULT 'un',
+        preco_unitario DECIMAL(10,2) DEFAULT 0.00,
+        estoque_atual INTEGER DEFAULT 0,
+        estoque_minimo INTEGER DEFAULT 0,
+        fornecedor VARCHAR(100),
+        codigo_barras VARCHAR(50),
+        ativo BOOLEAN DEFAULT 1,
+        data_cadastro DATETIME DEFAULT CURRENT_TIMESTAMP,
+        data_atualizacao DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE orcamentos (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        numero_orcamento VARCHAR(20) UNIQUE NOT NULL,
+        cliente_id INTEGER NOT NULL,
+        descricao_servico TEXT NOT NULL,
+        quantidade INTEGER DEFAULT 1,
+        valor_unitario DECIMAL(10,2) DEFAULT 0.00,
+        valor_total DECIMAL(10,2) DEFAULT 0.00,
+        prazo_entrega DATE,
+        status VARCHAR(20) DEFAULT 'pendente',
+        observacoes TEXT,
+        data_criacao DATETIME DEFAULT CURRENT_TIMESTAMP,
+        data_aprovacao DATETIME,
+        data_vencimento DATETIME,
+        usuario_id INTEGER,
+        FOREIGN KEY (cliente_id) REFERENCES clientes(id),
+        FOREIGN KEY (usuario_id) REFERENCES usuarios(id)
+    )
+    """,
+    """
+    CREATE TABLE pagamentos (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        orcamento_id INTEGER NOT NULL,
+        valor_pagamento DECIMAL(10,2) NOT NULL,
+        forma_pagamento VARCHAR(30) DEFAULT 'dinheiro',
+        status_pagamento VARCHAR(20) DEFAULT 'pendente',
+        data_vencimento DATE,
+        data_pagamento DATETIME,
+        observacoes TEXT,
+        numero_comprovante VARCHAR(50),
+        data_criacao DATETIME DEFAULT CURRENT_TIMESTAMP,
+        usuario_id INTEGER,
+        FOREIGN KEY (orcamento_id) REFERENCES orcamentos(id),
+        FOREIGN KEY (usuario_id) REFERENCES usuarios(id)
+    )
+    """,
+    "INSERT INTO usuarios (id, nome, email, senha, tipo) "
+    "VALUES (1, 'Admin', 'Admin@Grafica.com', 'x', 'administrador')",
+    "INSERT INTO clientes (id, nome, cpf_cnpj, ativo) VALUES (1, 'Cliente', '123', 0)",
+    "INSERT INTO orcamentos (id, numero_orcamento, cliente_id, descricao_servico, "
+    "valor_unitario, valor_total, status, usuario_id) "
+    "VALUES (1, 'ORC-1', 1, 'Banner', 150.5, 150.5, 'aprovado', 1)",
+    "INSERT INTO pagamentos (orcamento_id, valor_pagamento, status_pagamento, data_pagamento) "
+    "VALUES (1, 100.25, 'pago', '2024-03-01 10:00:00')",
+]
+
+
+@pytest.fixture
+def banco_legado(tmp_path):
+    caminho = str(tmp_path / "legado.sqlite")
+    conn = sqlite3.connect(caminho)
+    for comando in ESQUEMA_LEGADO:
+        conn.execute(comando)
+    conn.commit()
+    conn.close()
+
+    anterior = connection.get_database_target()
+    connection.configure_database(caminho)
+    try:
+        yield caminho
+    finally:
+        connection.configure_database(anterior)
+
+
+def _esquema(caminho):
+    conn = sqlite3.connect(caminho)
+    try:
+        return sorted(conn.execute("SELECT type, name, sql FROM sqlite_master").fetchall(),
+                      key=repr)
+    finally:
+        conn.close()
+
+
+def test_migra_banco_legado_ate_a_ultima_versao(banco_legado):
+    aplicadas = migrate()
+
+    assert [r.version for r in aplicadas] == list(range(1, LATEST_VERSION + 1))
+    assert get_version() == LATEST_VERSION
+    usuario = execute_query("SELECT email, perfil FROM usuarios WHERE id = 1")[0]
+    assert (usuario['email'], usuario['perfil']) == ('admin@grafica.com', 'admin')
+    assert execute_query("SELECT valor_total FROM orcamentos")[0]['valor_total'] == 15050
+    assert execute_query("SELECT valor_pagamento FROM pagamentos")[0]['valor_pagamento'] == 10025
+    # Cliente já inativo recebe data de exclusão (migração 8)
+    assert execute_query("SELECT data_exclusao FROM clientes")[0]['data_exclusao'] is not None
+    assert all(not linhas for linhas in summaries.verify_summaries().values())
+
+
+def test_migrar_de_novo_nao_altera_nada(banco_legado):
+    migrate()
+    esquema = _esquema(banco_legado)
+
+    assert migrate() == []
+    # Também com pools novos (outra execução do programa)
+    connection.configure_database(banco_legado)
+    assert migrate() == []
+    assert _esquema(banco_legado) == esquema
+    assert get_version() == LATEST_VERSION
+
+
+def test_migracao_parcial_continua_de_onde_parou(banco_legado):
+    assert [r.version for r in migrate(target=4)] == [1, 2, 3, 4]
+
+    assert [r.version for r in migrate()] == list(range(5, LATEST_VERSION + 1))
+    assert migrate() == []
+
+
+def test_emails_repetidos_ignorando_maiusculas_impedem_a_migracao(banco_legado):
+    conn = sqlite3.connect(banco_legado)
+    conn.execute("INSERT INTO usuarios (nome, email) VALUES ('Outro', 'ADMIN@grafica.com')")
+    conn.commit()
+    conn.close()
+
+    with pytest.raises(MigrationError, match='admin@grafica.com'):
+        migrate()
+    # A migração inteira foi desfeita
+    assert get_version() == 0
+
+
+def test_ids_de_linhas_apagadas_nao_voltam_apos_recriar_tabelas(banco_legado):
+    # O setup antigo apagava de verdade: o maior id usado some da tabela
+    conn = sqlite3.connect(banco_legado)
+    for i in (2, 3):
+        conn.execute("INSERT INTO usuarios (id, nome, email) VALUES (?, 'Ex', ?)",
+                     (i, f"ex{i}@grafica.com"))
+        conn.execute("INSERT INTO materiais (id, nome) VALUES (?, 'Papel')", (i,))
+    conn.execute("DELETE FROM usuarios WHERE id > 1")
+    conn.execute("DELETE FROM materiais")
+    conn.commit()
+    conn.close()
+
+    migrate()
+
+    execute_query("INSERT INTO usuarios (nome, email) VALUES ('Novo', 'novo@grafica.com')")
+    execute_query("INSERT INTO materiais (nome) VALUES ('Vinil')")
+    assert execute_query("SELECT MAX(id) FROM usuarios")[0][0] == 4
+    assert execute_query("SELECT MAX(id) FROM materiais")[0][0] == 4
+
+
+def test_migracao_recarrega_mapa_de_triggers_do_cache(banco_legado):
+    # Mapa de triggers carregado antes de a migração 7 criar os resumos
+    migrate(target=6)
+    connection.configure_result_cache(enabled=True)
+    try:
+        execute_query("UPDATE clientes SET nome = 'Cliente' WHERE id = 1")
+        migrate()
+        consulta = "SELECT COALESCE(SUM(total), 0) AS total FROM resumo_receita_diaria"
+        antes = execute_query(consulta)[0]['total']
+
+        execute_query("INSERT INTO pagamentos (orcamento_id, valor_pagamento, status_pagamento, "
+                      "data_pagamento) VALUES (1, 500, 'pago', '2024-03-02')")
+
+        assert execute_query(consulta)[0]['total'] == antes + 500
+    finally:
+        connection.configure_result_cache(enabled=False)
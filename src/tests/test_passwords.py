@@ -0,0 +1,26 @@
+"""
+Hash de senhas (database/passwords.py) e a direção das dependências:
+a camada de banco não importa os módulos de negócio.
+"""
+
+import os
+import subprocess
+import sys
+
+from database.passwords import hash_password
+from modules import usuarios
+
+
+def test_hash_sha256_hexadecimal():
+    assert hash_password("admin123") == (
+        "240be518fabd2724ddb6f04eeb1da5967448d7e831c08c8fa822809f74c720a9"
+    )
+    assert usuarios.gerar_hash_senha is hash_password
+
+
+def test_camada_de_banco_nao_importa_modules():
+    src = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    codigo = ("import sys; import database.setup, database.migrations, database.synthetic; "
+              "sys.exit(any(m.startswith('modules') for m in sys.modules))")
+
+    assert subprocess.run([sys.executable, '-c', codigo], cwd=src).returncode == 0
@@ -0,0 +1,100 @@
+"""
+Pool de conexões (database/connection.py): reuso, limite, verificação de
+saúde e encerramento.
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from database import connection
+from database.connection import ConnectionPool, PoolTimeoutError, execute_query
+
+
+def test_consultas_reutilizam_a_mesma_conexao(banco):
+    pool = connection.configure_pool(max_size=2)
+
+    for _ in range(20):
+        execute_query("INSERT INTO clientes (nome) VALUES ('Cliente')")
+
+    stats = pool.stats()
+    assert stats['created'] == 1
+    assert stats['reused'] == 19
+    assert stats['in_use'] == 0
+
+
+def test_chamadas_aninhadas_recebem_a_mesma_conexao(banco):
+    pool = ConnectionPool(banco, max_size=1)
+    try:
+        with pool.connection() as externa:
+            with pool.connection() as interna:
+                assert interna is externa
+            # Ainda em uso pela chamada externa
+            assert pool.stats()['in_use'] == 1
+        assert pool.stats()['idle'] == 1
+    finally:
+        pool.close()
+
+
+def test_pool_cheio_espera_e_desiste_apos_timeout(banco):
+    pool = ConnectionPool(banco, max_size=1, timeout=0.1)
+    liberar = threading.Event()
+    ocupada = threading.Event()
+
+    def segura_conexao():
+        with pool.connection():
+            ocupada.set()
+            liberar.wait(5)
+
+    thread = threading.Thread(target=segura_conexao)
+    thread.start()
+    try:
+        ocupada.wait(5)
+        with pytest.raises(PoolTimeoutError):
+            pool.acquire()
+        assert pool.stats()['waits'] >= 1
+    finally:
+        liberar.set()
+        thread.join()
+        pool.close()
+
+
+def test_conexao_ociosa_quebrada_e_descartada(banco):
+    pool = ConnectionPool(banco, health_check_interval=0)
+    try:
+        with pool.connection() as conn:
+            pass
+        conn.close()
+
+        with pool.connection() as nova:
+            assert nova is not conn
+            assert nova.execute("SELECT 1").fetchone()[0] == 1
+        stats = pool.stats()
+        assert (stats['health_checks'], stats['discarded'], stats['created']) == (1, 1, 2)
+    finally:
+        pool.close()
+
+
+def test_devolucao_desfaz_transacao_pendente(banco):
+    pool = ConnectionPool(banco, max_size=1)
+    try:
+        with pool.connection() as conn:
+            conn.execute("INSERT INTO clientes (nome) VALUES ('Pendente')")
+            assert conn.in_transaction
+        with pool.connection() as conn:
+            assert not conn.in_transaction
+            assert conn.execute("SELECT COUNT(*) FROM clientes").fetchone()[0] == 0
+    finally:
+        pool.close()
+
+
+def test_pool_fechado_recusa_novas_conexoes(banco):
+    pool = ConnectionPool(banco)
+    with pool.connection():
+        pass
+    pool.close()
+
+    assert pool.stats()['idle'] == 0
+    with pytest.raises(sqlite3.ProgrammingError):
+        pool.acquire()
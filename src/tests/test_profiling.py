@@ -0,0 +1,78 @@
+"""
+Instrumentação de consultas (database/profiling.py).
+"""
+
+import json
+
+import pytest
+
+from database import profiling
+from database.connection import execute_query
+from database.profiling import QueryHistogram, normalize_sql
+
+
+@pytest.fixture
+def profiling_ativo(banco, tmp_path):
+    log = tmp_path / "lentas.log"
+    profiling.reset_query_stats()
+    profiling.configure_profiling(enabled=True, slow_query_ms=0, slow_log_path=str(log),
+                                  explain=True)
+    yield log
+    profiling.configure_profiling(enabled=False, slow_log_path=None)
+    profiling.reset_query_stats()
+
+
+def test_normalizacao_troca_literais_e_reduz_listas_in():
+    sql = "SELECT *  FROM t\n WHERE id IN (1, 2, 3) AND nome = 'O''Brien' AND v > 1.5"
+
+    assert normalize_sql(sql) == "SELECT * FROM t WHERE id IN (?) AND nome = ? AND v > ?"
+
+
+def test_histograma_por_faixas():
+    histograma = QueryHistogram()
+    for ms in (0.05, 0.3, 0.3, 7, 2000):
+        histograma.add(ms, lenta=ms > 100)
+
+    dados = histograma.as_dict()
+    assert (dados['count'], dados['slow'], dados['max_ms']) == (5, 1, 2000)
+    assert dados['buckets']['<=0.5'] == 2
+    assert dados['buckets']['inf'] == 1
+    assert histograma.percentile(50) == 0.5
+    assert histograma.percentile(100) == 2000
+
+
+def test_consultas_agrupadas_pelo_sql_normalizado(profiling_ativo):
+    for i in range(3):
+        execute_query(f"SELECT nome FROM clientes WHERE id = {i}")
+
+    itens = {i['sql']: i for i in profiling.get_query_stats()}
+    assert itens["SELECT nome FROM clientes WHERE id = ?"]['count'] == 3
+
+
+def test_plano_marca_leitura_completa(profiling_ativo):
+    execute_query("SELECT nome FROM clientes WHERE id = ?", (1,))
+    execute_query("SELECT id FROM clientes WHERE observacoes = ?", ('x',))
+
+    planos = profiling.get_query_plans()
+    assert planos["SELECT nome FROM clientes WHERE id = ?"]['full_scan'] is False
+    assert planos["SELECT id FROM clientes WHERE observacoes = ?"]['full_scan'] is True
+    assert 'FULL SCAN' in profiling_ativo.read_text(encoding='utf-8')
+
+
+def test_log_de_lentas_e_arquivo_de_estatisticas(profiling_ativo, tmp_path):
+    execute_query("SELECT COUNT(*) FROM clientes")
+    destino = tmp_path / "stats.json"
+
+    profiling.save_stats(str(destino))
+
+    assert "ms | SELECT COUNT(*) FROM clientes" in profiling_ativo.read_text(encoding='utf-8')
+    itens = json.loads(destino.read_text(encoding='utf-8'))
+    assert itens[0]['sql'] == "SELECT COUNT(*) FROM clientes"
+
+
+def test_desligado_nao_coleta(banco):
+    profiling.reset_query_stats()
+
+    execute_query("SELECT COUNT(*) FROM clientes")
+
+    assert profiling.get_query_stats() == []
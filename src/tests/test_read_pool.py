@@ -0,0 +1,59 @@
+"""
+Pool somente leitura (database/connection.py): roteamento dos SELECTs.
+"""
+
+import sqlite3
+
+import pytest
+
+from database import connection
+from database.connection import execute_query, transaction
+
+
+def _criadas(pool):
+    return pool.stats()['created']
+
+
+def test_select_usa_o_pool_de_leitura(banco):
+    escrita = connection.get_pool()
+    antes = _criadas(escrita)
+
+    execute_query("SELECT COUNT(*) FROM clientes")
+
+    assert _criadas(connection.get_read_pool()) == 1
+    assert _criadas(escrita) == antes
+
+
+def test_conexao_de_leitura_recusa_gravacao(banco):
+    with connection.get_read_pool().connection() as conn:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO clientes (nome) VALUES ('Cliente')")
+
+
+def test_select_dentro_de_transacao_usa_a_conexao_de_escrita(banco):
+    with transaction() as conn:
+        execute_query("INSERT INTO clientes (id, nome) VALUES (1, 'Pendente')")
+        assert execute_query("SELECT nome FROM clientes")[0]['nome'] == 'Pendente'
+        assert conn.in_transaction
+    assert connection.get_read_pool_stats().get('created', 0) == 0
+
+
+def test_roteamento_desligado(banco):
+    connection.configure_read_pool(route_reads=False)
+    try:
+        execute_query("SELECT COUNT(*) FROM clientes")
+        assert _criadas(connection.get_read_pool()) == 0
+    finally:
+        connection.configure_read_pool()
+
+
+def test_banco_em_memoria_usa_so_o_pool_principal():
+    anterior = connection.get_database_target()
+    connection.configure_database(':memory:')
+    try:
+        execute_query("CREATE TABLE t (x INTEGER)")
+        execute_query("INSERT INTO t VALUES (1)")
+        assert execute_query("SELECT x FROM t")[0]['x'] == 1
+        assert connection.get_read_pool_stats() == {}
+    finally:
+        connection.configure_database(anterior)
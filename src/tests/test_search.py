@@ -0,0 +1,60 @@
+"""
+Busca textual com FTS5 (database/search.py).
+"""
+
+import pytest
+
+from database.connection import execute_query
+from database.search import buscar, build_match_query
+
+
+def _cliente(nome, empresa=None, cidade=None, ativo=1):
+    execute_query("INSERT INTO clientes (nome, empresa, cidade, ativo) VALUES (?, ?, ?, ?)",
+                  (nome, empresa, cidade, ativo))
+    return execute_query("SELECT MAX(id) FROM clientes")[0][0]
+
+
+def test_consulta_match_por_prefixos():
+    assert build_match_query('graf "cear-á') == '"graf"* "cear"* "á"*'
+    assert build_match_query(' -- ') is None
+
+
+def test_ignora_acentos_e_maiusculas(banco):
+    _cliente("João Silva", "Gráfica Ceará Ltda", "Fortaleza")
+
+    resultados = buscar("GRAF cear", tabelas=['clientes'])
+
+    assert [r['titulo'] for r in resultados] == ["João Silva"]
+    assert '[Gráfica]' in resultados[0]['trecho']
+
+
+def test_triggers_mantem_o_indice_em_dia(banco):
+    id_cliente = _cliente("Maria Souza")
+
+    execute_query("UPDATE clientes SET nome = 'Maria Oliveira' WHERE id = ?", (id_cliente,))
+    assert buscar("souza", tabelas=['clientes']) == []
+    assert [r['id'] for r in buscar("oliveira", tabelas=['clientes'])] == [id_cliente]
+
+    execute_query("DELETE FROM clientes WHERE id = ?", (id_cliente,))
+    assert buscar("oliveira", tabelas=['clientes']) == []
+
+
+def test_nome_pesa_mais_que_cidade(banco):
+    _cliente("Ana", cidade="Sobral")
+    _cliente("Sobral Impressos", cidade="Crato")
+
+    titulos = [r['titulo'] for r in buscar("sobral", tabelas=['clientes'])]
+
+    assert titulos == ["Sobral Impressos", "Ana"]
+
+
+def test_inativos_so_quando_pedidos(banco):
+    _cliente("Pedro Inativo", ativo=0)
+
+    assert buscar("pedro") == []
+    assert len(buscar("pedro", apenas_ativos=False)) == 1
+
+
+def test_tabela_sem_indice(banco):
+    with pytest.raises(ValueError):
+        buscar("x", tabelas=['pagamentos'])
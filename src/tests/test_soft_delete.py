@@ -0,0 +1,25 @@
+"""
+Linha de comando de database/soft_delete.py.
+"""
+
+import sys
+
+from database import connection, soft_delete
+from database.migrations import get_version, migrate
+
+
+def test_status_nao_migra_o_banco(tmp_path, monkeypatch, capsys):
+    anterior = connection.get_database_target()
+    connection.configure_database(str(tmp_path / "db.sqlite"))
+    try:
+        migrate(target=7)
+        monkeypatch.setattr(sys, 'argv', ['soft_delete.py', 'status'])
+        soft_delete.main()
+        assert get_version() == 7
+        assert 'clientes' in capsys.readouterr().out
+
+        monkeypatch.setattr(sys, 'argv', ['soft_delete.py', 'limpar'])
+        soft_delete.main()
+        assert get_version() > 7
+    finally:
+        connection.configure_database(anterior)
@@ -0,0 +1,52 @@
+"""
+Classificação de comandos SQL e cache de statements (database/connection.py).
+"""
+
+import pytest
+
+from database import connection
+from database.connection import execute_query
+
+
+@pytest.fixture
+def cache_de_comandos():
+    connection.configure_statement_cache(maxsize=4)
+    yield
+    connection.configure_statement_cache()
+
+
+@pytest.mark.parametrize('sql, tipo', [
+    ("SELECT * FROM clientes", 'read'),
+    ("  \n select nome FROM clientes", 'read'),
+    ("INSERT INTO clientes (nome) VALUES (?)", 'write'),
+    ("update clientes SET nome = ?", 'write'),
+    ("DELETE FROM clientes", 'write'),
+    ("CREATE TABLE t (x)", 'other'),
+    ("PRAGMA user_version", 'other'),
+])
+def test_classificacao_pelo_primeiro_token(sql, tipo):
+    assert connection.get_statement_info(sql).kind == tipo
+
+
+def test_classificacao_inclui_tabelas(cache_de_comandos):
+    info = connection.get_statement_info(
+        "SELECT o.id FROM orcamentos o JOIN Clientes c ON c.id = o.cliente_id"
+    )
+    assert info.tables == frozenset({'orcamentos', 'clientes'})
+
+
+def test_mesmo_texto_classificado_uma_vez(banco, cache_de_comandos):
+    for _ in range(5):
+        execute_query("SELECT COUNT(*) FROM clientes")
+
+    stats = connection.get_statement_cache_stats()
+    assert (stats['misses'], stats['hits'], stats['size']) == (1, 4, 1)
+
+
+def test_cache_limitado_ao_tamanho_configurado(cache_de_comandos):
+    for i in range(10):
+        connection.get_statement_info(f"SELECT {i}")
+
+    stats = connection.get_statement_cache_stats()
+    assert (stats['size'], stats['maxsize'], stats['misses']) == (4, 4, 10)
+
@@ -0,0 +1,77 @@
+"""
+Tabelas de resumo mantidas por triggers (database/summaries.py).
+"""
+
+from database import summaries
+from database.connection import execute_query
+from database.money import Money
+
+
+def _orcamento(id_orcamento, valor, status='pendente', cliente_id=1):
+    execute_query("""INSERT INTO orcamentos (id, numero_orcamento, cliente_id, descricao_servico,
+                     quantidade, valor_unitario, valor_total, status)
+                     VALUES (?, ?, ?, 'Cartões', 1, ?, ?, ?)""",
+                  (id_orcamento, f"ORC-{id_orcamento}", cliente_id, valor, valor, status))
+
+
+def _pagamento(orcamento_id, valor, data='2025-03-10', status='pago', forma='pix'):
+    execute_query("""INSERT INTO pagamentos (orcamento_id, valor_pagamento, forma_pagamento,
+                     status_pagamento, data_pagamento) VALUES (?, ?, ?, ?, ?)""",
+                  (orcamento_id, valor, forma, status, data))
+
+
+def _confere():
+    assert all(not linhas for linhas in summaries.verify_summaries().values())
+
+
+def test_triggers_acompanham_insert_update_e_delete(banco):
+    execute_query("INSERT INTO clientes (id, nome) VALUES (1, 'Cliente')")
+    _orcamento(1, 10000)
+    _orcamento(2, 2500, status='aprovado')
+    _pagamento(1, 4000)
+    _pagamento(1, 1000, status='pendente')
+    _confere()
+    assert summaries.saldo_cliente(1) == {
+        'faturado': Money(2500), 'pago': Money(4000), 'saldo': Money(-1500)}
+
+    execute_query("UPDATE orcamentos SET status = 'aprovado' WHERE id = 1")
+    execute_query("UPDATE pagamentos SET status_pagamento = 'pago' WHERE status_pagamento = 'pendente'")
+    _confere()
+    assert summaries.saldo_cliente(1)['saldo'] == Money(7500)
+    assert summaries.orcamentos_por_status() == {
+        'aprovado': {'quantidade': 2, 'total': Money(12500)}}
+
+    execute_query("DELETE FROM pagamentos WHERE valor_pagamento = 4000")
+    execute_query("DELETE FROM orcamentos WHERE id = 2")
+    _confere()
+    assert summaries.receita_por_dia('2025-03-01', '2025-03-31') == [
+        {'dia': '2025-03-10', 'forma_pagamento': 'pix', 'total': Money(1000), 'quantidade': 1}]
+
+
+def test_consultas_dos_paineis(banco):
+    execute_query("INSERT INTO clientes (id, nome) VALUES (1, 'Ana'), (2, 'Bruno')")
+    _orcamento(1, 9000, status='concluido', cliente_id=1)
+    _orcamento(2, 3000, status='aprovado', cliente_id=2)
+    _pagamento(1, 2000, forma='dinheiro')
+    _pagamento(2, 3000, data='2025-04-01')
+
+    assert summaries.maiores_saldos() == [{'cliente_id': 1, 'nome': 'Ana', 'saldo': Money(7000)}]
+    assert [r['dia'] for r in summaries.receita_por_dia('2025-01-01', '2025-12-31')] == [
+        '2025-03-10', '2025-04-01']
+    assert summaries.receita_por_dia('2025-01-01', '2025-12-31', forma_pagamento='pix')[0][
+        'total'] == Money(3000)
+    assert summaries.saldo_cliente(99)['saldo'] == Money(0)
+
+
+def test_verificacao_aponta_e_reconstrucao_corrige(banco):
+    execute_query("INSERT INTO clientes (id, nome) VALUES (1, 'Cliente')")
+    _orcamento(1, 5000, status='aprovado')
+    execute_query("UPDATE resumo_saldo_cliente SET faturado = 1")
+
+    diferencas = summaries.verify_summaries()
+    assert diferencas['resumo_saldo_cliente']
+    assert not diferencas['resumo_orcamentos_status']
+
+    assert summaries.rebuild_summaries()['resumo_saldo_cliente']
+    _confere()
+    assert summaries.saldo_cliente(1)['faturado'] == Money(5000)
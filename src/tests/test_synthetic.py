@@ -0,0 +1,66 @@
+"""
+Gerador de dados sintéticos (database/synthetic.py).
+"""
+
+import pytest
+
+from database import connection, summaries, synthetic
+from database.connection import execute_query
+from database.search import buscar
+
+
+def _amostra():
+    return [tuple(linha) for linha in execute_query("""
+        SELECT c.cpf_cnpj, c.email, o.numero_orcamento, o.valor_total, o.status,
+               (SELECT SUM(valor_pagamento) FROM pagamentos p WHERE p.orcamento_id = o.id)
+        FROM orcamentos o JOIN clientes c ON c.id = o.cliente_id
+        ORDER BY o.id
+    """)]
+
+
+def test_documentos_com_digitos_verificadores():
+    assert synthetic.cpf_digits(111444777) == "11144477735"
+    assert synthetic.cnpj_digits(11222333) == "11222333000181"
+    assert synthetic.ean13(123456789) == "7891234567895"
+
+
+def test_mesma_semente_gera_os_mesmos_dados(banco, tmp_path):
+    resultado = synthetic.generate_dataset(orcamentos=300, seed=7, chunk_size=100)
+    primeira = _amostra()
+
+    connection.configure_database(str(tmp_path / "outro.sqlite"))
+    synthetic.generate_dataset(orcamentos=300, seed=7, chunk_size=100)
+    assert _amostra() == primeira
+
+    connection.configure_database(str(tmp_path / "terceiro.sqlite"))
+    synthetic.generate_dataset(orcamentos=300, seed=8, chunk_size=100)
+    assert _amostra() != primeira
+
+    assert resultado.linhas['orcamentos'] == len(primeira) == 300
+    assert resultado.semente == 7
+
+
+def test_dados_consistentes_com_resumos_e_busca(banco):
+    synthetic.generate_dataset(orcamentos=200, seed=1, chunk_size=50)
+
+    assert all(not linhas for linhas in summaries.verify_summaries().values())
+    nome = execute_query("SELECT nome FROM clientes WHERE ativo = 1 LIMIT 1")[0]['nome']
+    assert any(r['titulo'] == nome for r in buscar(nome, tabelas=['clientes'], limite=100))
+    assert execute_query("SELECT COUNT(*) FROM sqlite_stat1")[0][0] > 0
+    with connection.get_pool().connection() as conn:
+        assert conn.execute("PRAGMA foreign_key_check").fetchall() == []
+
+
+def test_segunda_carga_continua_os_ids(banco):
+    synthetic.generate_dataset(orcamentos=100, seed=1)
+    synthetic.generate_dataset(orcamentos=100, seed=2)
+
+    assert tuple(execute_query("SELECT COUNT(*), MAX(id) FROM orcamentos")[0]) == (200, 200)
+    assert all(not linhas for linhas in summaries.verify_summaries().values())
+
+
+def test_parametros_invalidos(banco):
+    with pytest.raises(ValueError):
+        synthetic.generate_dataset('enorme')
+    with pytest.raises(ValueError):
+        synthetic.generate_dataset(orcamentos=0)
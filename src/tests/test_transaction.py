@@ -0,0 +1,51 @@
+"""
+transaction() de database/connection.py: commit, rollback e SAVEPOINTs
+dos blocos aninhados.
+"""
+
+import pytest
+
+from database.connection import execute_query, in_transaction, transaction
+
+
+def _nomes():
+    return [linha['nome'] for linha in execute_query("SELECT nome FROM clientes ORDER BY id")]
+
+
+def test_erro_no_bloco_interno_desfaz_apenas_o_savepoint(banco):
+    with transaction():
+        execute_query("INSERT INTO clientes (id, nome) VALUES (1, 'Externo')")
+        with pytest.raises(ValueError):
+            with transaction():
+                execute_query("INSERT INTO clientes (id, nome) VALUES (2, 'Interno')")
+                raise ValueError("falha no bloco interno")
+        assert in_transaction()
+        execute_query("INSERT INTO clientes (id, nome) VALUES (3, 'Depois')")
+
+    assert not in_transaction()
+    assert _nomes() == ['Externo', 'Depois']
+
+
+def test_bloco_interno_confirmado_e_desfeito_pelo_externo(banco):
+    with pytest.raises(RuntimeError):
+        with transaction():
+            execute_query("INSERT INTO clientes (id, nome) VALUES (1, 'Externo')")
+            with transaction():
+                execute_query("INSERT INTO clientes (id, nome) VALUES (2, 'Interno')")
+            raise RuntimeError("falha no bloco externo")
+
+    assert not in_transaction()
+    assert _nomes() == []
+
+
+def test_savepoints_em_tres_niveis(banco):
+    with transaction():
+        execute_query("INSERT INTO clientes (id, nome) VALUES (1, 'Nível 1')")
+        with transaction():
+            execute_query("INSERT INTO clientes (id, nome) VALUES (2, 'Nível 2')")
+            with pytest.raises(ValueError):
+                with transaction():
+                    execute_query("INSERT INTO clientes (id, nome) VALUES (3, 'Nível 3')")
+                    raise ValueError("falha no nível 3")
+
+    assert _nomes() == ['Nível 1', 'Nível 2']
@@ -0,0 +1,47 @@
+"""
+Cadastro de usuários (modules/usuarios.py) sobre um banco migrado.
+"""
+
+from database.connection import execute_query, get_pool
+from modules import usuarios
+
+
+def test_email_gravado_normalizado_e_buscado_sem_diferenciar_maiusculas(banco):
+    assert usuarios.criar_usuario("Ana", "  Ana.Souza@Grafica.COM ", "senha123", "operador")
+
+    assert execute_query("SELECT email FROM usuarios")[0]['email'] == 'ana.souza@grafica.com'
+    assert usuarios.buscar_usuario_por_email("ANA.SOUZA@grafica.com")['nome'] == "Ana"
+    assert usuarios.verificar_login("Ana.Souza@GRAFICA.com", "senha123")['nome'] == "Ana"
+
+
+def test_email_repetido_com_outra_caixa_recusado(banco):
+    assert usuarios.criar_usuario("Ana", "ana@grafica.com", "senha123", "operador")
+
+    assert not usuarios.criar_usuario("Outra Ana", "ANA@grafica.com", "senha123", "operador")
+    assert usuarios.contar_usuarios() == 1
+
+
+def test_busca_por_email_usa_o_indice_unico(banco):
+    with get_pool().connection() as conn:
+        plano = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM usuarios WHERE email = ? AND ativo = 1",
+            ('ana@grafica.com',)
+        ).fetchall()
+
+    assert any('USING INDEX sqlite_autoindex_usuarios' in linha[3] for linha in plano)
+
+
+def test_criar_com_email_de_usuario_desativado_reativa_o_cadastro(banco):
+    assert usuarios.criar_usuario("Ana", "ana@grafica.com", "senha123", "operador")
+    id_ana = usuarios.buscar_usuario_por_email("ana@grafica.com")['id']
+    assert usuarios.deletar_usuario(id_ana)
+    assert usuarios.verificar_login("ana@grafica.com", "senha123") is None
+
+    assert usuarios.criar_usuario("Ana Souza", "ANA@grafica.com", "nova123", "admin")
+
+    usuario = usuarios.buscar_usuario_por_id(id_ana)
+    assert (usuario['nome'], usuario['perfil'], usuario['ativo']) == ("Ana Souza", 'admin', 1)
+    assert usuarios.verificar_login("ana@grafica.com", "nova123")['id'] == id_ana
+    assert usuarios.verificar_login("ana@grafica.com", "senha123") is None
+    linha = execute_query("SELECT COUNT(*), MAX(data_exclusao) FROM usuarios")[0]
+    assert tuple(linha) == (1, None)
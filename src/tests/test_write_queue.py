@@ -0,0 +1,90 @@
+"""
+Fila de gravação com group commit (WriteQueue, database/connection.py).
+"""
+
+import sqlite3
+
+import pytest
+
+from database import connection
+from database.connection import WriteQueue, execute_query, transaction
+
+
+INSERT = "INSERT INTO clientes (nome, cpf_cnpj) VALUES (?, ?)"
+
+
+@pytest.fixture
+def fila_global(banco):
+    fila = connection.configure_write_queue(window_ms=1)
+    try:
+        yield fila
+    finally:
+        connection.configure_write_queue(enabled=False)
+
+
+def _total_clientes():
+    return execute_query("SELECT COUNT(*) FROM clientes")[0][0]
+
+
+def test_comandos_da_janela_gravados_com_um_commit(banco):
+    fila = WriteQueue(banco, window_ms=200)
+    try:
+        futuros = [fila.submit(INSERT, (f"Cliente {i}", f"{i:011d}")) for i in range(20)]
+        assert [f.result(timeout=5) for f in futuros] == [1] * 20
+        stats = fila.stats()
+    finally:
+        fila.close()
+
+    assert stats['statements'] == 20
+    assert stats['max_batch'] > 1
+    assert stats['batches'] < 20
+    assert _total_clientes() == 20
+
+
+def test_erro_desfaz_so_o_proprio_comando(banco):
+    fila = WriteQueue(banco, window_ms=200)
+    try:
+        primeiro = fila.submit(INSERT, ("Cliente 1", "00000000001"))
+        repetido = fila.submit(INSERT, ("Cliente 2", "00000000001"))
+        terceiro = fila.submit(INSERT, ("Cliente 3", "00000000003"))
+
+        assert primeiro.result(timeout=5) == 1
+        with pytest.raises(sqlite3.IntegrityError):
+            repetido.result(timeout=5)
+        assert terceiro.result(timeout=5) == 1
+        assert fila.stats()['errors'] == 1
+    finally:
+        fila.close()
+
+    nomes = [r['nome'] for r in execute_query("SELECT nome FROM clientes ORDER BY id")]
+    assert nomes == ['Cliente 1', 'Cliente 3']
+
+
+def test_close_grava_o_que_estiver_pendente(banco):
+    fila = WriteQueue(banco, window_ms=50, durability='deferred')
+    for i in range(5):
+        fila.submit(INSERT, (f"Cliente {i}", None))
+    fila.close()
+
+    assert _total_clientes() == 5
+    with pytest.raises(sqlite3.ProgrammingError):
+        fila.submit(INSERT, ("Depois", None))
+
+
+def test_execute_query_usa_a_fila_fora_de_transacao(fila_global):
+    execute_query(INSERT, ("Pela fila", None))
+    assert connection.get_write_queue_stats()['statements'] == 1
+
+    with transaction():
+        execute_query(INSERT, ("Na transação", None))
+    assert connection.get_write_queue_stats()['statements'] == 1
+    assert _total_clientes() == 2
+
+
+def test_parametros_invalidos(banco):
+    with pytest.raises(ValueError):
+        WriteQueue(banco, durability='turbo')
+    with pytest.raises(ValueError):
+        WriteQueue(banco, max_batch=0)
+    with pytest.raises(sqlite3.ProgrammingError):
+        connection.submit_write(INSERT, ("Sem fila", None))
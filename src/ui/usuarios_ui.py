@@ -24,6 +24,12 @@ from modules.usuarios import (
     atualizar_usuario, deletar_usuario, verificar_login,
     contar_usuarios, listar_usuarios_por_perfil
 )
+from database.connection import configure_result_cache
+from database.migrations import MigrationError, migrate
+from database.logger import get_logger
+
+
+logger = get_logger('ui.usuarios')
 
 
 class UsuariosUI:
@@ -53,7 +59,7 @@ class UsuariosUI:
         # Carrega dados iniciais
         self.atualizar_lista_usuarios()
         
-        print("🖥️  Interface de usuários iniciada")
+        logger.info("🖥️  Interface de usuários iniciada")
     
     def configurar_janela_principal(self):
         """
@@ -342,7 +348,7 @@ class UsuariosUI:
             total = contar_usuarios()
             self.label_contador.config(text=f"Usuários: {total}")
         except Exception as e:
-            print(f"❌ Erro ao contar usuários: {e}")
+            logger.error("❌ Erro ao contar usuários: %s", e)
     
     def limpar_formulario(self):
         """
@@ -432,7 +438,7 @@ class UsuariosUI:
         except Exception as e:
             messagebox.showerror("Erro", f"Erro inesperado: {str(e)}")
             self.atualizar_status("❌ Erro inesperado ao adicionar usuário.")
-            print(f"❌ Erro ao adicionar usuário: {e}")
+            logger.error("❌ Erro ao adicionar usuário: %s", e)
     
     def atualizar_lista_usuarios(self):
         """
@@ -475,7 +481,7 @@ class UsuariosUI:
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao carregar usuários: {str(e)}")
             self.atualizar_status("❌ Erro ao carregar lista de usuários.")
-            print(f"❌ Erro ao atualizar lista: {e}")
+            logger.error("❌ Erro ao atualizar lista: %s", e)
     
     def on_usuario_selecionado(self, event):
         """
@@ -558,7 +564,7 @@ class UsuariosUI:
         except Exception as e:
             messagebox.showerror("Erro", f"Erro inesperado: {str(e)}")
             self.atualizar_status("❌ Erro inesperado ao atualizar usuário.")
-            print(f"❌ Erro ao atualizar usuário: {e}")
+            logger.error("❌ Erro ao atualizar usuário: %s", e)
     
     def excluir_usuario_selecionado(self):
         """
@@ -574,7 +580,7 @@ class UsuariosUI:
         resposta = messagebox.askyesno(
             "Confirmar Exclusão",
             f"Tem certeza que deseja excluir o usuário '{nome}'?\n\n"
-            f"⚠️ Esta ação não pode ser desfeita!",
+            f"⚠️ O usuário não poderá mais entrar no sistema.",
             icon="warning"
         )
         
@@ -598,7 +604,7 @@ class UsuariosUI:
         except Exception as e:
             messagebox.showerror("Erro", f"Erro inesperado: {str(e)}")
             self.atualizar_status("❌ Erro inesperado ao excluir usuário.")
-            print(f"❌ Erro ao excluir usuário: {e}")
+            logger.error("❌ Erro ao excluir usuário: %s", e)
 
 
 def main():
@@ -607,6 +613,20 @@ def main():
     """
     print("🚀 Iniciando interface de usuários...")
     
+    # A lista e o total são recarregados após cada operação; o cache evita
+    # repetir os SELECTs enquanto a tabela não muda. TTL curto porque
+    # outras estações podem gravar no mesmo banco.
+    configure_result_cache(ttl=10.0)
+    
+    try:
+        # Garante que o banco tem a estrutura esperada por modules/usuarios
+        # (só lê PRAGMA user_version se já estiver atualizado)
+        migrate()
+    except MigrationError as e:
+        print(f"❌ Erro ao atualizar o banco: {e}")
+        messagebox.showerror("Erro Fatal", f"Erro ao atualizar o banco de dados:\n{str(e)}")
+        return
+    
     try:
         # Cria janela principal
         root = tk.Tk()